@@ -4,6 +4,7 @@ Módulo de configuración core para la aplicación.
 Author: Juan Felipe Henao (@Pipe-1z)
 """
 import os
+import tempfile
 
 
 def _as_bool(value: str) -> bool:
@@ -54,3 +55,305 @@ def get_dev_allowed_origins() -> list[str]:
     defaults = ["http://localhost:3000", "http://127.0.0.1:3000"]
     items = [s.strip() for s in raw.split(",") if s.strip()]
     return items if items else defaults
+
+
+def _as_int(value: str, default: int) -> int:
+    """
+    Convierte un string a entero, usando un valor por defecto si no es válido.
+    
+    Args:
+        value: String a convertir
+        default: Valor a retornar si el string no es un entero válido
+        
+    Returns:
+        Entero representado por el string o el valor por defecto
+        
+    Author: Juan Felipe Henao (@Pipe-1z)
+    """
+    try:
+        return int(value.strip())
+    except (AttributeError, ValueError):
+        return default
+
+
+def get_parse_cache_size() -> int:
+    """
+    Obtiene el número máximo de entradas de la caché de parsing.
+    
+    Se configura con la variable de entorno PARSE_CACHE_SIZE (por defecto 256).
+    Un valor de 0 desactiva la caché.
+    
+    Returns:
+        Número máximo de resultados de parsing a mantener en memoria
+        
+    Author: Juan Felipe Henao (@Pipe-1z)
+    """
+    return max(0, _as_int(os.getenv("PARSE_CACHE_SIZE", "256"), 256))
+
+
+def get_parse_document_store_size() -> int:
+    """
+    Obtiene el número máximo de documentos guardados para el parseo incremental.
+    
+    Se configura con la variable de entorno PARSE_DOCUMENT_STORE_SIZE (por defecto 64).
+    Un valor de 0 desactiva el parseo incremental (cada petición parsea completo).
+    
+    Returns:
+        Número máximo de documentos a mantener en memoria
+        
+    Author: Juan Felipe Henao (@Pipe-1z)
+    """
+    return max(0, _as_int(os.getenv("PARSE_DOCUMENT_STORE_SIZE", "64"), 64))
+
+
+def get_program_store_size() -> int:
+    """
+    Obtiene el número máximo de handles de programa guardados.
+    
+    Se configura con la variable de entorno PROGRAM_STORE_SIZE (por defecto 64).
+    Un valor de 0 desactiva los handles (cada petición debe enviar el código).
+    
+    Returns:
+        Número máximo de programas a mantener en memoria
+        
+    Author: Juan Felipe Henao (@Pipe-1z)
+    """
+    return max(0, _as_int(os.getenv("PROGRAM_STORE_SIZE", "64"), 64))
+
+
+def get_parse_batch_max_items() -> int:
+    """
+    Obtiene el número máximo de programas aceptados por /grammar/parse/batch.
+    
+    Se configura con la variable de entorno PARSE_BATCH_MAX_ITEMS (por defecto 1000).
+    
+    Returns:
+        Número máximo de programas por lote (al menos 1)
+        
+    Author: Juan Felipe Henao (@Pipe-1z)
+    """
+    return max(1, _as_int(os.getenv("PARSE_BATCH_MAX_ITEMS", "1000"), 1000))
+
+
+def get_analysis_batch_max_items() -> int:
+    """
+    Obtiene el número máximo de programas aceptados por /analyze/batch.
+    
+    Se configura con la variable de entorno ANALYSIS_BATCH_MAX_ITEMS (por defecto 1000).
+    
+    Returns:
+        Número máximo de programas por lote (al menos 1)
+        
+    Author: Juan Felipe Henao (@Pipe-1z)
+    """
+    return max(1, _as_int(os.getenv("ANALYSIS_BATCH_MAX_ITEMS", "1000"), 1000))
+
+
+def get_analysis_cache_size() -> int:
+    """
+    Obtiene el número máximo de resultados de análisis exitosos en caché.
+    
+    Se configura con la variable de entorno ANALYSIS_CACHE_SIZE (por defecto 256).
+    Un valor de 0 desactiva la caché de análisis.
+    
+    Returns:
+        Número máximo de resultados exitosos a mantener en memoria
+        
+    Author: Juan Felipe Henao (@Pipe-1z)
+    """
+    return max(0, _as_int(os.getenv("ANALYSIS_CACHE_SIZE", "256"), 256))
+
+
+def get_analysis_cache_failure_size() -> int:
+    """
+    Obtiene el número máximo de resultados fallidos (errores de parseo, "No
+    aplicable", etc.) en la caché de análisis.
+    
+    Se configura con la variable de entorno ANALYSIS_CACHE_FAILURE_SIZE (por
+    defecto 64). Un valor de 0 desactiva la caché de fallos.
+    
+    Returns:
+        Número máximo de resultados fallidos a mantener en memoria
+        
+    Author: Juan Felipe Henao (@Pipe-1z)
+    """
+    return max(0, _as_int(os.getenv("ANALYSIS_CACHE_FAILURE_SIZE", "64"), 64))
+
+
+def get_analysis_cache_ttl() -> int:
+    """
+    Obtiene el tiempo de vida (segundos) de las entradas de la caché de análisis.
+    
+    Se configura con la variable de entorno ANALYSIS_CACHE_TTL_SECONDS (por
+    defecto 3600). Un valor de 0 hace que las entradas no expiren.
+    
+    Returns:
+        Segundos de vida de cada entrada
+        
+    Author: Juan Felipe Henao (@Pipe-1z)
+    """
+    return max(0, _as_int(os.getenv("ANALYSIS_CACHE_TTL_SECONDS", "3600"), 3600))
+
+
+def get_subtree_memo_size() -> int:
+    """
+    Obtiene el número máximo de subárboles analizados en el memo compartido del proceso.
+    
+    Se configura con la variable de entorno SUBTREE_MEMO_SIZE (por defecto 1024).
+    El memo guarda las filas de bloques y cuerpos de bucle por su hash
+    estructural, de modo que los fragmentos repetidos (intercambios, recorridos
+    lineales, núcleos de bucles anidados) se analizan una vez por proceso. Un
+    valor de 0 lo desactiva (cada análisis solo reutiliza sus propios subárboles).
+    
+    Returns:
+        Número máximo de subárboles a mantener en memoria
+        
+    Author: Juan Felipe Henao (@Pipe-1z)
+    """
+    return max(0, _as_int(os.getenv("SUBTREE_MEMO_SIZE", "1024"), 1024))
+
+
+# Backends disponibles para el nivel compartido de las cachés
+CACHE_BACKENDS = ("memory", "sqlite", "redis")
+
+
+def get_cache_backend() -> str:
+    """
+    Obtiene el backend compartido de las cachés de parsing y análisis.
+    
+    Se configura con la variable de entorno CACHE_BACKEND:
+    - "memory" (por defecto): cada proceso solo usa sus cachés en memoria
+    - "sqlite": además, un archivo SQLite compartido por los workers del host
+    - "redis": además, un servidor Redis (o compatible) compartido
+    
+    Valores desconocidos usan "memory".
+    
+    Returns:
+        Nombre del backend
+        
+    Author: Juan Felipe Henao (@Pipe-1z)
+    """
+    backend = os.getenv("CACHE_BACKEND", "memory").strip().lower()
+    return backend if backend in CACHE_BACKENDS else "memory"
+
+
+def get_cache_sqlite_path() -> str:
+    """
+    Obtiene la ruta del archivo SQLite del backend de caché "sqlite".
+    
+    Se configura con la variable de entorno CACHE_SQLITE_PATH (por defecto
+    aa-api-cache.sqlite3 en el directorio temporal del sistema).
+    
+    Returns:
+        Ruta del archivo
+        
+    Author: Juan Felipe Henao (@Pipe-1z)
+    """
+    default = os.path.join(tempfile.gettempdir(), "aa-api-cache.sqlite3")
+    return os.getenv("CACHE_SQLITE_PATH", "").strip() or default
+
+
+def get_cache_redis_url() -> str:
+    """
+    Obtiene la URL del servidor del backend de caché "redis".
+    
+    Se configura con la variable de entorno CACHE_REDIS_URL (por defecto
+    redis://127.0.0.1:6379/0).
+    
+    Returns:
+        URL redis://[:password@]host[:port][/db]
+        
+    Author: Juan Felipe Henao (@Pipe-1z)
+    """
+    return os.getenv("CACHE_REDIS_URL", "").strip() or "redis://127.0.0.1:6379/0"
+
+
+def _available_cores() -> int:
+    """Núcleos disponibles para el proceso."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # plataformas sin sched_getaffinity
+        return os.cpu_count() or 1
+
+
+def get_engine_workers() -> int:
+    """
+    Obtiene el número de procesos del motor de ejecución de las rutas de análisis.
+    
+    Se configura con la variable de entorno ENGINE_WORKERS. Por defecto se usan
+    los núcleos disponibles si hay más de uno; con 0 (o un solo núcleo) los
+    análisis corren en los hilos del servidor, como las rutas síncronas.
+    
+    Returns:
+        Número de procesos (0 = sin pool de procesos)
+        
+    Author: Juan Felipe Henao (@Pipe-1z)
+    """
+    available = _available_cores()
+    default = available if available > 1 else 0
+    return max(0, _as_int(os.getenv("ENGINE_WORKERS", ""), default))
+
+
+def get_engine_queue_size() -> int:
+    """
+    Obtiene cuántas peticiones pueden esperar turno en el motor de ejecución.
+    
+    Se configura con la variable de entorno ENGINE_QUEUE_SIZE (por defecto 64).
+    Con la cola llena las rutas de análisis responden 429 de inmediato.
+    
+    Returns:
+        Tamaño de la cola (además de las peticiones en ejecución)
+        
+    Author: Juan Felipe Henao (@Pipe-1z)
+    """
+    return max(0, _as_int(os.getenv("ENGINE_QUEUE_SIZE", "64"), 64))
+
+
+def get_analysis_deadline() -> int:
+    """
+    Obtiene el tiempo máximo de análisis por petición, en segundos.
+
+    Se configura con la variable de entorno ANALYSIS_DEADLINE_SECONDS (por
+    defecto 30). Al agotarse, el análisis se corta y la respuesta devuelve el
+    mejor resultado parcial marcado como degradado. Con 0 no hay límite.
+
+    Returns:
+        Segundos (0 = sin límite)
+
+    Author: Juan Felipe Henao (@Pipe-1z)
+    """
+    return max(0, _as_int(os.getenv("ANALYSIS_DEADLINE_SECONDS", "30"), 30))
+
+
+def get_warmup_enabled() -> bool:
+    """
+    Obtiene si se ejecuta el calentamiento al arrancar la aplicación.
+    
+    Se configura con la variable de entorno WARMUP_ENABLED (por defecto activado).
+    Con el calentamiento desactivado /health reporta listo de inmediato.
+    
+    Returns:
+        True si el calentamiento está activado, False en caso contrario
+        
+    Author: Juan Felipe Henao (@Pipe-1z)
+    """
+    return _as_bool(os.getenv("WARMUP_ENABLED", "1"))
+
+
+def get_warmup_corpus_dir() -> str:
+    """
+    Obtiene el directorio con programas (.pseudo) del corpus de calentamiento.
+    
+    Se configura con la variable de entorno WARMUP_CORPUS_DIR. Si no está definida
+    se usan los fixtures de la gramática (packages/grammar/fixtures).
+    
+    Returns:
+        Ruta del directorio (puede no existir; en ese caso solo se usan los
+        algoritmos representativos incorporados)
+        
+    Author: Juan Felipe Henao (@Pipe-1z)
+    """
+    default = os.path.abspath(os.path.join(
+        os.path.dirname(__file__), "..", "..", "..", "..", "packages", "grammar", "fixtures"
+    ))
+    return os.getenv("WARMUP_CORPUS_DIR", "").strip() or default
@@ -0,0 +1,329 @@
+"""
+Motor de ejecución de las rutas de análisis.
+
+Las rutas eran funciones síncronas que Starlette ejecuta en su pool de hilos,
+así que el trabajo de SymPy y ANTLR de todas las peticiones competía por el GIL y
+una instancia de la API usaba en la práctica un solo núcleo. El motor pone un
+pool de procesos entre las rutas y el análisis: las rutas son async, envían el
+trabajo pesado al pool y esperan el resultado sin bloquear el event loop.
+
+- ENGINE_WORKERS procesos, creados al arrancar y calentados con el mismo corpus
+  que el proceso principal (si WARMUP_ENABLED). El motor queda listo (y /health
+  con él) cuando todos los workers terminaron de calentar.
+- Afinidad: cada worker es un pool de un proceso. run_on(clave, ...) envía el
+  trabajo siempre al mismo worker para la misma clave; las rutas de análisis
+  usan el programId (hash del código), así que detect-methods, open y trace del
+  mismo programa encuentran en ese worker su handle (AST, índice, recurrencia).
+  run(...) sin clave usa el worker con menos trabajo en curso.
+- Cola acotada (ENGINE_QUEUE_SIZE): con todos los workers ocupados y la cola
+  llena, la petición se rechaza de inmediato con 429 en vez de esperar.
+- Si un worker muere (p. ej. sin memoria), sus peticiones en curso responden 503
+  y ese worker se vuelve a crear para las siguientes.
+- Con ENGINE_WORKERS=0 (o un solo núcleo) el trabajo corre en los hilos del
+  servidor, con la misma cola acotada.
+
+Las excepciones EngineBusy y EngineUnavailable se convierten en respuestas
+429/503 con Retry-After en main.py.
+
+Author: Juan Felipe Henao (@Pipe-1z)
+"""
+import asyncio
+import os
+import threading
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import wait as wait_futures
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from .config import get_engine_queue_size, get_engine_workers, get_warmup_enabled
+
+# Segundos sugeridos al cliente (Retry-After) cuando el motor rechaza una petición
+RETRY_AFTER_SECONDS = 1
+
+
+class EngineError(Exception):
+    """
+    Error del motor de ejecución que se responde con un código HTTP propio.
+
+    Author: Juan Felipe Henao (@Pipe-1z)
+    """
+
+    status_code = 503
+
+    def __init__(self, message: str, retry_after: int = RETRY_AFTER_SECONDS):
+        super().__init__(message)
+        self.message = message
+        self.retry_after = retry_after
+
+
+class EngineBusy(EngineError):
+    """Todos los workers ocupados y la cola llena (429)."""
+
+    status_code = 429
+
+
+class EngineUnavailable(EngineError):
+    """Motor cerrado o worker caído durante la petición (503)."""
+
+    status_code = 503
+
+
+def _init_worker(warm: bool) -> None:
+    """Inicializa un worker del motor. Corre en cada proceso al crearse."""
+    if warm:
+        from .warmup import WarmupState, load_warmup_corpus, run_warmup
+
+        run_warmup(load_warmup_corpus(), WarmupState())
+
+
+def _ping() -> int:
+    """Tarea vacía para arrancar un worker. Solo corre cuando el worker ya calentó."""
+    return os.getpid()
+
+
+class ExecutionEngine:
+    """
+    Workers de un proceso con cola acotada para el trabajo pesado de las rutas.
+
+    Author: Juan Felipe Henao (@Pipe-1z)
+    """
+
+    def __init__(self, workers: int = 0, queue_size: int = 64, warm: bool = False):
+        """
+        Inicializa el motor (los workers se crean con start() o con la primera tarea).
+
+        Args:
+            workers: Número de procesos (0 = hilos del servidor)
+            queue_size: Peticiones que pueden esperar además de las que se ejecutan
+            warm: Si cada worker ejecuta el calentamiento al crearse
+
+        Author: Juan Felipe Henao (@Pipe-1z)
+        """
+        self.workers = max(0, int(workers))
+        self.queue_size = max(0, int(queue_size))
+        self.capacity = max(1, self.workers) + self.queue_size
+        self.warm = warm
+        # Un pool de un proceso por worker, para poder elegir a qué proceso va cada tarea
+        self._pools: List[Optional[ProcessPoolExecutor]] = [None] * self.workers
+        self._load = [0] * self.workers
+        self._lock = threading.Lock()
+        self._closed = False
+        self._ready = threading.Event()
+        if self.workers == 0:
+            self._ready.set()
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.crashes = 0
+
+    def _get_pool(self, slot: int) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._closed:
+                raise EngineUnavailable("El motor de ejecución está cerrado")
+            pool = self._pools[slot]
+            if pool is None:
+                pool = self._pools[slot] = ProcessPoolExecutor(
+                    max_workers=1,
+                    initializer=_init_worker,
+                    initargs=(self.warm,),
+                )
+            return pool
+
+    def _discard_pool(self, slot: int, pool: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._pools[slot] is pool:
+                self._pools[slot] = None
+                self.crashes += 1
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def slot_for(self, key: str) -> int:
+        """
+        Worker que atiende las tareas de una clave (siempre el mismo para la misma clave).
+
+        Args:
+            key: Clave de afinidad (p. ej. el programId)
+
+        Returns:
+            Índice del worker (0 sin pool de procesos)
+
+        Author: Juan Felipe Henao (@Pipe-1z)
+        """
+        return zlib.crc32(key.encode("utf-8")) % self.workers if self.workers else 0
+
+    def start(self) -> Optional[threading.Thread]:
+        """
+        Crea los workers y los arranca sin esperar a que terminen de calentar.
+
+        Un hilo de fondo marca el motor como listo (ready) cuando todos los
+        workers respondieron a un ping, es decir, cuando terminó su inicialización.
+
+        Returns:
+            Hilo que espera a los workers o None sin pool de procesos
+
+        Author: Juan Felipe Henao (@Pipe-1z)
+        """
+        if self.workers == 0:
+            return None
+        futures = [self._get_pool(slot).submit(_ping) for slot in range(self.workers)]
+        thread = threading.Thread(target=self._await_workers, args=(futures,), name="engine-warmup", daemon=True)
+        thread.start()
+        return thread
+
+    def _await_workers(self, futures: List[Any]) -> None:
+        # Con un proceso por pool, cada ping responde cuando su worker ya calentó;
+        # un worker roto o cerrado no bloquea: las peticiones lo recrean o responden 503
+        wait_futures(futures)
+        self._ready.set()
+
+    @property
+    def ready(self) -> bool:
+        """True cuando los workers terminaron de calentar (o no hay pool de procesos)."""
+        return self._ready.is_set()
+
+    async def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Ejecuta fn(*args, **kwargs) en el worker con menos trabajo y espera su resultado.
+
+        fn, sus argumentos y su resultado deben poder serializarse con pickle
+        (funciones de nivel de módulo y datos simples).
+
+        Args:
+            fn: Función a ejecutar
+            *args: Argumentos posicionales
+            **kwargs: Argumentos con nombre
+
+        Returns:
+            Resultado de fn
+
+        Raises:
+            EngineBusy: Si los workers y la cola están llenos
+            EngineUnavailable: Si el motor está cerrado o el worker murió
+            Exception: La excepción lanzada por fn
+
+        Author: Juan Felipe Henao (@Pipe-1z)
+        """
+        return await self._submit(None, fn, args, kwargs)
+
+    async def run_on(self, key: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Como run, pero siempre en el worker de key (ver slot_for), que conserva el
+        estado de las tareas anteriores con la misma clave (p. ej. el handle de un
+        programa).
+
+        Args:
+            key: Clave de afinidad (p. ej. el programId)
+            fn: Función a ejecutar
+            *args: Argumentos posicionales
+            **kwargs: Argumentos con nombre
+
+        Returns:
+            Resultado de fn
+
+        Raises:
+            Las mismas excepciones que run
+
+        Author: Juan Felipe Henao (@Pipe-1z)
+        """
+        return await self._submit(self.slot_for(key), fn, args, kwargs)
+
+    async def _submit(self, slot: Optional[int], fn: Callable[..., Any], args: Any, kwargs: Any) -> Any:
+        with self._lock:
+            if self._closed:
+                raise EngineUnavailable("El motor de ejecución está cerrado")
+            if self.in_flight >= self.capacity:
+                self.rejected += 1
+                raise EngineBusy("Servidor ocupado: demasiadas peticiones en cola, reintente en unos segundos")
+            self.in_flight += 1
+            if self.workers:
+                if slot is None:
+                    slot = min(range(self.workers), key=self._load.__getitem__)
+                self._load[slot] += 1
+
+        try:
+            if self.workers == 0:
+                return await run_in_threadpool(fn, *args, **kwargs)
+            pool = self._get_pool(slot)
+            try:
+                return await asyncio.wrap_future(pool.submit(fn, *args, **kwargs))
+            except BrokenProcessPool:
+                self._discard_pool(slot, pool)
+                raise EngineUnavailable("Un worker del motor de ejecución terminó inesperadamente")
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+                self.completed += 1
+                if self.workers:
+                    self._load[slot] -= 1
+
+    def shutdown(self) -> None:
+        """
+        Cierra los workers; las tareas siguientes responden EngineUnavailable.
+
+        Author: Juan Felipe Henao (@Pipe-1z)
+        """
+        with self._lock:
+            self._closed = True
+            pools, self._pools = self._pools, [None] * self.workers
+        for pool in pools:
+            if pool is not None:
+                pool.shutdown(wait=True, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Devuelve el estado del motor.
+
+        Returns:
+            Diccionario con mode ("process" o "thread"), workers, ready,
+            queue_size, in_flight, completed, rejected y crashes
+
+        Author: Juan Felipe Henao (@Pipe-1z)
+        """
+        with self._lock:
+            return {
+                "mode": "process" if self.workers else "thread",
+                "workers": self.workers,
+                "ready": self.ready,
+                "queue_size": self.queue_size,
+                "in_flight": self.in_flight,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "crashes": self.crashes,
+            }
+
+
+# Motor compartido del proceso (se crea con la configuración del entorno)
+_engine: Optional[ExecutionEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_engine() -> ExecutionEngine:
+    """
+    Obtiene el motor de ejecución del proceso, creándolo la primera vez.
+
+    Returns:
+        Instancia global de ExecutionEngine
+
+    Author: Juan Felipe Henao (@Pipe-1z)
+    """
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = ExecutionEngine(get_engine_workers(), get_engine_queue_size(), get_warmup_enabled())
+        return _engine
+
+
+def shutdown_engine() -> None:
+    """
+    Cierra el motor de ejecución (al apagar la API). Uno nuevo se crea con el
+    siguiente get_engine().
+
+    Author: Juan Felipe Henao (@Pipe-1z)
+    """
+    global _engine
+    with _engine_lock:
+        engine, _engine = _engine, None
+    if engine is not None:
+        engine.shutdown()
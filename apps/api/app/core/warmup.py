@@ -0,0 +1,321 @@
+"""
+Calentamiento de la aplicación al arrancar.
+
+Las primeras peticiones después de levantar un contenedor pagan la construcción
+del DFA de ANTLR, las importaciones perezosas y cachés de suposiciones de SymPy y
+los caminos de código de los analizadores que aún no se han ejecutado. Para que
+esa latencia no llegue a los usuarios, al arrancar se pasa un corpus de programas
+por parse_source, analyze_algorithm (todos los modos) y CodeExecutor en un hilo de
+fondo; /health reporta "listo" solo cuando termina.
+
+Author: Juan Felipe Henao (@Pipe-1z)
+"""
+import glob
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from .config import get_warmup_corpus_dir, get_warmup_enabled
+
+# Algoritmos representativos (iterativos y recursivos) que se suman a los fixtures
+WARMUP_PROGRAMS: List[str] = [
+    """burbuja(A[n], n) BEGIN
+  FOR i <- 1 TO n - 1 DO BEGIN
+    FOR j <- 1 TO n - i DO BEGIN
+      IF (A[j] > A[j + 1]) THEN BEGIN
+        temp <- A[j];
+        A[j] <- A[j + 1];
+        A[j + 1] <- temp;
+      END
+    END
+  END
+END""",
+    """busquedaLineal(A[n], x, n) BEGIN
+  i <- 1;
+  WHILE (i <= n and A[i] != x) DO BEGIN
+    i <- i + 1;
+  END
+  RETURN i;
+END""",
+    """factorial(n) BEGIN
+  IF (n <= 1) THEN BEGIN
+    RETURN 1;
+  END
+  ELSE BEGIN
+    RETURN n * factorial(n - 1);
+  END
+END""",
+    """fibonacci(n) BEGIN
+  IF (n <= 1) THEN BEGIN
+    RETURN n;
+  END
+  ELSE BEGIN
+    RETURN fibonacci(n - 1) + fibonacci(n - 2);
+  END
+END""",
+    """busquedaBinaria(A[n], x, inicio, fin) BEGIN
+  IF (inicio > fin) THEN BEGIN
+    RETURN -1;
+  END
+  mitad <- (inicio + fin) div 2;
+  IF (A[mitad] = x) THEN BEGIN
+    RETURN mitad;
+  END
+  ELSE BEGIN
+    IF (A[mitad] < x) THEN BEGIN
+      RETURN busquedaBinaria(A, x, mitad + 1, fin);
+    END
+    ELSE BEGIN
+      RETURN busquedaBinaria(A, x, inicio, mitad - 1);
+    END
+  END
+END""",
+]
+
+ANALYSIS_MODES = ("worst", "best", "avg", "all")
+
+# Tamaño de entrada pequeño para ejercitar CodeExecutor sin costo apreciable
+EXECUTOR_INPUT_SIZE = 4
+
+STATUS_PENDING = "pending"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+STATUS_DISABLED = "disabled"
+
+
+class WarmupState:
+    """
+    Estado del calentamiento, compartido entre el hilo de fondo y /health.
+
+    Author: Juan Felipe Henao (@Pipe-1z)
+    """
+
+    def __init__(self):
+        """
+        Inicializa el estado como pendiente.
+
+        Author: Juan Felipe Henao (@Pipe-1z)
+        """
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Vuelve al estado inicial (pendiente, sin métricas).
+
+        Author: Juan Felipe Henao (@Pipe-1z)
+        """
+        with self._lock:
+            self.status = STATUS_PENDING
+            self.duration_ms: Optional[float] = None
+            self.programs = 0
+            self.failures = 0
+            self.skipped = 0
+            self.error: Optional[str] = None
+
+    def start(self) -> None:
+        """
+        Marca el calentamiento como en curso.
+
+        Author: Juan Felipe Henao (@Pipe-1z)
+        """
+        with self._lock:
+            self.status = STATUS_RUNNING
+
+    def finish(self, duration_ms: float, programs: int, failures: int, skipped: int = 0) -> None:
+        """
+        Marca el calentamiento como terminado y guarda sus métricas.
+
+        Args:
+            duration_ms: Duración total en milisegundos
+            programs: Número de programas procesados
+            failures: Número de pasos que lanzaron una excepción
+            skipped: Número de programas del corpus que no parsean (no se analizan)
+
+        Author: Juan Felipe Henao (@Pipe-1z)
+        """
+        with self._lock:
+            self.status = STATUS_DONE
+            self.duration_ms = duration_ms
+            self.programs = programs
+            self.failures = failures
+            self.skipped = skipped
+
+    def fail(self, duration_ms: float, error: str) -> None:
+        """
+        Marca el calentamiento como fallido (p. ej. no se pudieron importar los
+        módulos de análisis). La aplicación no queda lista.
+
+        Args:
+            duration_ms: Duración hasta el fallo en milisegundos
+            error: Descripción del error
+
+        Author: Juan Felipe Henao (@Pipe-1z)
+        """
+        with self._lock:
+            self.status = STATUS_FAILED
+            self.duration_ms = duration_ms
+            self.error = error
+
+    def disable(self) -> None:
+        """
+        Marca el calentamiento como desactivado (la aplicación queda lista).
+
+        Author: Juan Felipe Henao (@Pipe-1z)
+        """
+        with self._lock:
+            self.status = STATUS_DISABLED
+
+    @property
+    def ready(self) -> bool:
+        """True cuando el calentamiento terminó o está desactivado."""
+        return self.status in (STATUS_DONE, STATUS_DISABLED)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Devuelve el estado para /health.
+
+        Returns:
+            Diccionario con status, durationMs, programs, failures, skipped y error
+
+        Author: Juan Felipe Henao (@Pipe-1z)
+        """
+        with self._lock:
+            return {
+                "status": self.status,
+                "durationMs": self.duration_ms,
+                "programs": self.programs,
+                "failures": self.failures,
+                "skipped": self.skipped,
+                "error": self.error,
+            }
+
+
+# Estado compartido del proceso
+warmup_state = WarmupState()
+
+
+def get_warmup_state() -> WarmupState:
+    """
+    Obtiene el estado de calentamiento del proceso.
+
+    Returns:
+        Instancia global de WarmupState
+
+    Author: Juan Felipe Henao (@Pipe-1z)
+    """
+    return warmup_state
+
+
+def load_warmup_corpus(directory: Optional[str] = None) -> List[str]:
+    """
+    Carga el corpus de calentamiento: los .pseudo del directorio configurado más
+    los algoritmos representativos incorporados.
+
+    Args:
+        directory: Directorio con programas .pseudo (por defecto WARMUP_CORPUS_DIR)
+
+    Returns:
+        Lista de códigos fuente
+
+    Author: Juan Felipe Henao (@Pipe-1z)
+    """
+    directory = directory or get_warmup_corpus_dir()
+    programs: List[str] = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.pseudo"))):
+        try:
+            with open(path, encoding="utf-8") as fh:
+                programs.append(fh.read())
+        except OSError:
+            continue
+    return programs + WARMUP_PROGRAMS
+
+
+def run_warmup(corpus: List[str], state: Optional[WarmupState] = None) -> Dict[str, Any]:
+    """
+    Pasa cada programa del corpus por el parser, el análisis en todos los modos y,
+    para los iterativos, por CodeExecutor.
+
+    Los resultados se descartan: solo interesa el efecto de calentar cachés e
+    importaciones. Un paso que falla se cuenta y no detiene el calentamiento; un
+    programa que no parsea se cuenta en skipped. Si falla algo fuera de los pasos
+    (p. ej. las importaciones), el estado queda en failed en lugar de running.
+
+    Args:
+        corpus: Lista de códigos fuente
+        state: Estado a actualizar (por defecto el global)
+
+    Returns:
+        Snapshot del estado al terminar
+
+    Author: Juan Felipe Henao (@Pipe-1z)
+    """
+    state = state or get_warmup_state()
+    state.start()
+    started = time.perf_counter()
+    failures = 0
+    skipped = 0
+
+    try:
+        # Importaciones aquí: los módulos de análisis dependen de app.core
+        from ..modules.analysis.service import analyze_algorithm
+        from ..modules.classification.classifier import detect_algorithm_kind
+        from ..modules.execution.executor import CodeExecutor
+        from ..modules.parsing.service import parse_source
+
+        for source in corpus:
+            try:
+                parsed = parse_source(source)
+            except Exception:
+                failures += 1
+                continue
+            ast = parsed.get("ast")
+            if not parsed.get("ok") or not ast:
+                skipped += 1
+                continue
+
+            for mode in ANALYSIS_MODES:
+                try:
+                    analyze_algorithm(source, mode)
+                except Exception:
+                    failures += 1
+
+            try:
+                if detect_algorithm_kind(ast) == "iterative":
+                    CodeExecutor(ast, EXECUTOR_INPUT_SIZE, "worst").execute()
+            except Exception:
+                failures += 1
+    except Exception as e:
+        state.fail((time.perf_counter() - started) * 1000, f"{type(e).__name__}: {e}")
+        return state.snapshot()
+
+    duration_ms = (time.perf_counter() - started) * 1000
+    state.finish(duration_ms, len(corpus), failures, skipped)
+    return state.snapshot()
+
+
+def start_warmup() -> Optional[threading.Thread]:
+    """
+    Lanza el calentamiento en un hilo de fondo (o marca la aplicación como lista
+    si está desactivado).
+
+    Returns:
+        Hilo del calentamiento o None si está desactivado
+
+    Author: Juan Felipe Henao (@Pipe-1z)
+    """
+    state = get_warmup_state()
+    if not get_warmup_enabled():
+        state.disable()
+        return None
+    state.start()
+    thread = threading.Thread(
+        target=run_warmup,
+        args=(load_warmup_corpus(), state),
+        name="warmup",
+        daemon=True,
+    )
+    thread.start()
+    return thread
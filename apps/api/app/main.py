@@ -2,27 +2,61 @@
 Punto de entrada principal de la aplicación FastAPI.
 
 Configura la aplicación FastAPI, middlewares (CORS en desarrollo),
-y registra los routers de los módulos principales.
+registra los routers de los módulos principales y lanza el calentamiento
+al arrancar (ver core/warmup.py). Cada petición mide sus etapas de análisis
+(ver modules/shared/metrics.py): se devuelven en la cabecera Server-Timing y se
+acumulan en /metrics.
 
 Author: Juan Felipe Henao (@Pipe-1z)
 """
 import os
+from contextlib import asynccontextmanager
 
 from dotenv import load_dotenv
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 
 from .core.config import get_dev_allowed_origins, get_dev_cors_enabled
+from .core.engine import EngineError, get_engine, shutdown_engine
+from .core.warmup import STATUS_FAILED, get_warmup_state, start_warmup
 from .modules.analysis.router import router as analyze_router
 from .modules.classification.router import router as classify_router
+from .modules.parsing.adapter import shutdown_parse_pool
 from .modules.parsing.router import router as parse_router
+from .modules.shared.metrics import (
+    OTHER_LABEL,
+    PROMETHEUS_CONTENT_TYPE,
+    collect_phases,
+    observe_phases,
+    render_metrics,
+)
 
 # Cargar variables de entorno desde .env
 env_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), ".env")
 load_dotenv(env_path)
 
-app = FastAPI(title="algorithmic-analysis API", version="0.1.0")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Ciclo de vida de la aplicación: arranca los workers del motor de ejecución y
+    lanza el calentamiento en segundo plano al arrancar, sin bloquear el inicio
+    del servidor, y cierra los pools de procesos (motor, parseo por lotes y
+    análisis de mode="all") al apagar.
+
+    Author: Juan Felipe Henao (@Pipe-1z)
+    """
+    # Antes del hilo de calentamiento: los workers se crean sin otros hilos activos
+    get_engine().start()
+    start_warmup()
+    yield
+    shutdown_engine()
+    shutdown_parse_pool()
+
+
+app = FastAPI(title="algorithmic-analysis API", version="0.1.0", lifespan=lifespan)
 
 # --- CORS SOLO DEV ---
 if get_dev_cors_enabled():
@@ -36,19 +70,89 @@ if get_dev_cors_enabled():
     )
 
 
+@app.middleware("http")
+async def phase_timing(request: Request, call_next):
+    """
+    Mide las etapas de análisis de la petición: las registra en los histogramas
+    de /metrics (etiquetados por endpoint, modo y tipo de algoritmo) y las
+    devuelve en la cabecera Server-Timing.
+    
+    Las respuestas en streaming (/analyze/batch) envían sus cabeceras antes de
+    analizar: cada elemento del lote registra sus propias etapas.
+    
+    El endpoint se etiqueta con la plantilla de la ruta (no con la URL), así que
+    las rutas desconocidas no crean series nuevas.
+    
+    Author: Juan Felipe Henao (@Pipe-1z)
+    """
+    with collect_phases() as timings:
+        response = await call_next(request)
+    if timings.phases:
+        route = request.scope.get("route")
+        timings.label(endpoint=getattr(route, "path", None) or OTHER_LABEL)
+        observe_phases(timings)
+        response.headers["Server-Timing"] = timings.server_timing()
+    return response
+
+
+@app.exception_handler(EngineError)
+async def engine_error_handler(request: Request, exc: EngineError) -> JSONResponse:
+    """
+    Responde 429/503 con Retry-After cuando el motor de ejecución rechaza una
+    petición, con el mismo formato de error que el resto de la API.
+    
+    Author: Juan Felipe Henao (@Pipe-1z)
+    """
+    return JSONResponse(
+        {"ok": False, "errors": [{"message": exc.message, "line": None, "column": None}]},
+        status_code=exc.status_code,
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
 # --- Rutas ---
 @app.get("/health")
 def health():
     """
     Endpoint de health check para verificar el estado del servidor.
     
+    El servidor se reporta listo solo cuando terminó el calentamiento (o está
+    desactivado) y los workers del motor terminaron el suyo; mientras tanto
+    responde 503 para que el balanceador no le envíe tráfico. Si el
+    calentamiento falló responde 503 con status "failed".
+    
+    Returns:
+        JSONResponse con {"status": "ok", "ready": true, "warmup": {...}, "engine": {...}}
+        (200) o {"status": "starting" | "failed", "ready": false, ...} (503)
+        
+    Author: Juan Felipe Henao (@Pipe-1z)
+    """
+    state = get_warmup_state()
+    engine = get_engine().stats()
+    if state.ready and engine["ready"]:
+        return JSONResponse({"status": "ok", "ready": True, "warmup": state.snapshot(), "engine": engine})
+    status = "failed" if state.status == STATUS_FAILED else "starting"
+    return JSONResponse(
+        {"status": status, "ready": False, "warmup": state.snapshot(), "engine": engine},
+        status_code=503,
+    )
+
+
+@app.get("/metrics")
+def metrics():
+    """
+    Expone las métricas del proceso en formato de texto de Prometheus.
+    
+    Incluye el histograma analysis_phase_duration_seconds, con la duración de
+    cada etapa del análisis (parse, classify, visit, summations, t_open, big_o,
+    recurrence, solve) por endpoint, mode y kind.
+    
     Returns:
-        JSONResponse con {"status": "ok"}
+        PlainTextResponse con Content-Type text/plain; version=0.0.4
         
     Author: Juan Felipe Henao (@Pipe-1z)
     """
-    # Respeta tu forma actual (JSON con {"status":"ok"})
-    return JSONResponse({"status": "ok"})
+    return PlainTextResponse(render_metrics(), media_type=PROMETHEUS_CONTENT_TYPE)
 
 
 app.include_router(parse_router)
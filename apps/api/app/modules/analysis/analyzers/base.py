@@ -1,12 +1,24 @@
 import hashlib
 import json
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Union
 
-from sympy import Expr, Integer, Symbol, Sum, latex, sympify
+from sympy import Expr, Integer, Symbol, Sum, srepr, sympify
 
+from ...shared.program_index import ProgramIndex
 from ...shared.types import AnalyzeOpenResponse, LineCost
 from ..models.avg_model import AvgModel
+from ..utils.closure_memo import ClosureMemo
 from ..utils.expr_converter import ExprConverter
+from ..utils.subtree_memo import MemoEntry, SubtreeInfo, get_subtree_memo, structural_hash, tree_hashes
+
+
+def _chain_context_hash(previous: str, multiplier: Any) -> str:
+    """Hash del contexto previous extendido con un multiplicador (srepr distingue los supuestos de los símbolos)."""
+    try:
+        text = srepr(multiplier)
+    except Exception:
+        text = repr(multiplier)
+    return hashlib.blake2b(f"{previous}|{text}".encode("utf-8"), digest_size=16).hexdigest()
 
 
 class BaseAnalyzer:
@@ -29,11 +41,14 @@ class BaseAnalyzer:
     
     La memoización se activa automáticamente en nodos que se benefician de ella
     (Block, For, If, While, etc.) y usa una clave compuesta por:
-    - Identificador estable del nodo (posición o hash)
-    - Modo de análisis (worst/best/avg)
+    - Hash estructural del subárbol (sin posiciones, con identificadores)
+    - Modo de análisis (worst/best/avg) y modelo de caso promedio
     - Contexto actual (hash del loop_stack)
     
-    El cache se limpia automáticamente cuando se llama a clear().
+    Al reutilizar filas de otro subárbol igual se desplazan sus líneas y se
+    renumeran sus constantes C_k. El cache del analizador se limpia con clear();
+    los subárboles reubicables se guardan además en un memo compartido por todos
+    los análisis del proceso (ver utils/subtree_memo.py).
     
     Author: Juan Camilo Cruz Parra (@Cruz1122)
     """
@@ -46,9 +61,12 @@ class BaseAnalyzer:
         """
         self.rows: List[LineCost] = []      # tabla por línea
         self.loop_stack: List[Expr] = []    # multiplicadores activos (expresiones SymPy)
+        self.context_hashes: List[str] = []  # hash acumulado de loop_stack[:i+1] (ver get_context_hash)
         self.symbols: Dict[str, str] = {}   # ej: { "n": "length(A)" }
         self.notes: List[str] = []          # reglas aplicadas / comentarios
-        self.memo: Dict[str, List[LineCost]] = {}  # PD: cache de filas por nodo+contexto
+        self.memo: Dict[str, MemoEntry] = {}  # PD: cache de filas por subárbol+contexto
+        self.closures = ClosureMemo()        # memo por expresión (cierres y LaTeX)
+        self.index: Optional[ProgramIndex] = None  # índice del programa (hashes estructurales)
         self.counter = 0                    # contador para generar constantes C_k
         self.t_polynomial: Optional[str] = None  # forma polinómica T(n) = an² + bn + c
         self.variable = "n"                  # variable principal del algoritmo
@@ -56,12 +74,16 @@ class BaseAnalyzer:
         self.mode: str = "worst"            # modo de análisis: "worst", "best", "avg"
         self.avg_model: Optional[AvgModel] = None  # modelo probabilístico para caso promedio
         self.procedure_steps: Optional[List[str]] = None  # pasos del procedimiento para caso promedio
+        self.degraded: Optional[str] = None  # etapa en la que se agotó el plazo (resultado parcial)
 
     # --- util 1: agregar fila ---
     def add_row(self, line: int, kind: str, ck: str, count: Union[str, Expr], note: Optional[str] = None):
         """
         Inserta una fila aplicando el multiplicador del contexto de bucles.
         
+        La fila guarda expresiones SymPy en count, count_raw y expectedRuns; se
+        convierten a LaTeX con render_latex al serializar el resultado.
+        
         Args:
             line: Número de línea
             kind: Tipo de instrucción (assign, for, while, if, etc.)
@@ -85,39 +107,78 @@ class BaseAnalyzer:
             if note:
                 note = self._normalize_string(note)
         
-        # Convertir a LaTeX para almacenar (mantener compatibilidad con formato actual)
-        try:
-            count_raw_latex = latex(count_raw_expr)
-            # Asegurar que sea un string
-            if not isinstance(count_raw_latex, str):
-                count_raw_latex = str(count_raw_latex)
-        except Exception as e:
-            print(f"[BaseAnalyzer] Error convirtiendo count_raw_expr a LaTeX: {e}")
-            # Fallback: convertir a string directamente
-            # Si count_raw_expr es 0, mantener "0", no convertir a "1"
-            if count_raw_expr is not None:
-                count_raw_latex = str(count_raw_expr)
-            else:
-                count_raw_latex = "1"
-        
-        count_latex = count_raw_latex  # Inicialmente igual, se simplificará después
-        
+        # count, count_raw y expectedRuns guardan la expresión SymPy; el LaTeX se
+        # genera una sola vez al serializar (ver render_latex y result)
         row = {
             "line": line,
             "kind": kind,
             "ck": ck,              # Ej: "C_{2} + C_{3}"
-            "count": count_latex,   # LaTeX para compatibilidad, se actualizará después
-            "count_raw": count_raw_latex,  # LaTeX de la expresión con sumatorias
-            "count_raw_expr": count_raw_expr,  # Expresión SymPy (nuevo campo interno)
+            "count": count_raw_expr,   # se reemplaza por la forma cerrada (LaTeX) al cerrar
+            "count_raw": count_raw_expr,  # expresión con sumatorias
+            "count_raw_expr": count_raw_expr,  # Expresión SymPy (campo interno)
             "note": note
         }
         
         # En modo promedio, agregar expectedRuns (alias de count para E[#])
         if self.mode == "avg":
-            row["expectedRuns"] = count_latex
+            row["expectedRuns"] = count_raw_expr
         
         self.rows.append(row)
 
+    def rows_checkpoint(self) -> int:
+        """
+        Marca la posición actual de self.rows para recuperar después las filas
+        que se agreguen desde aquí (ver take_rows).
+        
+        Returns:
+            Checkpoint (número de filas actual)
+            
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        return len(self.rows)
+
+    def take_rows(self, checkpoint: int) -> List[LineCost]:
+        """
+        Saca de self.rows las filas agregadas desde checkpoint.
+        
+        self.rows se trunca en el lugar (sin copiar las filas anteriores) y las
+        filas se mueven al buffer devuelto sin copiar sus dicts, así que el
+        costo es proporcional a las filas del tramo y no a todo el programa.
+        
+        Args:
+            checkpoint: Valor devuelto por rows_checkpoint()
+            
+        Returns:
+            Filas del tramo, en orden
+            
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        span = self.rows[checkpoint:]
+        del self.rows[checkpoint:]
+        return span
+
+    def render_latex(self, value: Any) -> str:
+        """
+        Devuelve el LaTeX de un valor de fila (count, count_raw, expectedRuns).
+        
+        Las expresiones SymPy se renderizan con el memo self.closures, así que
+        cada expresión distinta se convierte una sola vez por análisis (y por
+        programa en mode="all", donde los casos comparten el memo).
+        
+        Args:
+            value: Expresión SymPy, string LaTeX (se devuelve tal cual) o None
+            
+        Returns:
+            String LaTeX ("1" si value es None)
+            
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        if isinstance(value, str):
+            return value
+        if value is None:
+            return "1"
+        return self.closures.latex(value)
+
     def _apply_loop_multipliers(self, base_count: Expr) -> Expr:
         """
         Envuelve el conteo base con los multiplicadores activos del stack.
@@ -260,7 +321,9 @@ class BaseAnalyzer:
                 # No es una sumatoria, convertir a expresión SymPy
                 m = self._str_to_sympy(m)
         
+        previous = self.get_context_hash()
         self.loop_stack.append(m)
+        self.context_hashes.append(_chain_context_hash(previous, m))
 
     def pop_multiplier(self):
         """
@@ -270,6 +333,8 @@ class BaseAnalyzer:
         """
         if self.loop_stack:
             self.loop_stack.pop()
+            if self.context_hashes:
+                self.context_hashes.pop()
 
     # --- util 3: ensamblar T_open (o A(n) para promedio) ---
     def build_t_open(self) -> str:
@@ -388,7 +453,7 @@ class BaseAnalyzer:
             )
         
         # Convertir a LaTeX
-        return latex(total_expr)
+        return self.render_latex(total_expr)
     
     def _build_t_open_with_constants(self) -> str:
         """
@@ -404,7 +469,7 @@ class BaseAnalyzer:
             return "0"
         
         import re
-        from sympy import latex, Integer
+        from sympy import Integer
         
         terms_latex = []
         
@@ -449,7 +514,7 @@ class BaseAnalyzer:
                     continue
                 
                 # Convertir count a LaTeX
-                count_latex = latex(count_expr_simplified)
+                count_latex = self.render_latex(count_expr_simplified)
                 
                 # Si count es 1, no mostrar "· 1"
                 if count_expr_simplified == Integer(1):
@@ -536,6 +601,26 @@ class BaseAnalyzer:
         # Unir todos los términos con "+"
         return " + ".join(terms_latex)
     
+    def _build_t_open_unclosed(self) -> str:
+        """
+        Construye T_open = Σ C_{k}·count_{k} con el count actual de cada fila, sin
+        SymPy: las sumatorias que no se alcanzaron a cerrar quedan abiertas.
+        
+        Returns:
+            String con la ecuación de eficiencia en formato KaTeX
+            
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        terms = []
+        for r in self.rows:
+            ck = str(r.get('ck', ''))
+            count = self.render_latex(r.get('count', '1'))
+            if ck == "—" or count in ("—", "0"):
+                continue
+            ck_latex = f"({ck})" if "+" in ck else ck
+            terms.append(ck_latex if count == "1" else f"{ck_latex} \\cdot ({count})")
+        return " + ".join(terms) if terms else "0"
+    
     def _should_preserve_constants(self) -> bool:
         """
         Decide si debería preservar las constantes C_k en T_open o simplificar.
@@ -693,8 +778,9 @@ class BaseAnalyzer:
             
         Author: Juan Camilo Cruz Parra (@Cruz1122)
         """
-        # Construir T_open (o A(n) para promedio)
-        t_open_str = self.build_t_open()
+        # Construir T_open (o A(n) para promedio); si el plazo se agotó, sin
+        # volver a evaluar sumatorias
+        t_open_str = self._build_t_open_unclosed() if self.degraded else self.build_t_open()
         
         totals = {
             "T_open": t_open_str,
@@ -731,18 +817,14 @@ class BaseAnalyzer:
                     continue
                 # Convertir cualquier objeto SymPy restante a string
                 if hasattr(value, '__class__') and 'sympy' in str(type(value).__module__):
-                    try:
-                        from sympy import latex
-                        clean_row[key] = latex(value)
-                    except Exception:
-                        clean_row[key] = str(value)
+                    clean_row[key] = self.render_latex(value)
                 # Asegurar que count, count_raw y expectedRuns sean strings
                 elif key in ['count', 'count_raw', 'expectedRuns'] and not isinstance(value, str):
                     # Si el valor es 0, mantener "0", no convertir a "1"
                     if value == 0 or (hasattr(value, '__eq__') and value == 0):
                         clean_row[key] = "0"
                     else:
-                        clean_row[key] = str(value) if value is not None else "1"
+                        clean_row[key] = self.render_latex(value)
                 else:
                     clean_row[key] = value
             
@@ -786,16 +868,66 @@ class BaseAnalyzer:
                     hypotheses.append("Probabilidades simbólicas (p, q, etc.) son constantes > 0")
                 totals["hypotheses"] = hypotheses
         
-        return {
+        response = {
             "ok": True,
             "byLine": clean_rows,
             "totals": totals
         }
+        if self.degraded:
+            response["degraded"] = True
+            response["degradedStage"] = self.degraded
+        return response
 
     # --- util 5: memoización (PD) ---
     def _get_node_id(self, node: Any) -> str:
         """
-        Obtiene un identificador estable para un nodo del AST.
+        Obtiene el hash estructural de un nodo del AST.
+        
+        Dos subárboles con la misma estructura, identificadores y disposición
+        relativa de líneas tienen el mismo identificador, estén donde estén.
+        
+        Args:
+            node: Nodo del AST
+            
+        Returns:
+            String identificador del subárbol
+            
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        info = self._subtree_info(node)
+        return info.digest if info is not None else self._get_position_id(node)
+    
+    def _subtree_info(self, node: Any) -> Optional[SubtreeInfo]:
+        """Hash estructural y rango de líneas del subárbol (precalculados si el nodo es del programa)."""
+        if not isinstance(node, dict):
+            return None
+        if self.index is not None:
+            info = tree_hashes(self.index).get(id(node))
+            if info is not None:
+                return info
+        return structural_hash(node)
+    
+    def _memo_scope(self, mode: str) -> Optional[str]:
+        """
+        Parte de la clave del memo que depende del modelo de caso promedio.
+        
+        Returns:
+            "" fuera del caso promedio, los predicados del modelo uniforme, o None
+            si el resultado depende de la posición (modelo simbólico)
+        """
+        if mode != "avg" or self.avg_model is None:
+            return ""
+        if self.avg_model.mode != "uniform":
+            return None
+        return "avg:" + json.dumps(self.avg_model.predicates, sort_keys=True, default=str)
+    
+    def _get_position_id(self, node: Any) -> str:
+        """
+        Obtiene un identificador del nodo por su posición en el programa.
+        
+        Solo se usa cuando el análisis del subárbol depende de su posición (caso
+        promedio con probabilidades simbólicas, que numeran p, q, r... según el
+        orden de aparición).
         
         Prioridad:
         1. Posición (línea, columna) si está disponible
@@ -880,8 +1012,9 @@ class BaseAnalyzer:
         Genera clave estable para cachear filas de un subárbol bajo un contexto.
         
         La clave combina:
-        - Identificador estable del nodo (posición o hash)
-        - Modo de análisis (worst/best/avg)
+        - Analizador y variable principal
+        - Hash estructural del subárbol (posición si depende de ella)
+        - Modo de análisis (worst/best/avg) y modelo de caso promedio
         - Hash del contexto actual (loop_stack)
         
         Args:
@@ -890,68 +1023,125 @@ class BaseAnalyzer:
             ctx_hash: Hash del contexto actual (obtenido con get_context_hash())
             
         Returns:
-            Clave única para el cache en formato: "{node_id}|{mode}|{ctx_hash}"
+            Clave única para el cache
             
         Example:
             >>> analyzer = BaseAnalyzer()
             >>> node = {"type": "Block", "pos": {"line": 5, "column": 10}}
-            >>> ctx_hash = analyzer.get_context_hash()
-            >>> key = analyzer.memo_key(node, "worst", ctx_hash)
-            >>> cached = analyzer.memo_get(key)
+            >>> key = analyzer.memo_key(node, "worst", analyzer.get_context_hash())
+            >>> cached = analyzer.memo_get(key, node)
             >>> if cached is None:
+            ...     counter_start = analyzer.counter
             ...     # Analizar nodo...
-            ...     analyzer.memo_set(key, rows)
+            ...     analyzer.memo_set(key, rows, node, counter_start)
             
         Author: Juan Camilo Cruz Parra (@Cruz1122)
         """
+        scope = self._memo_scope(mode)
+        if scope is None:
+            return f"{self._get_position_id(node)}|{mode}|{ctx_hash}"
         nid = self._get_node_id(node)
-        return f"{nid}|{mode}|{ctx_hash}"
+        return f"{type(self).__name__}|{self.variable}|{nid}|{mode}|{scope}|{ctx_hash}"
 
-    def memo_get(self, key: str) -> Optional[List[LineCost]]:
+    def memo_get(self, key: str, node: Any = None) -> Optional[List[LineCost]]:
         """
         Obtiene filas del cache usando la clave proporcionada.
         
+        Busca primero en el cache del analizador y luego en el memo compartido
+        del proceso. Las filas de una entrada reubicable se devuelven con las
+        líneas de node y constantes C_k nuevas (el contador avanza como si el
+        subárbol se hubiera analizado).
+        
         Args:
             key: Clave del cache (generada con memo_key())
+            node: Nodo donde se reutilizan las filas
             
         Returns:
-            Lista de filas cacheadas o None si no existe en el cache
+            Lista de filas nuevas o None si no existe en el cache
             
         Example:
             >>> analyzer = BaseAnalyzer()
             >>> key = analyzer.memo_key(node, "worst", analyzer.get_context_hash())
-            >>> cached_rows = analyzer.memo_get(key)
+            >>> cached_rows = analyzer.memo_get(key, node)
             >>> if cached_rows:
             ...     analyzer.rows.extend(cached_rows)
             ...     return  # Usar resultados cacheados
             
         Author: Juan Camilo Cruz Parra (@Cruz1122)
         """
-        return self.memo.get(key)
+        entry = self.memo.get(key)
+        if entry is None and node is not None and self._memo_scope(self.mode) is not None:
+            entry = get_subtree_memo().get(key)
+            if entry is not None:
+                self.memo[key] = entry
+        if entry is None:
+            return None
+        rows = entry.replay(self._subtree_info(node) if entry.relocatable else None, self.counter)
+        self.counter += entry.constants
+        return rows
 
-    def memo_set(self, key: str, rows: List[LineCost]):
+    def memo_set(self, key: str, rows: List[LineCost], node: Any = None, counter_start: Optional[int] = None):
         """
         Guarda filas en el cache para reutilización posterior.
         
-        Crea una copia superficial de las filas para evitar aliasing accidental
-        y asegurar que los cambios posteriores no afecten el cache.
+        Con node y counter_start la entrada es reubicable: se puede reutilizar en
+        cualquier subárbol con el mismo hash estructural y, si no depende de la
+        posición, se comparte con los demás análisis del proceso. Las filas se
+        copian una vez a un tramo inmutable (ver MemoEntry).
         
         Args:
             key: Clave del cache (generada con memo_key())
             rows: Lista de filas a cachear (LineCost)
+            node: Nodo que produjo las filas
+            counter_start: Valor de self.counter antes de visitar node
             
         Example:
             >>> analyzer = BaseAnalyzer()
-            >>> rows_before = len(analyzer.rows)
+            >>> rows_before, counter_start = len(analyzer.rows), analyzer.counter
             >>> # ... analizar nodo ...
             >>> rows_added = analyzer.rows[rows_before:]
             >>> key = analyzer.memo_key(node, "worst", analyzer.get_context_hash())
-            >>> analyzer.memo_set(key, rows_added)
+            >>> analyzer.memo_set(key, rows_added, node, counter_start)
+            
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        info = None
+        if node is not None and counter_start is not None and self._memo_scope(self.mode) is not None:
+            info = self._subtree_info(node)
+        entry = MemoEntry.capture(rows, info, counter_start, self.counter)
+        if entry is None:
+            return
+        self.memo[key] = entry
+        if entry.relocatable and info.portable:
+            get_subtree_memo().put(key, entry)
+
+    def visit_memoized(self, node: Any, mode: str, visitor: Optional[Callable[[Any, str], None]] = None) -> None:
+        """
+        Visita un subárbol reutilizando sus filas del memo si ya se analizó uno
+        igual en el mismo contexto.
+        
+        Args:
+            node: Nodo del AST (los que no convienen cachear se visitan normalmente)
+            mode: Modo de análisis
+            visitor: Función que analiza el nodo (por defecto self.visit; el
+                despachador de Block pasa visitBlock para no volver a entrar)
             
         Author: Juan Camilo Cruz Parra (@Cruz1122)
         """
-        # Guardar una copia superficial para evitar aliasing accidental
-        self.memo[key] = [dict(r) for r in rows]
+        visit = visitor or self.visit
+        if not self._should_memoize(node):
+            visit(node, mode)
+            return
+        key = self.memo_key(node, mode, self.get_context_hash())
+        cached_rows = self.memo_get(key, node)
+        if cached_rows is not None:
+            self.rows.extend(cached_rows)
+            return
+        rows_before, counter_start = self.rows_checkpoint(), self.counter
+        visit(node, mode)
+        rows_added = self.rows[rows_before:]
+        if rows_added:
+            self.memo_set(key, rows_added, node, counter_start)
 
     # --- utilidades adicionales ---
     def add_symbol(self, symbol: str, description: str):
@@ -977,6 +1167,19 @@ class BaseAnalyzer:
         """
         self.notes.append(note)
 
+    def mark_degraded(self, stage: str) -> None:
+        """
+        Marca el resultado como parcial: el plazo del análisis se agotó durante
+        la etapa indicada (ver shared.deadline).
+        
+        Args:
+            stage: Etapa interrumpida ("summations", "asymptotics", "method")
+            
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        self.degraded = stage
+        self.add_note(f"Análisis incompleto: se agotó el tiempo de análisis (etapa {stage})")
+
 
     def clear(self):
         """
@@ -986,11 +1189,14 @@ class BaseAnalyzer:
         """
         self.rows.clear()
         self.loop_stack.clear()
+        self.context_hashes.clear()
         self.symbols.clear()
         self.notes.clear()
         self.memo.clear()
+        self.index = None
         self.t_polynomial = None
         self.procedure_steps = None
+        self.degraded = None
 
     def add_procedure_step(self, step: str) -> None:
         """
@@ -1007,18 +1213,26 @@ class BaseAnalyzer:
 
     def get_context_hash(self) -> str:
         """
-        Genera un hash del contexto actual (loop_stack).
+        Obtiene el hash del contexto actual (loop_stack).
+        
+        push_multiplier/pop_multiplier mantienen una cadena de hashes
+        acumulados (uno por nivel), así que la consulta es O(1) sin importar la
+        profundidad de anidamiento. Si loop_stack se modificó directamente, la
+        cadena se reconstruye.
         
         Returns:
-            String hash del contexto
+            String hash del contexto ("root" sin bucles activos)
             
         Author: Juan Camilo Cruz Parra (@Cruz1122)
         """
-        # Convertir expresiones SymPy a strings para el hash
         if not self.loop_stack:
             return "root"
-        # Usar representación LaTeX de las expresiones
-        return "|".join([latex(expr) for expr in self.loop_stack])
+        if len(self.context_hashes) != len(self.loop_stack):
+            self.context_hashes = []
+            for multiplier in self.loop_stack:
+                previous = self.context_hashes[-1] if self.context_hashes else "root"
+                self.context_hashes.append(_chain_context_hash(previous, multiplier))
+        return self.context_hashes[-1]
 
     def C(self) -> str:
         """
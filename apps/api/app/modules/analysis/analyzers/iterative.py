@@ -1,5 +1,5 @@
 from typing import Any, Dict, Optional
-from sympy import Expr, latex, Integer
+from sympy import Expr, Integer
 from .base import BaseAnalyzer
 from ..visitors.for_visitor import ForVisitor
 from ..visitors.if_visitor import IfVisitor
@@ -7,7 +7,11 @@ from ..visitors.while_repeat_visitor import WhileRepeatVisitor
 from ..visitors.simple_visitor import SimpleVisitor
 from ..utils.summation_closer import SummationCloser
 from ..utils.complexity_classes import ComplexityClasses
+from ..utils.closure_memo import ClosureMemo
 from ..models.avg_model import AvgModel
+from ...shared.deadline import DeadlineExceeded, interruptible
+from ...shared.metrics import phase
+from ...shared.program_index import get_program_index
 
 
 class IterativeAnalyzer(BaseAnalyzer, ForVisitor, IfVisitor, WhileRepeatVisitor, SimpleVisitor):
@@ -24,16 +28,49 @@ class IterativeAnalyzer(BaseAnalyzer, ForVisitor, IfVisitor, WhileRepeatVisitor,
     Author: Juan Camilo Cruz Parra (@Cruz1122)
     """
     
-    def __init__(self):
+    def __init__(self, closures: Optional[ClosureMemo] = None):
         """
         Inicializa una instancia de IterativeAnalyzer.
         
+        Args:
+            closures: Memo de cierres de sumatorias y simplificaciones (compartido
+                entre los analizadores de varios casos del mismo programa); por
+                defecto uno nuevo
+        
         Author: Juan Camilo Cruz Parra (@Cruz1122)
         """
         super().__init__()
         self.big_o: Optional[str] = None
         self.big_omega: Optional[str] = None
         self.big_theta: Optional[str] = None
+        self.closures = closures if closures is not None else ClosureMemo()
+    
+    @classmethod
+    def analyze_cases(cls, ast: Dict[str, Any], cases: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Analiza varios casos (worst, best, avg) del mismo AST compartiendo el trabajo común.
+        
+        Cada caso recorre el AST con su propio analizador (la selección de ramas y
+        el early return dependen del caso, y el recorrido es barato), pero todos
+        comparten un ClosureMemo: cada sumatoria, evaluación y simplificación que
+        aparece en más de un caso se calcula una sola vez.
+        
+        Args:
+            ast: AST del programa
+            cases: Modo -> argumentos extra de analyze(), en orden
+            
+        Returns:
+            Modo -> resultado de analyze()
+            
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        closures = ClosureMemo()
+        results = {}
+        for mode, kwargs in cases.items():
+            analyzer = cls()
+            analyzer.closures = closures
+            results[mode] = analyzer.analyze(ast, mode, **kwargs)
+        return results
     
     def _expr_to_str(self, expr: Any) -> str:
         """
@@ -111,6 +148,7 @@ class IterativeAnalyzer(BaseAnalyzer, ForVisitor, IfVisitor, WhileRepeatVisitor,
         
         Si después de simplificar quedan variables de iteración, las sustituye
         por su valor máximo (típicamente n) o las elimina según el contexto.
+        El resultado se memoriza en self.closures.
         
         Args:
             expr: Expresión SymPy a limpiar
@@ -120,10 +158,17 @@ class IterativeAnalyzer(BaseAnalyzer, ForVisitor, IfVisitor, WhileRepeatVisitor,
             
         Author: Juan Camilo Cruz Parra (@Cruz1122)
         """
-        from sympy import Symbol, simplify, expand, preorder_traversal
-        
         if expr is None:
             return expr
+        return self.closures.get("sanitize", expr, lambda: self._sanitize_expression_uncached(expr))
+    
+    def _sanitize_expression_uncached(self, expr: Expr) -> Expr:
+        """
+        Implementación de _sanitize_expression (sin memo).
+        
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        from sympy import Symbol, expand
         
         # Lista de variables de iteración a eliminar
         iteration_vars = ['i', 'j', 'k']
@@ -131,7 +176,7 @@ class IterativeAnalyzer(BaseAnalyzer, ForVisitor, IfVisitor, WhileRepeatVisitor,
         # Expandir y simplificar primero
         try:
             expr = expand(expr)
-            expr = simplify(expr)
+            expr = self.closures.simplify(expr)
         except Exception:
             pass
         
@@ -156,9 +201,9 @@ class IterativeAnalyzer(BaseAnalyzer, ForVisitor, IfVisitor, WhileRepeatVisitor,
         closer = SummationCloser()
         
         # Evaluar todas las sumatorias
-        expr = closer._evaluate_all_sums_sympy(expr)
+        expr = self.closures.evaluate_sums(closer, expr)
         expr = expand(expr)
-        expr = simplify(expr)
+        expr = self.closures.simplify(expr)
         
         # Verificar de nuevo
         free_vars = expr.free_symbols
@@ -182,7 +227,7 @@ class IterativeAnalyzer(BaseAnalyzer, ForVisitor, IfVisitor, WhileRepeatVisitor,
             try:
                 # Expandir y simplificar para asegurar que todas las sumatorias estén evaluadas
                 expr = expand(expr)
-                expr = simplify(expr)
+                expr = self.closures.simplify(expr)
                 
                 # Verificar de nuevo si todavía quedan
                 free_vars_after = expr.free_symbols
@@ -197,7 +242,7 @@ class IterativeAnalyzer(BaseAnalyzer, ForVisitor, IfVisitor, WhileRepeatVisitor,
                 if remaining_iter_vars:
                     for var_name, var_symbol in remaining_iter_vars:
                         expr = expr.subs(var_symbol, SymInteger(0))
-                    expr = simplify(expr)
+                    expr = self.closures.simplify(expr)
                     print(f"[IterativeAnalyzer] Advertencia: Variables de iteración {[v[0] for v in remaining_iter_vars]} eliminadas de expresión final (sustituidas por 0)")
             except Exception as e:
                 print(f"[IterativeAnalyzer] Error al limpiar variables de iteración: {e}")
@@ -206,7 +251,7 @@ class IterativeAnalyzer(BaseAnalyzer, ForVisitor, IfVisitor, WhileRepeatVisitor,
                 for var_name in iteration_vars:
                     var_symbol = Symbol(var_name, integer=True)
                     expr = expr.subs(var_symbol, SymInteger(0))
-                expr = simplify(expr)
+                expr = self.closures.simplify(expr)
         
         return expr
     
@@ -232,6 +277,10 @@ class IterativeAnalyzer(BaseAnalyzer, ForVisitor, IfVisitor, WhileRepeatVisitor,
         # Establecer modo
         self.mode = mode
         
+        # Índice del programa: los hashes estructurales de los subárboles se
+        # calculan una vez por AST (ver BaseAnalyzer._subtree_info)
+        self.index = get_program_index(ast) if isinstance(ast, dict) else None
+        
         # Crear instancia de AvgModel si mode == "avg"
         if mode == "avg":
             if avg_model:
@@ -246,7 +295,8 @@ class IterativeAnalyzer(BaseAnalyzer, ForVisitor, IfVisitor, WhileRepeatVisitor,
             self.avg_model = None
         
         # Visitar el AST completo
-        self.visit(ast, mode)
+        with phase("visit"):
+            self.visit(ast, mode)
         
         # Usar SymPy para cerrar sumatorias y generar procedimientos
         closer = SummationCloser()
@@ -255,7 +305,56 @@ class IterativeAnalyzer(BaseAnalyzer, ForVisitor, IfVisitor, WhileRepeatVisitor,
         # Detectar variable principal (n por defecto)
         variable = "n"
         
-        # Cerrar sumatorias y generar procedimientos para cada fila
+        # Cerrar sumatorias y calcular T_polynomial; si se agota el plazo, el
+        # resultado conserva las filas ya cerradas y deja abiertas las demás
+        try:
+            with phase("summations"):
+                self._close_rows(closer, variable, mode)
+            
+            with phase("t_open"):
+                # Obtener expresión SymPy de T_open directamente (más robusto que parsear LaTeX)
+                t_open_expr = interruptible(self.build_t_open_expr)
+                
+                # PASO 2: Limpiar variables de iteración de t_open_expr
+                if t_open_expr is not None:
+                    t_open_expr = self._sanitize_expression(t_open_expr)
+                
+                # Calcular T_polynomial: agrupar términos con C_k (para mostrar estructura)
+                self._calculate_t_polynomial_fallback()
+                
+                # Generar procedimiento general para caso promedio
+                if mode == "avg":
+                    self._generate_avg_procedure()
+        except DeadlineExceeded:
+            self.mark_degraded("summations")
+            return self.result()
+        
+        # Calcular notaciones asintóticas; si se agota el plazo, se devuelve T_open sin ellas
+        try:
+            with phase("big_o"):
+                self._calculate_asymptotics(t_open_expr, variable, mode, complexity)
+        except DeadlineExceeded:
+            self.big_o = self.big_omega = self.big_theta = None
+            self.mark_degraded("asymptotics")
+
+        # Retornar resultado
+        return self.result()
+    
+    def _close_rows(self, closer: SummationCloser, variable: str, mode: str) -> None:
+        """
+        Cierra las sumatorias de cada fila y genera sus procedimientos.
+        
+        Args:
+            closer: Instancia de SummationCloser
+            variable: Variable principal
+            mode: Modo de análisis ("worst", "best", "avg")
+            
+        Raises:
+            DeadlineExceeded: Si se agota el plazo del análisis; las filas no
+                alcanzadas conservan count = count_raw
+            
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
         for row in self.rows:
             # Obtener expresión SymPy si está disponible
             count_raw_expr = row.get("count_raw_expr")
@@ -299,20 +398,15 @@ class IterativeAnalyzer(BaseAnalyzer, ForVisitor, IfVisitor, WhileRepeatVisitor,
             # Preferir usar count_raw_expr directamente si está disponible
             if count_raw_expr is not None:
                 try:
-                    # Actualizar count_raw para reflejar count_raw_expr (puede incluir probabilidades)
-                    # Esto asegura que count_raw muestre la expresión con probabilidad antes del cierre
-                    try:
-                        count_raw_latex_from_expr = latex(count_raw_expr)
-                        if isinstance(count_raw_latex_from_expr, str):
-                            row["count_raw"] = count_raw_latex_from_expr
-                            # También actualizar expectedRuns en modo promedio para que refleje la probabilidad
-                            if mode == "avg":
-                                row["expectedRuns"] = count_raw_latex_from_expr
-                    except Exception:
-                        pass  # Si falla, mantener count_raw original
+                    # Actualizar count_raw para reflejar count_raw_expr (puede incluir probabilidades);
+                    # se convierte a LaTeX al serializar
+                    row["count_raw"] = count_raw_expr
+                    # También actualizar expectedRuns en modo promedio para que refleje la probabilidad
+                    if mode == "avg":
+                        row["expectedRuns"] = count_raw_expr
                     
                     # Pasar el objeto SymPy directamente a close_summation
-                    closed_count, steps = closer.close_summation(count_raw_expr, variable)
+                    closed_count, steps = self.closures.close_summation(closer, count_raw_expr, variable)
                     row["count"] = closed_count
                     
                     # En modo promedio, actualizar expectedRuns con la expresión cerrada
@@ -320,29 +414,26 @@ class IterativeAnalyzer(BaseAnalyzer, ForVisitor, IfVisitor, WhileRepeatVisitor,
                         row["expectedRuns"] = closed_count
                     
                     # Guardar la expresión SymPy evaluada para usar en build_t_open_expr
-                    from sympy import simplify
                     # Si contiene símbolos iterativos, no intentar evaluar sumatorias
                     # (ya se manejan en close_summation)
                     if closer._has_iterative_symbols(count_raw_expr) and not closer._has_summations(count_raw_expr):
                         # Es un símbolo iterativo puro, simplificar y limpiar variables de iteración
-                        count_evaluated = simplify(count_raw_expr)
+                        count_evaluated = self.closures.simplify(count_raw_expr)
                         # IMPORTANTE: Eliminar variables de iteración que no deberían estar
                         count_evaluated = self._sanitize_expression(count_evaluated)
                     else:
                         # Evaluar sumatorias si las hay
-                        count_evaluated = closer._evaluate_all_sums_sympy(count_raw_expr)
-                        count_evaluated = simplify(count_evaluated)
+                        count_evaluated = self.closures.evaluate_sums(closer, count_raw_expr)
+                        count_evaluated = self.closures.simplify(count_evaluated)
                         # IMPORTANTE: Eliminar variables de iteración que no deberían estar
                         count_evaluated = self._sanitize_expression(count_evaluated)
                     row["count_expr"] = count_evaluated  # Expresión SymPy evaluada
                     
                     # Generar procedimiento paso a paso (consistente entre modos)
-                    count_raw_latex_str = row.get("count_raw", latex(count_raw_expr) if hasattr(count_raw_expr, '__str__') else str(count_raw_expr))
-                    
                     if mode == "avg":
                         # Para caso promedio, agregar explicación de E[N_ℓ]
                         procedure_steps = [
-                            f"\\text{{Esperanza de ejecuciones para línea {row.get('line', '?')}: }} E[N_{{{row.get('line', '?')}}}] = {count_raw_latex_str}"
+                            f"\\text{{Esperanza de ejecuciones para línea {row.get('line', '?')}: }} E[N_{{{row.get('line', '?')}}}] = {self.render_latex(count_raw_expr)}"
                         ]
                         if steps:
                             procedure_steps.extend(steps)
@@ -357,7 +448,7 @@ class IterativeAnalyzer(BaseAnalyzer, ForVisitor, IfVisitor, WhileRepeatVisitor,
                         else:
                             # Si no hay pasos, generar procedimiento básico
                             row["procedure"] = [
-                                f"\\text{{Expresión original: }} {count_raw_latex_str}",
+                                f"\\text{{Expresión original: }} {self.render_latex(count_raw_expr)}",
                                 f"\\text{{Resultado: }} {closed_count}"
                             ]
                     continue
@@ -370,21 +461,8 @@ class IterativeAnalyzer(BaseAnalyzer, ForVisitor, IfVisitor, WhileRepeatVisitor,
             # Fallback: procesar desde LaTeX
             # Asegurar que siempre tengamos un string LaTeX para close_summation
             if count_raw_expr is not None:
-                try:
-                    # Convertir expresión SymPy a LaTeX para procesamiento
-                    count_raw_latex = latex(count_raw_expr)
-                    # Verificar que el resultado sea un string
-                    if not isinstance(count_raw_latex, str):
-                        count_raw_latex = str(count_raw_latex)
-                except Exception as e:
-                    print(f"[IterativeAnalyzer] Error convirtiendo count_raw_expr a LaTeX: {e}")
-                    # Fallback: usar count_raw si está disponible
-                    if not isinstance(count_raw_latex, str):
-                        # Si count_raw_expr es 0, mantener "0"
-                        if count_raw_expr == 0 or (hasattr(count_raw_expr, '__eq__') and count_raw_expr == 0):
-                            count_raw_latex = "0"
-                        else:
-                            count_raw_latex = "1"
+                # Convertir expresión SymPy a LaTeX para procesamiento (memorizado)
+                count_raw_latex = self.render_latex(count_raw_expr)
             
             # Asegurar que count_raw_latex sea un string
             # Si count_raw es "0", mantener "0", no convertir a "1"
@@ -392,11 +470,11 @@ class IterativeAnalyzer(BaseAnalyzer, ForVisitor, IfVisitor, WhileRepeatVisitor,
                 if count_raw_latex == 0 or (hasattr(count_raw_latex, '__eq__') and count_raw_latex == 0):
                     count_raw_latex = "0"
                 else:
-                    count_raw_latex = str(count_raw_latex) if count_raw_latex is not None else "1"
+                    count_raw_latex = self.render_latex(count_raw_latex)
             
             # Cerrar sumatoria (trabaja con LaTeX por ahora, pero recibe SymPy internamente)
             try:
-                closed_count, steps = closer.close_summation(count_raw_latex, variable)
+                closed_count, steps = self.closures.close_summation(closer, count_raw_latex, variable)
                 row["count"] = closed_count
                 
                 # En modo promedio, actualizar expectedRuns con la expresión cerrada
@@ -430,30 +508,29 @@ class IterativeAnalyzer(BaseAnalyzer, ForVisitor, IfVisitor, WhileRepeatVisitor,
                 # Fallback: usar expresión original
                 row["count"] = count_raw_latex
                 row["procedure"] = [f"\\text{{Error al simplificar: }} {count_raw_latex}"]
+    
+    def _calculate_asymptotics(self, t_open_expr: Optional[Expr], variable: str, mode: str, complexity: ComplexityClasses) -> None:
+        """
+        Calcula big_o, big_omega y big_theta a partir de la expresión SymPy de T_open.
         
-        # Calcular T_polynomial y notaciones asintóticas usando SymPy
-        # Obtener expresión SymPy de T_open directamente (más robusto que parsear LaTeX)
-        t_open_expr = self.build_t_open_expr()
-        
-        # PASO 2: Limpiar variables de iteración de t_open_expr
-        if t_open_expr is not None:
-            t_open_expr = self._sanitize_expression(t_open_expr)
-        
-        # Calcular T_polynomial: agrupar términos con C_k (para mostrar estructura)
-        self._calculate_t_polynomial_fallback()
-        
-        # Generar procedimiento general para caso promedio
-        if mode == "avg":
-            self._generate_avg_procedure()
-        
-        # Calcular notaciones asintóticas usando la expresión SymPy directamente
+        Args:
+            t_open_expr: Expresión SymPy de T_open (None si no hay términos)
+            variable: Variable principal
+            mode: Modo de análisis ("worst", "best", "avg")
+            complexity: Instancia de ComplexityClasses (fallback)
+            
+        Raises:
+            DeadlineExceeded: Si se agota el plazo del análisis
+            
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
         if t_open_expr is not None:
             try:
-                from sympy import latex as sympy_latex, Symbol, expand, simplify
+                from sympy import Symbol, expand
                 
                 # Primero, asegurarse de que la expresión esté completamente simplificada
                 t_open_expr = expand(t_open_expr)
-                t_open_expr = simplify(t_open_expr)
+                t_open_expr = self.closures.simplify(t_open_expr)
                 
                 # Verificar y eliminar variables de iteración que no deberían estar
                 iteration_vars = ['i', 'j', 'k']
@@ -462,7 +539,7 @@ class IterativeAnalyzer(BaseAnalyzer, ForVisitor, IfVisitor, WhileRepeatVisitor,
                     if t_open_expr.has(var_symbol):
                         # Intentar expandir y simplificar para eliminar la variable
                         t_open_expr = expand(t_open_expr)
-                        t_open_expr = simplify(t_open_expr)
+                        t_open_expr = self.closures.simplify(t_open_expr)
                 
                 n_sym = Symbol(variable, integer=True, positive=True)
                 
@@ -489,7 +566,6 @@ class IterativeAnalyzer(BaseAnalyzer, ForVisitor, IfVisitor, WhileRepeatVisitor,
                             
                             # Primero verificar si el término tiene log(n)
                             # Usar has() para verificar rápidamente
-                            from sympy import log as sym_log
                             if term.has(sym_log):
                                 # Verificar si el log contiene n
                                 for subexpr in preorder_traversal(term):
@@ -550,7 +626,7 @@ class IterativeAnalyzer(BaseAnalyzer, ForVisitor, IfVisitor, WhileRepeatVisitor,
                         
                         if dominant_term is not None and max_degree >= 0:
                             # Simplificar el término dominante
-                            dominant_term = simplify(dominant_term)
+                            dominant_term = self.closures.simplify(dominant_term)
                             
                             # Para notación asintótica, simplificar el coeficiente: O(5n²/2) -> O(n²)
                             # Extraer solo la forma asintótica sin coeficientes
@@ -558,7 +634,7 @@ class IterativeAnalyzer(BaseAnalyzer, ForVisitor, IfVisitor, WhileRepeatVisitor,
                                 # Solo log(n)
                                 from sympy import log as sym_log, Symbol as SymSymbol
                                 n_for_notation = SymSymbol(variable, integer=True, positive=True)
-                                dominant_latex = sympy_latex(sym_log(n_for_notation))
+                                dominant_latex = self.render_latex(sym_log(n_for_notation))
                             elif max_degree > 0 and max_degree < 1:
                                 # Caso edge: constante, no debería llegar aquí
                                 dominant_latex = "1"
@@ -571,16 +647,16 @@ class IterativeAnalyzer(BaseAnalyzer, ForVisitor, IfVisitor, WhileRepeatVisitor,
                                 
                                 if degree_int == 1 and not has_log_component:
                                     # Solo n
-                                    dominant_latex = sympy_latex(n_for_notation)
+                                    dominant_latex = self.render_latex(n_for_notation)
                                 elif degree_int == 1 and has_log_component:
                                     # n * log(n)
-                                    dominant_latex = sympy_latex(n_for_notation * sym_log(n_for_notation))
+                                    dominant_latex = self.render_latex(n_for_notation * sym_log(n_for_notation))
                                 elif degree_int > 1 and not has_log_component:
                                     # n^k
-                                    dominant_latex = sympy_latex(n_for_notation**degree_int)
+                                    dominant_latex = self.render_latex(n_for_notation**degree_int)
                                 else:
                                     # n^k * log(n)
-                                    dominant_latex = sympy_latex((n_for_notation**degree_int) * sym_log(n_for_notation))
+                                    dominant_latex = self.render_latex((n_for_notation**degree_int) * sym_log(n_for_notation))
                             else:
                                 # Si es constante (grado 0), mostrar como "1" en notación asintótica
                                 # En notación asintótica, todas las constantes son equivalentes a 1
@@ -614,13 +690,10 @@ class IterativeAnalyzer(BaseAnalyzer, ForVisitor, IfVisitor, WhileRepeatVisitor,
                                 self.big_theta = f"\\Theta({dominant_latex})"
                         else:
                             # Fallback: usar ComplexityClasses
-                            t_open_latex = sympy_latex(t_open_expr)
-                            self.big_o = complexity.calculate_big_o(t_open_latex, variable)
-                            self.big_omega = complexity.calculate_big_omega(t_open_latex, variable)
-                            self.big_theta = complexity.calculate_big_theta(t_open_latex, variable)
+                            self._set_asymptotics(complexity.classify_expr(t_open_expr, variable))
                     else:
                         # Expresión simple, verificar si es constante
-                        simplified = simplify(t_open_expr)
+                        simplified = self.closures.simplify(t_open_expr)
                         # Verificar si la expresión es constante (no depende de n)
                         n_sym = Symbol(variable, integer=True, positive=True)
                         if not simplified.has(n_sym):
@@ -628,7 +701,7 @@ class IterativeAnalyzer(BaseAnalyzer, ForVisitor, IfVisitor, WhileRepeatVisitor,
                             dominant_latex = "1"
                         else:
                             # No es constante, usar la expresión
-                            dominant_latex = sympy_latex(simplified)
+                            dominant_latex = self.render_latex(simplified)
                         self.big_o = f"O({dominant_latex})"
                         self.big_omega = f"\\Omega({dominant_latex})"
                         self.big_theta = f"\\Theta({dominant_latex})"
@@ -636,11 +709,8 @@ class IterativeAnalyzer(BaseAnalyzer, ForVisitor, IfVisitor, WhileRepeatVisitor,
                     print(f"[IterativeAnalyzer] Error calculando término dominante: {e}")
                     import traceback
                     traceback.print_exc()
-                    # Fallback: usar ComplexityClasses con LaTeX
-                    t_open_latex = sympy_latex(t_open_expr)
-                    self.big_o = complexity.calculate_big_o(t_open_latex, variable)
-                    self.big_omega = complexity.calculate_big_omega(t_open_latex, variable)
-                    self.big_theta = complexity.calculate_big_theta(t_open_latex, variable)
+                    # Fallback: usar ComplexityClasses
+                    self._set_asymptotics(complexity.classify_expr(t_open_expr, variable))
             except Exception as e:
                 print(f"[IterativeAnalyzer] Error calculando notaciones asintóticas desde expresión SymPy: {e}")
                 import traceback
@@ -654,9 +724,12 @@ class IterativeAnalyzer(BaseAnalyzer, ForVisitor, IfVisitor, WhileRepeatVisitor,
             self.big_o = "O(1)"
             self.big_omega = "\\Omega(1)"
             self.big_theta = "\\Theta(1)"
-
-        # Retornar resultado
-        return self.result()
+    
+    def _set_asymptotics(self, bounds: Dict[str, str]) -> None:
+        """Asigna big_o, big_omega y big_theta desde ComplexityClasses.classify_expr."""
+        self.big_o = bounds["big_o"]
+        self.big_omega = bounds["big_omega"]
+        self.big_theta = bounds["big_theta"]
     
     def _generate_avg_procedure(self):
         """
@@ -798,7 +871,7 @@ class IterativeAnalyzer(BaseAnalyzer, ForVisitor, IfVisitor, WhileRepeatVisitor,
             
         Author: Juan Camilo Cruz Parra (@Cruz1122)
         """
-        from sympy import Symbol, Integer, latex, expand, simplify, Poly
+        from sympy import Symbol, Integer, expand, Poly
         from ..utils.summation_closer import SummationCloser
         import re
         
@@ -829,9 +902,9 @@ class IterativeAnalyzer(BaseAnalyzer, ForVisitor, IfVisitor, WhileRepeatVisitor,
                     count_expr = self._str_to_sympy(row.get('count_raw', '1'))
                 
                 # Evaluar sumatorias y simplificar
-                count_expr = closer._evaluate_all_sums_sympy(count_expr)
+                count_expr = self.closures.evaluate_sums(closer, count_expr)
                 count_expr = expand(count_expr)
-                count_expr = simplify(count_expr)
+                count_expr = self.closures.simplify(count_expr)
                 
                 # IMPORTANTE: Eliminar variables de iteración (i, j, k) que no deberían estar en el resultado final
                 count_expr = self._sanitize_expression(count_expr)
@@ -848,7 +921,7 @@ class IterativeAnalyzer(BaseAnalyzer, ForVisitor, IfVisitor, WhileRepeatVisitor,
                         coeff_idx = max_degree - degree
                         if coeff_idx < len(all_coeffs):
                             coeff = all_coeffs[coeff_idx]
-                            coeff = simplify(coeff)
+                            coeff = self.closures.simplify(coeff)
                             
                             # IMPORTANTE: Eliminar variables de iteración del coeficiente
                             coeff = self._sanitize_expression(coeff)
@@ -860,7 +933,7 @@ class IterativeAnalyzer(BaseAnalyzer, ForVisitor, IfVisitor, WhileRepeatVisitor,
                             except:
                                 # Si hay error, intentar simplificar y verificar de nuevo
                                 try:
-                                    coeff = simplify(expand(coeff))
+                                    coeff = self.closures.simplify(expand(coeff))
                                     if coeff.is_zero if hasattr(coeff, 'is_zero') else (coeff == 0 or coeff == Integer(0)):
                                         continue
                                 except:
@@ -869,7 +942,7 @@ class IterativeAnalyzer(BaseAnalyzer, ForVisitor, IfVisitor, WhileRepeatVisitor,
                             # Normalizar coeficiente para comparación determinista
                             # Usar una representación canónica (expandida y simplificada)
                             coeff_normalized = expand(coeff)
-                            coeff_normalized = simplify(coeff_normalized)
+                            coeff_normalized = self.closures.simplify(coeff_normalized)
                             # Asegurar que no queden variables de iteración
                             coeff_normalized = self._sanitize_expression(coeff_normalized)
                             
@@ -902,7 +975,7 @@ class IterativeAnalyzer(BaseAnalyzer, ForVisitor, IfVisitor, WhileRepeatVisitor,
                     # Esto puede pasar con expresiones complejas, pero intentamos manejarlo
                     try:
                         # Intentar extraer como constante (grado 0)
-                        const_value = simplify(count_expr.subs(n_sym, 0))
+                        const_value = self.closures.simplify(count_expr.subs(n_sym, 0))
                         
                         # Verificar si la constante es cero
                         try:
@@ -955,7 +1028,7 @@ class IterativeAnalyzer(BaseAnalyzer, ForVisitor, IfVisitor, WhileRepeatVisitor,
                 except:
                     # Si hay error al verificar, intentar simplificar y verificar de nuevo
                     try:
-                        coeff_simplified = simplify(coeff)
+                        coeff_simplified = self.closures.simplify(coeff)
                         if coeff_simplified.is_zero if hasattr(coeff_simplified, 'is_zero') else (coeff_simplified == 0 or coeff_simplified == Integer(0)):
                             continue
                         coeff = coeff_simplified
@@ -987,7 +1060,7 @@ class IterativeAnalyzer(BaseAnalyzer, ForVisitor, IfVisitor, WhileRepeatVisitor,
                     elif coeff == Integer(-1):
                         polynomial_terms.append(f"-({ck_combined})")
                     else:
-                        coeff_latex = latex(coeff)
+                        coeff_latex = self.render_latex(coeff)
                         polynomial_terms.append(f"({ck_combined}) \\cdot {coeff_latex}")
                 elif degree == 1:
                     # Término lineal
@@ -996,7 +1069,7 @@ class IterativeAnalyzer(BaseAnalyzer, ForVisitor, IfVisitor, WhileRepeatVisitor,
                     elif coeff == Integer(-1):
                         polynomial_terms.append(f"-({ck_combined}) \\cdot n")
                     else:
-                        coeff_latex = latex(coeff)
+                        coeff_latex = self.render_latex(coeff)
                         polynomial_terms.append(f"({ck_combined}) \\cdot {coeff_latex} \\cdot n")
                 else:
                     # Términos de grado superior (n², n³, etc.)
@@ -1005,7 +1078,7 @@ class IterativeAnalyzer(BaseAnalyzer, ForVisitor, IfVisitor, WhileRepeatVisitor,
                     elif coeff == Integer(-1):
                         polynomial_terms.append(f"-({ck_combined}) \\cdot n^{{{degree}}}")
                     else:
-                        coeff_latex = latex(coeff)
+                        coeff_latex = self.render_latex(coeff)
                         polynomial_terms.append(f"({ck_combined}) \\cdot {coeff_latex} \\cdot n^{{{degree}}}")
         
         if polynomial_terms:
@@ -1112,7 +1185,8 @@ class IterativeAnalyzer(BaseAnalyzer, ForVisitor, IfVisitor, WhileRepeatVisitor,
         if node_type == "Program":
             self.visitProgram(node, mode)
         elif node_type == "Block":
-            self.visitBlock(node, mode)
+            # Los bloques se memorizan por hash estructural (ver BaseAnalyzer.visit_memoized)
+            self.visit_memoized(node, mode, self.visitBlock)
         elif node_type == "ProcDef":
             self.visitProcDef(node, mode)
         elif node_type == "For":
@@ -1149,31 +1223,15 @@ class IterativeAnalyzer(BaseAnalyzer, ForVisitor, IfVisitor, WhileRepeatVisitor,
     
     def visitBlock(self, node: Dict[str, Any], mode: str = "worst") -> None:
         """
-        Visita un bloque de código con memoización para optimización.
+        Visita un bloque de código.
         
-        Si el bloque ya fue analizado en el mismo contexto, reutiliza los resultados
-        del cache en lugar de analizar nuevamente.
+        El dispatcher (visit) lo llama a través del memo: si ya se analizó un
+        bloque igual en el mismo contexto, se reutilizan sus filas.
         
         Args:
             node: Nodo Block del AST
             mode: Modo de análisis
         """
-        # Verificar si este nodo debe ser cacheado
-        if self._should_memoize(node):
-            # Generar clave de memoización
-            ctx_hash = self.get_context_hash()
-            memo_key = self.memo_key(node, mode, ctx_hash)
-            
-            # Intentar obtener del cache
-            cached_rows = self.memo_get(memo_key)
-            if cached_rows is not None:
-                # Usar resultados cacheados
-                self.rows.extend(cached_rows)
-                return
-        
-        # Si no está en cache, analizar normalmente
-        rows_before = len(self.rows)
-        
         for stmt in node.get("body", []):
             # Guardar el número de rows antes de visitar el statement
             stmt_rows_before = len(self.rows)
@@ -1214,14 +1272,6 @@ class IterativeAnalyzer(BaseAnalyzer, ForVisitor, IfVisitor, WhileRepeatVisitor,
                 # Si debemos detener, salir del bucle
                 if should_stop:
                     break
-        
-        # Guardar resultados en cache si corresponde
-        if self._should_memoize(node):
-            rows_added = self.rows[rows_before:]
-            if rows_added:  # Solo cachear si se agregaron filas
-                ctx_hash = self.get_context_hash()
-                memo_key = self.memo_key(node, mode, ctx_hash)
-                self.memo_set(memo_key, rows_added)
     
     def visitProcDef(self, node: Dict[str, Any], mode: str = "worst") -> None:
         """
@@ -1,9 +1,13 @@
 from typing import Any, Dict, List, Optional, Tuple
+import copy
 import math
 import re
 from sympy import Expr, latex, Integer, Symbol, sympify, simplify, solve, symbols, I, im, expand, factor
 from collections import Counter
 from .base import BaseAnalyzer
+from ...shared.deadline import DeadlineExceeded, interruptible, killable
+from ...shared.metrics import phase
+from ...shared.program_index import ProgramIndex, get_program_index
 
 
 class RecursiveAnalyzer(BaseAnalyzer):
@@ -26,6 +30,7 @@ class RecursiveAnalyzer(BaseAnalyzer):
         self.procedure_name: Optional[str] = None
         self.proc_def: Optional[Dict[str, Any]] = None
         self.ast: Optional[Dict[str, Any]] = None  # Guardar AST completo para buscar funciones auxiliares
+        self.index: Optional[ProgramIndex] = None  # Índice compartido del AST (procedimientos y llamadas)
         self.recurrence: Optional[Dict[str, Any]] = None
         self.master: Optional[Dict[str, Any]] = None
         self.iteration: Optional[Dict[str, Any]] = None
@@ -57,6 +62,7 @@ class RecursiveAnalyzer(BaseAnalyzer):
         self.clear()
         self.mode = mode
         self.ast = ast  # Guardar AST completo
+        self.index = get_program_index(ast)
         
         # 1. Encontrar el procedimiento principal
         proc_def = self._find_main_procedure(ast)
@@ -100,7 +106,8 @@ class RecursiveAnalyzer(BaseAnalyzer):
                 }
         
         # 3. Extraer recurrencia (puede usar preferred_method si se proporciona)
-        extraction_result = self._extract_recurrence(proc_def, preferred_method=preferred_method)
+        with phase("recurrence"):
+            extraction_result = self._extract_recurrence_memo(proc_def, preferred_method)
         if not extraction_result["success"]:
             return {
                 "ok": False,
@@ -130,6 +137,34 @@ class RecursiveAnalyzer(BaseAnalyzer):
             # Usar la prioridad automática (PRIORIDAD: Ecuación Característica > Iteración > Árbol > Maestro)
             method = self.recurrence.get("method", "master")
         
+        # Los métodos pueden tardar mucho con SymPy; si se agota el plazo se
+        # devuelve la recurrencia extraída sin la solución, marcada como degradada
+        try:
+            with phase("solve"):
+                error = interruptible(self._apply_method, method)
+        except DeadlineExceeded:
+            self.characteristic_equation = self.iteration = self.recursion_tree = self.master = None
+            self.mark_degraded("method")
+            return self.result()
+        if error is not None:
+            return error
+        
+        # 5. Generar resultado
+        return self.result()
+    
+    def _apply_method(self, method: str) -> Optional[Dict[str, Any]]:
+        """
+        Aplica el método de resolución indicado a la recurrencia extraída.
+        
+        Args:
+            method: "characteristic_equation", "iteration", "recursion_tree" o "master"
+            
+        Returns:
+            None si el método se aplicó, o la respuesta de error
+            
+        Raises:
+            DeadlineExceeded: Si se agota el plazo del análisis
+        """
         if method == "characteristic_equation":
             # Aplicar Método de Ecuación Característica (PRIORIDAD ALTA)
             char_eq_result = self._apply_characteristic_equation_method()
@@ -171,8 +206,7 @@ class RecursiveAnalyzer(BaseAnalyzer):
             
             self.master = master_result["master"]
         
-        # 5. Generar resultado
-        return self.result()
+        return None
     
     def detect_applicable_methods(self, ast: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -195,6 +229,7 @@ class RecursiveAnalyzer(BaseAnalyzer):
             self.clear()
             self.mode = "worst"  # Usar worst para detección
             self.ast = ast
+            self.index = get_program_index(ast)
             
             # 1. Encontrar el procedimiento principal
             proc_def = self._find_main_procedure(ast)
@@ -216,7 +251,8 @@ class RecursiveAnalyzer(BaseAnalyzer):
                 }
             
             # 3. Extraer recurrencia sin método preferido (para detectar todos los métodos)
-            extraction_result = self._extract_recurrence(proc_def, preferred_method=None)
+            with phase("recurrence"):
+                extraction_result = self._extract_recurrence_memo(proc_def, None)
             if not extraction_result["success"]:
                 return {
                     "ok": False,
@@ -436,6 +472,9 @@ class RecursiveAnalyzer(BaseAnalyzer):
         if not isinstance(ast, dict):
             return None
         
+        if self.index is not None and self.index.ast is ast:
+            return self.index.main_procedure
+        
         body = ast.get("body", [])
         for item in body:
             if isinstance(item, dict) and item.get("type") == "ProcDef":
@@ -456,6 +495,9 @@ class RecursiveAnalyzer(BaseAnalyzer):
         if not self.ast or not isinstance(self.ast, dict):
             return None
         
+        if self.index is not None and self.index.ast is self.ast:
+            return self.index.find_procedure(name, case_sensitive=False)
+        
         body = self.ast.get("body", [])
         for item in body:
             if isinstance(item, dict) and item.get("type") == "ProcDef":
@@ -501,6 +543,10 @@ class RecursiveAnalyzer(BaseAnalyzer):
         if not proc_name:
             return False
         
+        indexed = self._indexed_recursive_calls(proc_def, proc_name)
+        if indexed is not None:
+            return bool(indexed)
+        
         body = proc_def.get("body", {})
         return self._search_recursive_calls(body, proc_name)
     
@@ -540,6 +586,40 @@ class RecursiveAnalyzer(BaseAnalyzer):
         
         return False
     
+    def _extract_recurrence_memo(self, proc_def: Dict[str, Any], preferred_method: Optional[str]) -> Dict[str, Any]:
+        """
+        _extract_recurrence memorizado en el índice del programa.
+
+        La extracción solo depende del procedimiento y del método preferido (no del
+        modo), así que detect-methods, open y los casos de mode="all" sobre el mismo
+        AST (p. ej. el de un handle de programa) la calculan una sola vez. Se
+        devuelven copias del resultado y de los pasos de prueba que generó.
+
+        Args:
+            proc_def: Nodo ProcDef del procedimiento
+            preferred_method: Método preferido (opcional)
+
+        Returns:
+            {"success": bool, "recurrence": dict, "reason": str}
+
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        if self.index is None or self.index.ast is not self.ast:
+            return self._extract_recurrence(proc_def, preferred_method=preferred_method)
+
+        key = ("recurrence", id(proc_def), preferred_method)
+        entry = self.index.derived.get(key)
+        if entry is None:
+            start = len(self.proof_steps)
+            result = self._extract_recurrence(proc_def, preferred_method=preferred_method)
+            entry = copy.deepcopy((result, self.proof_steps[start:]))
+            self.index.derived[key] = entry
+            return result
+
+        result, steps = copy.deepcopy(entry)
+        self.proof_steps.extend(steps)
+        return result
+
     def _extract_recurrence(self, proc_def: Dict[str, Any], preferred_method: Optional[str] = None) -> Dict[str, Any]:
         """
         Extrae la recurrencia T(n) = a·T(n/b) + f(n) del procedimiento.
@@ -956,11 +1036,38 @@ class RecursiveAnalyzer(BaseAnalyzer):
             Lista de nodos Call recursivos
         """
         proc_name = proc_def.get("name", "")
+        indexed = self._indexed_recursive_calls(proc_def, proc_name)
+        if indexed is not None:
+            return indexed
         calls = []
         body = proc_def.get("body", {})
         self._collect_recursive_calls(body, proc_name, calls)
         return calls
     
+    def _indexed_recursive_calls(self, proc_def: Dict[str, Any], proc_name: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Obtiene las llamadas recursivas desde el índice del programa.
+        
+        Args:
+            proc_def: Nodo ProcDef
+            proc_name: Nombre del procedimiento
+            
+        Returns:
+            Lista de nodos Call recursivos en preorden, o None si proc_def no está
+            en el índice (el llamador debe recorrer el árbol)
+        """
+        if self.index is None or not proc_name:
+            return None
+        calls = self.index.calls_in(proc_def)
+        if calls is None:
+            return None
+        target = proc_name.lower()
+        return [
+            call for call in calls
+            if call.get("type") == "Call"
+            and (call.get("name") or call.get("callee") or "").lower() == target
+        ]
+    
     def _collect_recursive_calls(self, node: Any, proc_name: str, calls: List[Dict[str, Any]]):
         """
         Recolecta recursivamente todas las llamadas a proc_name.
@@ -2914,7 +3021,7 @@ class RecursiveAnalyzer(BaseAnalyzer):
                         }
                     # Si tiene n pero no es polinomial simple, verificar con límite
                     ratio = simplify(f_n_expr / g_n_expr)
-                    lim = limit(ratio, n_sym, oo)
+                    lim = killable(limit, ratio, n_sym, oo)
                     if lim == oo or (hasattr(lim, 'is_infinite') and lim.is_infinite):
                         return {
                             "case": 3,
@@ -2940,7 +3047,7 @@ class RecursiveAnalyzer(BaseAnalyzer):
                 # Si f(n) tiene n pero con exponente diferente, verificar con límite
                 if f_n_expr.has(n_sym):
                     ratio = simplify(f_n_expr / g_n_expr)
-                    lim = limit(ratio, n_sym, oo)
+                    lim = killable(limit, ratio, n_sym, oo)
                     # Si el límite es constante positiva (1), es Caso 2
                     if hasattr(lim, 'is_number') and lim.is_number and lim > 0:
                         return {
@@ -2950,7 +3057,7 @@ class RecursiveAnalyzer(BaseAnalyzer):
             
             # Calcular límite de f(n) / g(n) cuando n → ∞
             ratio = simplify(f_n_expr / g_n_expr)
-            lim = limit(ratio, n_sym, oo)
+            lim = killable(limit, ratio, n_sym, oo)
             
             # Si el límite es 0 → f(n) = o(g(n)) → Caso 1
             if lim == 0 or (isinstance(lim, (int, float)) and abs(lim) < 1e-10):
@@ -3502,11 +3609,15 @@ class RecursiveAnalyzer(BaseAnalyzer):
         
         totals["proof"] = proof
         
-        return {
+        response = {
             "ok": True,
             "byLine": by_line,
             "totals": totals
         }
+        if self.degraded:
+            response["degraded"] = True
+            response["degradedStage"] = self.degraded
+        return response
     
     def clear(self):
         """Limpia todos los datos del analizador."""
@@ -3514,6 +3625,7 @@ class RecursiveAnalyzer(BaseAnalyzer):
         self.procedure_name = None
         self.proc_def = None
         self.ast = None
+        self.index = None
         self.recurrence = None
         self.master = None
         self.proof = []
@@ -3891,9 +4003,9 @@ class RecursiveAnalyzer(BaseAnalyzer):
                         try:
                             if root.real.is_real:
                                 real_roots.append(root)
-                        except:
+                        except Exception:
                             pass
-                except:
+                except Exception:
                     # Si no se puede verificar, incluir de todas formas
                     real_roots.append(root)
             
@@ -3905,11 +4017,11 @@ class RecursiveAnalyzer(BaseAnalyzer):
             # Pero mantener la forma simbólica
             try:
                 real_roots = sorted(real_roots, key=lambda r: abs(float(r.evalf())) if hasattr(r, 'evalf') else 0, reverse=True)
-            except:
+            except Exception:
                 try:
                     # Fallback: ordenar por valor real si es complejo
                     real_roots = sorted(real_roots, key=lambda r: abs(float(r.real.evalf())) if hasattr(r, 'real') else 0, reverse=True)
-                except:
+                except Exception:
                     pass
             
             # Procesar raíces con multiplicidad (mantener forma simbólica)
@@ -3930,7 +4042,7 @@ class RecursiveAnalyzer(BaseAnalyzer):
                         root_map[root_key] = root_simplified
                     
                     root_counts[root_key] += 1
-                except:
+                except Exception:
                     root_key = str(root)
                     if root_key not in root_map:
                         root_map[root_key] = root
@@ -3952,7 +4064,7 @@ class RecursiveAnalyzer(BaseAnalyzer):
                         root_factorized = factor(root_simplified)
                         if root_factorized != root_simplified:
                             root_simplified = root_factorized
-                    except:
+                    except Exception:
                         pass
                     
                     root_latex = latex(root_simplified)
@@ -3965,9 +4077,9 @@ class RecursiveAnalyzer(BaseAnalyzer):
                             root_latex = "\\frac{1 + \\sqrt{5}}{2}"
                         elif abs(root_num - -0.618033988749895) < 1e-10:
                             root_latex = "\\frac{1 - \\sqrt{5}}{2}"
-                    except:
+                    except Exception:
                         pass
-                except:
+                except Exception:
                     root_latex = root_str
                 
                 roots_info.append({
@@ -4067,7 +4179,7 @@ class RecursiveAnalyzer(BaseAnalyzer):
                                     g_sympy = sympify(g_value)
                                     g_latex = latex(g_sympy)
                                     particular_sol = f"{g_latex} \\cdot n"
-                                except:
+                                except Exception:
                                     particular_sol = f"{g_value} \\cdot n"
                         else:
                             # Si r != 1, usar solución constante T_p(n) = K
@@ -4083,7 +4195,7 @@ class RecursiveAnalyzer(BaseAnalyzer):
                                     particular_sol = "A_2"
                                 else:
                                     particular_sol = f"A_2 \\cdot {k_latex}" if abs(k_value) != 1 else "A_2"
-                            except:
+                            except Exception:
                                 # Redondear a 3 decimales si es necesario
                                 if abs(k_value - round(k_value)) < 1e-6:
                                     k_int = int(round(k_value))
@@ -4135,7 +4247,7 @@ class RecursiveAnalyzer(BaseAnalyzer):
                     else:
                         # Caso r != 1: T(n) = c_1 * r^n
                         closed_form = f"c_1 \\cdot {r_val}^n"
-                except:
+                except Exception:
                     closed_form = f"c_1 \\cdot {r_val}^n"
             elif len(roots_info) == 2:
                 # Dos raíces distintas: T(n) = c_1 * r1^n + c_2 * r2^n
@@ -4156,7 +4268,7 @@ class RecursiveAnalyzer(BaseAnalyzer):
                             closed_form = f"c_1 \\cdot {r1_val}^n + c_2 \\cdot {r2_val}^n + c_3"
                     else:
                         closed_form = f"c_1 \\cdot {r1_val}^n + c_2 \\cdot {r2_val}^n"
-                except:
+                except Exception:
                     # Fallback: usar ambas raíces
                     closed_form = f"c_1 \\cdot {r1_val}^n + c_2 \\cdot {r2_val}^n"
             else:
@@ -4248,7 +4360,7 @@ class RecursiveAnalyzer(BaseAnalyzer):
                     else:
                         # Caso r < 1: exponencial decreciente
                         theta_result = f"\\Theta({r_val}^n)"
-                except:
+                except Exception:
                     # Fallback: usar r^n
                     theta_result = f"\\Theta({r_val}^n)"
             elif len(roots_info) == 2:
@@ -4264,7 +4376,7 @@ class RecursiveAnalyzer(BaseAnalyzer):
                     r_max_num = max(abs(r1_num), abs(r2_num))
                     r_max_val = r1_val if abs(r1_num) >= abs(r2_num) else r2_val
                     theta_result = f"\\Theta({r_max_val}^n)"
-                except:
+                except Exception:
                     # Fallback: usar la primera raíz
                     theta_result = f"\\Theta({r1_val}^n)"
             else:
@@ -4272,7 +4384,7 @@ class RecursiveAnalyzer(BaseAnalyzer):
                 try:
                     r_max = max(roots_info, key=lambda r: abs(float(sympify(r["root"]).evalf())) if sympify(r["root"]).is_real else 0)
                     theta_result = f"\\Theta({r_max['root']}^n)"
-                except:
+                except Exception:
                     # Fallback: usar la primera raíz
                     theta_result = f"\\Theta({roots_info[0]['root']}^n)"
             
@@ -4289,13 +4401,13 @@ class RecursiveAnalyzer(BaseAnalyzer):
                     r_max_info = max(roots_info, key=lambda r: abs(float(sympify(r["root"]).evalf())) if sympify(r["root"]).is_real else 0)
                     dominant_root = r_max_info["root"]
                     growth_rate = float(sympify(dominant_root).evalf())
-                except:
+                except Exception:
                     # Fallback: usar la primera raíz (ya está ordenada)
                     if roots_info:
                         dominant_root = roots_info[0]["root"]
                         try:
                             growth_rate = float(sympify(dominant_root).evalf())
-                        except:
+                        except Exception:
                             pass
             
             # Detectar early returns para manejar mejor caso
@@ -5463,7 +5575,7 @@ FIN FUNCIÓN"""
             else:
                 # Intentar parsear como expresión
                 f_n_expr = sympify(f_n.replace("\\", "").replace("theta", "").replace("Theta", "").replace("(", "").replace(")", "").strip(), evaluate=False)
-        except:
+        except Exception:
             # Si falla, usar como string
             f_n_expr = None
         
@@ -5628,7 +5740,7 @@ FIN FUNCIÓN"""
                 f_n_expr = Integer(int(f_simplified))
             else:
                 f_n_expr = None
-        except:
+        except Exception:
             f_n_expr = None
         
         # Detectar el tipo de sumatoria
@@ -0,0 +1,126 @@
+"""
+Análisis por lotes con resultados en streaming (/analyze/batch).
+
+Para calificar una tarea se analizan cientos de entregas; con una petición por
+archivo cada una paga su viaje de red y el cliente tiene que manejar cientos de
+timeouts. Un lote recibe todos los programas, los reparte en el motor de
+ejecución (core.engine) con un límite de concurrencia por lote y devuelve cada
+resultado en cuanto termina, como una línea de JSON (NDJSON), para que el
+cliente empiece a procesar antes de que acabe el lote.
+
+- Cada elemento se analiza con analyze_algorithm_async: usa las cachés, el
+  plazo por petición (shared.deadline) y los handles de programa como una
+  llamada a /analyze/open.
+- La concurrencia por defecto (y máxima) es el número de workers del motor: un
+  lote basta para ocupar la máquina sin llenar la cola que comparten las demás
+  peticiones.
+- Las líneas llegan en orden de finalización; index e id permiten asociarlas a
+  la entrada. La última línea es un resumen con done=true.
+- Las cabeceras salen antes de analizar, así que no hay Server-Timing: cada
+  elemento registra sus etapas en /metrics (shared.metrics) como una petición.
+
+Author: Juan Camilo Cruz Parra (@Cruz1122)
+"""
+import asyncio
+import json
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from fastapi.encoders import jsonable_encoder
+
+from ...core.engine import EngineError, get_engine
+from ..shared.metrics import collect_phases, observe_phases
+from .service import analyze_algorithm_async
+
+
+def batch_concurrency(requested: Optional[int] = None) -> int:
+    """
+    Calcula cuántos elementos de un lote se analizan a la vez.
+
+    Args:
+        requested: Concurrencia pedida por el cliente (opcional)
+
+    Returns:
+        Entre 1 y el número de workers del motor (1 en modo hilos)
+
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+    limit = max(1, get_engine().workers)
+    if requested is None:
+        return limit
+    return max(1, min(int(requested), limit))
+
+
+def _to_line(payload: Dict[str, Any]) -> str:
+    return json.dumps(jsonable_encoder(payload), ensure_ascii=False) + "\n"
+
+
+async def _analyze_item(index: int, item: Dict[str, Any], semaphore: asyncio.Semaphore) -> Dict[str, Any]:
+    """Analiza un elemento del lote cuando hay turno y devuelve su línea."""
+    async with semaphore:
+        started = time.perf_counter()
+        with collect_phases(endpoint="/analyze/batch") as timings:
+            try:
+                result = await analyze_algorithm_async(
+                    source=item.get("source"),
+                    mode=item.get("mode", "worst"),
+                    avg_model=item.get("avg_model"),
+                    algorithm_kind=item.get("algorithm_kind"),
+                    preferred_method=item.get("preferred_method"),
+                    program_id=item.get("program_id"),
+                )
+            except EngineError as e:
+                # Motor lleno o worker caído: solo falla este elemento
+                result = {
+                    "ok": False,
+                    "status": e.status_code,
+                    "errors": [{"message": e.message, "line": None, "column": None}],
+                }
+        observe_phases(timings)
+        return {
+            "index": index,
+            "id": item.get("id"),
+            "ok": bool(result.get("ok")),
+            "durationMs": round((time.perf_counter() - started) * 1000, 3),
+            "result": result,
+        }
+
+
+async def stream_batch(items: List[Dict[str, Any]], concurrency: Optional[int] = None) -> AsyncIterator[str]:
+    """
+    Analiza un lote y genera una línea NDJSON por elemento, en orden de finalización.
+
+    Args:
+        items: Elementos con id, source (o program_id), mode, avg_model,
+            algorithm_kind y preferred_method
+        concurrency: Límite de análisis simultáneos (ver batch_concurrency)
+
+    Yields:
+        Líneas JSON {index, id, ok, durationMs, result} y, al final,
+        {done: true, count, succeeded, failed, concurrency, durationMs}
+
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+    started = time.perf_counter()
+    limit = batch_concurrency(concurrency)
+    semaphore = asyncio.Semaphore(limit)
+    tasks = [asyncio.ensure_future(_analyze_item(index, item, semaphore)) for index, item in enumerate(items)]
+    succeeded = 0
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            line = await next_done
+            succeeded += line["ok"]
+            yield _to_line(line)
+    finally:
+        # Si el cliente se desconecta, los elementos pendientes no se analizan
+        for task in tasks:
+            task.cancel()
+
+    yield _to_line({
+        "done": True,
+        "count": len(items),
+        "succeeded": succeeded,
+        "failed": len(items) - succeeded,
+        "concurrency": limit,
+        "durationMs": round((time.perf_counter() - started) * 1000, 3),
+    })
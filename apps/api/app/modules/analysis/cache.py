@@ -0,0 +1,331 @@
+"""
+Caché de resultados de análisis (analyze_algorithm y detect_methods).
+
+Estudiantes y docentes reenvían constantemente los mismos programas y cada
+análisis cuesta cientos de milisegundos de SymPy. Los resultados se guardan en
+una caché LRU con tiempo de vida, indexada por el hash del código y todo lo que
+cambia el resultado: operación, modo, avgModel normalizado, algorithm_kind,
+preferred_method y una marca de versión del código de análisis.
+
+Los resultados fallidos (errores de parseo, "No aplicable", ...) también se
+guardan, con su propio límite, para que no desplacen a los exitosos. Las
+excepciones inesperadas no se guardan: pueden ser transitorias.
+
+Cada entrada se guarda serializada (ver shared.cache_backends.encode_value): lo
+guardado es inmutable, cada lectura devuelve datos nuevos y el tamaño de la caché
+en bytes es exacto. Con CACHE_BACKEND=sqlite o redis, además del nivel en memoria
+del proceso se consulta un nivel compartido por todos los workers.
+
+Author: Juan Camilo Cruz Parra (@Cruz1122)
+"""
+import hashlib
+import json
+import threading
+from typing import Any, Dict, Optional
+
+from ...core.config import (
+    get_analysis_cache_failure_size,
+    get_analysis_cache_size,
+    get_analysis_cache_ttl,
+    get_cache_backend,
+)
+from ..parsing.cache import source_key
+from ..shared.cache_backends import (
+    CODE_VERSION,
+    CacheBackend,
+    MemoryBackend,
+    create_shared_backend,
+    decode_value,
+    encode_value,
+)
+
+# Modelo promedio usado cuando no se envía avgModel
+DEFAULT_AVG_MODEL = {"mode": "uniform", "predicates": {}}
+
+# Marca de versión del código de análisis (forma parte de cada clave)
+ANALYZER_VERSION = CODE_VERSION
+
+
+def normalize_avg_model(mode: str, avg_model: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Normaliza avgModel para la clave de caché.
+
+    Solo los modos "avg" y "all" usan el modelo; sin avgModel se usa el uniforme.
+
+    Args:
+        mode: Modo de análisis
+        avg_model: Modelo recibido (o None)
+
+    Returns:
+        {"mode", "predicates"} o None si el modo no usa el modelo
+
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+    if mode not in ("avg", "all"):
+        return None
+    model = avg_model or DEFAULT_AVG_MODEL
+    return {"mode": model.get("mode", "uniform"), "predicates": model.get("predicates") or {}}
+
+
+def analysis_key(
+    operation: str,
+    source: str,
+    mode: Optional[str] = None,
+    avg_model: Optional[Dict[str, Any]] = None,
+    algorithm_kind: Optional[str] = None,
+    preferred_method: Optional[str] = None,
+) -> str:
+    """
+    Calcula la clave de caché de un análisis.
+
+    Args:
+        operation: "analyze", "detect_methods" o "load" (errores de parseo)
+        source: Código fuente
+        mode: Modo de análisis
+        avg_model: Modelo promedio recibido
+        algorithm_kind: Tipo de algoritmo recibido (None = detección automática)
+        preferred_method: Método preferido para recursivos
+
+    Returns:
+        Hash SHA-256 (hex) de todos los parámetros que afectan el resultado
+
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+    return program_analysis_key(operation, source_key(source), mode, avg_model, algorithm_kind, preferred_method)
+
+
+def program_analysis_key(
+    operation: str,
+    program_id: str,
+    mode: Optional[str] = None,
+    avg_model: Optional[Dict[str, Any]] = None,
+    algorithm_kind: Optional[str] = None,
+    preferred_method: Optional[str] = None,
+) -> str:
+    """
+    Igual que analysis_key, a partir del programId (hash del código) en lugar del
+    código: permite consultar la caché con solo el programId, sin el código.
+
+    Args:
+        operation: "analyze", "detect_methods" o "load" (errores de parseo)
+        program_id: source_key del código
+        mode: Modo de análisis
+        avg_model: Modelo promedio recibido
+        algorithm_kind: Tipo de algoritmo recibido (None = detección automática)
+        preferred_method: Método preferido para recursivos
+
+    Returns:
+        La misma clave que analysis_key con el código correspondiente
+
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+    parts = [
+        operation,
+        ANALYZER_VERSION,
+        program_id,
+        mode,
+        normalize_avg_model(mode, avg_model) if mode else None,
+        algorithm_kind,
+        preferred_method,
+    ]
+    encoded = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class AnalysisCache:
+    """
+    Caché LRU con tiempo de vida, acotada y thread-safe, de resultados de análisis.
+
+    - Clave: analysis_key(...)
+    - Valor: resultado serializado con encode_value (copy-on-read)
+    - Exitosos y fallidos (ok: false) en LRUs separados, cada uno con su límite
+    - Nivel compartido opcional (backends de exitosos y fallidos): un miss local
+      se busca ahí y, si está, se copia al nivel local
+    - Contadores de hits, misses, evictions y expirations, y bytes en uso, con stats()
+
+    Un tamaño máximo de 0 desactiva la parte correspondiente; un ttl de 0 hace que
+    las entradas no expiren.
+
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        max_failures: int = 64,
+        ttl_seconds: float = 3600,
+        shared: Optional[CacheBackend] = None,
+        shared_failures: Optional[CacheBackend] = None,
+    ):
+        """
+        Inicializa la caché.
+
+        Args:
+            max_entries: Número máximo de resultados exitosos
+            max_failures: Número máximo de resultados fallidos
+            ttl_seconds: Segundos de vida de cada entrada (0 = sin expiración)
+            shared: Backend compartido de resultados exitosos (opcional)
+            shared_failures: Backend compartido de resultados fallidos (opcional)
+
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        self.max_entries = max(0, int(max_entries))
+        self.max_failures = max(0, int(max_failures))
+        self.ttl_seconds = max(0.0, float(ttl_seconds))
+        self._entries = MemoryBackend(self.max_entries)
+        self._failures = MemoryBackend(self.max_failures)
+        self._shared = shared if self.max_entries else None
+        self._shared_failures = shared_failures if self.max_failures else None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Busca un resultado de análisis.
+
+        Args:
+            key: Clave calculada con analysis_key
+
+        Returns:
+            Copia del resultado si está en caché y no expiró, None en caso contrario
+
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        if self.max_entries == 0 and self.max_failures == 0:
+            return None
+
+        data = self._entries.get(key) or self._failures.get(key)
+        shared_hit = False
+        if data is None:
+            for shared, local in ((self._shared, self._entries), (self._shared_failures, self._failures)):
+                data = shared.get(key) if shared is not None else None
+                if data is not None:
+                    local.set(key, data, self.ttl_seconds)
+                    shared_hit = True
+                    break
+
+        result = None
+        if data is not None:
+            try:
+                result = decode_value(data)
+            except ValueError:
+                result = None
+        with self._lock:
+            if result is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.shared_hits += shared_hit
+        return result
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        """
+        Guarda un resultado de análisis (exitoso o fallido según result["ok"]).
+
+        Args:
+            key: Clave calculada con analysis_key
+            result: Resultado a cachear
+
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        failed = not result.get("ok", False)
+        if failed:
+            local, other, shared = self._failures, self._entries, self._shared_failures
+        else:
+            local, other, shared = self._entries, self._failures, self._shared
+        if local.max_entries == 0:
+            return
+        try:
+            data = encode_value(result)
+        except (TypeError, ValueError):
+            # Resultado no serializable: no se cachea
+            return
+
+        other.delete(key)
+        local.set(key, data, self.ttl_seconds)
+        if shared is not None:
+            shared.set(key, data, self.ttl_seconds)
+
+    def clear(self) -> None:
+        """
+        Vacía la caché (también el nivel compartido) y reinicia los contadores.
+
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        for backend in (self._entries, self._failures, self._shared, self._shared_failures):
+            if backend is not None:
+                backend.clear()
+        with self._lock:
+            self.hits = 0
+            self.shared_hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Devuelve los contadores de la caché.
+
+        Returns:
+            Diccionario con size, failures, max_entries, max_failures, ttl_seconds,
+            hits, shared_hits, misses, evictions, expirations, hit_ratio, bytes,
+            version y shared (stats de los backends compartidos, o None)
+
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        entries = self._entries.stats()
+        failures = self._failures.stats()
+        shared = None
+        if self._shared is not None or self._shared_failures is not None:
+            shared = {
+                "results": self._shared.stats() if self._shared is not None else None,
+                "failures": self._shared_failures.stats() if self._shared_failures is not None else None,
+            }
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": entries["size"],
+                "failures": failures["size"],
+                "max_entries": self.max_entries,
+                "max_failures": self.max_failures,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "shared_hits": self.shared_hits,
+                "misses": self.misses,
+                "evictions": entries["evictions"] + failures["evictions"],
+                "expirations": entries["expirations"] + failures["expirations"],
+                "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+                "bytes": entries["bytes"] + failures["bytes"],
+                "version": ANALYZER_VERSION,
+                "backend": get_cache_backend(),
+                "shared": shared,
+            }
+
+
+def _create_analysis_cache() -> AnalysisCache:
+    """Crea la caché de análisis con la configuración del entorno."""
+    max_entries = get_analysis_cache_size()
+    max_failures = get_analysis_cache_failure_size()
+    return AnalysisCache(
+        max_entries,
+        max_failures,
+        get_analysis_cache_ttl(),
+        shared=create_shared_backend("analysis", max_entries) if max_entries else None,
+        shared_failures=create_shared_backend("analysis-failures", max_failures) if max_failures else None,
+    )
+
+
+# Instancia compartida por analyze_algorithm y detect_methods
+analysis_cache = _create_analysis_cache()
+
+
+def get_analysis_cache() -> AnalysisCache:
+    """
+    Obtiene la caché de análisis compartida del proceso.
+
+    Returns:
+        Instancia global de AnalysisCache
+
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+    return analysis_cache
@@ -0,0 +1,41 @@
+"""
+Análisis de los casos worst, best y avg de mode="all".
+
+Los casos se analizan uno tras otro en el proceso de la petición: el
+paralelismo entre núcleos lo da el motor de ejecución (core.engine), que reparte
+peticiones entre workers. Los analizadores que comparten trabajo entre casos
+(los que definen el classmethod analyze_cases, como IterativeAnalyzer) analizan
+todos los casos juntos: cerrar una sola vez las sumatorias comunes cuesta menos
+CPU que tres análisis completos.
+
+Author: Juan Camilo Cruz Parra (@Cruz1122)
+"""
+from typing import Any, Dict, Type
+
+
+def analyze_cases(
+    analyzer_class: Type,
+    ast: Dict[str, Any],
+    cases: Dict[str, Dict[str, Any]],
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Analiza varios casos del mismo AST, con analyzer_class.analyze_cases si el
+    analizador comparte trabajo entre casos o con un analizador nuevo por caso.
+
+    Args:
+        analyzer_class: Clase del analizador
+        ast: AST del programa
+        cases: Modo -> argumentos extra de analyze(), en orden
+
+    Returns:
+        Modo -> resultado de analyze(), con las mismas claves que cases
+
+    Raises:
+        Exception: La primera excepción lanzada por un análisis, en el orden de cases
+
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+    shared = getattr(analyzer_class, "analyze_cases", None)
+    if shared is not None:
+        return shared(ast, cases)
+    return {mode: analyzer_class().analyze(ast, mode, **kwargs) for mode, kwargs in cases.items()}
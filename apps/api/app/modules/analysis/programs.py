@@ -0,0 +1,151 @@
+"""
+Handles de programa: trabajo reutilizable entre endpoints.
+
+El frontend suele llamar a /analyze/detect-methods, luego a /analyze/open con un
+preferred_method y luego a /analyze/trace sobre el mismo código, y cada llamada
+volvía a parsear, clasificar y (en recursivos) extraer la recurrencia. Esos
+endpoints devuelven ahora un programId que apunta al programa ya preparado: AST,
+ProgramIndex (con su memo de resultados derivados, como la recurrencia) y la
+clasificación automática. Las llamadas siguientes pueden enviar ese programId en
+lugar de source.
+
+El programId es el hash SHA-256 del código, así que enviar el mismo source
+también reutiliza el handle. Los handles se guardan en un LRU acotado; si uno fue
+expulsado, el endpoint responde programExpired=True para que el cliente reenvíe
+el código.
+
+El almacén es por proceso. Con el motor de ejecución (core.engine) las rutas
+envían el trabajo de un programa siempre al worker de su programId (run_on), así
+que el handle creado por detect-methods es el que encuentran open y trace.
+
+Author: Juan Camilo Cruz Parra (@Cruz1122)
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from ...core.config import get_program_store_size
+from ..shared.program_index import get_program_index, register_program_index
+
+
+class ProgramHandle:
+    """
+    Programa parseado y preparado para los analizadores.
+
+    El AST y el índice no se modifican después de crearse (el mismo supuesto que
+    ProgramIndex), así que los endpoints los comparten sin copiarlos.
+
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+
+    def __init__(self, program_id: str, source: str, ast: Dict[str, Any]):
+        """
+        Crea el handle e indexa el programa.
+
+        Args:
+            program_id: Identificador del programa (hash del código)
+            source: Código fuente
+            ast: AST del código
+
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        self.id = program_id
+        self.source = source
+        self.ast = ast
+        self.index = get_program_index(ast)
+        # Tipo detectado automáticamente (se calcula con el primer uso)
+        self.kind: Optional[str] = None
+
+    def activate(self) -> None:
+        """
+        Vuelve a registrar el índice del handle, para que los analizadores que
+        piden get_program_index(ast) reciban este mismo índice (y su memo).
+
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        register_program_index(self.index)
+
+
+class ProgramStore:
+    """
+    Almacén LRU acotado y thread-safe de handles de programa.
+
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+
+    def __init__(self, max_entries: int = 64):
+        """
+        Inicializa el almacén.
+
+        Args:
+            max_entries: Número máximo de programas antes de expulsar el menos usado
+
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        self.max_entries = max(0, int(max_entries))
+        self._entries: "OrderedDict[str, ProgramHandle]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, program_id: str) -> Optional[ProgramHandle]:
+        """
+        Obtiene un programa por su identificador.
+
+        Args:
+            program_id: Identificador devuelto por un endpoint anterior
+
+        Returns:
+            ProgramHandle o None si no existe (o fue expulsado)
+
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        with self._lock:
+            program = self._entries.get(program_id)
+            if program is not None:
+                self._entries.move_to_end(program_id)
+            return program
+
+    def put(self, program: ProgramHandle) -> None:
+        """
+        Guarda un programa.
+
+        Args:
+            program: ProgramHandle a guardar
+
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        if self.max_entries == 0:
+            return
+        with self._lock:
+            self._entries[program.id] = program
+            self._entries.move_to_end(program.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """
+        Elimina todos los programas.
+
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+# Instancia compartida por los endpoints de análisis
+program_store = ProgramStore(get_program_store_size())
+
+
+def get_program_store() -> ProgramStore:
+    """
+    Obtiene el almacén de programas compartido del proceso.
+
+    Returns:
+        Instancia global de ProgramStore
+
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+    return program_store
@@ -4,19 +4,21 @@ Router para el módulo de analysis.
 Author: Juan Camilo Cruz Parra (@Cruz1122)
 """
 from fastapi import APIRouter, Body
-from typing import Any, Dict
-from .service import analyze_algorithm, detect_methods
+from fastapi.responses import StreamingResponse
+from typing import Any, Dict, Optional, Union
+from .service import analyze_algorithm_async, detect_methods_async, trace_program_async
+from .batch import stream_batch
+from .cache import get_analysis_cache
 from .analyzers.dummy import create_dummy_analysis
-from .schemas import AnalyzeRequest, TraceRequest, TraceResponse
-from ..parsing.service import parse_source
-from ..classification.service import classify_algorithm as classify_algo
-from ..execution.executor import CodeExecutor
+from .schemas import AnalyzeRequest, BatchAnalyzeRequest, TraceRequest, TraceResponse
+from ...core.config import get_analysis_batch_max_items
+from ...core.engine import EngineError
 
 router = APIRouter(prefix="/analyze", tags=["analyze"])
 
 
 @router.post("/open")
-def analyze_open(payload: AnalyzeRequest = Body(...)) -> Dict[str, Any]:
+async def analyze_open(payload: AnalyzeRequest = Body(...)) -> Dict[str, Any]:
     """
     Analiza un algoritmo y devuelve el contrato mínimo:
     - byLine: tabla por línea
@@ -34,26 +36,71 @@ def analyze_open(payload: AnalyzeRequest = Body(...)) -> Dict[str, Any]:
         
     Author: Juan Camilo Cruz Parra (@Cruz1122)
     """
-    # Preparar avg_model
-    avg_model = None
-    if payload.avgModel:
-        avg_model = {
-            "mode": payload.avgModel.mode,
-            "predicates": payload.avgModel.predicates or {}
-        }
-    
-    return analyze_algorithm(
+    return await analyze_algorithm_async(
         source=payload.source,
         mode=payload.mode,
         api_key=payload.api_key,
-        avg_model=avg_model,
+        avg_model=_avg_model(payload),
         algorithm_kind=payload.algorithm_kind,
-        preferred_method=payload.preferred_method
+        preferred_method=payload.preferred_method,
+        program_id=payload.program_id
     )
 
 
+def _avg_model(payload: AnalyzeRequest) -> Optional[Dict[str, Any]]:
+    """Convierte el avgModel de la petición al diccionario que usa el servicio."""
+    if not payload.avgModel:
+        return None
+    return {
+        "mode": payload.avgModel.mode,
+        "predicates": payload.avgModel.predicates or {}
+    }
+
+
+@router.post("/batch", response_model=None)
+async def analyze_batch(payload: BatchAnalyzeRequest = Body(...)) -> Union[StreamingResponse, Dict[str, Any]]:
+    """
+    Analiza un lote de programas y devuelve los resultados en streaming (NDJSON).
+    
+    Cada elemento acepta los campos de /analyze/open más un id opcional. Los
+    análisis se reparten en el motor de ejecución con a lo sumo `concurrency`
+    a la vez, y cada resultado se envía como una línea
+    {index, id, ok, durationMs, result} en cuanto termina; la última línea es
+    un resumen con done=true.
+    
+    Args:
+        payload: Lote con items y concurrency (opcional)
+        
+    Returns:
+        Respuesta application/x-ndjson, o ok=false con errors si el lote supera
+        el máximo configurado
+        
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+    max_items = get_analysis_batch_max_items()
+    if len(payload.items) > max_items:
+        return {
+            "ok": False,
+            "errors": [{"message": f"El lote supera el máximo de {max_items} programas", "line": None, "column": None}]
+        }
+    
+    items = [
+        {
+            "id": item.id,
+            "source": item.source,
+            "program_id": item.program_id,
+            "mode": item.mode,
+            "avg_model": _avg_model(item),
+            "algorithm_kind": item.algorithm_kind,
+            "preferred_method": item.preferred_method,
+        }
+        for item in payload.items
+    ]
+    return StreamingResponse(stream_batch(items, payload.concurrency), media_type="application/x-ndjson")
+
+
 @router.post("/detect-methods")
-def detect_methods_endpoint(payload: AnalyzeRequest = Body(...)) -> Dict[str, Any]:
+async def detect_methods_endpoint(payload: AnalyzeRequest = Body(...)) -> Dict[str, Any]:
     """
     Detecta qué métodos de análisis son aplicables para un algoritmo recursivo
     sin ejecutar el análisis completo.
@@ -68,12 +115,27 @@ def detect_methods_endpoint(payload: AnalyzeRequest = Body(...)) -> Dict[str, An
         
     Author: Juan Camilo Cruz Parra (@Cruz1122)
     """
-    return detect_methods(
+    return await detect_methods_async(
         source=payload.source,
-        algorithm_kind=payload.algorithm_kind
+        algorithm_kind=payload.algorithm_kind,
+        program_id=payload.program_id
     )
 
 
+@router.get("/cache")
+def analysis_cache_stats() -> Dict[str, Any]:
+    """
+    Devuelve los contadores de la caché de resultados de análisis.
+    
+    Returns:
+        Diccionario con ok y stats (size, failures, hits, misses, evictions,
+        expirations, hit_ratio, bytes, ...)
+        
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+    return {"ok": True, "stats": get_analysis_cache().stats()}
+
+
 @router.get("/dummy")
 def analyze_dummy() -> Dict[str, Any]:
     """
@@ -102,14 +164,14 @@ def analyze_dummy() -> Dict[str, Any]:
 
 
 @router.post("/trace")
-def analyze_trace(payload: TraceRequest = Body(...)) -> Dict[str, Any]:
+async def analyze_trace(payload: TraceRequest = Body(...)) -> Dict[str, Any]:
     """
     Genera un rastro de ejecución paso a paso del pseudocódigo.
     Para algoritmos iterativos: devuelve trace completo con pasos.
     Para algoritmos recursivos/híbridos: devuelve metadatos mínimos sin trace detallado.
     
     Args:
-        payload: Solicitud con código fuente, caso y tamaño de entrada
+        payload: Solicitud con código fuente (o program_id), caso y tamaño de entrada
         
     Returns:
         Rastro de ejecución con pasos detallados (iterativos) o metadatos (recursivos/híbridos)
@@ -117,59 +179,15 @@ def analyze_trace(payload: TraceRequest = Body(...)) -> Dict[str, Any]:
     Author: Juan Camilo Cruz Parra (@Cruz1122)
     """
     try:
-        # 1) Parsear el código fuente
-        parse_result = parse_source(payload.source)
-        if not parse_result.get("ok", False):
-            return {
-                "ok": False,
-                "errors": parse_result.get("errors", [])
-            }
-        
-        ast = parse_result.get("ast")
-        if not ast:
-            return {
-                "ok": False,
-                "errors": [{"message": "No se pudo obtener el AST del código", "line": None, "column": None}]
-            }
-        
-        # 2) Clasificar el algoritmo
-        classification_result = classify_algo(ast=ast)
-        algorithm_kind = classification_result.get("kind", "unknown")
-        
-        # 3) Determinar si construir trace detallado
-        is_recursive_or_hybrid = algorithm_kind in ["recursive", "hybrid"]
-        
-        # 4) Ejecutar y generar rastro
-        if is_recursive_or_hybrid:
-            # Para recursivos/híbridos: no construir trace detallado
-            # Solo devolver metadatos básicos
-            return {
-                "ok": True,
-                "algorithmKind": algorithm_kind,
-                "trace": None,
-                "metadata": {
-                    "pseudocode": payload.source,
-                    "inputSize": payload.input_size,
-                    "case": payload.case,
-                    "message": "Para algoritmos recursivos e híbridos, el diagrama se genera en el frontend mediante LLM"
-                }
-            }
-        else:
-            # Para iterativos: trace completo como siempre
-            executor = CodeExecutor(
-                ast, 
-                payload.input_size, 
-                payload.case,
-                initial_variables=payload.initial_variables
-            )
-            trace = executor.execute()
-            
-            return {
-                "ok": True,
-                "trace": trace,
-                "algorithmKind": algorithm_kind
-            }
-        
+        return await trace_program_async(
+            source=payload.source,
+            program_id=payload.program_id,
+            input_size=payload.input_size,
+            case=payload.case,
+            initial_variables=payload.initial_variables
+        )
+    except EngineError:
+        raise
     except Exception as e:
         return {
             "ok": False,
@@ -2,7 +2,18 @@
 Modelos Pydantic para el módulo de analysis.
 """
 from typing import Any, Dict, List, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, model_validator
+
+
+class ProgramRequest(BaseModel):
+    source: Optional[str] = None
+    program_id: Optional[str] = None  # programId devuelto por una llamada anterior
+
+    @model_validator(mode="after")
+    def _require_program(self):
+        if self.source is None and self.program_id is None:
+            raise ValueError("Se requiere 'source' o 'program_id'")
+        return self
 
 
 class AvgModelConfig(BaseModel):
@@ -10,8 +21,7 @@ class AvgModelConfig(BaseModel):
     predicates: Optional[Dict[str, str]] = None  # ej: {"A[j] > A[j+1]": "1/2"}
 
 
-class AnalyzeRequest(BaseModel):
-    source: str
+class AnalyzeRequest(ProgramRequest):
     mode: str = "worst"  # "worst" | "best" | "avg" | "all"
     api_key: Optional[str] = None  # API Key de Gemini (opcional)
     avgModel: Optional[AvgModelConfig] = None  # Modelo probabilístico para caso promedio
@@ -19,6 +29,15 @@ class AnalyzeRequest(BaseModel):
     preferred_method: Optional[str] = None  # "characteristic_equation" | "iteration" | "recursion_tree" | "master"
 
 
+class BatchAnalyzeItem(AnalyzeRequest):
+    id: Optional[str] = None  # Identificador del cliente (se devuelve en la línea del resultado)
+
+
+class BatchAnalyzeRequest(BaseModel):
+    items: List[BatchAnalyzeItem]
+    concurrency: Optional[int] = None  # Análisis simultáneos (por defecto, los workers del motor)
+
+
 class LineCost(BaseModel):
     line: int
     kind: str  # "assign" | "if" | "for" | "while" | "repeat" | "call" | "return" | "decl" | "other"
@@ -39,8 +58,7 @@ class AnalyzeError(BaseModel):
     errors: List[Dict[str, Any]]
 
 
-class TraceRequest(BaseModel):
-    source: str
+class TraceRequest(ProgramRequest):
     case: str = "worst"  # "worst" | "best" | "avg"
     input_size: Optional[int] = None  # Tamaño de entrada concreto (ej: n=4)
     initial_variables: Optional[Dict[str, Any]] = None  # Variables iniciales (ej: arrays)
@@ -3,36 +3,218 @@ Servicio de análisis de algoritmos.
 
 Author: Juan Camilo Cruz Parra (@Cruz1122)
 """
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional, Tuple
+from starlette.concurrency import run_in_threadpool
+from ...core.config import get_analysis_deadline
+from ...core.engine import EngineError, get_engine
 from .analyzers.registry import AnalyzerRegistry
 from .analyzers.iterative import IterativeAnalyzer
 from .analyzers.recursive import RecursiveAnalyzer
 from .analyzers.dummy import create_dummy_analysis
+from .cache import analysis_key, get_analysis_cache, program_analysis_key
+from .cases import analyze_cases
+from .programs import ProgramHandle, get_program_store
 from ..classification.classifier import detect_algorithm_kind
+from ..execution.executor import CodeExecutor
+from ..parsing.cache import source_key
 from ..parsing.service import parse_source
+from ..shared.deadline import DeadlineExceeded, deadline_after, deadline_scope
+from ..shared.metrics import label_phases, merge_phases, phase, timed
+
+
+def load_program(
+    source: Optional[str] = None,
+    program_id: Optional[str] = None
+) -> Tuple[Optional[ProgramHandle], Optional[Dict[str, Any]]]:
+    """
+    Obtiene el programa preparado (AST, índice y memo) por id o por código.
+    
+    Con program_id se reutiliza el handle guardado; si expiró y no se envió el
+    código, se devuelve un error con programExpired=True. Con source se busca el
+    handle del mismo código y, si no existe, se parsea y se guarda uno nuevo.
+    
+    Los errores de parseo se guardan en la caché de análisis (operación "load",
+    con los demás resultados fallidos): reenviar el mismo código inválido no lo
+    vuelve a parsear.
+    
+    Args:
+        source: Código fuente (opcional si se envía program_id)
+        program_id: Identificador devuelto en programId por una llamada anterior
+        
+    Returns:
+        Tupla (programa, None) o (None, diccionario de error)
+        
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+    store = get_program_store()
+    program = store.get(program_id) if program_id else None
+    if program is None and source is None:
+        if program_id:
+            return None, {
+                "ok": False,
+                "programExpired": True,
+                "errors": [{"message": "Programa desconocido o expirado: reenviar 'source'", "line": None, "column": None}]
+            }
+        return None, _missing_program_error()
+    
+    if program is None:
+        key = source_key(source)
+        program = store.get(key)
+        if program is None:
+            failure_key = analysis_key("load", source)
+            failure = get_analysis_cache().get(failure_key)
+            if failure is not None:
+                return None, failure
+            
+            parse_result = parse_source(source)
+            ast = parse_result.get("ast")
+            if not parse_result.get("ok", False):
+                failure = {
+                    "ok": False,
+                    "errors": parse_result.get("errors", [])
+                }
+            elif not ast:
+                failure = {
+                    "ok": False,
+                    "errors": [{"message": "No se pudo obtener el AST del código", "line": None, "column": None}]
+                }
+            if failure is not None:
+                get_analysis_cache().put(failure_key, failure)
+                return None, failure
+            program = ProgramHandle(key, source, ast)
+            store.put(program)
+    
+    program.activate()
+    return program, None
+
+
+def _missing_program_error() -> Dict[str, Any]:
+    """Error de una petición sin 'source' ni 'program_id'."""
+    return {
+        "ok": False,
+        "errors": [{"message": "Se requiere 'source' o 'program_id'", "line": None, "column": None}]
+    }
+
+
+def program_kind(program: ProgramHandle) -> str:
+    """
+    Devuelve el tipo de algoritmo del programa, detectándolo una sola vez.
+    
+    Args:
+        program: Programa obtenido con load_program
+        
+    Returns:
+        "iterative", "recursive", "hybrid" o "unknown"
+        
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+    if program.kind is None:
+        with phase("classify"):
+            program.kind = detect_algorithm_kind(program.ast, program.index)
+    return program.kind
+
+
+def _cached_result(
+    operation: str,
+    source: Optional[str],
+    program_id: Optional[str],
+    *key_args: Any
+) -> Tuple[Optional[ProgramHandle], Optional[str], Optional[Dict[str, Any]]]:
+    """
+    Carga el programa y busca el resultado de la operación en la caché de análisis.
+    
+    Returns:
+        (programa, clave, resultado cacheado o None), o (None, None, error) si el
+        programa no se pudo cargar
+    """
+    program, error = load_program(source, program_id)
+    if error is not None:
+        return None, None, error
+    key = analysis_key(operation, program.source, *key_args)
+    return program, key, get_analysis_cache().get(key)
+
+
+async def _run_in_engine(
+    operation: str,
+    source: Optional[str],
+    program_id: Optional[str],
+    key_args: Tuple[Any, ...],
+    fn: Callable[..., Tuple[Optional[str], Dict[str, Any]]],
+    *args: Any
+) -> Dict[str, Any]:
+    """
+    Busca el resultado en la caché y, en un miss, ejecuta la operación en el motor.
+    
+    El proceso principal no parsea: la clave de caché se calcula con el programId
+    (el hash del código, o el program_id recibido). En un miss, fn(source,
+    program_id, *args) carga el programa y ejecuta la operación en el worker del
+    programId (run_on), que es el que guarda su handle; fn devuelve (programId,
+    resultado), con programId None si el programa no se pudo cargar.
+    
+    Args:
+        operation: Operación de la clave de caché ("analyze" o "detect_methods")
+        source: Código fuente (opcional si se envía program_id)
+        program_id: Identificador de un programa ya cargado
+        key_args: Resto de parámetros de la clave (ver program_analysis_key)
+        fn: Función de nivel de módulo que corre en el worker
+        *args: Argumentos de fn después de source y program_id
+        
+    Returns:
+        Resultado de la operación con programId, o el error de carga
+        
+    Raises:
+        EngineError: Si el motor rechaza la petición (cola llena o worker caído)
+    """
+    if source is None and not program_id:
+        return _missing_program_error()
+    cache = get_analysis_cache()
+    if source is not None:
+        failure = await run_in_threadpool(cache.get, analysis_key("load", source))
+        if failure is not None:
+            return failure
+    key_id = source_key(source) if source is not None else program_id
+    key = program_analysis_key(operation, key_id, *key_args)
+    result = await run_in_threadpool(cache.get, key)
+    if result is None:
+        # Las etapas medidas en el worker vuelven con el resultado (ver shared.metrics)
+        (loaded_id, result), phases = await get_engine().run_on(key_id, timed, fn, source, program_id, *args)
+        merge_phases(phases)
+        if loaded_id is None:
+            # El worker ya guardó los errores de parseo en su caché; aquí se
+            # guardan para este proceso (un programa expirado no se guarda)
+            if source is not None and not result.get("programExpired"):
+                await run_in_threadpool(cache.put, analysis_key("load", source), result)
+            return result
+        if not result.get("degraded"):
+            await run_in_threadpool(cache.put, key, result)
+    result["programId"] = key_id
+    return result
 
 
 def analyze_algorithm(
-    source: str,
+    source: Optional[str] = None,
     mode: str = "worst",
     api_key: Optional[str] = None,
     avg_model: Optional[Dict[str, Any]] = None,
     algorithm_kind: Optional[str] = None,
-    preferred_method: Optional[str] = None
+    preferred_method: Optional[str] = None,
+    program_id: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Analiza un algoritmo y devuelve el resultado.
     
     Args:
-        source: Código fuente a analizar
+        source: Código fuente a analizar (opcional si se envía program_id)
         mode: Modo de análisis ("worst", "best", "avg", "all")
         api_key: API Key de Gemini (opcional, mantenido por compatibilidad)
         avg_model: Modelo probabilístico para caso promedio
         algorithm_kind: Tipo de algoritmo (opcional, se detecta automáticamente)
         preferred_method: Método preferido para algoritmos recursivos
+        program_id: Identificador de un programa ya cargado (ver load_program)
         
     Returns:
-        Resultado del análisis con estructura AnalyzeOpenResponse o diccionario con worst/best/avg
+        Resultado del análisis con estructura AnalyzeOpenResponse o diccionario con worst/best/avg,
+        con programId para reutilizar el programa en llamadas siguientes
         
     Author: Juan Camilo Cruz Parra (@Cruz1122)
     
@@ -41,136 +223,76 @@ def analyze_algorithm(
         >>> print(result["ok"])
         True
     """
+    label_phases(mode=mode)
     try:
-        # 1) Parsear el código fuente
-        parse_result = parse_source(source)
-        if not parse_result.get("ok", False):
-            return {
-                "ok": False,
-                "errors": parse_result.get("errors", [])
-            }
-        
-        ast = parse_result.get("ast")
-        if not ast:
-            return {
-                "ok": False,
-                "errors": [{"message": "No se pudo obtener el AST del código", "line": None, "column": None}]
-            }
-        
-        # 2) Determinar el tipo de algoritmo
-        if not algorithm_kind:
-            algorithm_kind = detect_algorithm_kind(ast)
-        
-        # Seleccionar analizador según el tipo
-        analyzer_class = AnalyzerRegistry.get(algorithm_kind)
-        if not analyzer_class:
-            analyzer_class = IterativeAnalyzer
+        program, key, result = _cached_result(
+            "analyze", source, program_id, mode, avg_model, algorithm_kind, preferred_method
+        )
+        if program is None:
+            return result
+        if result is None:
+            expires_at = deadline_after(get_analysis_deadline())
+            result = _analyze_within_deadline(
+                expires_at, program, mode, api_key, avg_model, algorithm_kind, preferred_method
+            )
+            # Los resultados degradados dependen de la carga: no se cachean
+            if not result.get("degraded"):
+                get_analysis_cache().put(key, result)
+    except Exception as e:
+        # Las excepciones no se cachean (pueden ser transitorias)
+        return {
+            "ok": False,
+            "errors": [
+                {
+                    "message": f"Error en análisis: {str(e)}",
+                    "line": None,
+                    "column": None
+                }
+            ]
+        }
+    result["programId"] = program.id
+    return result
+
+
+async def analyze_algorithm_async(
+    source: Optional[str] = None,
+    mode: str = "worst",
+    api_key: Optional[str] = None,
+    avg_model: Optional[Dict[str, Any]] = None,
+    algorithm_kind: Optional[str] = None,
+    preferred_method: Optional[str] = None,
+    program_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Versión de analyze_algorithm para las rutas async.
+    
+    La caché se consulta en un hilo sin parsear el código (ver _run_in_engine);
+    en un miss la carga del programa y el análisis corren en el motor de
+    ejecución (core.engine), en el worker que guarda el handle del programa.
+    
+    Args:
+        Los mismos de analyze_algorithm
         
-        # 3) Determinar si debemos analizar todos los casos
-        analyze_all = mode == "all"
+    Returns:
+        El mismo resultado que analyze_algorithm
         
-        if analyze_all:
-            # Analizar todos los casos (worst, best y avg)
-            analyzer_worst = analyzer_class()
-            analyzer_best = analyzer_class()
-            analyzer_avg = analyzer_class()
-            
-            # Analizar worst y best
-            if isinstance(analyzer_worst, RecursiveAnalyzer) and preferred_method:
-                result_worst = analyzer_worst.analyze(ast, "worst", preferred_method=preferred_method)
-                result_best = analyzer_best.analyze(ast, "best", preferred_method=preferred_method)
-            else:
-                result_worst = analyzer_worst.analyze(ast, "worst")
-                result_best = analyzer_best.analyze(ast, "best")
-            
-            if not result_worst.get("ok", False):
-                return result_worst
-            if not result_best.get("ok", False):
-                return result_best
-            
-            # Preparar avgModel para caso promedio
-            if avg_model:
-                avg_model_dict = avg_model
-            else:
-                avg_model_dict = {"mode": "uniform", "predicates": {}}
-            
-            # Analizar caso promedio
-            if isinstance(analyzer_avg, RecursiveAnalyzer) and preferred_method:
-                result_avg = analyzer_avg.analyze(ast, "avg", api_key=api_key, avg_model=avg_model_dict, preferred_method=preferred_method)
-            else:
-                result_avg = analyzer_avg.analyze(ast, "avg", api_key=api_key, avg_model=avg_model_dict)
-            
-            if not result_avg.get("ok", False):
-                print(f"[analyze_algorithm] Error en análisis promedio: {result_avg.get('errors', [])}")
-                result_avg = None
-            
-            # Verificar variabilidad
-            # Comparar directamente worst, best y avg - si todos tienen la misma T_open y recurrence, no hay variabilidad
-            has_variability = False  # Inicializar como False, solo True si hay diferencias
-            if result_worst.get("ok") and result_best.get("ok"):
-                worst_t_open = result_worst.get("totals", {}).get("T_open", "")
-                best_t_open = result_best.get("totals", {}).get("T_open", "")
-                worst_recurrence = result_worst.get("totals", {}).get("recurrence")
-                best_recurrence = result_best.get("totals", {}).get("recurrence")
-                
-                # Si T_open o recurrence son diferentes entre worst y best, hay variabilidad
-                if worst_t_open != best_t_open or worst_recurrence != best_recurrence:
-                    has_variability = True
-                else:
-                    # Worst y best son iguales, verificar avg si existe
-                    if result_avg and result_avg.get("ok"):
-                        avg_t_open = result_avg.get("totals", {}).get("T_open", "")
-                        avg_recurrence = result_avg.get("totals", {}).get("recurrence")
-                        # Si avg es diferente de worst/best, hay variabilidad
-                        if (avg_t_open != worst_t_open or avg_recurrence != worst_recurrence):
-                            has_variability = True
-                        # Si avg también es igual, NO hay variabilidad (todos los casos son iguales)
-                        else:
-                            has_variability = False
-                    else:
-                        # No hay avg, worst y best son iguales - NO hay variabilidad
-                        has_variability = False
-            
-            # Construir respuesta
-            if not has_variability:
-                response = {
-                    "ok": True,
-                    "has_case_variability": False,
-                    "worst": result_worst,
-                    "best": "same_as_worst",
-                    "avg": "same_as_worst" if result_avg else None
-                }
-            else:
-                response = {
-                    "ok": True,
-                    "has_case_variability": True,
-                    "worst": result_worst,
-                    "best": result_best
-                }
-                if result_avg:
-                    response["avg"] = result_avg
-            
-            return response
-        else:
-            # Analizar solo el caso solicitado
-            analyzer = analyzer_class()
-            
-            # Preparar avgModel si mode == "avg"
-            if mode == "avg" and avg_model:
-                avg_model_dict = avg_model
-            elif mode == "avg":
-                avg_model_dict = {"mode": "uniform", "predicates": {}}
-            else:
-                avg_model_dict = None
-            
-            # Ejecutar análisis
-            if isinstance(analyzer, RecursiveAnalyzer) and preferred_method:
-                result = analyzer.analyze(ast, mode, api_key=api_key, avg_model=avg_model_dict, preferred_method=preferred_method)
-            else:
-                result = analyzer.analyze(ast, mode, api_key=api_key, avg_model=avg_model_dict)
-            return result
+    Raises:
+        EngineError: Si el motor rechaza la petición (cola llena o worker caído)
         
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+    # El plazo cuenta desde que llega la petición (incluye la espera en la cola)
+    expires_at = deadline_after(get_analysis_deadline())
+    label_phases(mode=mode)
+    try:
+        return await _run_in_engine(
+            "analyze", source, program_id, (mode, avg_model, algorithm_kind, preferred_method),
+            _analyze_program, mode, api_key, avg_model, algorithm_kind, preferred_method, expires_at
+        )
+    except EngineError:
+        raise
     except Exception as e:
+        # Las excepciones no se cachean (pueden ser transitorias)
         return {
             "ok": False,
             "errors": [
@@ -183,19 +305,196 @@ def analyze_algorithm(
         }
 
 
+def _analyze_program(
+    source: Optional[str],
+    program_id: Optional[str],
+    mode: str,
+    api_key: Optional[str],
+    avg_model: Optional[Dict[str, Any]],
+    algorithm_kind: Optional[str],
+    preferred_method: Optional[str],
+    expires_at: Optional[float] = None
+) -> Tuple[Optional[str], Dict[str, Any]]:
+    """Carga y analiza un programa, sin caché. Corre en el motor de ejecución."""
+    program, error = load_program(source, program_id)
+    if error is not None:
+        return None, error
+    return program.id, _analyze_within_deadline(
+        expires_at, program, mode, api_key, avg_model, algorithm_kind, preferred_method
+    )
+
+
+def _analyze_within_deadline(
+    expires_at: Optional[float],
+    program: ProgramHandle,
+    mode: str,
+    api_key: Optional[str],
+    avg_model: Optional[Dict[str, Any]],
+    algorithm_kind: Optional[str],
+    preferred_method: Optional[str]
+) -> Dict[str, Any]:
+    """
+    Ejecuta _analyze_algorithm dentro del plazo de la petición (ver shared.deadline).
+    
+    Si el plazo se agota durante SymPy, los analizadores devuelven el mejor
+    resultado parcial con degraded=True; si se agota en otra etapa, se devuelve
+    un error también marcado como degradado.
+    """
+    try:
+        with deadline_scope(expires_at):
+            return _analyze_algorithm(program, mode, api_key, avg_model, algorithm_kind, preferred_method)
+    except DeadlineExceeded:
+        return {
+            "ok": False,
+            "degraded": True,
+            "errors": [{"message": "Tiempo de análisis agotado", "line": None, "column": None}]
+        }
+
+
+def _analyze_algorithm(
+    program: ProgramHandle,
+    mode: str,
+    api_key: Optional[str],
+    avg_model: Optional[Dict[str, Any]],
+    algorithm_kind: Optional[str],
+    preferred_method: Optional[str]
+) -> Dict[str, Any]:
+    """Cuerpo de analyze_algorithm, sin caché ni manejo de excepciones."""
+    # 1) Programa ya parseado e indexado (compartido por clasificador y analizadores)
+    ast = program.ast
+    
+    # 2) Determinar el tipo de algoritmo
+    if not algorithm_kind:
+        algorithm_kind = program_kind(program)
+    label_phases(kind=algorithm_kind)
+    
+    # Seleccionar analizador según el tipo
+    analyzer_class = AnalyzerRegistry.get(algorithm_kind)
+    if not analyzer_class:
+        analyzer_class = IterativeAnalyzer
+    
+    # 3) Determinar si debemos analizar todos los casos
+    analyze_all = mode == "all"
+    
+    if analyze_all:
+        # Analizar todos los casos (worst, best y avg)
+        if issubclass(analyzer_class, RecursiveAnalyzer) and preferred_method:
+            extra = {"preferred_method": preferred_method}
+        else:
+            extra = {}
+        
+        # Preparar avgModel para caso promedio
+        if avg_model:
+            avg_model_dict = avg_model
+        else:
+            avg_model_dict = {"mode": "uniform", "predicates": {}}
+        
+        results = analyze_cases(analyzer_class, ast, {
+            "worst": extra,
+            "best": extra,
+            "avg": {"api_key": api_key, "avg_model": avg_model_dict, **extra},
+        })
+        result_worst = results["worst"]
+        result_best = results["best"]
+        result_avg = results["avg"]
+        
+        if not result_worst.get("ok", False):
+            return result_worst
+        if not result_best.get("ok", False):
+            return result_best
+        
+        if not result_avg.get("ok", False):
+            print(f"[analyze_algorithm] Error en análisis promedio: {result_avg.get('errors', [])}")
+            result_avg = None
+        
+        # Verificar variabilidad
+        # Comparar directamente worst, best y avg - si todos tienen la misma T_open y recurrence, no hay variabilidad
+        has_variability = False  # Inicializar como False, solo True si hay diferencias
+        if result_worst.get("ok") and result_best.get("ok"):
+            worst_t_open = result_worst.get("totals", {}).get("T_open", "")
+            best_t_open = result_best.get("totals", {}).get("T_open", "")
+            worst_recurrence = result_worst.get("totals", {}).get("recurrence")
+            best_recurrence = result_best.get("totals", {}).get("recurrence")
+            
+            # Si T_open o recurrence son diferentes entre worst y best, hay variabilidad
+            if worst_t_open != best_t_open or worst_recurrence != best_recurrence:
+                has_variability = True
+            else:
+                # Worst y best son iguales, verificar avg si existe
+                if result_avg and result_avg.get("ok"):
+                    avg_t_open = result_avg.get("totals", {}).get("T_open", "")
+                    avg_recurrence = result_avg.get("totals", {}).get("recurrence")
+                    # Si avg es diferente de worst/best, hay variabilidad
+                    if (avg_t_open != worst_t_open or avg_recurrence != worst_recurrence):
+                        has_variability = True
+                    # Si avg también es igual, NO hay variabilidad (todos los casos son iguales)
+                    else:
+                        has_variability = False
+                else:
+                    # No hay avg, worst y best son iguales - NO hay variabilidad
+                    has_variability = False
+        
+        # Construir respuesta
+        if not has_variability:
+            response = {
+                "ok": True,
+                "has_case_variability": False,
+                "worst": result_worst,
+                "best": "same_as_worst",
+                "avg": "same_as_worst" if result_avg else None
+            }
+        else:
+            response = {
+                "ok": True,
+                "has_case_variability": True,
+                "worst": result_worst,
+                "best": result_best
+            }
+            if result_avg:
+                response["avg"] = result_avg
+        
+        # Algún caso se cortó por el plazo: la respuesta completa es parcial
+        if any(case and case.get("degraded") for case in (result_worst, result_best, result_avg)):
+            response["degraded"] = True
+        
+        return response
+    else:
+        # Analizar solo el caso solicitado
+        analyzer = analyzer_class()
+        
+        # Preparar avgModel si mode == "avg"
+        if mode == "avg" and avg_model:
+            avg_model_dict = avg_model
+        elif mode == "avg":
+            avg_model_dict = {"mode": "uniform", "predicates": {}}
+        else:
+            avg_model_dict = None
+        
+        # Ejecutar análisis
+        if isinstance(analyzer, RecursiveAnalyzer) and preferred_method:
+            result = analyzer.analyze(ast, mode, api_key=api_key, avg_model=avg_model_dict, preferred_method=preferred_method)
+        else:
+            result = analyzer.analyze(ast, mode, api_key=api_key, avg_model=avg_model_dict)
+        return result
+    
+
+
 def detect_methods(
-    source: str,
-    algorithm_kind: Optional[str] = None
+    source: Optional[str] = None,
+    algorithm_kind: Optional[str] = None,
+    program_id: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Detecta qué métodos de análisis son aplicables para un algoritmo recursivo.
     
     Args:
-        source: Código fuente a analizar
+        source: Código fuente a analizar (opcional si se envía program_id)
         algorithm_kind: Tipo de algoritmo (opcional, se detecta automáticamente)
+        program_id: Identificador de un programa ya cargado (ver load_program)
         
     Returns:
-        Diccionario con métodos aplicables, método por defecto e información de recurrencia
+        Diccionario con métodos aplicables, método por defecto, información de
+        recurrencia y programId
         
     Author: Juan Camilo Cruz Parra (@Cruz1122)
     
@@ -205,47 +504,56 @@ def detect_methods(
         ['master', 'iteration', 'recursion_tree']
     """
     try:
-        # 1) Parsear el código fuente
-        parse_result = parse_source(source)
-        if not parse_result.get("ok", False):
-            return {
-                "ok": False,
-                "errors": parse_result.get("errors", [])
-            }
-        
-        ast = parse_result.get("ast")
-        if not ast:
-            return {
-                "ok": False,
-                "errors": [{"message": "No se pudo obtener el AST del código", "line": None, "column": None}]
-            }
-        
-        # 2) Determinar el tipo de algoritmo
-        if not algorithm_kind:
-            algorithm_kind = detect_algorithm_kind(ast)
-        
-        # Solo detectar métodos para algoritmos recursivos
-        if algorithm_kind not in ["recursive", "hybrid"]:
-            return {
-                "ok": False,
-                "errors": [{"message": "Este endpoint solo es para algoritmos recursivos", "line": None, "column": None}]
-            }
-        
-        # 3) Usar RecursiveAnalyzer para detectar métodos aplicables
-        analyzer = RecursiveAnalyzer()
-        applicable_methods = analyzer.detect_applicable_methods(ast)
-        
-        if not applicable_methods.get("ok", False):
-            return applicable_methods
-        
+        program, key, result = _cached_result("detect_methods", source, program_id, None, None, algorithm_kind)
+        if program is None:
+            return result
+        if result is None:
+            result = _detect_methods(program, algorithm_kind)
+            get_analysis_cache().put(key, result)
+    except Exception as e:
+        # Las excepciones no se cachean (pueden ser transitorias)
         return {
-            "ok": True,
-            "applicable_methods": applicable_methods.get("applicable_methods", []),
-            "default_method": applicable_methods.get("default_method"),
-            "recurrence_info": applicable_methods.get("recurrence_info")
+            "ok": False,
+            "errors": [
+                {
+                    "message": f"Error detectando métodos: {str(e)}",
+                    "line": None,
+                    "column": None
+                }
+            ]
         }
+    result["programId"] = program.id
+    return result
+
+
+async def detect_methods_async(
+    source: Optional[str] = None,
+    algorithm_kind: Optional[str] = None,
+    program_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Versión de detect_methods para las rutas async (ver analyze_algorithm_async).
+    
+    Args:
+        Los mismos de detect_methods
+        
+    Returns:
+        El mismo resultado que detect_methods
         
+    Raises:
+        EngineError: Si el motor rechaza la petición (cola llena o worker caído)
+        
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+    try:
+        return await _run_in_engine(
+            "detect_methods", source, program_id, (None, None, algorithm_kind),
+            _detect_program, algorithm_kind
+        )
+    except EngineError:
+        raise
     except Exception as e:
+        # Las excepciones no se cachean (pueden ser transitorias)
         return {
             "ok": False,
             "errors": [
@@ -257,3 +565,134 @@ def detect_methods(
             ]
         }
 
+
+def _detect_program(
+    source: Optional[str],
+    program_id: Optional[str],
+    algorithm_kind: Optional[str]
+) -> Tuple[Optional[str], Dict[str, Any]]:
+    """Carga un programa y detecta sus métodos, sin caché. Corre en el motor de ejecución."""
+    program, error = load_program(source, program_id)
+    if error is not None:
+        return None, error
+    return program.id, _detect_methods(program, algorithm_kind)
+
+
+def _detect_methods(program: ProgramHandle, algorithm_kind: Optional[str]) -> Dict[str, Any]:
+    """Cuerpo de detect_methods, sin caché ni manejo de excepciones."""
+    # 1) Programa ya parseado e indexado (compartido por clasificador y analizadores)
+    ast = program.ast
+    
+    # 2) Determinar el tipo de algoritmo
+    if not algorithm_kind:
+        algorithm_kind = program_kind(program)
+    label_phases(kind=algorithm_kind)
+    
+    # Solo detectar métodos para algoritmos recursivos
+    if algorithm_kind not in ["recursive", "hybrid"]:
+        return {
+            "ok": False,
+            "errors": [{"message": "Este endpoint solo es para algoritmos recursivos", "line": None, "column": None}]
+        }
+    
+    # 3) Usar RecursiveAnalyzer para detectar métodos aplicables
+    analyzer = RecursiveAnalyzer()
+    applicable_methods = analyzer.detect_applicable_methods(ast)
+    
+    if not applicable_methods.get("ok", False):
+        return applicable_methods
+    
+    return {
+        "ok": True,
+        "applicable_methods": applicable_methods.get("applicable_methods", []),
+        "default_method": applicable_methods.get("default_method"),
+        "recurrence_info": applicable_methods.get("recurrence_info")
+    }
+
+
+async def trace_program_async(
+    source: Optional[str] = None,
+    program_id: Optional[str] = None,
+    input_size: Optional[int] = None,
+    case: str = "worst",
+    initial_variables: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Genera el rastro de ejecución en el motor, en el worker del programId (ver
+    _run_in_engine), sin parsear en el proceso principal.
+    
+    Args:
+        Los mismos de trace_program
+        
+    Returns:
+        El mismo resultado que trace_program
+        
+    Raises:
+        EngineError: Si el motor rechaza la petición (cola llena o worker caído)
+        
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+    if source is None and not program_id:
+        return _missing_program_error()
+    key_id = source_key(source) if source is not None else program_id
+    result, phases = await get_engine().run_on(
+        key_id, timed, trace_program, source, program_id, input_size, case, initial_variables
+    )
+    merge_phases(phases)
+    return result
+
+
+def trace_program(
+    source: Optional[str] = None,
+    program_id: Optional[str] = None,
+    input_size: Optional[int] = None,
+    case: str = "worst",
+    initial_variables: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Genera el rastro de ejecución paso a paso de un programa.
+    
+    Para algoritmos iterativos devuelve el rastro completo; para recursivos e
+    híbridos, solo metadatos (el diagrama se genera en el frontend). Corre en el
+    motor de ejecución (ver /analyze/trace).
+    
+    Args:
+        source: Código fuente (opcional si se envía program_id)
+        program_id: Identificador de un programa ya cargado (ver load_program)
+        input_size: Tamaño de entrada concreto
+        case: Caso a simular ("worst", "best", "avg")
+        initial_variables: Variables iniciales (ej: arrays)
+        
+    Returns:
+        Diccionario con ok, trace (o metadata), algorithmKind y programId, o el
+        error de carga del programa
+        
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+    program, error = load_program(source, program_id)
+    if error is not None:
+        return error
+    algorithm_kind = program_kind(program)
+    
+    if algorithm_kind in ["recursive", "hybrid"]:
+        # Para recursivos/híbridos: no construir trace detallado
+        return {
+            "ok": True,
+            "algorithmKind": algorithm_kind,
+            "programId": program.id,
+            "trace": None,
+            "metadata": {
+                "pseudocode": program.source,
+                "inputSize": input_size,
+                "case": case,
+                "message": "Para algoritmos recursivos e híbridos, el diagrama se genera en el frontend mediante LLM"
+            }
+        }
+    
+    executor = CodeExecutor(program.ast, input_size, case, initial_variables=initial_variables)
+    return {
+        "ok": True,
+        "trace": executor.execute(),
+        "algorithmKind": algorithm_kind,
+        "programId": program.id
+    }
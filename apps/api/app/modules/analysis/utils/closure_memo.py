@@ -0,0 +1,133 @@
+from typing import Any, Callable, Dict, List, Tuple, Union
+from sympy import Expr, latex, simplify
+from ...shared.deadline import interruptible
+
+
+class ClosureMemo:
+    """
+    Memo de cierres de sumatorias y simplificaciones, indexado por expresión.
+
+    Cerrar sumatorias, evaluarlas y simplificar con SymPy es casi todo el costo
+    del análisis iterativo, y las mismas expresiones se repiten: entre filas, entre
+    el cierre de filas y el cálculo de T_polynomial, y sobre todo entre los casos
+    worst, best y avg de mode="all", que solo difieren en las filas que dependen
+    del caso (ramas de IF, early return, probabilidades). Todas estas operaciones
+    son funciones puras de la expresión, así que un mismo memo compartido por los
+    analizadores de los tres casos cierra una sola vez cada sumatoria común.
+
+    Las expresiones de SymPy son inmutables y se comparan por estructura (incluidas
+    las suposiciones de los símbolos), por lo que sirven directamente como clave.
+
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+
+    def __init__(self):
+        """
+        Inicializa un memo vacío.
+
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        self._entries: Dict[Tuple[str, Any], Any] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, operation: str, key: Any, compute: Callable[[], Any]) -> Any:
+        """
+        Devuelve el resultado memorizado de una operación o lo calcula.
+
+        El cálculo se corta si se agota el plazo del análisis (ver
+        shared.deadline); en ese caso no se memoriza nada.
+
+        Args:
+            operation: Nombre de la operación (forma parte de la clave)
+            key: Argumentos de la operación (hashables)
+            compute: Función sin argumentos que calcula el resultado
+
+        Returns:
+            Resultado de la operación
+
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        entry_key = (operation, key)
+        try:
+            if entry_key in self._entries:
+                self.hits += 1
+                return self._entries[entry_key]
+        except TypeError:
+            # Clave no hashable: calcular sin memorizar
+            return interruptible(compute)
+        self.misses += 1
+        result = interruptible(compute)
+        self._entries[entry_key] = result
+        return result
+
+    def close_summation(self, closer: Any, expr: Union[str, Expr], variable: str = "n") -> Tuple[str, List[str]]:
+        """
+        SummationCloser.close_summation memorizado.
+
+        Args:
+            closer: Instancia de SummationCloser
+            expr: Expresión SymPy o LaTeX a cerrar
+            variable: Variable principal
+
+        Returns:
+            (expresión cerrada en LaTeX, pasos); la lista de pasos es una copia
+
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        closed, steps = self.get("close", (expr, variable), lambda: closer.close_summation(expr, variable))
+        return closed, list(steps)
+
+    def evaluate_sums(self, closer: Any, expr: Expr) -> Expr:
+        """
+        SummationCloser._evaluate_all_sums_sympy memorizado.
+
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        return self.get("evaluate", expr, lambda: closer._evaluate_all_sums_sympy(expr))
+
+    def simplify(self, expr: Expr) -> Expr:
+        """
+        sympy.simplify memorizado.
+
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        return self.get("simplify", expr, lambda: simplify(expr))
+
+    def latex(self, expr: Any) -> str:
+        """
+        sympy.latex memorizado: cada expresión distinta se renderiza una sola vez
+        aunque aparezca en varias filas, en los procedimientos o en otro caso.
+
+        A diferencia de las demás operaciones no se corta por el plazo: se usa al
+        serializar el resultado, también el de un análisis degradado.
+
+        Args:
+            expr: Expresión SymPy (u otro valor de una fila)
+
+        Returns:
+            LaTeX de la expresión (str(expr) si SymPy no puede renderizarla)
+
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        entry_key = ("latex", expr)
+        try:
+            cached = self._entries.get(entry_key)
+        except TypeError:
+            return _render_latex(expr)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        self.misses += 1
+        rendered = self._entries[entry_key] = _render_latex(expr)
+        return rendered
+
+
+def _render_latex(expr: Any) -> str:
+    try:
+        rendered = latex(expr)
+        # Asegurar que sea un string
+        return rendered if isinstance(rendered, str) else str(rendered)
+    except Exception as e:
+        print(f"[ClosureMemo] Error convirtiendo {type(expr).__name__} a LaTeX: {e}")
+        return str(expr)
@@ -2,6 +2,8 @@ from sympy import Symbol, sympify, latex, oo, log, exp, Expr
 from sympy import Poly
 from sympy.polys.polytools import LC, LM
 import re
+from typing import Dict
+from ...shared.deadline import interruptible
 
 
 class ComplexityClasses:
@@ -44,24 +46,71 @@ class ComplexityClasses:
         try:
             # Convertir a SymPy
             expr = self._parse_polynomial(polynomial, variable)
-            
-            # Expandir la expresión antes de extraer el término dominante
-            # NO usar simplify() aquí porque puede factorizar la expresión
-            # Esto evita problemas cuando SymPy factoriza expresiones como n^3 + n^2 + n -> n*(n**2 + n + 1)
-            from sympy import expand
-            # Expandir la expresión para asegurar que esté en forma de suma de términos
-            expr = expand(expr)
-            
-            # Extraer término dominante
-            dominant = self._extract_dominant_sympy(expr, variable)
-            
-            # Convertir a LaTeX
-            result = self._sympy_to_latex(dominant)
-            return result
+            return self._dominant_latex(expr, variable)
         except Exception as e:
             print(f"[ComplexityClasses] Error extrayendo término dominante de {polynomial}: {e}")
             return polynomial
     
+    def classify_expr(self, expr: Expr, variable: str = "n") -> Dict[str, str]:
+        """
+        Calcula O, Ω y Θ de una expresión SymPy con una sola extracción del
+        término dominante, sin pasar por LaTeX.
+        
+        Args:
+            expr: Expresión SymPy (p. ej. T_open ya simplificado)
+            variable: Variable principal
+            
+        Returns:
+            Diccionario {"big_o", "big_omega", "big_theta"} en formato LaTeX
+            (ej: {"big_o": "O(n^{2})", ...})
+            
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        try:
+            dominant = self._dominant_latex(sympify(expr), variable)
+        except Exception as e:
+            print(f"[ComplexityClasses] Error extrayendo término dominante de {expr}: {e}")
+            dominant = self._sympy_to_latex(expr)
+        return {
+            "big_o": f"O({dominant})",
+            "big_omega": f"\\Omega({dominant})",
+            "big_theta": f"\\Theta({dominant})",
+        }
+    
+    def _dominant_latex(self, expr: Expr, variable: str = "n") -> str:
+        """
+        Término dominante de una expresión SymPy, en formato LaTeX.
+        
+        Args:
+            expr: Expresión SymPy
+            variable: Variable principal
+            
+        Returns:
+            Término dominante en formato LaTeX
+            
+        Raises:
+            ValueError: Si la expresión contiene constantes C_k
+            DeadlineExceeded: Si se agota el plazo del análisis
+            
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        # Con constantes C_k es T_polynomial, no T_open simplificado
+        if any(str(sym).startswith("C_") for sym in expr.free_symbols):
+            raise ValueError(f"Expresión contiene constantes C_k: {expr}")
+        
+        # Expandir la expresión antes de extraer el término dominante
+        # NO usar simplify() aquí porque puede factorizar la expresión
+        # Esto evita problemas cuando SymPy factoriza expresiones como n^3 + n^2 + n -> n*(n**2 + n + 1)
+        from sympy import expand
+        # Expandir la expresión para asegurar que esté en forma de suma de términos
+        expr = expand(expr)
+        
+        # Extraer término dominante (se corta si se agota el plazo del análisis)
+        dominant = interruptible(self._extract_dominant_sympy, expr, variable)
+        
+        # Convertir a LaTeX
+        return self._sympy_to_latex(dominant)
+    
     def calculate_big_o(self, polynomial: str, variable: str = "n") -> str:
         """
         Calcula O(f(n)) para una expresión.
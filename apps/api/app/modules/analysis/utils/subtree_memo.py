@@ -0,0 +1,354 @@
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+from ....core.config import get_subtree_memo_size
+from ...shared.program_index import ProgramIndex
+from ...shared.types import LineCost
+
+# Tipos cuyo análisis depende de la línea absoluta: los símbolos t_{while_L} y
+# las notas de la condición llevan la línea del bucle, y la cota se busca en el
+# bloque que lo contiene. Sus subárboles no se reubican ni se comparten.
+_POSITIONAL_TYPES = frozenset({"While", "Repeat"})
+
+_CK_PATTERN = re.compile(r"C_\{(\d+)\}")
+
+# Clave de ProgramIndex.derived con los hashes de todos los nodos del programa
+_DERIVED_KEY = "structural_hashes"
+
+
+class SubtreeInfo(NamedTuple):
+    """
+    Hash estructural de un subárbol y el rango de líneas que ocupa.
+
+    - digest: hash del subárbol sin posiciones absolutas (los identificadores y
+      literales sí cuentan, y también la disposición relativa de las líneas)
+    - first_line / last_line: primera y última línea del subárbol (None si
+      ningún nodo tiene línea)
+    - portable: False si el subárbol contiene nodos cuyo análisis depende de la
+      línea absoluta (While, Repeat)
+
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+
+    digest: str
+    first_line: Optional[int]
+    last_line: Optional[int]
+    portable: bool
+
+
+def _node_line(node: Dict[str, Any]) -> Optional[int]:
+    pos = node.get("pos")
+    line = pos.get("line") if isinstance(pos, dict) else None
+    # El parser deja línea 0 en las expresiones sin posición propia
+    return line if isinstance(line, int) and line > 0 else None
+
+
+def structural_hash(node: Dict[str, Any], cache: Optional[Dict[int, SubtreeInfo]] = None) -> SubtreeInfo:
+    """
+    Calcula el hash estructural (tipo Merkle) de un subárbol del AST.
+
+    El hash de cada nodo combina su tipo, sus campos escalares y el hash de cada
+    hijo junto con el desplazamiento de la primera línea del hijo respecto a la
+    del nodo. Así dos subárboles iguales en distintas posiciones del programa (o
+    en distintos programas) tienen el mismo hash, y uno con otra disposición de
+    líneas no. Los While y Repeat conservan además su línea absoluta.
+
+    Args:
+        node: Nodo del AST
+        cache: Diccionario id(nodo) -> SubtreeInfo donde guardar el resultado de
+            cada nodo visitado (solo para nodos que siguen vivos, ver tree_hashes)
+
+    Returns:
+        SubtreeInfo del subárbol
+
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+    if cache is not None:
+        cached = cache.get(id(node))
+        if cached is not None:
+            return cached
+
+    node_type = node.get("type")
+    own_line = _node_line(node)
+    portable = node_type not in _POSITIONAL_TYPES
+    lines = [own_line] if own_line is not None else []
+    fields: List[Tuple[str, Any]] = []
+
+    def child(value: Dict[str, Any]) -> SubtreeInfo:
+        nonlocal portable
+        info = structural_hash(value, cache)
+        portable = portable and info.portable
+        if info.first_line is not None:
+            lines.append(info.first_line)
+            lines.append(info.last_line)
+        return info
+
+    for key in sorted(node):
+        if key == "pos":
+            continue
+        value = node[key]
+        if isinstance(value, dict):
+            fields.append((key, child(value)))
+        elif isinstance(value, list):
+            fields.append((key, [child(item) if isinstance(item, dict) else repr(item) for item in value]))
+        else:
+            fields.append((key, repr(value)))
+
+    first_line = min(lines) if lines else None
+    last_line = max(lines) if lines else None
+
+    def relative(info: Any) -> Any:
+        if not isinstance(info, SubtreeInfo):
+            return info
+        offset = info.first_line - first_line if info.first_line is not None else None
+        return (info.digest, offset)
+
+    parts = [
+        node_type,
+        own_line - first_line if own_line is not None else None,
+        [(key, [relative(item) for item in value] if isinstance(value, list) else relative(value))
+         for key, value in fields],
+    ]
+    if node_type in _POSITIONAL_TYPES:
+        parts.append(first_line)
+
+    digest = hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=16).hexdigest()
+    info = SubtreeInfo(digest, first_line, last_line, portable)
+    if cache is not None:
+        cache[id(node)] = info
+    return info
+
+
+def tree_hashes(index: ProgramIndex) -> Dict[int, SubtreeInfo]:
+    """
+    Devuelve los hashes estructurales de todos los nodos del programa,
+    calculándolos en una sola pasada la primera vez.
+
+    Se guardan en index.derived: el índice mantiene vivo el AST, así que los id
+    de sus nodos no se reutilizan, y el handle del programa los conserva entre
+    peticiones.
+
+    Args:
+        index: Índice del programa
+
+    Returns:
+        id(nodo) -> SubtreeInfo para cada nodo (dict) del AST
+
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+    hashes = index.derived.get(_DERIVED_KEY)
+    if hashes is None:
+        hashes = {}
+        if isinstance(index.ast, dict):
+            structural_hash(index.ast, hashes)
+        index.derived[_DERIVED_KEY] = hashes
+    return hashes
+
+
+class MemoEntry:
+    """
+    Filas producidas por un subárbol, listas para reutilizarse en otra posición.
+
+    Las filas se guardan como un tramo inmutable (tupla de vistas de solo
+    lectura), así que una misma entrada se comparte sin riesgo entre análisis e
+    hilos. Al reutilizarlas (replay) se crean copias con las líneas desplazadas
+    a la primera línea del nuevo subárbol y las constantes C_k renumeradas a
+    partir del contador actual, como si el subárbol se hubiera analizado de
+    nuevo; el analizador cierra sus filas en el lugar, por eso las copias.
+
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+
+    __slots__ = ("rows", "line_offsets", "counter_start", "constants", "relocatable")
+
+    def __init__(
+        self,
+        rows: Sequence[Mapping[str, Any]],
+        line_offsets: Optional[List[Optional[int]]] = None,
+        counter_start: int = 0,
+        constants: int = 0,
+    ):
+        self.rows: Tuple[Mapping[str, Any], ...] = tuple(
+            row if isinstance(row, MappingProxyType) else MappingProxyType(dict(row)) for row in rows
+        )
+        self.line_offsets = line_offsets
+        self.counter_start = counter_start
+        self.constants = constants
+        self.relocatable = line_offsets is not None
+
+    @classmethod
+    def capture(
+        cls,
+        rows: List[LineCost],
+        info: Optional[SubtreeInfo] = None,
+        counter_start: Optional[int] = None,
+        counter_end: int = 0,
+    ) -> Optional["MemoEntry"]:
+        """
+        Crea una entrada a partir de las filas recién producidas por un subárbol.
+
+        Args:
+            rows: Filas agregadas al visitar el subárbol
+            info: SubtreeInfo del subárbol (None = entrada no reubicable, que se
+                reutiliza tal cual)
+            counter_start: Valor del contador de constantes antes de visitarlo
+            counter_end: Valor del contador después de visitarlo
+
+        Returns:
+            La entrada, o None si las filas no se pueden reubicar (una línea o
+            una constante que no pertenece al subárbol)
+
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        if info is None or counter_start is None:
+            return cls(rows)
+
+        line_offsets: List[Optional[int]] = []
+        for row in rows:
+            line = row.get("line")
+            if isinstance(line, int) and line > 0:
+                if info.first_line is None or not info.first_line <= line <= info.last_line:
+                    return None
+                line_offsets.append(line - info.first_line)
+            else:
+                line_offsets.append(None)
+            ck = row.get("ck")
+            if isinstance(ck, str):
+                for match in _CK_PATTERN.finditer(ck):
+                    if not counter_start < int(match.group(1)) <= counter_end:
+                        return None
+        return cls(rows, line_offsets, counter_start, counter_end - counter_start)
+
+    def replay(self, info: Optional[SubtreeInfo], counter: int) -> List[LineCost]:
+        """
+        Devuelve copias de las filas para el subárbol info.
+
+        Args:
+            info: SubtreeInfo del subárbol donde se reutilizan (ignorado si la
+                entrada no es reubicable)
+            counter: Valor actual del contador de constantes; el llamador debe
+                avanzarlo en self.constants
+
+        Returns:
+            Filas nuevas (el memo no comparte dicts con el analizador)
+
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        if not self.relocatable or info is None:
+            return [dict(row) for row in self.rows]
+
+        shift = counter - self.counter_start
+        rows = []
+        for row, offset in zip(self.rows, self.line_offsets):
+            row = dict(row)
+            if offset is not None and info.first_line is not None:
+                row["line"] = info.first_line + offset
+            if shift and isinstance(row.get("ck"), str):
+                row["ck"] = _CK_PATTERN.sub(lambda m: f"C_{{{int(m.group(1)) + shift}}}", row["ck"])
+            rows.append(row)
+        return rows
+
+
+class SubtreeMemo:
+    """
+    Memo LRU acotado y thread-safe de subárboles analizados, compartido por
+    todos los análisis del proceso.
+
+    Las claves combinan el hash estructural del subárbol con el modo, el
+    contexto de bucles y el modelo de caso promedio (ver BaseAnalyzer.memo_key),
+    así que una entrada sirve para cualquier programa que contenga el mismo
+    fragmento en el mismo contexto.
+
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        """
+        Inicializa el memo.
+
+        Args:
+            max_entries: Número máximo de subárboles (0 = desactivado)
+
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        self.max_entries = max(0, int(max_entries))
+        self._entries: "OrderedDict[str, MemoEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[MemoEntry]:
+        """
+        Obtiene la entrada de un subárbol.
+
+        Args:
+            key: Clave generada con BaseAnalyzer.memo_key
+
+        Returns:
+            MemoEntry o None
+
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        if self.max_entries == 0:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: str, entry: MemoEntry) -> None:
+        """
+        Guarda la entrada de un subárbol.
+
+        Args:
+            key: Clave generada con BaseAnalyzer.memo_key
+            entry: Filas reubicables del subárbol
+
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        if self.max_entries == 0:
+            return
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """
+        Elimina todas las entradas y reinicia los contadores.
+
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+# Instancia compartida por los analizadores del proceso
+subtree_memo = SubtreeMemo(get_subtree_memo_size())
+
+
+def get_subtree_memo() -> SubtreeMemo:
+    """
+    Obtiene el memo de subárboles compartido del proceso.
+
+    Returns:
+        Instancia global de SubtreeMemo
+
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+    return subtree_memo
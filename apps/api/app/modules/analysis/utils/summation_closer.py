@@ -2,6 +2,7 @@ from typing import List, Tuple, Optional, Union
 from sympy import Symbol, summation, simplify, latex, sympify, Sum, expand, factor, Expr, Add, Mul
 from sympy.parsing.sympy_parser import parse_expr
 import re
+from ...shared.deadline import check_deadline
 
 
 class SummationCloser:
@@ -145,6 +146,9 @@ class SummationCloser:
                     # Evaluar todas las sumatorias recursivamente
                     result_expr = self._evaluate_all_sums_sympy(expr)
                 
+                # Punto de control del plazo antes de simplificar
+                check_deadline()
+                
                 # Simplificar completamente el resultado
                 result_expr = simplify(result_expr)
                 
@@ -174,6 +178,7 @@ class SummationCloser:
                 for var_name in iteration_vars:
                     var_symbol = Symbol(var_name, integer=True)
                     if result_expr.has(var_symbol):
+                        check_deadline()
                         # La expresión todavía contiene una variable de iteración
                         # Esto significa que alguna sumatoria no se evaluó completamente
                         # Intentar forzar la evaluación expandiendo y simplificando
@@ -204,7 +209,7 @@ class SummationCloser:
                                 from sympy import Integer as SymInteger
                                 result_expr = result_expr.subs(var_symbol, SymInteger(0))
                                 result_expr = simplify(result_expr)
-                            except:
+                            except Exception:
                                 pass
                 
                 # Convertir a LaTeX
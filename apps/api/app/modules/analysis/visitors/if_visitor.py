@@ -98,35 +98,16 @@ class IfVisitor:
         # Helper para ejecutar un bloque y extraer solo las filas nuevas (con memoización)
         def run_block_to_buffer(block_node):
             # Guardar estado de rows para extraer solo lo nuevo
-            start = len(self.rows)
+            checkpoint = self.rows_checkpoint()
             
-            # Visitar el bloque sobre el mismo contexto (loop_stack se respeta)
+            # Visitar el bloque sobre el mismo contexto (loop_stack se respeta;
+            # los bloques se memorizan en visit)
             if block_node:
-                # Aplicar memoización si el bloque es cacheable
-                if self._should_memoize(block_node):
-                    ctx_hash = self.get_context_hash()
-                    memo_key = self.memo_key(block_node, mode, ctx_hash)
-                    
-                    # Intentar obtener del cache
-                    cached_rows = self.memo_get(memo_key)
-                    if cached_rows is not None:
-                        # Usar resultados cacheados
-                        self.rows.extend(cached_rows)
-                    else:
-                        # Analizar y cachear
-                        self.visit(block_node, mode)
-                        rows_added = self.rows[start:]
-                        if rows_added:
-                            self.memo_set(memo_key, rows_added)
-                else:
-                    # No es cacheable, visitar normalmente
-                    self.visit(block_node, mode)
+                self.visit(block_node, mode)
             
-            # Extraer lo recién agregado
-            new_rows = self.rows[start:]
-            # Removerlos de rows para decidir luego qué rama se queda
-            self.rows = self.rows[:start]
-            return new_rows
+            # Mover lo recién agregado a un buffer para decidir luego qué rama
+            # se queda (sin copiar las filas anteriores)
+            return self.take_rows(checkpoint)
         
         # 2) THEN y 3) ELSE -> buffers
         then_buf = run_block_to_buffer(consequent)
@@ -135,7 +116,6 @@ class IfVisitor:
         # Helper para multiplicar count_raw_expr por probabilidad (definido antes de usarlo)
         def multiply_by_probability(rows, prob_expr, prob_str, branch_name):
             """Multiplica el count_raw_expr de cada fila por la probabilidad."""
-            from sympy import latex as sympy_latex
             multiplied_rows = []
             for row in rows:
                 new_row = dict(row)
@@ -152,16 +132,12 @@ class IfVisitor:
                 new_count_expr = Mul(count_expr, prob_expr)
                 new_row["count_raw_expr"] = new_count_expr
                 
-                # Actualizar count_raw (LaTeX) para reflejar la probabilidad
-                try:
-                    new_count_raw_latex = sympy_latex(new_count_expr)
-                    new_row["count_raw"] = new_count_raw_latex
-                    # También actualizar expectedRuns para caso promedio
-                    if hasattr(self, 'mode') and self.mode == "avg":
-                        new_row["expectedRuns"] = new_count_raw_latex
-                except Exception:
-                    # Si falla la conversión, dejar el count_raw original
-                    pass
+                # Actualizar count_raw para reflejar la probabilidad (el LaTeX se
+                # genera al serializar)
+                new_row["count_raw"] = new_count_expr
+                # También actualizar expectedRuns para caso promedio
+                if hasattr(self, 'mode') and self.mode == "avg":
+                    new_row["expectedRuns"] = new_count_expr
                 
                 # Actualizar nota para indicar probabilidad
                 old_note = new_row.get("note", "")
@@ -178,7 +154,7 @@ class IfVisitor:
             # Helper para detectar si una rama contiene early returns
             def has_early_return(rows):
                 for row in rows:
-                    if row.get("kind") in ("return", "break") and row.get("count") != "1":
+                    if row.get("kind") in ("return", "break") and str(row.get("count")) != "1":
                         return True
                 return False
             
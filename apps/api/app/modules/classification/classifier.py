@@ -8,8 +8,10 @@ Author: Juan Camilo Cruz Parra (@Cruz1122)
 """
 from typing import Any, Dict, List, Optional
 
+from ..shared.program_index import ProgramIndex, call_name, get_program_index
 
-def detect_algorithm_kind(ast: Dict[str, Any]) -> str:
+
+def detect_algorithm_kind(ast: Dict[str, Any], index: Optional[ProgramIndex] = None) -> str:
     """
     Detecta el tipo de algoritmo desde el AST.
     
@@ -17,23 +19,35 @@ def detect_algorithm_kind(ast: Dict[str, Any]) -> str:
     
     Args:
         ast: AST del programa parseado
+        index: Índice del programa (por defecto el compartido de get_program_index)
         
     Returns:
         "iterative", "recursive", "hybrid", o "unknown"
         
     Author: Juan Camilo Cruz Parra (@Cruz1122)
     """
+    if index is None:
+        index = get_program_index(ast)
+
     # Buscar construcciones iterativas
-    has_iterative = _has_iterative_constructs(ast)
+    has_iterative = index.has_type("For", "While", "Repeat")
     
     # Buscar procedimiento y llamadas recursivas
-    proc_def = _find_procedure_definition(ast)
+    proc_def = index.main_procedure
     has_recursive = False
     
     if proc_def:
         proc_name = proc_def.get("name")
         if proc_name:
-            has_recursive = _has_recursive_calls(proc_def, proc_name)
+            calls = index.calls_in(proc_def)
+            if calls is None:
+                has_recursive = _has_recursive_calls(proc_def, proc_name)
+            else:
+                target = proc_name.lower()
+                has_recursive = any(
+                    call.get("type") == "Call" and (call_name(call) or "").lower() == target
+                    for call in calls
+                )
     
     # Clasificar
     if has_iterative and has_recursive:
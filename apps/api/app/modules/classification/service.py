@@ -6,6 +6,7 @@ Author: Juan Camilo Cruz Parra (@Cruz1122)
 from typing import Dict, Any
 from .classifier import detect_algorithm_kind
 from ..parsing.service import parse_source
+from ..shared.metrics import label_phases, phase
 
 
 def classify_algorithm(source: str = None, ast: Dict[str, Any] = None) -> Dict[str, Any]:
@@ -26,7 +27,9 @@ def classify_algorithm(source: str = None, ast: Dict[str, Any] = None) -> Dict[s
         # Determinar si recibimos source o ast
         if ast is not None:
             # Usar AST directamente
-            kind = detect_algorithm_kind(ast)
+            with phase("classify"):
+                kind = detect_algorithm_kind(ast)
+            label_phases(kind=kind)
             return {
                 "ok": True,
                 "kind": kind,
@@ -55,7 +58,9 @@ def classify_algorithm(source: str = None, ast: Dict[str, Any] = None) -> Dict[s
                 }
             
             # Clasificar el algoritmo
-            kind = detect_algorithm_kind(ast)
+            with phase("classify"):
+                kind = detect_algorithm_kind(ast)
+            label_phases(kind=kind)
             
             return {
                 "ok": True,
@@ -6,6 +6,7 @@ Author: Juan Camilo Cruz Parra (@Cruz1122)
 from typing import Any, Dict, List, Optional
 from .environment import ExecutionEnvironment
 from .trace_builder import TraceBuilder
+from ..shared.program_index import get_program_index
 
 
 class MaxRecursionDepthExceeded(Exception):
@@ -36,6 +37,7 @@ class CodeExecutor:
         Author: Juan Camilo Cruz Parra (@Cruz1122)
         """
         self.ast = ast
+        self.index = get_program_index(ast)
         self.input_size = input_size
         self.case = case
         self.environment = ExecutionEnvironment(input_size)
@@ -649,15 +651,10 @@ class CodeExecutor:
             evaluated_args.append(arg_val)
             arg_values[f"arg_{i}"] = arg_val
         
-        # Buscar el procedimiento en el AST
+        # Buscar el procedimiento en el índice del programa
         proc_def = None
         if self.ast.get("type") == "Program":
-            body = self.ast.get("body", [])
-            proc_defs = [item for item in body if isinstance(item, dict) and item.get("type") == "ProcDef"]
-            for p in proc_defs:
-                if p.get("name") == proc_name:
-                    proc_def = p
-                    break
+            proc_def = self.index.find_procedure(proc_name)
         
         # Si encontramos el procedimiento, ejecutarlo recursivamente
         if proc_def:
@@ -792,9 +789,14 @@ class CodeExecutor:
         Author: Juan Camilo Cruz Parra (@Cruz1122)
         """
         proc_name = proc_def.get("name", "")
-        body = proc_def.get("body", {})
+        
+        # Llamadas del procedimiento según el índice (None si no está indexado)
+        calls = self.index.calls_in(proc_def)
+        if calls is not None:
+            return any(call.get("name", "") == proc_name for call in calls)
         
         # Buscar llamadas a sí mismo en el cuerpo
+        body = proc_def.get("body", {})
         return self._has_recursive_call(body, proc_name)
     
     def _has_recursive_call(self, node: Any, proc_name: str) -> bool:
@@ -1,5 +1,6 @@
 # Módulo de parsing
 from .router import router
 from .service import parse_source
+from .cache import get_parse_cache
 
-__all__ = ["router", "parse_source"]
+__all__ = ["router", "parse_source", "get_parse_cache"]
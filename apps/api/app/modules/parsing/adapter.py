@@ -3,7 +3,9 @@ Adaptador para el parser de gramática.
 
 Author: Juan Camilo Cruz Parra (@Cruz1122)
 """
+import copy
 from typing import Tuple, Optional, List, Dict, Any
+from .cache import get_parse_cache
 
 # Intentar usar el parser real si está instalado
 try:
@@ -13,6 +15,41 @@ except Exception:
     parse_to_ast = None
     GRAMMAR_AVAILABLE = False
 
+try:
+    from aa_grammar.api import parse_many, shutdown_pool  # type: ignore
+except Exception:
+    parse_many = None
+    shutdown_pool = None
+
+try:
+    from aa_grammar.validation import validate_source  # type: ignore
+except Exception:
+    validate_source = None
+
+try:
+    from aa_grammar.incremental import parse_document, reparse_document  # type: ignore
+except Exception:
+    parse_document = None
+    reparse_document = None
+
+
+def _is_cacheable(errors: List[Dict[str, Any]]) -> bool:
+    """
+    Indica si un resultado de parsing se puede guardar en la caché.
+    
+    Un parseo detenido por el presupuesto de tiempo depende de la carga del
+    servidor en ese momento, no solo del código, así que no se cachea.
+    
+    Args:
+        errors: Errores devueltos por el parser
+        
+    Returns:
+        False si el parseo se detuvo por el presupuesto de tiempo, True en otro caso
+        
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+    return not any(e.get("budget") == "deadline" for e in errors)
+
 
 def is_grammar_available() -> bool:
     """
@@ -30,6 +67,9 @@ def parse_to_ast_adapter(source: str) -> Tuple[Optional[Dict[str, Any]], List[Di
     """
     Adaptador para parsear código fuente usando aa_grammar.
     
+    Los resultados se sirven desde la caché de parsing compartida cuando el mismo
+    código ya fue parseado; el AST devuelto es siempre una copia independiente.
+    
     Args:
         source: Código fuente a parsear
         
@@ -43,7 +83,122 @@ def parse_to_ast_adapter(source: str) -> Tuple[Optional[Dict[str, Any]], List[Di
     if not GRAMMAR_AVAILABLE or parse_to_ast is None:
         return None, [{"line": 0, "column": 0, "message": "aa_grammar no disponible"}]
 
+    cache = get_parse_cache()
+    cached = cache.get(source)
+    if cached is not None:
+        return cached
+
     # Parsear el código
     ast, raw_errors = parse_to_ast(source)
+    if _is_cacheable(raw_errors):
+        cache.put(source, (ast, raw_errors))
     return ast, raw_errors
 
+
+def parse_many_adapter(sources: List[str]) -> List[Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]], float]]:
+    """
+    Adaptador para parsear un lote de programas en paralelo usando aa_grammar.parse_many.
+    
+    Los programas que ya están en la caché de parsing se sirven desde ella; solo los
+    demás se reparten en el pool de procesos, y sus resultados se guardan en la caché.
+    
+    Args:
+        sources: Códigos fuente a parsear
+        
+    Returns:
+        Lista, en el orden de entrada, de tuplas (ast, errors, duración en ms). La
+        duración es el tiempo de parseo de ese programa (0 si vino de la caché).
+        
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+    if not GRAMMAR_AVAILABLE or parse_many is None:
+        unavailable = [{"line": 0, "column": 0, "message": "aa_grammar no disponible"}]
+        return [(None, list(unavailable), 0.0) for _ in sources]
+
+    cache = get_parse_cache()
+    results: List[Any] = [None] * len(sources)
+    # Programas repetidos dentro del lote se parsean una sola vez
+    pending: Dict[str, List[int]] = {}
+    for i, source in enumerate(sources):
+        cached = cache.get(source)
+        if cached is not None:
+            results[i] = (cached[0], cached[1], 0.0)
+        else:
+            pending.setdefault(source, []).append(i)
+
+    if pending:
+        to_parse = list(pending)
+        for source, parsed in zip(to_parse, parse_many(to_parse)):
+            if _is_cacheable(parsed["errors"]):
+                cache.put(source, (parsed["ast"], parsed["errors"]))
+            indices = pending[source]
+            results[indices[0]] = (parsed["ast"], parsed["errors"], parsed["durationMs"])
+            for i in indices[1:]:
+                # Copias independientes para los duplicados
+                results[i] = (copy.deepcopy(parsed["ast"]), copy.deepcopy(parsed["errors"]), 0.0)
+    return results
+
+
+def validate_source_adapter(source: str) -> List[Dict[str, Any]]:
+    """
+    Adaptador para la validación ligera de aa_grammar (solo lexer y balance de
+    paréntesis, corchetes, llaves y bloques BEGIN…END; sin parser ni AST).
+    
+    Args:
+        source: Código fuente a validar
+        
+    Returns:
+        Lista de errores (cada uno con line, column, message); vacía si es válido
+        
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+    if not GRAMMAR_AVAILABLE or validate_source is None:
+        return [{"line": 0, "column": 0, "message": "aa_grammar no disponible"}]
+    return validate_source(source)
+
+
+def shutdown_parse_pool() -> None:
+    """
+    Cierra el pool de procesos usado por parse_many_adapter (al apagar la API).
+    
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+    if shutdown_pool is not None:
+        shutdown_pool()
+
+
+def parse_document_adapter(source: str) -> Optional[Any]:
+    """
+    Parsea un documento completo conservando los rangos de sus unidades de primer
+    nivel, para poder re-parsearlo incrementalmente después.
+    
+    Args:
+        source: Código fuente a parsear
+        
+    Returns:
+        ParsedDocument de aa_grammar.incremental o None si aa_grammar no está disponible
+        
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+    if not GRAMMAR_AVAILABLE or parse_document is None:
+        return None
+    return parse_document(source)
+
+
+def reparse_document_adapter(document: Any, edits: List[Dict[str, Any]]) -> Tuple[Optional[Any], Dict[str, Any]]:
+    """
+    Aplica ediciones del editor a un documento y re-parsea solo las unidades afectadas.
+    
+    Args:
+        document: ParsedDocument obtenido con parse_document_adapter
+        edits: Ediciones estilo Monaco ({range, text}) referidas al documento anterior
+        
+    Returns:
+        Tupla (documento nuevo, estadísticas del re-parseo); (None, {}) si aa_grammar
+        no está disponible
+        
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+    if not GRAMMAR_AVAILABLE or reparse_document is None:
+        return None, {}
+    return reparse_document(document, edits)
@@ -0,0 +1,226 @@
+"""
+Caché de parsing direccionada por contenido.
+
+El editor reenvía constantemente el mismo código fuente, así que guardamos el
+resultado de parse_to_ast (AST + errores) indexado por un hash del código. Las
+entradas se guardan en la forma compacta e inmutable de aa_grammar.compact
+(nodos con __slots__, posiciones empaquetadas) y cada lectura materializa dicts
+nuevos, así que ningún analizador puede corromper lo que está en caché.
+
+Con CACHE_BACKEND=sqlite o redis, un miss en memoria se busca además en el nivel
+compartido por todos los workers (ver shared.cache_backends), donde los
+resultados se guardan serializados con encode_value.
+
+Author: Juan Camilo Cruz Parra (@Cruz1122)
+"""
+import copy
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from ...core.config import get_cache_backend, get_parse_cache_size
+from ..shared.cache_backends import CacheBackend, create_shared_backend, decode_value, encode_value
+
+try:
+    from aa_grammar.compact import compact_ast, materialize  # type: ignore
+except Exception:
+    # Sin aa_grammar no hay nada que parsear; mantener la caché funcional con copias
+    compact_ast = copy.deepcopy
+    materialize = copy.deepcopy
+
+ParseResult = Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]
+
+
+def source_key(source: str) -> str:
+    """
+    Calcula la clave de caché de un código fuente.
+
+    Args:
+        source: Código fuente
+
+    Returns:
+        Hash SHA-256 (hex) del código en UTF-8
+
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+class ParseCache:
+    """
+    Caché LRU acotada y thread-safe de resultados de parsing.
+
+    - Clave: hash SHA-256 del código fuente
+    - Valor: tupla (ast, errors) en forma compacta (ver aa_grammar.compact)
+    - Cada lectura devuelve dicts y listas nuevos (copy-on-read)
+    - Nivel compartido opcional: un miss local se busca ahí y, si está, se copia
+      al nivel local
+    - Contadores de hits, misses y evictions disponibles con stats()
+
+    Un tamaño máximo de 0 desactiva la caché.
+
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+
+    def __init__(self, max_entries: int = 256, shared: Optional[CacheBackend] = None):
+        """
+        Inicializa la caché.
+
+        Args:
+            max_entries: Número máximo de entradas antes de expulsar la menos usada
+            shared: Backend compartido entre workers (opcional)
+
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        self.max_entries = max(0, int(max_entries))
+        self._entries: "OrderedDict[str, Tuple[Any, Any]]" = OrderedDict()
+        self._shared = shared if self.max_entries else None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, source: str) -> Optional[ParseResult]:
+        """
+        Busca el resultado de parsing de un código fuente.
+
+        Args:
+            source: Código fuente
+
+        Returns:
+            Copia de (ast, errors) si está en caché, None en caso contrario
+
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        if self.max_entries == 0:
+            return None
+
+        key = source_key(source)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        if entry is not None:
+            # Materializar fuera del lock: la entrada guardada es inmutable
+            ast, errors = entry
+            return materialize(ast), materialize(errors)
+
+        result = self._get_shared(key)
+        with self._lock:
+            if result is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.shared_hits += 1
+        self._store(key, result)
+        return result
+
+    def _get_shared(self, key: str) -> Optional[ParseResult]:
+        """Busca una entrada en el nivel compartido (None si no está o es ilegible)."""
+        if self._shared is None:
+            return None
+        data = self._shared.get(key)
+        if data is None:
+            return None
+        try:
+            ast, errors = decode_value(data)
+        except (ValueError, TypeError):
+            return None
+        return ast, errors
+
+    def _store(self, key: str, result: ParseResult) -> None:
+        """Guarda una entrada en el nivel local."""
+        ast, errors = result
+        entry = (compact_ast(ast), compact_ast(list(errors)))
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def put(self, source: str, result: ParseResult) -> None:
+        """
+        Guarda el resultado de parsing de un código fuente.
+
+        Args:
+            source: Código fuente
+            result: Tupla (ast, errors) a cachear
+
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        if self.max_entries == 0:
+            return
+
+        key = source_key(source)
+        self._store(key, result)
+        if self._shared is not None:
+            ast, errors = result
+            try:
+                data = encode_value([ast, list(errors)])
+            except (TypeError, ValueError):
+                return
+            self._shared.set(key, data)
+
+    def clear(self) -> None:
+        """
+        Vacía la caché (también el nivel compartido) y reinicia los contadores.
+
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        if self._shared is not None:
+            self._shared.clear()
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.shared_hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Devuelve los contadores de la caché.
+
+        Returns:
+            Diccionario con size, max_entries, hits, shared_hits, misses, evictions,
+            hit_ratio, backend y shared (stats del backend compartido, o None)
+
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        shared = self._shared.stats() if self._shared is not None else None
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "shared_hits": self.shared_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+                "backend": get_cache_backend(),
+                "shared": shared,
+            }
+
+
+# Instancia compartida por todos los endpoints que parsean código
+_parse_cache_size = get_parse_cache_size()
+parse_cache = ParseCache(
+    _parse_cache_size,
+    shared=create_shared_backend("parse", _parse_cache_size) if _parse_cache_size else None,
+)
+
+
+def get_parse_cache() -> ParseCache:
+    """
+    Obtiene la caché de parsing compartida del proceso.
+
+    Returns:
+        Instancia global de ParseCache
+
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+    return parse_cache
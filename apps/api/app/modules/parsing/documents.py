@@ -0,0 +1,104 @@
+"""
+Almacén de documentos para el parseo incremental.
+
+Guarda, por identificador de documento, el último resultado de parsear el código
+del editor (incluidos los rangos de sus unidades de primer nivel). El cliente
+envía luego ese identificador junto con sus ediciones y el servidor solo
+re-parsea lo que cambió.
+
+Author: Juan Camilo Cruz Parra (@Cruz1122)
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+from ...core.config import get_parse_document_store_size
+
+
+class DocumentStore:
+    """
+    Almacén LRU acotado y thread-safe de documentos parseados.
+
+    Los documentos se guardan tal cual (no se copian): un ParsedDocument nunca se
+    modifica después de crearse, cada edición produce uno nuevo.
+
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+
+    def __init__(self, max_entries: int = 64):
+        """
+        Inicializa el almacén.
+
+        Args:
+            max_entries: Número máximo de documentos antes de expulsar el menos usado
+
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        self.max_entries = max(0, int(max_entries))
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, document_id: str) -> Optional[Any]:
+        """
+        Obtiene un documento por su identificador.
+
+        Args:
+            document_id: Identificador devuelto al parsear
+
+        Returns:
+            ParsedDocument o None si no existe (o fue expulsado)
+
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        with self._lock:
+            document = self._entries.get(document_id)
+            if document is not None:
+                self._entries.move_to_end(document_id)
+            return document
+
+    def put(self, document_id: str, document: Any) -> None:
+        """
+        Guarda un documento parseado.
+
+        Args:
+            document_id: Identificador del documento
+            document: ParsedDocument a guardar
+
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        if self.max_entries == 0:
+            return
+        with self._lock:
+            self._entries[document_id] = document
+            self._entries.move_to_end(document_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """
+        Elimina todos los documentos.
+
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+# Instancia compartida por el endpoint de parseo incremental
+document_store = DocumentStore(get_parse_document_store_size())
+
+
+def get_document_store() -> DocumentStore:
+    """
+    Obtiene el almacén de documentos compartido del proceso.
+
+    Returns:
+        Instancia global de DocumentStore
+
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+    return document_store
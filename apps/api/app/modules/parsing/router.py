@@ -5,8 +5,11 @@ Author: Juan Camilo Cruz Parra (@Cruz1122)
 """
 from fastapi import APIRouter, Body
 from typing import Any, Dict
-from .service import parse_source
+import time
+from .service import parse_batch, parse_incremental, parse_source, validate_tokens
 from .adapter import is_grammar_available
+from .cache import get_parse_cache
+from ...core.config import get_parse_batch_max_items
 
 router = APIRouter(prefix="/grammar", tags=["grammar"])
 
@@ -45,3 +48,134 @@ def parse(payload: Dict[str, Any] = Body(...)) -> Dict[str, Any]:
         "errors": result["errors"],
     }
 
+
+@router.post("/validate")
+def validate(payload: Dict[str, Any] = Body(...)) -> Dict[str, Any]:
+    """
+    Validación ligera pensada para cada pulsación del editor: solo lexer y balance
+    de paréntesis, corchetes, llaves y bloques BEGIN…END, sin parser ni AST.
+    
+    Body compat:
+      { "input": string }  o  { "source": string }
+    Respuesta:
+      { ok, available, runtime, mode: "lexer", error?, errors }
+    Los errores tienen la misma forma que los de /grammar/parse. ok=true no
+    garantiza que el programa no tenga errores de sintaxis.
+    
+    Args:
+        payload: Diccionario con "input" o "source" conteniendo el código a validar
+        
+    Returns:
+        Diccionario con ok, available, runtime, mode, error y errors
+        
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+    source = str(payload.get("input") or payload.get("source") or "")
+    result = validate_tokens(source)
+    return {
+        "ok": result["ok"],
+        "available": is_grammar_available(),
+        "runtime": "python",
+        "mode": "lexer",
+        "error": result["errors"][0]["message"] if result["errors"] else None,
+        "errors": result["errors"],
+    }
+
+
+@router.post("/parse/batch")
+def parse_batch_endpoint(payload: Dict[str, Any] = Body(...)) -> Dict[str, Any]:
+    """
+    Parsea un lote de programas en una sola petición, repartiéndolos en un pool
+    de procesos del tamaño de los núcleos disponibles.
+    
+    Body:
+      { "sources": [string, ...] }
+    Respuesta:
+      { ok, available, runtime, count, durationMs, results: [{ok, ast, errors, durationMs}] }
+    Los resultados vienen en el orden de entrada; ok es true solo si todos los
+    programas parsearon sin errores.
+    
+    Args:
+        payload: Diccionario con "sources" (lista de códigos fuente)
+        
+    Returns:
+        Diccionario con ok, available, runtime, count, durationMs y results
+        (o ok=false y error si el body no es válido)
+        
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+    sources = payload.get("sources")
+    if not isinstance(sources, list) or not all(isinstance(s, str) for s in sources):
+        return {"ok": False, "error": "'sources' debe ser una lista de strings", "results": []}
+    max_items = get_parse_batch_max_items()
+    if len(sources) > max_items:
+        return {"ok": False, "error": f"El lote supera el máximo de {max_items} programas", "results": []}
+
+    started = time.perf_counter()
+    results = parse_batch(sources)
+    return {
+        "ok": all(result["ok"] for result in results),
+        "available": is_grammar_available(),
+        "runtime": "python",
+        "count": len(results),
+        "durationMs": round((time.perf_counter() - started) * 1000, 3),
+        "results": results,
+    }
+
+
+@router.post("/parse/incremental")
+def parse_incremental_endpoint(payload: Dict[str, Any] = Body(...)) -> Dict[str, Any]:
+    """
+    Parseo incremental para validación en cada pulsación del editor.
+    
+    Body:
+      { "source": string }                                  -> parseo completo
+      { "documentId": string, "edits": [{range, text}] }    -> solo re-parsea lo editado
+    Las ediciones siguen el formato de Monaco (IModelContentChange: range con
+    startLineNumber/startColumn/endLineNumber/endColumn base 1, y text) y se
+    refieren al documento identificado por documentId.
+    Respuesta: la misma de /grammar/parse más documentId e incremental
+    ({incremental, reparsedUnits, totalUnits}). Si el documento expiró se devuelve
+    documentExpired=true y el cliente debe reenviar "source".
+    
+    Args:
+        payload: Diccionario con "source" o con "documentId" y "edits"
+        
+    Returns:
+        Diccionario con ok, available, runtime, error, ast, errors, documentId e incremental
+        
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+    source = payload.get("source", payload.get("input"))
+    # documentId y edits se validan en el servicio (error estándar si están mal formados)
+    result = parse_incremental(
+        source=str(source) if source is not None else None,
+        document_id=payload.get("documentId"),
+        edits=payload.get("edits"),
+    )
+    response = {
+        "ok": result["ok"],
+        "available": is_grammar_available(),
+        "runtime": "python",
+        "error": result["errors"][0]["message"] if result["errors"] else None,
+        "ast": result["ast"],
+        "errors": result["errors"],
+        "documentId": result["documentId"],
+        "incremental": result["incremental"],
+    }
+    if result.get("documentExpired"):
+        response["documentExpired"] = True
+    return response
+
+
+@router.get("/cache")
+def parse_cache_stats() -> Dict[str, Any]:
+    """
+    Devuelve los contadores de la caché de parsing compartida.
+    
+    Returns:
+        Diccionario con ok y stats (size, max_entries, hits, misses, evictions, hit_ratio)
+        
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+    return {"ok": True, "stats": get_parse_cache().stats()}
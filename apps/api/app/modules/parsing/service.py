@@ -3,8 +3,18 @@ Servicio de parsing.
 
 Author: Juan Camilo Cruz Parra (@Cruz1122)
 """
-from typing import Dict, Any
-from .adapter import parse_to_ast_adapter, is_grammar_available
+from typing import Any, Dict, List, Optional
+from .adapter import (
+    is_grammar_available,
+    parse_document_adapter,
+    parse_many_adapter,
+    parse_to_ast_adapter,
+    reparse_document_adapter,
+    validate_source_adapter,
+)
+from .cache import source_key
+from .documents import get_document_store
+from ..shared.metrics import phase
 
 
 def parse_source(source: str) -> Dict[str, Any]:
@@ -27,7 +37,63 @@ def parse_source(source: str) -> Dict[str, Any]:
         }
 
     # Parsear el código
-    ast, raw_errors = parse_to_ast_adapter(source)
+    with phase("parse"):
+        ast, raw_errors = parse_to_ast_adapter(source)
+    return _to_parse_result(ast, raw_errors)
+
+
+def validate_tokens(source: str) -> Dict[str, Any]:
+    """
+    Validación ligera para cada pulsación del editor: solo tokeniza y comprueba
+    el balance de delimitadores y bloques BEGIN…END (no detecta errores de
+    sintaxis; para eso está parse_source).
+    
+    Args:
+        source: Código fuente a validar
+        
+    Returns:
+        Diccionario con ok (bool) y errors (lista con line, column, message)
+        
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+    errors = validate_source_adapter(source)
+    return {"ok": len(errors) == 0, "errors": errors}
+
+
+def parse_batch(sources: List[str]) -> List[Dict[str, Any]]:
+    """
+    Parsea un lote de programas en paralelo (pool de procesos de aa_grammar).
+    
+    Args:
+        sources: Códigos fuente a parsear
+        
+    Returns:
+        Lista en el orden de entrada; cada elemento tiene ok, ast, errors y
+        durationMs (tiempo de parseo de ese programa, 0 si vino de la caché)
+        
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+    results = []
+    for ast, raw_errors, duration_ms in parse_many_adapter(sources):
+        result = _to_parse_result(ast, raw_errors)
+        result["durationMs"] = round(duration_ms, 3)
+        results.append(result)
+    return results
+
+
+def _to_parse_result(ast: Optional[Dict[str, Any]], raw_errors: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Construye el resultado estándar de parsing a partir de (ast, errores crudos).
+    
+    Args:
+        ast: AST devuelto por el parser (puede ser None)
+        raw_errors: Errores devueltos por el parser
+        
+    Returns:
+        Diccionario con ok (bool), ast (opcional) y errors (lista)
+        
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
     ok = len(raw_errors) == 0
     
     # Convertir errores al formato estándar
@@ -46,3 +112,116 @@ def parse_source(source: str) -> Dict[str, Any]:
         "errors": errors_list,
     }
 
+
+# Campos del rango de una edición de Monaco (base 1)
+EDIT_RANGE_FIELDS = ("startLineNumber", "startColumn", "endLineNumber", "endColumn")
+
+
+def _invalid_incremental_request(document_id: Any, edits: Any) -> Optional[str]:
+    """
+    Valida documentId y las ediciones de una petición incremental.
+    
+    Args:
+        document_id: documentId recibido en la petición
+        edits: Ediciones recibidas en la petición
+        
+    Returns:
+        Mensaje de error o None si la petición es válida
+        
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+    if document_id is not None and not isinstance(document_id, str):
+        return "'documentId' debe ser un string"
+    if edits is None:
+        return None
+    if not isinstance(edits, list):
+        return "'edits' debe ser una lista de ediciones {range, text}"
+    for i, edit in enumerate(edits):
+        if not isinstance(edit, dict):
+            return f"Edición {i}: debe ser un objeto {{range, text}}"
+        rng = edit.get("range")
+        if rng is not None:
+            if not isinstance(rng, dict):
+                return f"Edición {i}: 'range' debe ser un objeto"
+            for field in EDIT_RANGE_FIELDS:
+                value = rng.get(field)
+                if value is not None and (not isinstance(value, int) or isinstance(value, bool)):
+                    return f"Edición {i}: '{field}' debe ser un entero"
+        text = edit.get("text")
+        if text is not None and not isinstance(text, str):
+            return f"Edición {i}: 'text' debe ser un string"
+    return None
+
+
+def parse_incremental(
+    source: Optional[str] = None,
+    document_id: Optional[str] = None,
+    edits: Optional[List[Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    """
+    Parsea código del editor reutilizando el parseo anterior del mismo documento.
+    
+    - Con document_id conocido y edits: aplica las ediciones y re-parsea solo las
+      unidades de primer nivel (procDef/stmt/classDef) que tocan la edición.
+    - Con source: parsea el documento completo y lo registra.
+    - Con document_id desconocido (expirado) y sin source: devuelve un error con
+      documentExpired=True para que el cliente reenvíe el código completo.
+    - Con document_id que no es string o ediciones mal formadas (no son objetos,
+      rangos no enteros): devuelve un error sin tocar el almacén.
+    
+    Args:
+        source: Código fuente completo (opcional)
+        document_id: Identificador devuelto por una llamada anterior (opcional)
+        edits: Ediciones estilo Monaco ({range, text}) sobre ese documento (opcional)
+        
+    Returns:
+        Diccionario con ok, ast, errors, documentId e incremental (estadísticas)
+        
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+    if not is_grammar_available():
+        return {
+            "ok": False,
+            "ast": None,
+            "errors": [{"line": 0, "column": 0, "message": "aa_grammar no disponible"}],
+            "documentId": None,
+            "incremental": None,
+        }
+
+    invalid = _invalid_incremental_request(document_id, edits)
+    if invalid is not None:
+        return {
+            "ok": False,
+            "ast": None,
+            "errors": [{"line": 0, "column": 0, "message": invalid}],
+            "documentId": None,
+            "incremental": None,
+        }
+
+    store = get_document_store()
+    previous = store.get(document_id) if document_id else None
+
+    if previous is not None and edits is not None:
+        document, stats = reparse_document_adapter(previous, edits)
+    elif source is not None:
+        document = parse_document_adapter(source)
+        total = len(document.units or []) if document is not None else 0
+        stats = {"incremental": False, "reparsedUnits": total, "totalUnits": total}
+    else:
+        return {
+            "ok": False,
+            "ast": None,
+            "errors": [{"line": 0, "column": 0, "message": "Documento desconocido o expirado: reenviar 'source'"}],
+            "documentId": None,
+            "documentExpired": True,
+            "incremental": None,
+        }
+
+    new_id = source_key(document.source)
+    store.put(new_id, document)
+
+    result = _to_parse_result(document.ast, document.errors)
+    result["documentId"] = new_id
+    result["incremental"] = stats
+    return result
+
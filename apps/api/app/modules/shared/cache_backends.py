@@ -0,0 +1,625 @@
+"""
+Backends de almacenamiento para las cachés de parsing y análisis.
+
+Con varios workers (uvicorn --workers, gunicorn) cada proceso tiene sus propias
+cachés en memoria, así que un programa analizado por un worker se vuelve a
+calcular en otro. Las cachés de parsing y análisis mantienen su nivel en memoria
+por proceso y, si se configura CACHE_BACKEND, consultan además un nivel
+compartido por todos los workers:
+
+- MemoryBackend: LRU con tiempo de vida en el proceso (nivel local)
+- SQLiteBackend: archivo SQLite compartido por los workers de un mismo host
+- RedisBackend: servidor Redis (o cualquiera que hable el protocolo RESP)
+
+Todos guardan bytes. Los resultados se serializan con encode_value (JSON
+compacto, comprimido con zlib si es grande): es portable entre procesos y, a
+diferencia de pickle, leer una entrada compartida nunca ejecuta código.
+
+Un backend compartido nunca hace fallar una petición: los errores de conexión o
+de disco cuentan como miss y quedan en stats()["errors"].
+
+Author: Juan Camilo Cruz Parra (@Cruz1122)
+"""
+import glob
+import hashlib
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+from ...core.config import get_cache_backend, get_cache_redis_url, get_cache_sqlite_path
+
+# Tamaño a partir del cual los valores se comprimen
+COMPRESS_MIN_BYTES = 1024
+
+
+def _code_version() -> str:
+    """Hash del código de los módulos y de aa_grammar: cambia con cada despliegue."""
+    modules_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    paths = glob.glob(os.path.join(modules_dir, "**", "*.py"), recursive=True)
+    try:
+        import aa_grammar  # type: ignore
+
+        paths += glob.glob(os.path.join(os.path.dirname(aa_grammar.__file__), "*.py"))
+    except Exception:
+        pass
+    digest = hashlib.sha256()
+    for path in sorted(paths):
+        try:
+            with open(path, "rb") as fh:
+                digest.update(fh.read())
+        except OSError:
+            continue
+    return digest.hexdigest()[:16]
+
+
+# Marca de versión del código: separa las entradas compartidas entre despliegues
+CODE_VERSION = _code_version()
+
+
+def encode_value(value: Any) -> bytes:
+    """
+    Serializa un resultado (dicts, listas y escalares) para guardarlo en un backend.
+
+    Args:
+        value: Valor serializable a JSON
+
+    Returns:
+        Bytes compactos (JSON, comprimido con zlib si supera COMPRESS_MIN_BYTES)
+
+    Raises:
+        TypeError, ValueError: Si el valor no es serializable a JSON
+
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+    raw = json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    if len(raw) >= COMPRESS_MIN_BYTES:
+        return b"z" + zlib.compress(raw, 1)
+    return b"j" + raw
+
+
+def decode_value(data: bytes) -> Any:
+    """
+    Deserializa un valor guardado con encode_value.
+
+    Args:
+        data: Bytes de encode_value
+
+    Returns:
+        Valor nuevo (cada llamada devuelve objetos nuevos)
+
+    Raises:
+        ValueError: Si los bytes no tienen un formato conocido
+
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+    tag, payload = data[:1], data[1:]
+    if tag == b"z":
+        try:
+            payload = zlib.decompress(payload)
+        except zlib.error as e:
+            raise ValueError(str(e))
+    elif tag != b"j":
+        raise ValueError("Formato de valor de caché desconocido")
+    return json.loads(payload)
+
+
+class CacheBackendError(Exception):
+    """Error de un backend de caché (conexión, protocolo o almacenamiento)."""
+
+
+class _ServerError(CacheBackendError):
+    """Respuesta de error de Redis: la conexión sigue siendo válida."""
+
+
+class CacheBackend:
+    """
+    Interfaz de los backends: almacenamiento clave -> bytes con tiempo de vida.
+
+    Las subclases implementan _get, _set, _delete, _clear y _stats; los métodos
+    públicos convierten cualquier error del backend en un miss (o en un no-op) y
+    lo cuentan en errors.
+
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+
+    name = "base"
+
+    def __init__(self):
+        """
+        Inicializa los contadores comunes.
+
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        self.errors = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Busca un valor.
+
+        Args:
+            key: Clave
+
+        Returns:
+            Bytes guardados, o None si no está, expiró o el backend falló
+
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        try:
+            return self._get(key)
+        except (CacheBackendError, sqlite3.Error, OSError):
+            self.errors += 1
+            return None
+
+    def set(self, key: str, value: bytes, ttl_seconds: float = 0) -> None:
+        """
+        Guarda un valor.
+
+        Args:
+            key: Clave
+            value: Bytes a guardar
+            ttl_seconds: Segundos de vida (0 = sin expiración)
+
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        try:
+            self._set(key, value, ttl_seconds)
+        except (CacheBackendError, sqlite3.Error, OSError):
+            self.errors += 1
+
+    def delete(self, key: str) -> None:
+        """
+        Elimina un valor (si existe).
+
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        try:
+            self._delete(key)
+        except (CacheBackendError, sqlite3.Error, OSError):
+            self.errors += 1
+
+    def clear(self) -> None:
+        """
+        Elimina todos los valores del backend (solo los de su espacio de nombres).
+
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        try:
+            self._clear()
+        except (CacheBackendError, sqlite3.Error, OSError):
+            self.errors += 1
+        self.evictions = 0
+        self.expirations = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Devuelve los contadores del backend.
+
+        Returns:
+            Diccionario con backend, size, bytes, evictions, expirations y errors
+            (size y bytes son None si el backend no está disponible)
+
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        try:
+            size, used = self._stats()
+        except (CacheBackendError, sqlite3.Error, OSError):
+            self.errors += 1
+            size, used = None, None
+        return {
+            "backend": self.name,
+            "size": size,
+            "bytes": used,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "errors": self.errors,
+        }
+
+    def _get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def _set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        raise NotImplementedError
+
+    def _delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def _clear(self) -> None:
+        raise NotImplementedError
+
+    def _stats(self) -> Tuple[Optional[int], Optional[int]]:
+        raise NotImplementedError
+
+
+class MemoryBackend(CacheBackend):
+    """
+    Backend en memoria del proceso: LRU acotado y thread-safe con tiempo de vida.
+
+    Un tamaño máximo de 0 lo desactiva (no guarda nada).
+
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = 256):
+        """
+        Inicializa el backend.
+
+        Args:
+            max_entries: Número máximo de entradas antes de expulsar la menos usada
+
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        super().__init__()
+        self.max_entries = max(0, int(max_entries))
+        # clave -> (expira en, valor)
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def _get(self, key: str) -> Optional[bytes]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at and expires_at <= now:
+                del self._entries[key]
+                self._bytes -= len(value)
+                self.expirations += 1
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def _set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        if self.max_entries == 0:
+            return
+        expires_at = time.monotonic() + ttl_seconds if ttl_seconds else 0.0
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old[1])
+            self._entries[key] = (expires_at, value)
+            self._bytes += len(value)
+            while len(self._entries) > self.max_entries:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self.evictions += 1
+
+    def _delete(self, key: str) -> None:
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old[1])
+
+    def _clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _stats(self) -> Tuple[Optional[int], Optional[int]]:
+        with self._lock:
+            return len(self._entries), self._bytes
+
+
+class SQLiteBackend(CacheBackend):
+    """
+    Backend en un archivo SQLite compartido por todos los workers de un host.
+
+    Usa una conexión por hilo (y por proceso, para sobrevivir a un fork) en modo
+    WAL, así que las lecturas de un worker no bloquean las escrituras de otro.
+    El orden LRU se aproxima con accessed_at, que se refresca como mucho cada
+    ACCESS_REFRESH_SECONDS para que un hit no implique siempre una escritura.
+    Al abrirse borra las entradas de su espacio de nombres escritas por otra
+    versión del código.
+
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+
+    name = "sqlite"
+
+    ACCESS_REFRESH_SECONDS = 30.0
+
+    _SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS cache_entries ("
+        " namespace TEXT NOT NULL,"
+        " key TEXT NOT NULL,"
+        " version TEXT NOT NULL,"
+        " value BLOB NOT NULL,"
+        " expires_at REAL NOT NULL,"
+        " accessed_at REAL NOT NULL,"
+        " PRIMARY KEY (namespace, key)"
+        ") WITHOUT ROWID",
+        "CREATE INDEX IF NOT EXISTS cache_entries_lru ON cache_entries (namespace, accessed_at)",
+    )
+
+    def __init__(self, path: str, namespace: str, max_entries: int = 0, version: str = CODE_VERSION):
+        """
+        Inicializa el backend (la conexión se abre con el primer uso).
+
+        Args:
+            path: Ruta del archivo SQLite (se crea si no existe)
+            namespace: Espacio de nombres de las claves ("parse", "analysis", ...)
+            max_entries: Número máximo de entradas del espacio de nombres (0 = sin límite)
+            version: Versión del código que escribe las entradas
+
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        super().__init__()
+        self.path = path
+        self.namespace = namespace
+        self.max_entries = max(0, int(max_entries))
+        self.version = version
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        for statement in self._SCHEMA:
+            conn.execute(statement)
+        conn.execute(
+            "DELETE FROM cache_entries WHERE namespace = ? AND version != ?",
+            (self.namespace, self.version),
+        )
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    def _get(self, key: str) -> Optional[bytes]:
+        conn = self._conn()
+        row = conn.execute(
+            "SELECT value, expires_at, accessed_at FROM cache_entries"
+            " WHERE namespace = ? AND key = ? AND version = ?",
+            (self.namespace, key, self.version),
+        ).fetchone()
+        if row is None:
+            return None
+        value, expires_at, accessed_at = row
+        now = time.time()
+        if expires_at and expires_at <= now:
+            conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND key = ? AND expires_at = ?",
+                (self.namespace, key, expires_at),
+            )
+            self.expirations += 1
+            return None
+        if now - accessed_at > self.ACCESS_REFRESH_SECONDS:
+            conn.execute(
+                "UPDATE cache_entries SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                (now, self.namespace, key),
+            )
+        return bytes(value)
+
+    def _set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        conn = self._conn()
+        now = time.time()
+        expires_at = now + ttl_seconds if ttl_seconds else 0.0
+        conn.execute(
+            "INSERT OR REPLACE INTO cache_entries VALUES (?, ?, ?, ?, ?, ?)",
+            (self.namespace, key, self.version, sqlite3.Binary(value), expires_at, now),
+        )
+        if self.max_entries:
+            (count,) = conn.execute(
+                "SELECT COUNT(*) FROM cache_entries WHERE namespace = ?", (self.namespace,)
+            ).fetchone()
+            excess = count - self.max_entries
+            if excess > 0:
+                conn.execute(
+                    "DELETE FROM cache_entries WHERE namespace = ? AND key IN ("
+                    " SELECT key FROM cache_entries WHERE namespace = ?"
+                    " ORDER BY accessed_at LIMIT ?)",
+                    (self.namespace, self.namespace, excess),
+                )
+                self.evictions += excess
+
+    def _delete(self, key: str) -> None:
+        self._conn().execute(
+            "DELETE FROM cache_entries WHERE namespace = ? AND key = ?", (self.namespace, key)
+        )
+
+    def _clear(self) -> None:
+        self._conn().execute("DELETE FROM cache_entries WHERE namespace = ?", (self.namespace,))
+
+    def _stats(self) -> Tuple[Optional[int], Optional[int]]:
+        count, used = self._conn().execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(value)), 0) FROM cache_entries WHERE namespace = ?",
+            (self.namespace,),
+        ).fetchone()
+        return count, used
+
+
+def _encode_command(*args: Any) -> bytes:
+    """Codifica un comando RESP (array de bulk strings)."""
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if isinstance(arg, str):
+            arg = arg.encode("utf-8")
+        elif isinstance(arg, int):
+            arg = str(arg).encode("ascii")
+        parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+    return b"".join(parts)
+
+
+def _read_reply(stream: Any) -> Any:
+    """Lee una respuesta RESP2 del stream del socket."""
+    line = stream.readline()
+    if not line.endswith(b"\r\n"):
+        raise CacheBackendError("Conexión cerrada por el servidor")
+    prefix, rest = line[:1], line[1:-2]
+    if prefix == b"+":
+        return rest.decode("utf-8")
+    if prefix == b"-":
+        raise _ServerError(rest.decode("utf-8", "replace"))
+    if prefix == b":":
+        return int(rest)
+    if prefix == b"$":
+        length = int(rest)
+        if length < 0:
+            return None
+        data = stream.read(length + 2)
+        if len(data) != length + 2:
+            raise CacheBackendError("Respuesta incompleta del servidor")
+        return data[:-2]
+    if prefix == b"*":
+        length = int(rest)
+        if length < 0:
+            return None
+        return [_read_reply(stream) for _ in range(length)]
+    raise CacheBackendError("Respuesta RESP inválida")
+
+
+class RedisBackend(CacheBackend):
+    """
+    Backend en un servidor Redis, con un cliente RESP mínimo (sin dependencias).
+
+    Las claves llevan el prefijo aa:<namespace>:<version>:, así que cada versión
+    del código usa sus propias entradas. El tamaño lo controla el propio servidor
+    (TTL de cada entrada y maxmemory-policy, p. ej. allkeys-lru). Si el servidor
+    no responde, el backend deja de intentarlo durante RETRY_SECONDS.
+
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+
+    name = "redis"
+
+    RETRY_SECONDS = 5.0
+    SCAN_COUNT = 500
+
+    def __init__(self, url: str, namespace: str, version: str = CODE_VERSION, timeout: float = 0.5):
+        """
+        Inicializa el backend (la conexión se abre con el primer uso).
+
+        Args:
+            url: URL redis://[:password@]host[:port][/db]
+            namespace: Espacio de nombres de las claves ("parse", "analysis", ...)
+            version: Versión del código que escribe las entradas
+            timeout: Segundos máximos de espera por conexión y respuesta
+
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        super().__init__()
+        parts = urlsplit(url)
+        self.host = parts.hostname or "127.0.0.1"
+        self.port = parts.port or 6379
+        self.password = unquote(parts.password) if parts.password else None
+        self.db = int(parts.path.strip("/") or 0)
+        self.timeout = timeout
+        self.prefix = f"aa:{namespace}:{version}:"
+        self._sock: Optional[socket.socket] = None
+        self._stream: Any = None
+        self._pid = 0
+        self._retry_at = 0.0
+        self._lock = threading.Lock()
+
+    def _connect(self) -> None:
+        if time.monotonic() < self._retry_at:
+            raise CacheBackendError("Servidor Redis no disponible")
+        try:
+            self._sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        except OSError as e:
+            self._retry_at = time.monotonic() + self.RETRY_SECONDS
+            raise CacheBackendError(str(e))
+        self._stream = self._sock.makefile("rb")
+        self._pid = os.getpid()
+        if self.password:
+            self._send("AUTH", self.password)
+        if self.db:
+            self._send("SELECT", self.db)
+
+    def _close(self) -> None:
+        for resource in (self._stream, self._sock):
+            if resource is not None:
+                try:
+                    resource.close()
+                except OSError:
+                    pass
+        self._sock = None
+        self._stream = None
+
+    def _send(self, *args: Any) -> Any:
+        self._sock.sendall(_encode_command(*args))
+        return _read_reply(self._stream)
+
+    def _command(self, *args: Any) -> Any:
+        with self._lock:
+            if self._sock is not None and self._pid != os.getpid():
+                # Proceso hijo (fork): no compartir el socket del padre
+                self._sock = None
+                self._stream = None
+            try:
+                if self._sock is None:
+                    self._connect()
+                return self._send(*args)
+            except _ServerError:
+                raise
+            except (OSError, ValueError, CacheBackendError) as e:
+                # Conexión rota o respuesta ilegible: reconectar tras RETRY_SECONDS
+                self._close()
+                self._retry_at = time.monotonic() + self.RETRY_SECONDS
+                raise CacheBackendError(str(e))
+
+    def _keys(self) -> List[bytes]:
+        keys: List[bytes] = []
+        cursor = b"0"
+        while True:
+            cursor, batch = self._command("SCAN", cursor, "MATCH", self.prefix + "*", "COUNT", self.SCAN_COUNT)
+            keys.extend(batch)
+            if cursor in (b"0", "0"):
+                return keys
+
+    def _get(self, key: str) -> Optional[bytes]:
+        return self._command("GET", self.prefix + key)
+
+    def _set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        if ttl_seconds:
+            self._command("SET", self.prefix + key, value, "PX", int(ttl_seconds * 1000))
+        else:
+            self._command("SET", self.prefix + key, value)
+
+    def _delete(self, key: str) -> None:
+        self._command("DEL", self.prefix + key)
+
+    def _clear(self) -> None:
+        keys = self._keys()
+        for start in range(0, len(keys), self.SCAN_COUNT):
+            self._command("DEL", *keys[start:start + self.SCAN_COUNT])
+
+    def _stats(self) -> Tuple[Optional[int], Optional[int]]:
+        return len(self._keys()), None
+
+
+def create_shared_backend(namespace: str, max_entries: int) -> Optional[CacheBackend]:
+    """
+    Crea el backend compartido configurado con CACHE_BACKEND.
+
+    Args:
+        namespace: Espacio de nombres de las claves ("parse", "analysis", ...)
+        max_entries: Número máximo de entradas (lo aplica SQLite; en Redis lo
+            controla el servidor)
+
+    Returns:
+        SQLiteBackend o RedisBackend, o None con CACHE_BACKEND=memory (sin nivel
+        compartido)
+
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+    backend = get_cache_backend()
+    if backend == "sqlite":
+        return SQLiteBackend(get_cache_sqlite_path(), namespace, max_entries)
+    if backend == "redis":
+        return RedisBackend(get_cache_redis_url(), namespace)
+    return None
@@ -0,0 +1,259 @@
+"""
+Plazo por petición para el análisis.
+
+Algunas operaciones de SymPy (simplify sobre sumatorias anidadas, limit en el
+Teorema Maestro) pueden tardar minutos con ciertas entradas, y mientras tanto la
+petición ocupa un worker del motor. Cada análisis corre dentro de un plazo
+(deadline_scope) que se propaga por una variable de contexto, sin pasarlo de
+función en función:
+
+- check_deadline: punto de control cooperativo entre operaciones costosas.
+- interruptible: ejecuta una operación que se corta al agotarse el plazo. En el
+  hilo principal (workers del motor) se usa una alarma
+  (SIGALRM); en otros hilos solo se comprueba el plazo antes de empezar.
+- killable: como interruptible, pero fuera del hilo principal ejecuta la
+  operación en un proceso hijo (fork) que se mata al agotarse el plazo. Crear el
+  proceso cuesta unos 10 ms, así que se reserva para las operaciones que pueden
+  no terminar nunca en la práctica (limit).
+
+Al agotarse el plazo se lanza DeadlineExceeded. Hereda de BaseException para
+que los `except Exception` del pipeline (que tragan los errores de SymPy y
+siguen con un fallback) no la oculten: la capturan los analizadores, que
+devuelven el mejor resultado parcial marcado como degradado.
+
+El plazo es un instante absoluto (time.time()), así que puede enviarse a otro
+proceso tal cual.
+
+Author: Juan Camilo Cruz Parra (@Cruz1122)
+"""
+import multiprocessing
+import signal
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator, Optional
+
+
+class DeadlineExceeded(BaseException):
+    """
+    Se agotó el plazo del análisis.
+
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+
+
+class Deadline:
+    """
+    Instante límite de un análisis.
+
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+
+    def __init__(self, expires_at: float):
+        """
+        Inicializa el plazo.
+
+        Args:
+            expires_at: Instante límite (segundos desde epoch, como time.time())
+
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        self.expires_at = expires_at
+
+    def remaining(self) -> float:
+        """Segundos que quedan (0 si ya se agotó)."""
+        return max(0.0, self.expires_at - time.time())
+
+    def expired(self) -> bool:
+        """Si el plazo ya se agotó."""
+        return time.time() >= self.expires_at
+
+
+_current: ContextVar[Optional[Deadline]] = ContextVar("analysis_deadline", default=None)
+
+# Alarma armada por un interruptible en curso (solo se usa en el hilo principal)
+_alarm_armed = False
+
+
+def deadline_after(seconds: float) -> Optional[float]:
+    """
+    Calcula el instante límite a partir de ahora.
+
+    Args:
+        seconds: Duración del plazo (0 o menos = sin plazo)
+
+    Returns:
+        Instante límite o None si no hay plazo
+
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+    if seconds <= 0:
+        return None
+    return time.time() + seconds
+
+
+def current_deadline() -> Optional[Deadline]:
+    """
+    Obtiene el plazo del contexto actual.
+
+    Returns:
+        Deadline o None si no hay plazo
+
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+    return _current.get()
+
+
+@contextmanager
+def deadline_scope(expires_at: Optional[float]) -> Iterator[Optional[Deadline]]:
+    """
+    Ejecuta el bloque con un plazo. Si ya hay uno más corto, se conserva ese.
+
+    Args:
+        expires_at: Instante límite (ver deadline_after) o None para no cambiar
+            el plazo actual
+
+    Yields:
+        El plazo vigente dentro del bloque (o None)
+
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+    outer = _current.get()
+    if expires_at is None or (outer is not None and outer.expires_at <= expires_at):
+        yield outer
+        return
+    token = _current.set(Deadline(expires_at))
+    try:
+        yield _current.get()
+    finally:
+        _current.reset(token)
+
+
+def check_deadline() -> Optional[Deadline]:
+    """
+    Punto de control: lanza DeadlineExceeded si el plazo actual se agotó.
+
+    Returns:
+        El plazo actual (o None si no hay)
+
+    Raises:
+        DeadlineExceeded: Si el plazo se agotó
+
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+    deadline = _current.get()
+    if deadline is not None and deadline.expired():
+        raise DeadlineExceeded("Tiempo de análisis agotado")
+    return deadline
+
+
+def _on_alarm(signum: int, frame: Any) -> None:
+    raise DeadlineExceeded("Tiempo de análisis agotado")
+
+
+def _can_alarm() -> bool:
+    return hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+
+
+def interruptible(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Ejecuta fn(*args, **kwargs) cortándola si se agota el plazo.
+
+    En el hilo principal fn se interrumpe con una alarma en el instante límite
+    (las llamadas anidadas quedan cubiertas por la alarma exterior) y, al volver,
+    se comprueba de nuevo el plazo por si fn tragó la alarma. En otros hilos solo
+    se comprueba el plazo antes de empezar.
+
+    Args:
+        fn: Función a ejecutar
+        *args: Argumentos posicionales
+        **kwargs: Argumentos con nombre
+
+    Returns:
+        Resultado de fn
+
+    Raises:
+        DeadlineExceeded: Si el plazo se agotó antes o durante la ejecución
+
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+    global _alarm_armed
+    deadline = check_deadline()
+    if deadline is None or _alarm_armed or not _can_alarm():
+        return fn(*args, **kwargs)
+
+    previous = signal.signal(signal.SIGALRM, _on_alarm)
+    _alarm_armed = True
+    try:
+        signal.setitimer(signal.ITIMER_REAL, max(deadline.remaining(), 0.001))
+        result = fn(*args, **kwargs)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous if previous is not None else signal.SIG_DFL)
+        _alarm_armed = False
+    # La alarma es de un solo disparo; si algún `except:` de fn la tragó, se
+    # vuelve a lanzar aquí en lugar de devolver un resultado a medias
+    check_deadline()
+    return result
+
+
+def _run_child(conn: Any, fn: Callable[..., Any], args: Any, kwargs: Any) -> None:
+    """Ejecuta fn en el proceso hijo de killable y envía el resultado."""
+    try:
+        conn.send((True, fn(*args, **kwargs)))
+    except Exception as e:
+        conn.send((False, f"{type(e).__name__}: {e}"))
+    finally:
+        conn.close()
+
+
+def killable(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Ejecuta fn(*args, **kwargs) garantizando que termina con el plazo.
+
+    En el hilo principal equivale a interruptible. En otros hilos (motor de
+    ejecución en modo hilos) fn corre en un proceso hijo creado con fork, que se
+    mata al agotarse el plazo. fn, sus argumentos y su resultado deben poder
+    serializarse con pickle. Sin plazo, o sin fork, fn corre directamente.
+
+    Args:
+        fn: Función a ejecutar
+        *args: Argumentos posicionales
+        **kwargs: Argumentos con nombre
+
+    Returns:
+        Resultado de fn
+
+    Raises:
+        DeadlineExceeded: Si el plazo se agotó antes o durante la ejecución
+        RuntimeError: Si fn falló en el proceso hijo o este terminó sin responder
+
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+    deadline = check_deadline()
+    if deadline is None or _can_alarm():
+        return interruptible(fn, *args, **kwargs)
+    if "fork" not in multiprocessing.get_all_start_methods():
+        return fn(*args, **kwargs)
+
+    context = multiprocessing.get_context("fork")
+    receiver, sender = context.Pipe(duplex=False)
+    child = context.Process(target=_run_child, args=(sender, fn, args, kwargs), daemon=True)
+    child.start()
+    sender.close()
+    try:
+        if not receiver.poll(deadline.remaining()):
+            raise DeadlineExceeded("Tiempo de análisis agotado")
+        try:
+            ok, value = receiver.recv()
+        except EOFError:
+            raise RuntimeError("El proceso de la operación terminó sin responder")
+    finally:
+        if child.is_alive():
+            child.kill()
+        child.join()
+        receiver.close()
+    if not ok:
+        raise RuntimeError(value)
+    return value
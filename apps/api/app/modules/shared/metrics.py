@@ -0,0 +1,357 @@
+"""
+Métricas de latencia por etapa del análisis, en formato de texto de Prometheus.
+
+Una petición de análisis pasa por etapas bien separadas (parseo, clasificación,
+recorrido del AST, cierre de sumatorias, construcción de T_open/T_polynomial,
+cotas asintóticas y, en los recursivos, extracción y resolución de la
+recurrencia). Cada etapa se mide con `phase`, que suma su duración en las
+medidas de la petición actual (una variable de contexto, como el plazo de
+shared.deadline):
+
+- Fuera de una petición (calentamiento, uso como biblioteca) `phase` no mide
+  nada: solo consulta la variable de contexto.
+- Al terminar la petición, main.py registra cada etapa en un histograma
+  etiquetado por endpoint, modo y tipo de algoritmo (expuesto en /metrics) y
+  la devuelve en la cabecera Server-Timing.
+- Lo que corre en otro proceso (workers del motor de ejecución) se
+  ejecuta con `timed`, que devuelve las medidas junto al resultado para que el
+  proceso de la petición las sume con `merge_phases`.
+
+Las medidas de una petición no se protegen con locks: cada análisis (y cada
+elemento de un lote) mide en su propio ámbito, y lo que corre en paralelo
+devuelve sus medidas con `timed`.
+
+Author: Juan Camilo Cruz Parra (@Cruz1122)
+"""
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# Límites superiores (segundos) de los buckets de los histogramas de etapas
+PHASE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Etiquetas de cada etapa registrada; las que no se conocen valen "none"
+PHASE_LABELS = ("endpoint", "mode", "kind")
+
+# Valores admitidos de las etiquetas que llegan del cliente (mode, algorithm_kind):
+# cualquier otro se registra como OTHER_LABEL para que /metrics tenga un número
+# acotado de series
+LABEL_VALUES = {
+    "mode": frozenset(("worst", "best", "avg", "all")),
+    "kind": frozenset(("iterative", "recursive", "hybrid", "unknown", "dummy")),
+}
+OTHER_LABEL = "other"
+
+# Content-Type del formato de texto de Prometheus
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class PhaseTimings:
+    """
+    Duración acumulada de cada etapa de una petición, con sus etiquetas.
+
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+
+    __slots__ = ("phases", "labels")
+
+    def __init__(self):
+        """
+        Inicializa unas medidas vacías.
+
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        self.phases: Dict[str, float] = {}
+        self.labels: Dict[str, str] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        """Suma seconds a la etapa name (una etapa puede repetirse, p. ej. en mode="all")."""
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def label(self, **labels: Optional[str]) -> None:
+        """
+        Fija etiquetas (endpoint, mode, kind); los valores vacíos se ignoran y los
+        de mode y kind fuera de LABEL_VALUES se guardan como OTHER_LABEL.
+        """
+        for key, value in labels.items():
+            if value:
+                allowed = LABEL_VALUES.get(key)
+                self.labels[key] = value if allowed is None or value in allowed else OTHER_LABEL
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Copia serializable de las medidas (para enviarla desde otro proceso).
+
+        Returns:
+            {"phases": {etapa: segundos}, "labels": {etiqueta: valor}}
+
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        return {"phases": dict(self.phases), "labels": dict(self.labels)}
+
+    def merge(self, snapshot: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Suma las medidas de un snapshot (ver timed).
+
+        Args:
+            snapshot: Resultado de snapshot() en otro ámbito o proceso
+
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        for name, seconds in snapshot.get("phases", {}).items():
+            self.add(name, seconds)
+        self.label(**snapshot.get("labels", {}))
+
+    def server_timing(self) -> str:
+        """
+        Valor de la cabecera Server-Timing (duraciones en milisegundos).
+
+        Returns:
+            Por ejemplo "parse;dur=1.204, visit;dur=0.310"
+
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        return ", ".join(f"{name};dur={seconds * 1000:.3f}" for name, seconds in self.phases.items())
+
+
+_current: ContextVar[Optional[PhaseTimings]] = ContextVar("phase_timings", default=None)
+
+
+class phase:
+    """
+    Mide la duración del bloque como la etapa name de la petición actual.
+
+    Sin medidas activas (fuera de collect_phases) no hace nada. La duración se
+    registra también si el bloque lanza una excepción (p. ej. DeadlineExceeded).
+
+    Example:
+        >>> with phase("visit"):
+        ...     analyzer.visit(ast, mode)
+
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+
+    __slots__ = ("name", "timings", "started")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.timings: Optional[PhaseTimings] = None
+        self.started = 0.0
+
+    def __enter__(self) -> "phase":
+        self.timings = _current.get()
+        if self.timings is not None:
+            self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> bool:
+        if self.timings is not None:
+            self.timings.add(self.name, time.perf_counter() - self.started)
+        return False
+
+
+@contextmanager
+def collect_phases(**labels: Optional[str]) -> Iterator[PhaseTimings]:
+    """
+    Ejecuta el bloque midiendo sus etapas en unas medidas nuevas.
+
+    Args:
+        **labels: Etiquetas iniciales (endpoint, mode, kind)
+
+    Yields:
+        Las medidas del bloque
+
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+    timings = PhaseTimings()
+    timings.label(**labels)
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+
+def label_phases(**labels: Optional[str]) -> None:
+    """
+    Fija etiquetas de las medidas actuales (si las hay).
+
+    Args:
+        **labels: mode y/o kind de la petición
+
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+    timings = _current.get()
+    if timings is not None:
+        timings.label(**labels)
+
+
+def merge_phases(snapshot: Optional[Dict[str, Dict[str, Any]]]) -> None:
+    """
+    Suma a las medidas actuales (si las hay) las devueltas por timed.
+
+    Args:
+        snapshot: Medidas de otro ámbito o proceso
+
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+    timings = _current.get()
+    if timings is not None and snapshot:
+        timings.merge(snapshot)
+
+
+def timed(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Tuple[Any, Dict[str, Dict[str, Any]]]:
+    """
+    Ejecuta fn midiendo sus etapas aparte. Para enviar al motor de ejecución o a
+    un pool de procesos, donde no llegan las medidas de la petición.
+
+    Args:
+        fn: Función a ejecutar (de nivel de módulo si corre en otro proceso)
+        *args: Argumentos posicionales
+        **kwargs: Argumentos con nombre
+
+    Returns:
+        Tupla (resultado de fn, snapshot de sus medidas) para merge_phases
+
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+    with collect_phases() as timings:
+        result = fn(*args, **kwargs)
+    return result, timings.snapshot()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}"
+
+
+class Histogram:
+    """
+    Histograma acumulativo con etiquetas, en formato de texto de Prometheus.
+
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...], buckets: Tuple[float, ...]):
+        """
+        Inicializa el histograma.
+
+        Args:
+            name: Nombre de la métrica
+            documentation: Texto de la línea HELP
+            labelnames: Nombres de las etiquetas, en orden
+            buckets: Límites superiores de los buckets, en orden creciente
+
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = buckets
+        # Valores de etiquetas -> [conteo por bucket (el último es +Inf), suma, total]
+        self._series: Dict[Tuple[str, ...], List[Any]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: Tuple[str, ...], value: float) -> None:
+        """
+        Registra una observación.
+
+        Args:
+            labels: Valores de las etiquetas, en el orden de labelnames
+            value: Valor observado (segundos)
+
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        bucket = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][bucket] += 1
+            series[1] += value
+            series[2] += 1
+
+    def clear(self) -> None:
+        """Descarta todas las observaciones."""
+        with self._lock:
+            self._series.clear()
+
+    def render(self) -> List[str]:
+        """
+        Líneas del histograma en formato de texto de Prometheus.
+
+        Returns:
+            HELP, TYPE y, por cada combinación de etiquetas, sus buckets
+            acumulados, _sum y _count
+
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        with self._lock:
+            series = sorted((labels, [list(data[0]), data[1], data[2]]) for labels, data in self._series.items())
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        bounds = [repr(float(bound)) for bound in self.buckets] + ["+Inf"]
+        for labels, (counts, total, count) in series:
+            cumulative = 0
+            for bound, bucket_count in zip(bounds, counts):
+                cumulative += bucket_count
+                label_text = _format_labels(self.labelnames, labels, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{label_text} {cumulative}")
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {repr(float(total))}")
+            lines.append(f"{self.name}_count{label_text} {count}")
+        return lines
+
+
+_phase_histogram = Histogram(
+    "analysis_phase_duration_seconds",
+    "Duración de cada etapa del pipeline de análisis por petición.",
+    PHASE_LABELS + ("phase",),
+    PHASE_BUCKETS,
+)
+
+
+def get_phase_histogram() -> Histogram:
+    """
+    Obtiene el histograma de duración por etapa del proceso.
+
+    Returns:
+        Histograma analysis_phase_duration_seconds
+
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+    return _phase_histogram
+
+
+def observe_phases(timings: PhaseTimings) -> None:
+    """
+    Registra cada etapa de una petición terminada en el histograma.
+
+    Args:
+        timings: Medidas de la petición (ver collect_phases)
+
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+    labels = tuple(timings.labels.get(name, "none") for name in PHASE_LABELS)
+    for name, seconds in timings.phases.items():
+        _phase_histogram.observe(labels + (name,), seconds)
+
+
+def render_metrics() -> str:
+    """
+    Exposición completa de las métricas del proceso para /metrics.
+
+    Returns:
+        Texto en formato de Prometheus (ver PROMETHEUS_CONTENT_TYPE)
+
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+    return "\n".join(_phase_histogram.render()) + "\n"
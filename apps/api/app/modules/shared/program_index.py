@@ -0,0 +1,254 @@
+"""
+Índice de un programa construido en una sola pasada sobre el AST.
+
+El clasificador, los analizadores y el ejecutor necesitan los mismos hechos del
+AST (procedimiento principal, procedimientos por nombre, llamadas dentro de cada
+procedimiento, si hay bucles) y antes los obtenían recorriendo el árbol una y
+otra vez; el ejecutor incluso recorría el cuerpo del programa en cada llamada
+ejecutada. ProgramIndex recorre el AST una vez y responde esas preguntas con
+búsquedas en diccionarios.
+
+Los índices se guardan en un registro LRU pequeño indexado por la identidad del
+AST (get_program_index), así que todos los consumidores de una misma petición
+comparten el mismo índice. El registro mantiene viva una referencia al AST, de
+modo que su id no puede reutilizarse mientras la entrada exista. Los AST no se
+modifican después de parsearse; si alguien lo hiciera, el índice quedaría
+desactualizado.
+
+Cada índice lleva además un memo (derived) donde los consumidores guardan
+resultados que solo dependen del programa (p. ej. la recurrencia extraída). Los
+handles de programa (analysis.programs) mantienen vivo su índice y lo vuelven a
+registrar en cada petición, así que ese trabajo se reutiliza entre endpoints.
+
+Author: Juan Camilo Cruz Parra (@Cruz1122)
+"""
+import threading
+from collections import Counter, OrderedDict
+from typing import Any, Dict, List, Optional
+
+# Claves que no contienen nodos hijos
+_SKIP_KEYS = ("type", "pos")
+
+# Entradas del registro de índices (una por AST en uso)
+PROGRAM_INDEX_REGISTRY_SIZE = 32
+
+
+def call_name(node: Dict[str, Any]) -> Optional[str]:
+    """
+    Obtiene el nombre del procedimiento invocado por un nodo Call.
+
+    Args:
+        node: Nodo Call del AST
+
+    Returns:
+        Nombre de la llamada (name, callee, function o target.name) o None
+
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+    target = node.get("target")
+    return (
+        node.get("name")
+        or node.get("callee")
+        or node.get("function")
+        or (target.get("name") if isinstance(target, dict) else None)
+    )
+
+
+class ProgramIndex:
+    """
+    Hechos de un programa obtenidos en un único recorrido del AST.
+
+    - procedures: ProcDef de primer nivel por nombre (el primero gana)
+    - main_procedure: primer ProcDef del programa
+    - type_counts: número de nodos de cada tipo
+    - call_graph: procedimiento -> nombres que invoca, en orden (None = fuera de
+      cualquier procedimiento)
+    - llamadas de cada procedimiento en preorden (calls_in) y enlace al padre de
+      cada nodo (parent)
+    - derived: memo de resultados derivados del programa, a cargo de quien los usa
+
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+
+    def __init__(self, ast: Any):
+        """
+        Construye el índice recorriendo el AST una vez.
+
+        Args:
+            ast: AST del programa (normalmente un nodo Program)
+
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        self.ast = ast
+        self.procedures: Dict[str, Dict[str, Any]] = {}
+        self.main_procedure: Optional[Dict[str, Any]] = None
+        self.type_counts: Counter = Counter()
+        self.call_graph: Dict[Optional[str], List[str]] = {}
+        self.derived: Dict[Any, Any] = {}
+        self._procedures_ci: Dict[str, Dict[str, Any]] = {}
+        self._calls_by_proc: Dict[int, List[Dict[str, Any]]] = {}
+        self._parents: Dict[int, Any] = {}
+
+        if isinstance(ast, dict):
+            body = ast.get("body", [])
+            for item in body if isinstance(body, list) else []:
+                if isinstance(item, dict) and item.get("type") == "ProcDef":
+                    if self.main_procedure is None:
+                        self.main_procedure = item
+                    name = item.get("name")
+                    if name:
+                        self.procedures.setdefault(name, item)
+                        self._procedures_ci.setdefault(name.lower(), item)
+        self._walk(ast)
+
+    def _walk(self, root: Any) -> None:
+        # Preorden iterativo, hijos en el orden de las claves del dict (el mismo
+        # orden en que los recorridos recursivos anteriores encontraban las llamadas)
+        stack = [(root, None, None)]
+        while stack:
+            node, parent, proc = stack.pop()
+            if not isinstance(node, dict):
+                continue
+            self._parents[id(node)] = parent
+            node_type = node.get("type")
+            if node_type:
+                self.type_counts[node_type] += 1
+            if node_type == "ProcDef":
+                proc = node
+                self._calls_by_proc.setdefault(id(node), [])
+            elif isinstance(node_type, str) and node_type.lower() == "call":
+                if proc is not None:
+                    self._calls_by_proc[id(proc)].append(node)
+                caller = proc.get("name") if proc is not None else None
+                callees = self.call_graph.setdefault(caller, [])
+                name = call_name(node)
+                if name and name not in callees:
+                    callees.append(name)
+
+            children = []
+            for key, value in node.items():
+                if key in _SKIP_KEYS:
+                    continue
+                if isinstance(value, dict):
+                    children.append(value)
+                elif isinstance(value, list):
+                    children.extend(item for item in value if isinstance(item, dict))
+            for child in reversed(children):
+                stack.append((child, node, proc))
+
+    def find_procedure(self, name: str, case_sensitive: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Busca un ProcDef de primer nivel por nombre.
+
+        Args:
+            name: Nombre del procedimiento
+            case_sensitive: Si False, compara sin distinguir mayúsculas
+
+        Returns:
+            Nodo ProcDef o None
+
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        if not name:
+            return None
+        if case_sensitive:
+            return self.procedures.get(name)
+        return self._procedures_ci.get(name.lower())
+
+    def has_type(self, *node_types: str) -> bool:
+        """
+        Indica si el programa contiene algún nodo de los tipos dados.
+
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        return any(self.type_counts.get(t, 0) for t in node_types)
+
+    def calls_in(self, proc_def: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Devuelve las llamadas dentro de un procedimiento, en preorden.
+
+        Se devuelven todos los nodos cuyo tipo es "call" (sin distinguir
+        mayúsculas); cada consumidor filtra con su propio criterio de nombre.
+
+        Args:
+            proc_def: Nodo ProcDef
+
+        Returns:
+            Lista de nodos Call, o None si proc_def no pertenece a este programa
+            (el llamador debe recorrer el nodo por su cuenta)
+
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        return self._calls_by_proc.get(id(proc_def))
+
+    def parent(self, node: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Devuelve el nodo padre (el dict que contiene a node), o None en la raíz.
+
+        Author: Juan Camilo Cruz Parra (@Cruz1122)
+        """
+        return self._parents.get(id(node))
+
+
+class _ProgramIndexRegistry:
+    """Registro LRU y thread-safe de índices por identidad del AST."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[int, ProgramIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, ast: Any) -> ProgramIndex:
+        key = id(ast)
+        with self._lock:
+            index = self._entries.get(key)
+            if index is not None and index.ast is ast:
+                self._entries.move_to_end(key)
+                return index
+        index = ProgramIndex(ast)
+        self.put(index)
+        return index
+
+    def put(self, index: ProgramIndex) -> None:
+        with self._lock:
+            self._entries[id(index.ast)] = index
+            self._entries.move_to_end(id(index.ast))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_registry = _ProgramIndexRegistry(PROGRAM_INDEX_REGISTRY_SIZE)
+
+
+def get_program_index(ast: Any) -> ProgramIndex:
+    """
+    Obtiene el índice de un AST, construyéndolo la primera vez.
+
+    Todos los consumidores que reciben el mismo objeto AST comparten el índice.
+
+    Args:
+        ast: AST del programa
+
+    Returns:
+        ProgramIndex del AST
+
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+    return _registry.get(ast)
+
+
+def register_program_index(index: ProgramIndex) -> None:
+    """
+    Registra (o refresca) un índice ya construido, para que get_program_index
+    de su AST lo devuelva aunque el registro lo hubiera expulsado.
+
+    Args:
+        index: ProgramIndex a registrar
+
+    Author: Juan Camilo Cruz Parra (@Cruz1122)
+    """
+    _registry.put(index)
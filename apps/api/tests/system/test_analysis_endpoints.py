@@ -76,6 +76,48 @@ class TestDummyEndpoint:
         assert response.status_code == 200
 
 
+class TestCacheEndpoint:
+    """Tests para el endpoint /analyze/cache."""
+
+    def test_cache_counts_repeated_analysis(self):
+        """Test: Un análisis repetido sale de la caché y se refleja en /cache"""
+        source = "cacheado(n) BEGIN\n    x <- n;\nEND"
+        first = client.post("/analyze/open", json={"source": source, "mode": "worst"}).json()
+        before = client.get("/analyze/cache").json()["stats"]
+        second = client.post("/analyze/open", json={"source": source, "mode": "worst"}).json()
+        after = client.get("/analyze/cache").json()["stats"]
+        assert second == first
+        assert after["hits"] == before["hits"] + 1
+        assert after["bytes"] > 0
+        assert 0.0 <= after["hit_ratio"] <= 1.0
+
+
+class TestProgramHandles:
+    """Tests para program_id en /analyze/detect-methods, /analyze/open y /analyze/trace."""
+
+    def test_program_id_reused_across_endpoints(self):
+        """Test: El programId devuelto sirve en lugar de source"""
+        source = "handle(n) BEGIN\n    FOR i <- 1 TO n DO BEGIN\n        x <- i;\n    END\nEND"
+        first = client.post("/analyze/open", json={"source": source, "mode": "worst"}).json()
+        program_id = first["programId"]
+        second = client.post("/analyze/open", json={"program_id": program_id, "mode": "worst"}).json()
+        assert second == first
+        trace = client.post("/analyze/trace", json={"program_id": program_id, "input_size": 2}).json()
+        assert trace["ok"] is True
+        assert trace["programId"] == program_id
+
+    def test_unknown_program_id(self):
+        """Test: Un programId desconocido pide reenviar el código"""
+        data = client.post("/analyze/open", json={"program_id": "desconocido"}).json()
+        assert data["ok"] is False
+        assert data["programExpired"] is True
+
+    def test_source_or_program_id_required(self):
+        """Test: Sin source ni program_id la solicitud es inválida"""
+        response = client.post("/analyze/trace", json={"case": "worst"})
+        assert response.status_code == 422
+
+
 class TestClosedEndpoint:
     """Tests para el endpoint /analyze/closed."""
 
@@ -3,13 +3,26 @@ Tests de sistema para el endpoint /health.
 
 Author: Juan Camilo Cruz Parra (@Cruz1122)
 """
+from unittest.mock import patch
+
 import pytest
 from fastapi.testclient import TestClient
+from app.core.engine import ExecutionEngine
+from app.core.warmup import get_warmup_state
 from app.main import app
 
 client = TestClient(app)
 
 
+@pytest.fixture(autouse=True)
+def warmup_state():
+    """Deja el calentamiento terminado y restaura el estado al final."""
+    state = get_warmup_state()
+    state.finish(12.5, 3, 0)
+    yield state
+    state.reset()
+
+
 class TestHealthEndpoint:
     """Tests para el endpoint /health."""
 
@@ -18,7 +31,11 @@ class TestHealthEndpoint:
         response = client.get("/health")
         assert response.status_code == 200
         data = response.json()
-        assert data == {"status": "ok"}
+        assert data["status"] == "ok"
+        assert data["ready"] is True
+        assert data["warmup"] == {
+            "status": "done", "durationMs": 12.5, "programs": 3, "failures": 0, "skipped": 0, "error": None,
+        }
 
     def test_health_method_get(self):
         """Test: Endpoint /health acepta método GET"""
@@ -30,3 +47,41 @@ class TestHealthEndpoint:
         response = client.post("/health")
         assert response.status_code == 405  # Method Not Allowed
 
+    def test_health_not_ready_during_warmup(self, warmup_state):
+        """Test: Mientras corre el calentamiento /health responde 503"""
+        warmup_state.reset()
+        warmup_state.start()
+        response = client.get("/health")
+        assert response.status_code == 503
+        data = response.json()
+        assert data["status"] == "starting"
+        assert data["ready"] is False
+        assert data["warmup"]["status"] == "running"
+
+    def test_health_ready_when_warmup_disabled(self, warmup_state):
+        """Test: Con el calentamiento desactivado el servidor está listo"""
+        warmup_state.disable()
+        response = client.get("/health")
+        assert response.status_code == 200
+        assert response.json()["ready"] is True
+
+    def test_health_not_ready_until_engine_warm(self):
+        """Test: Con los workers del motor calentando /health responde 503"""
+        engine = ExecutionEngine(workers=2)
+        with patch("app.main.get_engine", return_value=engine):
+            response = client.get("/health")
+        assert response.status_code == 503
+        data = response.json()
+        assert data["ready"] is False
+        assert data["warmup"]["status"] == "done"
+        assert data["engine"]["ready"] is False
+
+    def test_health_failed_warmup(self, warmup_state):
+        """Test: Si el calentamiento falló /health responde 503 con status failed"""
+        warmup_state.reset()
+        warmup_state.fail(3.0, "ImportError: sin sympy")
+        response = client.get("/health")
+        assert response.status_code == 503
+        data = response.json()
+        assert data["status"] == "failed"
+        assert data["warmup"]["error"] == "ImportError: sin sympy"
@@ -69,3 +69,111 @@ END
         assert data["ok"] is True
         assert isinstance(data["ast"], dict)
 
+    
+    def test_repeated_parse_hits_cache(self):
+        """Test: Reenviar el mismo código se sirve desde la caché de parsing"""
+        source = "{ cache_probe <- 1; }"
+        client.post("/grammar/parse", json={"source": source})
+        before = client.get("/grammar/cache").json()["stats"]
+        response = client.post("/grammar/parse", json={"source": source})
+        after = client.get("/grammar/cache").json()["stats"]
+        
+        assert response.status_code == 200
+        assert response.json()["ok"] is True
+        assert after["hits"] == before["hits"] + 1
+
+    def test_incremental_parse_roundtrip(self):
+        """Test: Parseo incremental con documentId y ediciones del editor"""
+        source = "test(n) BEGIN\n    x <- 1;\nEND\ny <- 2;\n"
+        first = client.post("/grammar/parse/incremental", json={"source": source}).json()
+        assert first["ok"] is True
+        assert first["documentId"]
+
+        edit = {
+            "range": {"startLineNumber": 2, "startColumn": 10, "endLineNumber": 2, "endColumn": 11},
+            "text": "5",
+        }
+        response = client.post(
+            "/grammar/parse/incremental",
+            json={"documentId": first["documentId"], "edits": [edit]},
+        )
+        data = response.json()
+        full = client.post("/grammar/parse", json={"source": source.replace("x <- 1", "x <- 5")}).json()
+
+        assert response.status_code == 200
+        assert data["ok"] is True
+        assert data["incremental"]["incremental"] is True
+        assert data["ast"] == full["ast"]
+
+    def test_incremental_parse_unknown_document(self):
+        """Test: Un documentId desconocido pide reenviar el código"""
+        response = client.post(
+            "/grammar/parse/incremental",
+            json={"documentId": "desconocido", "edits": []},
+        )
+        data = response.json()
+
+        assert response.status_code == 200
+        assert data["ok"] is False
+        assert data["documentExpired"] is True
+
+    def test_incremental_parse_malformed_edits(self):
+        """Test: Ediciones mal formadas responden 200 con ok=false y el error"""
+        source = "x <- 1;\n"
+        first = client.post("/grammar/parse/incremental", json={"source": source}).json()
+        edit = {"range": {"startLineNumber": "dos", "startColumn": 1, "endLineNumber": 1, "endColumn": 1}, "text": ""}
+        for payload in (
+            {"documentId": first["documentId"], "edits": [edit]},
+            {"documentId": first["documentId"], "edits": [42]},
+            {"documentId": {"id": 1}, "edits": []},
+        ):
+            response = client.post("/grammar/parse/incremental", json=payload)
+            data = response.json()
+            assert response.status_code == 200
+            assert data["ok"] is False
+            assert data["error"]
+
+    def test_batch_parse_keeps_input_order(self):
+        """Test: El lote devuelve un resultado por programa, en orden y con tiempos"""
+        sources = ["x <- 1;", "test(n) BEGIN\n  x <- ;\nEND", "y <- 2;"]
+        response = client.post("/grammar/parse/batch", json={"sources": sources})
+        data = response.json()
+
+        assert response.status_code == 200
+        assert data["ok"] is False
+        assert data["count"] == 3
+        assert [r["ok"] for r in data["results"]] == [True, False, True]
+        assert data["results"][2]["ast"] == client.post("/grammar/parse", json={"source": sources[2]}).json()["ast"]
+        assert all(r["durationMs"] >= 0 for r in data["results"])
+
+    def test_batch_parse_invalid_body(self):
+        """Test: 'sources' debe ser una lista de strings"""
+        response = client.post("/grammar/parse/batch", json={"sources": "x <- 1;"})
+        data = response.json()
+
+        assert response.status_code == 200
+        assert data["ok"] is False
+        assert data["results"] == []
+
+    def test_validate_lexer_mode(self):
+        """Test: /grammar/validate solo reporta errores léxicos y de balance"""
+        ok = client.post("/grammar/validate", json={"source": "f(n) BEGIN x <- (1); END"}).json()
+        bad = client.post("/grammar/validate", json={"input": "f(n) BEGIN x <- (1; END"}).json()
+
+        assert ok["ok"] is True
+        assert ok["mode"] == "lexer"
+        assert ok["errors"] == []
+        assert bad["ok"] is False
+        assert bad["errors"][0] == {"line": 1, "column": 17, "message": "'(' sin cerrar (falta ')')"}
+        assert bad["error"] == bad["errors"][0]["message"]
+
+    def test_parse_budget_deep_nesting(self):
+        """Test: Un anidamiento patológico devuelve un error claro en lugar de fallar"""
+        source = "x <- " + "(" * 5000 + "1" + ")" * 5000 + ";"
+        response = client.post("/grammar/parse", json={"source": source})
+        data = response.json()
+
+        assert response.status_code == 200
+        assert data["ok"] is False
+        assert "profundidad máxima" in data["error"]
+        assert set(data["errors"][-1]) == {"line", "column", "message"}
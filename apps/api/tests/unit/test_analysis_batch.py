@@ -0,0 +1,135 @@
+"""
+Tests unitarios para el análisis por lotes (app.modules.analysis.batch y
+POST /analyze/batch).
+
+Author: Juan Camilo Cruz Parra (@Cruz1122)
+"""
+import asyncio
+import json
+import os
+import unittest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from app.core.engine import EngineBusy, ExecutionEngine
+from app.main import app
+from app.modules.analysis.batch import batch_concurrency
+
+BURBUJA = """burbuja(A[n], n) BEGIN
+  FOR i <- 1 TO n - 1 DO BEGIN
+    FOR j <- 1 TO n - i DO BEGIN
+      IF (A[j] > A[j + 1]) THEN BEGIN
+        temp <- A[j];
+      END
+    END
+  END
+END"""
+
+ERRONEO = """erroneo(n) BEGIN
+  x <- ;
+END"""
+
+
+class _FakeAnalysis:
+    """Sustituto de analyze_algorithm_async que duerme según el código y cuenta la concurrencia."""
+
+    def __init__(self):
+        self.running = 0
+        self.max_running = 0
+
+    async def __call__(self, source=None, **kwargs):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(float(source))
+        finally:
+            self.running -= 1
+        return {"ok": True, "source": source, "mode": kwargs["mode"]}
+
+
+def _lines(response):
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+class TestBatchConcurrency(unittest.TestCase):
+    """Tests para batch_concurrency."""
+
+    def test_limits(self):
+        """Test: Por defecto los workers del motor; lo pedido se limita a [1, workers]"""
+        with patch("app.modules.analysis.batch.get_engine", return_value=ExecutionEngine(workers=4)):
+            self.assertEqual(batch_concurrency(), 4)
+            self.assertEqual(batch_concurrency(2), 2)
+            self.assertEqual(batch_concurrency(100), 4)
+            self.assertEqual(batch_concurrency(0), 1)
+
+    def test_thread_mode(self):
+        """Test: Sin pool de procesos se analiza un elemento a la vez"""
+        with patch("app.modules.analysis.batch.get_engine", return_value=ExecutionEngine(workers=0)):
+            self.assertEqual(batch_concurrency(8), 1)
+
+
+class TestBatchEndpoint(unittest.TestCase):
+    """Tests del endpoint POST /analyze/batch."""
+
+    def setUp(self):
+        self.client = TestClient(app)
+        self.engine = patch("app.modules.analysis.batch.get_engine", return_value=ExecutionEngine(workers=4))
+        self.engine.start()
+
+    def tearDown(self):
+        self.engine.stop()
+
+    def test_streams_in_completion_order(self):
+        """Test: Una línea por elemento en orden de finalización y un resumen al final"""
+        fake = _FakeAnalysis()
+        items = [{"id": "lento", "source": "0.3"}, {"id": "rapido", "source": "0", "mode": "best"}]
+        with patch("app.modules.analysis.batch.analyze_algorithm_async", fake):
+            response = self.client.post("/analyze/batch", json={"items": items})
+        self.assertEqual(response.headers["content-type"], "application/x-ndjson")
+        first, second, summary = _lines(response)
+        self.assertEqual((first["id"], first["index"]), ("rapido", 1))
+        self.assertEqual(first["result"]["mode"], "best")
+        self.assertEqual(second["id"], "lento")
+        self.assertGreaterEqual(second["durationMs"], 300)
+        self.assertEqual(summary, {**summary, "done": True, "count": 2, "succeeded": 2, "failed": 0, "concurrency": 4})
+
+    def test_concurrency_limit(self):
+        """Test: No se analizan más elementos a la vez que concurrency"""
+        fake = _FakeAnalysis()
+        items = [{"source": "0.05"} for _ in range(6)]
+        with patch("app.modules.analysis.batch.analyze_algorithm_async", fake):
+            response = self.client.post("/analyze/batch", json={"items": items, "concurrency": 2})
+        self.assertEqual(len(_lines(response)), 7)
+        self.assertEqual(fake.max_running, 2)
+
+    def test_engine_error_fails_only_item(self):
+        """Test: Si el motor rechaza un elemento, solo esa línea falla"""
+        async def busy(**kwargs):
+            raise EngineBusy("ocupado")
+
+        with patch("app.modules.analysis.batch.analyze_algorithm_async", busy):
+            response = self.client.post("/analyze/batch", json={"items": [{"id": "x", "source": "a"}]})
+        line, summary = _lines(response)
+        self.assertFalse(line["ok"])
+        self.assertEqual(line["result"]["status"], 429)
+        self.assertEqual(summary["failed"], 1)
+
+    @patch.dict(os.environ, {"ANALYSIS_BATCH_MAX_ITEMS": "1"})
+    def test_too_many_items(self):
+        """Test: Un lote mayor que ANALYSIS_BATCH_MAX_ITEMS se rechaza"""
+        response = self.client.post("/analyze/batch", json={"items": [{"source": "a"}, {"source": "b"}]})
+        self.assertFalse(response.json()["ok"])
+
+    def test_real_analysis(self):
+        """Test: Los elementos se analizan como en /analyze/open"""
+        items = [{"id": "ok", "source": BURBUJA, "mode": "all"}, {"id": "mal", "source": ERRONEO}]
+        response = self.client.post("/analyze/batch", json={"items": items})
+        results = {line["id"]: line for line in _lines(response)[:-1]}
+        self.assertTrue(results["ok"]["ok"])
+        self.assertIn("worst", results["ok"]["result"])
+        self.assertIn("programId", results["ok"]["result"])
+        self.assertFalse(results["mal"]["ok"])
+        self.assertTrue(results["mal"]["result"]["errors"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,187 @@
+"""
+Tests unitarios para app.modules.analysis.cache.
+
+Author: Juan Camilo Cruz Parra (@Cruz1122)
+"""
+import unittest
+from unittest.mock import patch
+from app.modules.analysis import cache as cache_module
+from app.modules.analysis.cache import AnalysisCache, analysis_key, get_analysis_cache
+from app.modules.analysis.programs import get_program_store
+from app.modules.analysis.service import analyze_algorithm, detect_methods
+
+OK = {"ok": True, "byLine": [{"line": 1}], "totals": {"T_open": "n"}}
+FAILED = {"ok": False, "errors": [{"message": "No aplicable", "line": None, "column": None}]}
+
+SOURCE = """suma(A[n], n) BEGIN
+  s <- 0;
+  FOR i <- 1 TO n DO BEGIN
+    s <- s + A[i];
+  END
+  RETURN s;
+END"""
+
+
+class TestAnalysisCache(unittest.TestCase):
+    """Tests para la clase AnalysisCache."""
+
+    def test_miss_then_hit(self):
+        """Test: Primera lectura es miss, tras guardar es hit"""
+        cache = AnalysisCache(max_entries=4)
+        self.assertIsNone(cache.get("k"))
+        cache.put("k", OK)
+        self.assertEqual(cache.get("k"), OK)
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["size"]), (1, 1, 1))
+        self.assertEqual(stats["hit_ratio"], 0.5)
+        self.assertGreater(stats["bytes"], 0)
+
+    def test_copy_on_read_and_write(self):
+        """Test: Mutar el resultado guardado o el devuelto no altera la caché"""
+        cache = AnalysisCache(max_entries=4)
+        result = {"ok": True, "byLine": [{"line": 1}]}
+        cache.put("k", result)
+        result["byLine"].append({"line": 2})
+        cached = cache.get("k")
+        cached["byLine"].clear()
+        self.assertEqual(cache.get("k"), {"ok": True, "byLine": [{"line": 1}]})
+
+    def test_failures_have_own_limit(self):
+        """Test: Los resultados fallidos no desplazan a los exitosos"""
+        cache = AnalysisCache(max_entries=2, max_failures=1)
+        cache.put("ok", OK)
+        cache.put("f1", FAILED)
+        cache.put("f2", FAILED)
+        self.assertIsNone(cache.get("f1"))
+        self.assertEqual(cache.get("f2"), FAILED)
+        self.assertEqual(cache.get("ok"), OK)
+        stats = cache.stats()
+        self.assertEqual((stats["size"], stats["failures"], stats["evictions"]), (1, 1, 1))
+
+    def test_lru_eviction_and_bytes(self):
+        """Test: Se expulsa la entrada menos usada y se descuentan sus bytes"""
+        cache = AnalysisCache(max_entries=2)
+        cache.put("a", OK)
+        single = cache.stats()["bytes"]
+        cache.put("b", OK)
+        cache.get("a")
+        cache.put("c", OK)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.stats()["bytes"], 2 * single)
+
+    def test_ttl_expiration(self):
+        """Test: Las entradas vencidas se descartan"""
+        cache = AnalysisCache(max_entries=4, ttl_seconds=10)
+        with patch("time.monotonic", return_value=100.0):
+            cache.put("k", OK)
+        with patch("time.monotonic", return_value=105.0):
+            self.assertEqual(cache.get("k"), OK)
+        with patch("time.monotonic", return_value=111.0):
+            self.assertIsNone(cache.get("k"))
+        stats = cache.stats()
+        self.assertEqual((stats["expirations"], stats["size"], stats["bytes"]), (1, 0, 0))
+
+    def test_zero_size_disables_cache(self):
+        """Test: Tamaños 0 desactivan la caché"""
+        cache = AnalysisCache(max_entries=0, max_failures=0)
+        cache.put("k", OK)
+        cache.put("f", FAILED)
+        self.assertIsNone(cache.get("k"))
+        self.assertEqual(cache.stats()["bytes"], 0)
+
+    def test_clear(self):
+        """Test: clear vacía la caché y reinicia los contadores"""
+        cache = AnalysisCache(max_entries=4)
+        cache.put("k", OK)
+        cache.get("k")
+        cache.clear()
+        stats = cache.stats()
+        self.assertEqual((stats["size"], stats["hits"], stats["bytes"]), (0, 0, 0))
+
+
+class TestAnalysisKey(unittest.TestCase):
+    """Tests para analysis_key."""
+
+    def test_avg_model_normalized(self):
+        """Test: avgModel ausente equivale al uniforme y se ignora fuera de avg/all"""
+        uniform = {"mode": "uniform", "predicates": {}}
+        self.assertEqual(analysis_key("analyze", "x", "avg"), analysis_key("analyze", "x", "avg", uniform))
+        self.assertEqual(
+            analysis_key("analyze", "x", "worst", {"mode": "symbolic", "predicates": {"p": "1/2"}}),
+            analysis_key("analyze", "x", "worst"),
+        )
+        self.assertNotEqual(
+            analysis_key("analyze", "x", "all", {"mode": "symbolic", "predicates": {}}),
+            analysis_key("analyze", "x", "all"),
+        )
+
+    def test_parameters_change_key(self):
+        """Test: Operación, código, modo, tipo y método forman parte de la clave"""
+        base = analysis_key("analyze", "x", "worst")
+        self.assertEqual(len({
+            base,
+            analysis_key("detect_methods", "x", "worst"),
+            analysis_key("analyze", "y", "worst"),
+            analysis_key("analyze", "x", "best"),
+            analysis_key("analyze", "x", "worst", algorithm_kind="recursive"),
+            analysis_key("analyze", "x", "worst", preferred_method="master"),
+        }), 6)
+
+    def test_version_changes_key(self):
+        """Test: Cambiar la versión del código de análisis invalida las claves"""
+        before = analysis_key("analyze", "x", "worst")
+        with patch.object(cache_module, "ANALYZER_VERSION", "otra"):
+            self.assertNotEqual(analysis_key("analyze", "x", "worst"), before)
+
+
+class TestServiceCache(unittest.TestCase):
+    """Tests de la caché en analyze_algorithm y detect_methods."""
+
+    def setUp(self):
+        get_analysis_cache().clear()
+        get_program_store().clear()
+
+    def tearDown(self):
+        get_analysis_cache().clear()
+
+    def test_repeated_analysis_is_cached(self):
+        """Test: Un análisis repetido no vuelve a parsear ni analizar"""
+        first = analyze_algorithm(SOURCE, "worst")
+        with patch("app.modules.analysis.service.parse_source") as parse:
+            second = analyze_algorithm(SOURCE, "worst")
+        parse.assert_not_called()
+        self.assertEqual(second, first)
+        self.assertTrue(first["ok"])
+
+    def test_failed_outcome_is_cached(self):
+        """Test: Los resultados fallidos (no recursivo) también se cachean"""
+        first = detect_methods(SOURCE)
+        self.assertFalse(first["ok"])
+        with patch("app.modules.analysis.service.parse_source") as parse:
+            self.assertEqual(detect_methods(SOURCE), first)
+        parse.assert_not_called()
+        self.assertEqual(get_analysis_cache().stats()["failures"], 1)
+
+    def test_parse_error_is_cached(self):
+        """Test: Un error de parseo se cachea y el mismo código no se vuelve a parsear"""
+        broken = "roto(n) BEGIN\n  x <- ;\nEND"
+        first = analyze_algorithm(broken, "worst")
+        self.assertFalse(first["ok"])
+        with patch("app.modules.analysis.service.parse_source") as parse:
+            self.assertEqual(analyze_algorithm(broken, "best"), first)
+            self.assertEqual(detect_methods(broken), first)
+        parse.assert_not_called()
+        self.assertEqual(get_analysis_cache().stats()["failures"], 1)
+
+    def test_exceptions_are_not_cached(self):
+        """Test: Las excepciones se reportan pero no se cachean"""
+        get_program_store().clear()
+        with patch("app.modules.analysis.service.parse_source", side_effect=RuntimeError("fallo")):
+            result = analyze_algorithm(SOURCE, "worst")
+        self.assertFalse(result["ok"])
+        self.assertIn("fallo", result["errors"][0]["message"])
+        self.assertTrue(analyze_algorithm(SOURCE, "worst")["ok"])
+
+
+if __name__ == '__main__':
+    unittest.main()
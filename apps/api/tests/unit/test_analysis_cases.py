@@ -0,0 +1,70 @@
+"""
+Tests unitarios para el análisis de los casos de mode="all" (app.modules.analysis.cases).
+
+Author: Juan Camilo Cruz Parra (@Cruz1122)
+"""
+import unittest
+from unittest.mock import patch
+from app.modules.analysis.analyzers.iterative import IterativeAnalyzer
+from app.modules.analysis.analyzers.recursive import RecursiveAnalyzer
+from app.modules.analysis.cases import analyze_cases
+from app.modules.parsing.service import parse_source
+
+BUSQUEDA = """busquedaLineal(A[n], x, n) BEGIN
+  i <- 1;
+  WHILE (i <= n and A[i] != x) DO BEGIN
+    i <- i + 1;
+  END
+  RETURN i;
+END"""
+
+FACTORIAL = """factorial(n) BEGIN
+  IF (n <= 1) THEN BEGIN
+    RETURN 1;
+  END
+  ELSE BEGIN
+    RETURN n * factorial(n - 1);
+  END
+END"""
+
+CASES = {
+    "worst": {},
+    "best": {},
+    "avg": {"avg_model": {"mode": "uniform", "predicates": {}}},
+}
+
+
+def parse(source):
+    return parse_source(source)["ast"]
+
+
+class TestAnalyzeCases(unittest.TestCase):
+    """Tests para analyze_cases."""
+
+    def sequential(self, analyzer_class, ast):
+        return {mode: analyzer_class().analyze(ast, mode, **kwargs) for mode, kwargs in CASES.items()}
+
+    def test_matches_separate_analyses(self):
+        """Test: Los resultados son los mismos que analizando cada caso por separado"""
+        ast = parse(FACTORIAL)
+        results = analyze_cases(RecursiveAnalyzer, ast, CASES)
+        self.assertEqual(list(results), ["worst", "best", "avg"])
+        self.assertEqual(results, self.sequential(RecursiveAnalyzer, ast))
+
+    def test_shared_work_analyzer(self):
+        """Test: IterativeAnalyzer analiza los casos con trabajo compartido y el mismo resultado"""
+        ast = parse(BUSQUEDA)
+        expected = self.sequential(IterativeAnalyzer, ast)
+        with patch.object(IterativeAnalyzer, "analyze_cases", wraps=IterativeAnalyzer.analyze_cases) as shared:
+            self.assertEqual(analyze_cases(IterativeAnalyzer, ast, CASES), expected)
+        shared.assert_called_once()
+
+    def test_exception_propagates(self):
+        """Test: Una excepción del análisis llega al llamador"""
+        with patch.object(RecursiveAnalyzer, "analyze", side_effect=ValueError("fallo")):
+            with self.assertRaises(ValueError):
+                analyze_cases(RecursiveAnalyzer, parse(FACTORIAL), CASES)
+
+
+if __name__ == '__main__':
+    unittest.main()
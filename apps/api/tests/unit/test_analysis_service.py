@@ -5,12 +5,19 @@ Author: Juan Camilo Cruz Parra (@Cruz1122)
 """
 import unittest
 from unittest.mock import patch, MagicMock
+from app.modules.analysis.cache import get_analysis_cache
+from app.modules.analysis.programs import get_program_store
 from app.modules.analysis.service import analyze_algorithm, detect_methods
 
 
 class TestAnalyzeAlgorithm(unittest.TestCase):
     """Tests para la función analyze_algorithm."""
 
+    def setUp(self):
+        # Los análisis simulados no deben salir de la caché de otros tests
+        get_analysis_cache().clear()
+        get_program_store().clear()
+
     @patch('app.modules.analysis.service.parse_source')
     def test_returns_error_when_parsing_fails(self, mock_parse):
         """Test: Retorna error cuando el parsing falla"""
@@ -347,6 +354,11 @@ class TestAnalyzeAlgorithm(unittest.TestCase):
 class TestDetectMethods(unittest.TestCase):
     """Tests para la función detect_methods."""
 
+    def setUp(self):
+        # Los análisis simulados no deben salir de la caché de otros tests
+        get_analysis_cache().clear()
+        get_program_store().clear()
+
     @patch('app.modules.analysis.service.parse_source')
     def test_returns_error_when_parsing_fails(self, mock_parse):
         """Test: Retorna error cuando el parsing falla"""
@@ -1,6 +1,7 @@
 # tests/unit/test_base_analyzer.py
 
 import unittest
+from unittest.mock import patch
 from app.modules.analysis.analyzers.base import BaseAnalyzer
 from sympy import Symbol, Sum, Integer, latex
 
@@ -58,7 +59,7 @@ class TestBaseAnalyzer(unittest.TestCase):
         self.assertGreater(len(t_open), 0)
     
     def test_add_row_latex_error_handling(self):
-        """Test: add_row maneja errores al convertir count_raw_expr a LaTeX"""
+        """Test: result maneja errores al convertir count_raw_expr a LaTeX"""
         # Crear un objeto que cause error en latex() pero permita str()
         class BadSymPy:
             def __repr__(self):
@@ -71,29 +72,48 @@ class TestBaseAnalyzer(unittest.TestCase):
         # El error en latex() debe ser capturado y usar str() como fallback
         # Mockeamos latex para que lance excepción
         from unittest.mock import patch
-        with patch('app.modules.analysis.analyzers.base.latex', side_effect=Exception("Cannot convert to LaTeX")):
+        with patch('app.modules.analysis.utils.closure_memo.latex', side_effect=Exception("Cannot convert to LaTeX")):
             self.analyzer.add_row(1, "assign", "C_1", bad_expr, "test")
             self.assertEqual(len(self.analyzer.rows), 1)
             # Verificar que se usó str() como fallback
-            self.assertEqual(self.analyzer.rows[0]["count_raw"], "BadSymPy fallback")
+            self.assertEqual(self.analyzer.render_latex(self.analyzer.rows[0]["count_raw"]), "BadSymPy fallback")
     
     def test_add_row_count_raw_expr_none(self):
         """Test: add_row maneja count_raw_expr=None"""
         self.analyzer.add_row(1, "assign", "C_1", None, "test")
         row = self.analyzer.rows[0]
-        self.assertEqual(row["count_raw"], "1")
+        self.assertEqual(self.analyzer.render_latex(row["count_raw"]), "1")
     
     def test_add_row_count_raw_expr_not_string(self):
-        """Test: add_row convierte count_raw_latex a string si no lo es"""
-        # Simular que latex() retorna un objeto no-string
-        class NotString:
-            def __str__(self):
-                return "not_a_string"
-        
-        # En la práctica, esto sería manejado internamente
+        """Test: add_row guarda la expresión y result la convierte a string"""
         self.analyzer.add_row(1, "assign", "C_1", Integer(5), "test")
         row = self.analyzer.rows[0]
-        self.assertIsInstance(row["count_raw"], str)
+        self.assertEqual(row["count_raw"], Integer(5))
+        self.assertEqual(self.analyzer.result()["byLine"][0]["count_raw"], "5")
+    
+    def test_take_rows_moves_span(self):
+        """Test: take_rows trunca rows en el lugar y mueve las filas sin copiarlas"""
+        self.analyzer.add_row(1, "assign", "C_1", Integer(1))
+        rows = self.analyzer.rows
+        checkpoint = self.analyzer.rows_checkpoint()
+        self.analyzer.add_row(2, "assign", "C_2", Integer(1))
+        added = self.analyzer.rows[-1]
+        span = self.analyzer.take_rows(checkpoint)
+        self.assertIs(self.analyzer.rows, rows)
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(len(span), 1)
+        self.assertIs(span[0], added)
+    
+    def test_render_latex_once_per_expression(self):
+        """Test: Cada expresión distinta se convierte a LaTeX una sola vez"""
+        n = Symbol("n", integer=True, positive=True)
+        self.analyzer.add_row(1, "assign", "C_{1}", n)
+        self.analyzer.add_row(2, "assign", "C_{2}", n)
+        with patch("app.modules.analysis.utils.closure_memo.latex", side_effect=latex) as latex_mock:
+            by_line = self.analyzer.result()["byLine"]
+            self.analyzer.render_latex(n)
+        self.assertEqual([row["count_raw"] for row in by_line], ["n", "n"])
+        self.assertEqual(latex_mock.call_count, 1)
     
     def test_build_t_open_empty_loop_stack(self):
         """Test: build_t_open funciona con loop_stack vacío"""
@@ -123,6 +143,29 @@ class TestBaseAnalyzer(unittest.TestCase):
         """Test: get_context_hash funciona con loop_stack vacío"""
         hash1 = self.analyzer.get_context_hash()
         self.assertIsInstance(hash1, str)
+
+    def test_get_context_hash_incremental(self):
+        """Test: get_context_hash se mantiene con push/pop sin renderizar LaTeX"""
+        self.analyzer.push_multiplier(Integer(5))
+        outer = self.analyzer.get_context_hash()
+        with patch("app.modules.analysis.utils.closure_memo.latex") as latex_mock:
+            self.analyzer.push_multiplier(Symbol("n"))
+            inner = self.analyzer.get_context_hash()
+            self.analyzer.pop_multiplier()
+            self.assertEqual(self.analyzer.get_context_hash(), outer)
+            latex_mock.assert_not_called()
+        self.assertNotEqual(inner, outer)
+        self.analyzer.pop_multiplier()
+        self.assertEqual(self.analyzer.get_context_hash(), "root")
+    
+    def test_get_context_hash_direct_stack(self):
+        """Test: Si loop_stack se asigna directamente, el hash se reconstruye igual"""
+        self.analyzer.push_multiplier(Integer(5))
+        self.analyzer.push_multiplier(Symbol("n"))
+        expected = self.analyzer.get_context_hash()
+        other = BaseAnalyzer()
+        other.loop_stack = [Integer(5), Symbol("n")]
+        self.assertEqual(other.get_context_hash(), expected)
     
     def test_add_procedure_step(self):
         """Test: add_procedure_step agrega un paso"""
@@ -225,15 +268,20 @@ class TestBaseAnalyzer(unittest.TestCase):
     # --- Tests de memoización (PD) ---
     
     def test_get_node_id_with_position(self):
-        """Test: _get_node_id usa posición si está disponible"""
+        """Test: _get_node_id no depende de la posición absoluta; _get_position_id sí"""
         node = {
             "type": "Block",
             "pos": {"line": 5, "column": 10}
         }
-        node_id = self.analyzer._get_node_id(node)
-        self.assertIn("Block", node_id)
-        self.assertIn("5", node_id)
-        self.assertIn("10", node_id)
+        moved = {
+            "type": "Block",
+            "pos": {"line": 40, "column": 2}
+        }
+        self.assertEqual(self.analyzer._get_node_id(node), self.analyzer._get_node_id(moved))
+        position_id = self.analyzer._get_position_id(node)
+        self.assertIn("Block", position_id)
+        self.assertIn("5", position_id)
+        self.assertIn("10", position_id)
     
     def test_get_node_id_without_position(self):
         """Test: _get_node_id usa hash del contenido si no hay posición"""
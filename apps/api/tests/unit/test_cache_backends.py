@@ -0,0 +1,270 @@
+"""
+Tests unitarios para app.modules.shared.cache_backends.
+
+Author: Juan Camilo Cruz Parra (@Cruz1122)
+"""
+import os
+import socketserver
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+from app.modules.analysis.cache import AnalysisCache
+from app.modules.parsing.cache import ParseCache
+from app.modules.shared.cache_backends import (
+    MemoryBackend,
+    RedisBackend,
+    SQLiteBackend,
+    create_shared_backend,
+    decode_value,
+    encode_value,
+)
+
+AST = {"type": "Program", "body": [{"type": "Assign", "pos": {"line": 1, "column": 1}}]}
+RESULT = {"ok": True, "byLine": [{"line": 1, "ck": "C_{1}"}], "totals": {"T_open": "n"}}
+
+
+class _RespHandler(socketserver.StreamRequestHandler):
+    """Servidor RESP mínimo (sustituto local de Redis) para los tests."""
+
+    def _read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        args = []
+        for _ in range(int(line[1:-2])):
+            length = int(self.rfile.readline()[1:-2])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+    def _bulk(self, value):
+        if value is None:
+            return b"$-1\r\n"
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+
+    def handle(self):
+        store = self.server.store
+        while True:
+            args = self._read_command()
+            if args is None:
+                return
+            command = args[0].upper()
+            now = time.monotonic()
+            if command == b"GET":
+                value, expires_at = store.get(args[1], (None, 0))
+                if expires_at and expires_at <= now:
+                    store.pop(args[1], None)
+                    value = None
+                reply = self._bulk(value)
+            elif command == b"SET":
+                expires_at = now + int(args[4]) / 1000 if len(args) > 3 else 0
+                store[args[1]] = (args[2], expires_at)
+                reply = b"+OK\r\n"
+            elif command == b"DEL":
+                reply = b":%d\r\n" % sum(store.pop(key, None) is not None for key in args[1:])
+            elif command == b"SCAN":
+                prefix = args[3].rstrip(b"*")
+                keys = [key for key in store if key.startswith(prefix)]
+                reply = b"*2\r\n$1\r\n0\r\n*%d\r\n" % len(keys) + b"".join(self._bulk(k) for k in keys)
+            else:
+                reply = b"-ERR unknown command\r\n"
+            self.wfile.write(reply)
+
+
+class TestCodec(unittest.TestCase):
+    """Tests para encode_value y decode_value."""
+
+    def test_round_trip(self):
+        """Test: Los valores se recuperan iguales, pequeños y comprimidos"""
+        big = {"rows": [RESULT] * 50}
+        self.assertEqual(decode_value(encode_value(RESULT)), RESULT)
+        self.assertEqual(decode_value(encode_value(big)), big)
+        self.assertTrue(encode_value(big).startswith(b"z"))
+        self.assertTrue(encode_value(RESULT).startswith(b"j"))
+
+    def test_invalid_data(self):
+        """Test: Datos desconocidos o corruptos lanzan ValueError"""
+        with self.assertRaises(ValueError):
+            decode_value(b"x123")
+        with self.assertRaises(ValueError):
+            decode_value(b"zbasura")
+
+
+class TestMemoryBackend(unittest.TestCase):
+    """Tests para MemoryBackend."""
+
+    def test_lru_ttl_and_bytes(self):
+        """Test: LRU acotado, expiración y bytes en uso"""
+        backend = MemoryBackend(max_entries=2)
+        backend.set("a", b"11")
+        backend.set("b", b"22", ttl_seconds=10)
+        backend.get("a")
+        backend.set("c", b"333")
+        self.assertIsNone(backend.get("b"))
+        self.assertEqual(backend.get("a"), b"11")
+        stats = backend.stats()
+        self.assertEqual((stats["size"], stats["bytes"], stats["evictions"]), (2, 5, 1))
+        backend.set("d", b"4", ttl_seconds=10)
+        with patch("time.monotonic", return_value=time.monotonic() + 11):
+            self.assertIsNone(backend.get("d"))
+        self.assertEqual(backend.stats()["expirations"], 1)
+
+
+class TestSQLiteBackend(unittest.TestCase):
+    """Tests para SQLiteBackend (dos instancias simulan dos workers)."""
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".sqlite3")
+        os.close(handle)
+
+    def tearDown(self):
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(self.path + suffix):
+                os.remove(self.path + suffix)
+
+    def test_shared_between_instances(self):
+        """Test: Lo que guarda un worker lo lee otro"""
+        SQLiteBackend(self.path, "analysis").set("k", b"valor")
+        self.assertEqual(SQLiteBackend(self.path, "analysis").get("k"), b"valor")
+        self.assertIsNone(SQLiteBackend(self.path, "parse").get("k"))
+
+    def test_eviction_and_stats(self):
+        """Test: Se respeta el máximo de entradas del espacio de nombres"""
+        backend = SQLiteBackend(self.path, "analysis", max_entries=2)
+        for index, key in enumerate("abc"):
+            backend.set(key, b"x" * (index + 1))
+            time.sleep(0.01)
+        self.assertIsNone(backend.get("a"))
+        stats = backend.stats()
+        self.assertEqual((stats["backend"], stats["size"], stats["bytes"], stats["evictions"]), ("sqlite", 2, 5, 1))
+
+    def test_ttl(self):
+        """Test: Las entradas vencidas no se devuelven"""
+        backend = SQLiteBackend(self.path, "analysis")
+        backend.set("k", b"v", ttl_seconds=10)
+        with patch("time.time", return_value=time.time() + 11):
+            self.assertIsNone(backend.get("k"))
+        self.assertEqual(backend.stats()["size"], 0)
+
+    def test_other_version_is_pruned(self):
+        """Test: Las entradas de otra versión del código se descartan"""
+        SQLiteBackend(self.path, "analysis", version="vieja").set("k", b"v")
+        backend = SQLiteBackend(self.path, "analysis", version="nueva")
+        self.assertIsNone(backend.get("k"))
+        self.assertEqual(backend.stats()["size"], 0)
+
+    def test_unusable_file_counts_errors(self):
+        """Test: Un archivo inutilizable cuenta como miss y error"""
+        backend = SQLiteBackend(os.path.join(self.path, "no", "existe.sqlite3"), "analysis")
+        backend.set("k", b"v")
+        self.assertIsNone(backend.get("k"))
+        self.assertEqual(backend.stats()["errors"], 3)
+
+
+class TestRedisBackend(unittest.TestCase):
+    """Tests para RedisBackend contra un servidor RESP local."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _RespHandler)
+        cls.server.daemon_threads = True
+        cls.server.store = {}
+        cls.url = "redis://127.0.0.1:%d/0" % cls.server.server_address[1]
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.server.store.clear()
+
+    def test_set_get_delete(self):
+        """Test: Lo que guarda un worker lo lee otro, con prefijo por espacio y versión"""
+        RedisBackend(self.url, "analysis").set("k", b"valor\r\ncon saltos")
+        backend = RedisBackend(self.url, "analysis")
+        self.assertEqual(backend.get("k"), b"valor\r\ncon saltos")
+        self.assertIsNone(RedisBackend(self.url, "analysis", version="otra").get("k"))
+        backend.delete("k")
+        self.assertIsNone(backend.get("k"))
+
+    def test_ttl_and_clear(self):
+        """Test: El TTL se envía al servidor y clear solo borra su espacio de nombres"""
+        backend = RedisBackend(self.url, "analysis")
+        other = RedisBackend(self.url, "parse")
+        backend.set("a", b"1", ttl_seconds=60)
+        backend.set("b", b"2")
+        other.set("a", b"3")
+        self.assertEqual(backend.stats()["size"], 2)
+        backend.clear()
+        self.assertEqual(backend.stats()["size"], 0)
+        self.assertEqual(other.get("a"), b"3")
+
+    def test_unavailable_server(self):
+        """Test: Sin servidor los accesos son misses y no se reintenta en cada petición"""
+        backend = RedisBackend("redis://127.0.0.1:1/0", "analysis")
+        with patch("socket.create_connection", side_effect=ConnectionRefusedError) as connect:
+            self.assertIsNone(backend.get("k"))
+            backend.set("k", b"v")
+        self.assertEqual(connect.call_count, 1)
+        self.assertEqual(backend.stats()["errors"], 3)
+        self.assertIsNone(backend.stats()["size"])
+
+
+class TestSharedLevel(unittest.TestCase):
+    """Tests del nivel compartido en ParseCache y AnalysisCache."""
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".sqlite3")
+        os.close(handle)
+
+    def tearDown(self):
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(self.path + suffix):
+                os.remove(self.path + suffix)
+
+    def test_parse_cache_shared_hit(self):
+        """Test: Un parseo guardado por un worker es hit en otro"""
+        worker_a = ParseCache(4, shared=SQLiteBackend(self.path, "parse"))
+        worker_b = ParseCache(4, shared=SQLiteBackend(self.path, "parse"))
+        worker_a.put("x <- 1", (AST, []))
+        self.assertEqual(worker_b.get("x <- 1"), (AST, []))
+        self.assertEqual(worker_b.get("x <- 1"), (AST, []))
+        stats = worker_b.stats()
+        self.assertEqual((stats["hits"], stats["shared_hits"], stats["size"]), (2, 1, 1))
+
+    def test_analysis_cache_shared_hit(self):
+        """Test: Un análisis guardado por un worker es hit en otro"""
+        def worker():
+            return AnalysisCache(
+                4, 4, 60,
+                shared=SQLiteBackend(self.path, "analysis"),
+                shared_failures=SQLiteBackend(self.path, "analysis-failures"),
+            )
+
+        worker_a, worker_b = worker(), worker()
+        worker_a.put("ok", RESULT)
+        worker_a.put("fallo", {"ok": False, "errors": []})
+        self.assertEqual(worker_b.get("ok"), RESULT)
+        self.assertEqual(worker_b.get("fallo"), {"ok": False, "errors": []})
+        stats = worker_b.stats()
+        self.assertEqual((stats["shared_hits"], stats["size"], stats["failures"]), (2, 1, 1))
+        self.assertEqual(stats["shared"]["results"]["size"], 1)
+
+    def test_create_shared_backend(self):
+        """Test: CACHE_BACKEND elige el nivel compartido"""
+        with patch.dict(os.environ, {"CACHE_BACKEND": "memory"}):
+            self.assertIsNone(create_shared_backend("parse", 8))
+        with patch.dict(os.environ, {"CACHE_BACKEND": "sqlite", "CACHE_SQLITE_PATH": self.path}):
+            backend = create_shared_backend("parse", 8)
+        self.assertIsInstance(backend, SQLiteBackend)
+        self.assertEqual((backend.path, backend.max_entries), (self.path, 8))
+        with patch.dict(os.environ, {"CACHE_BACKEND": "redis", "CACHE_REDIS_URL": "redis://:clave@cache:6380/2"}):
+            backend = create_shared_backend("parse", 8)
+        self.assertEqual((backend.host, backend.port, backend.password, backend.db), ("cache", 6380, "clave", 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+"""
+Tests unitarios para ClosureMemo y el análisis de casos con trabajo compartido.
+
+Author: Juan Camilo Cruz Parra (@Cruz1122)
+"""
+import unittest
+from unittest.mock import patch
+from sympy import Sum, Symbol, simplify
+from app.modules.analysis.analyzers.iterative import IterativeAnalyzer
+from app.modules.analysis.utils.closure_memo import ClosureMemo
+from app.modules.analysis.utils.summation_closer import SummationCloser
+from app.modules.parsing.service import parse_source
+
+BURBUJA = """burbuja(A[n], n) BEGIN
+  FOR i <- 1 TO n - 1 DO BEGIN
+    FOR j <- 1 TO n - i DO BEGIN
+      IF (A[j] > A[j + 1]) THEN BEGIN
+        temp <- A[j];
+        A[j] <- A[j + 1];
+        A[j + 1] <- temp;
+      END
+    END
+  END
+END"""
+
+CASES = {
+    "worst": {},
+    "best": {},
+    "avg": {"avg_model": {"mode": "uniform", "predicates": {}}},
+}
+
+
+class TestClosureMemo(unittest.TestCase):
+    """Tests para ClosureMemo."""
+
+    def setUp(self):
+        self.memo = ClosureMemo()
+        self.closer = SummationCloser()
+        n = Symbol("n", integer=True, positive=True)
+        i = Symbol("i", integer=True)
+        self.expr = Sum(1, (i, 1, n))
+
+    def test_close_summation_once(self):
+        """Test: Cerrar la misma sumatoria dos veces la calcula una sola vez"""
+        with patch.object(SummationCloser, "close_summation", wraps=self.closer.close_summation) as close:
+            first = self.memo.close_summation(self.closer, self.expr, "n")
+            second = self.memo.close_summation(self.closer, self.expr, "n")
+        self.assertEqual(close.call_count, 1)
+        self.assertEqual(first, second)
+        self.assertEqual((self.memo.hits, self.memo.misses), (1, 1))
+
+    def test_steps_are_copies(self):
+        """Test: Modificar los pasos devueltos no altera el memo"""
+        _, steps = self.memo.close_summation(self.closer, self.expr, "n")
+        steps.append("extra")
+        _, again = self.memo.close_summation(self.closer, self.expr, "n")
+        self.assertNotIn("extra", again)
+
+    def test_operations_are_separate(self):
+        """Test: La operación forma parte de la clave"""
+        evaluated = self.memo.evaluate_sums(self.closer, self.expr)
+        self.assertEqual(evaluated, Symbol("n", integer=True, positive=True))
+        self.assertEqual(self.memo.simplify(self.expr), simplify(self.expr))
+        self.assertEqual(self.memo.misses, 2)
+
+    def test_unhashable_key_is_computed(self):
+        """Test: Claves no hashables se calculan sin memorizar"""
+        self.assertEqual(self.memo.get("op", [1], lambda: 3), 3)
+        self.assertEqual(len(self.memo._entries), 0)
+
+    def test_errors_are_not_memoized(self):
+        """Test: Una excepción no deja entrada en el memo"""
+        with self.assertRaises(ZeroDivisionError):
+            self.memo.get("op", 1, lambda: 1 / 0)
+        self.assertEqual(self.memo.get("op", 1, lambda: 2), 2)
+
+
+class TestAnalyzeCases(unittest.TestCase):
+    """Tests para IterativeAnalyzer.analyze_cases."""
+
+    def test_same_results_as_separate_analyses(self):
+        """Test: Compartir el memo no cambia los resultados de ningún caso"""
+        ast = parse_source(BURBUJA)["ast"]
+        expected = {mode: IterativeAnalyzer().analyze(ast, mode, **kwargs) for mode, kwargs in CASES.items()}
+        self.assertEqual(IterativeAnalyzer.analyze_cases(ast, CASES), expected)
+
+    def test_common_sums_closed_once(self):
+        """Test: Las sumatorias comunes a varios casos se cierran una sola vez"""
+        ast = parse_source(BURBUJA)["ast"]
+        with patch.object(SummationCloser, "close_summation", autospec=True,
+                          side_effect=SummationCloser.close_summation) as close:
+            for mode, kwargs in CASES.items():
+                IterativeAnalyzer().analyze(ast, mode, **kwargs)
+            separate = close.call_count
+            close.reset_mock()
+            IterativeAnalyzer.analyze_cases(ast, CASES)
+            shared = close.call_count
+        self.assertLess(shared, separate)
+        self.assertLessEqual(shared * 2, separate)
+
+
+if __name__ == '__main__':
+    unittest.main()
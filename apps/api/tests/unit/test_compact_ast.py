@@ -0,0 +1,93 @@
+"""
+Tests unitarios para aa_grammar.compact.
+
+Author: Juan Camilo Cruz Parra (@Cruz1122)
+"""
+import glob
+import os
+import unittest
+from aa_grammar.api import parse_to_ast
+from aa_grammar.compact import (
+    TYPE_TAGS,
+    CompactNode,
+    compact_ast,
+    materialize,
+    pack_pos,
+    unpack_pos,
+)
+
+FIXTURES_DIR = os.path.join(
+    os.path.dirname(__file__), "..", "..", "..", "..", "packages", "grammar", "fixtures"
+)
+
+PROGRAMS = [
+    "factorial(n) BEGIN\n  IF (n <= 1) THEN BEGIN\n    RETURN 1;\n  END\n  ELSE BEGIN\n    RETURN n * factorial(n - 1);\n  END\nEND",
+    "buscar(A[n], x, n) BEGIN\n  i <- 1;\n  WHILE (i <= n and A[i] != x) DO BEGIN\n    i <- i + 1;\n  END\n  RETURN i;\nEND",
+    "{ i <- 1; repeat i <- i * 2; until (i >= n) }",
+]
+
+
+class TestCompactRoundTrip(unittest.TestCase):
+    """Tests de ida y vuelta dict -> compacto -> dict."""
+
+    def test_programs_round_trip(self):
+        """Test: materialize(compact_ast(ast)) reproduce el AST de ASTBuilder"""
+        sources = list(PROGRAMS)
+        for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, "*.pseudo"))):
+            with open(path, encoding="utf-8") as fh:
+                sources.append(fh.read())
+        for source in sources:
+            ast, _ = parse_to_ast(source)
+            self.assertEqual(materialize(compact_ast(ast)), ast, source)
+
+    def test_materialize_returns_independent_copy(self):
+        """Test: Cada materialización devuelve dicts y listas nuevos"""
+        node = compact_ast({"type": "Block", "body": [{"type": "Return", "value": None}]})
+        first = node.to_dict()
+        first["body"].append("x")
+        self.assertEqual(node.to_dict(), {"type": "Block", "body": [{"type": "Return", "value": None}]})
+
+    def test_non_standard_pos_is_preserved(self):
+        """Test: Un "pos" que no es {line, column} se conserva tal cual"""
+        ast = {"type": "Literal", "value": 1, "pos": {"line": 1, "column": 2, "extra": True}}
+        self.assertEqual(materialize(compact_ast(ast)), ast)
+
+
+class TestCompactNodeView(unittest.TestCase):
+    """Tests de lectura de CompactNode como Mapping."""
+
+    def setUp(self):
+        ast, _ = parse_to_ast("{ x <- 1 + y; }")
+        self.ast = ast
+        self.node = compact_ast(ast)
+
+    def test_reads_like_dict(self):
+        """Test: Acceso por clave, get y pertenencia funcionan como en el dict"""
+        assign = self.node["body"][0]["body"][0]
+        self.assertIsInstance(assign, CompactNode)
+        self.assertEqual(assign["type"], "Assign")
+        self.assertEqual(assign["value"]["op"], "+")
+        self.assertEqual(assign.get("missing", "default"), "default")
+        self.assertIn("target", assign)
+        self.assertEqual(list(assign), list(self.ast["body"][0]["body"][0]))
+        self.assertEqual(assign["pos"], self.ast["body"][0]["body"][0]["pos"])
+
+    def test_tag_and_position(self):
+        """Test: Etiqueta entera de tipo y posición empaquetada"""
+        assign = self.node["body"][0]["body"][0]
+        self.assertEqual(assign.tag, TYPE_TAGS["Assign"])
+        self.assertEqual((assign.line, assign.column), (1, 2))
+
+    def test_shapes_are_shared(self):
+        """Test: Nodos con las mismas claves comparten la forma"""
+        ast, _ = parse_to_ast("{ a <- 1 + 2; b <- 3 + 4; }")
+        body = compact_ast(ast)["body"][0]["body"]
+        self.assertIs(body[0]["value"]._shape, body[1]["value"]._shape)
+
+    def test_pack_unpack(self):
+        """Test: Empaquetado de posiciones"""
+        self.assertEqual(unpack_pos(pack_pos(12, 345)), {"line": 12, "column": 345})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,8 @@
 # tests/unit/test_complexity_classes.py
 
 import unittest
+from unittest.mock import patch
+from sympy import Integer, Symbol
 from app.modules.analysis.utils.complexity_classes import ComplexityClasses
 
 
@@ -324,6 +326,30 @@ class TestComplexityClasses(unittest.TestCase):
         self.assertTrue("\\Theta" in big_theta or "Theta" in big_theta)
 
 
+    def test_classify_expr_matches_string_api(self):
+        """Test: classify_expr da las mismas cotas que la API de strings"""
+        n = Symbol("n", integer=True, positive=True)
+        bounds = self.complexity.classify_expr(2 * n**3 + 3 * n + 5)
+        poly = "2*n^3 + 3*n + 5"
+        self.assertEqual(bounds, {
+            "big_o": self.complexity.calculate_big_o(poly),
+            "big_omega": self.complexity.calculate_big_omega(poly),
+            "big_theta": self.complexity.calculate_big_theta(poly),
+        })
+
+    def test_classify_expr_without_latex_round_trip(self):
+        """Test: classify_expr no reparsea LaTeX (\\frac{n^{2}}{2} no se puede parsear)"""
+        n = Symbol("n", integer=True, positive=True)
+        with patch.object(self.complexity, "_parse_polynomial") as parse_mock:
+            bounds = self.complexity.classify_expr(n**2 / 2 + 3 * n + 5)
+        parse_mock.assert_not_called()
+        self.assertEqual(bounds["big_theta"], "\\Theta(\\frac{n^{2}}{2})")
+
+    def test_classify_expr_constant(self):
+        """Test: classify_expr con constante da O(1)"""
+        self.assertEqual(self.complexity.classify_expr(Integer(7))["big_o"], "O(1)")
+
+
 if __name__ == '__main__':
     unittest.main()
 
@@ -6,7 +6,28 @@ Author: Juan Felipe Henao (@Pipe-1z)
 import unittest
 from unittest.mock import patch
 import os
-from app.core.config import _as_bool, get_dev_cors_enabled, get_dev_allowed_origins
+from app.core.config import (
+    _as_bool,
+    get_analysis_batch_max_items,
+    get_analysis_cache_failure_size,
+    get_analysis_deadline,
+    get_analysis_cache_size,
+    get_analysis_cache_ttl,
+    get_cache_backend,
+    get_cache_redis_url,
+    get_cache_sqlite_path,
+    get_dev_allowed_origins,
+    get_dev_cors_enabled,
+    get_engine_queue_size,
+    get_engine_workers,
+    get_parse_batch_max_items,
+    get_parse_cache_size,
+    get_parse_document_store_size,
+    get_program_store_size,
+    get_subtree_memo_size,
+    get_warmup_corpus_dir,
+    get_warmup_enabled,
+)
 
 
 class TestAsBool(unittest.TestCase):
@@ -131,3 +152,232 @@ class TestGetDevAllowedOrigins(unittest.TestCase):
         result = get_dev_allowed_origins()
         self.assertEqual(result, ["http://example.com", "http://test.com"])
 
+
+class TestGetParseCacheSize(unittest.TestCase):
+    """Tests para la función get_parse_cache_size."""
+
+    @patch.dict(os.environ, {}, clear=True)
+    def test_default_size(self):
+        """Test: Tamaño por defecto cuando no hay variable de entorno"""
+        self.assertEqual(get_parse_cache_size(), 256)
+
+    @patch.dict(os.environ, {"PARSE_CACHE_SIZE": "32"})
+    def test_custom_size(self):
+        """Test: Tamaño personalizado"""
+        self.assertEqual(get_parse_cache_size(), 32)
+
+    @patch.dict(os.environ, {"PARSE_CACHE_SIZE": "0"})
+    def test_zero_disables(self):
+        """Test: 0 desactiva la caché"""
+        self.assertEqual(get_parse_cache_size(), 0)
+
+    @patch.dict(os.environ, {"PARSE_CACHE_SIZE": "abc"})
+    def test_invalid_uses_default(self):
+        """Test: Valor inválido usa el tamaño por defecto"""
+        self.assertEqual(get_parse_cache_size(), 256)
+
+    @patch.dict(os.environ, {"PARSE_CACHE_SIZE": "-5"})
+    def test_negative_clamped_to_zero(self):
+        """Test: Valores negativos se limitan a 0"""
+        self.assertEqual(get_parse_cache_size(), 0)
+
+
+class TestGetParseDocumentStoreSize(unittest.TestCase):
+    """Tests para la función get_parse_document_store_size."""
+
+    @patch.dict(os.environ, {}, clear=True)
+    def test_default_size(self):
+        """Test: Tamaño por defecto cuando no hay variable de entorno"""
+        self.assertEqual(get_parse_document_store_size(), 64)
+
+    @patch.dict(os.environ, {"PARSE_DOCUMENT_STORE_SIZE": "8"})
+    def test_custom_size(self):
+        """Test: Tamaño personalizado"""
+        self.assertEqual(get_parse_document_store_size(), 8)
+
+    @patch.dict(os.environ, {"PARSE_DOCUMENT_STORE_SIZE": "-1"})
+    def test_negative_clamped_to_zero(self):
+        """Test: Valores negativos se limitan a 0"""
+        self.assertEqual(get_parse_document_store_size(), 0)
+
+
+class TestGetProgramStoreSize(unittest.TestCase):
+    """Tests para la función get_program_store_size."""
+
+    @patch.dict(os.environ, {}, clear=True)
+    def test_default_size(self):
+        """Test: Tamaño por defecto cuando no hay variable de entorno"""
+        self.assertEqual(get_program_store_size(), 64)
+
+    @patch.dict(os.environ, {"PROGRAM_STORE_SIZE": "0"})
+    def test_zero_disables(self):
+        """Test: 0 desactiva los handles de programa"""
+        self.assertEqual(get_program_store_size(), 0)
+
+
+class TestGetParseBatchMaxItems(unittest.TestCase):
+    """Tests para la función get_parse_batch_max_items."""
+
+    @patch.dict(os.environ, {}, clear=True)
+    def test_default(self):
+        """Test: Máximo por defecto cuando no hay variable de entorno"""
+        self.assertEqual(get_parse_batch_max_items(), 1000)
+
+    @patch.dict(os.environ, {"PARSE_BATCH_MAX_ITEMS": "0"})
+    def test_minimum_is_one(self):
+        """Test: El máximo nunca baja de 1"""
+        self.assertEqual(get_parse_batch_max_items(), 1)
+
+
+class TestGetAnalysisCacheSettings(unittest.TestCase):
+    """Tests para la configuración de la caché de análisis."""
+
+    @patch.dict(os.environ, {}, clear=True)
+    def test_defaults(self):
+        """Test: Valores por defecto cuando no hay variables de entorno"""
+        self.assertEqual(get_analysis_cache_size(), 256)
+        self.assertEqual(get_analysis_cache_failure_size(), 64)
+        self.assertEqual(get_analysis_cache_ttl(), 3600)
+
+    @patch.dict(os.environ, {
+        "ANALYSIS_CACHE_SIZE": "16",
+        "ANALYSIS_CACHE_FAILURE_SIZE": "0",
+        "ANALYSIS_CACHE_TTL_SECONDS": "60",
+    })
+    def test_custom_values(self):
+        """Test: Las variables de entorno fijan tamaños y tiempo de vida"""
+        self.assertEqual(get_analysis_cache_size(), 16)
+        self.assertEqual(get_analysis_cache_failure_size(), 0)
+        self.assertEqual(get_analysis_cache_ttl(), 60)
+
+    @patch.dict(os.environ, {"ANALYSIS_CACHE_SIZE": "-1", "ANALYSIS_CACHE_TTL_SECONDS": "abc"})
+    def test_invalid_values(self):
+        """Test: Negativos se llevan a 0 y valores inválidos usan el defecto"""
+        self.assertEqual(get_analysis_cache_size(), 0)
+        self.assertEqual(get_analysis_cache_ttl(), 3600)
+
+
+class TestGetSubtreeMemoSize(unittest.TestCase):
+    """Tests para la función get_subtree_memo_size."""
+
+    @patch.dict(os.environ, {}, clear=True)
+    def test_default(self):
+        """Test: Por defecto 1024 subárboles"""
+        self.assertEqual(get_subtree_memo_size(), 1024)
+
+    @patch.dict(os.environ, {"SUBTREE_MEMO_SIZE": "0"})
+    def test_zero_disables(self):
+        """Test: 0 desactiva el memo compartido"""
+        self.assertEqual(get_subtree_memo_size(), 0)
+
+    @patch.dict(os.environ, {"SUBTREE_MEMO_SIZE": "abc"})
+    def test_invalid_value(self):
+        """Test: Un valor inválido usa el defecto"""
+        self.assertEqual(get_subtree_memo_size(), 1024)
+
+
+class TestGetCacheBackend(unittest.TestCase):
+    """Tests para la configuración del backend compartido de caché."""
+
+    @patch.dict(os.environ, {}, clear=True)
+    def test_defaults(self):
+        """Test: Sin variables de entorno no hay nivel compartido"""
+        self.assertEqual(get_cache_backend(), "memory")
+        self.assertTrue(get_cache_sqlite_path().endswith("aa-api-cache.sqlite3"))
+        self.assertEqual(get_cache_redis_url(), "redis://127.0.0.1:6379/0")
+
+    @patch.dict(os.environ, {"CACHE_BACKEND": " SQLite ", "CACHE_SQLITE_PATH": "/data/cache.db"})
+    def test_custom_values(self):
+        """Test: CACHE_BACKEND y CACHE_SQLITE_PATH se respetan"""
+        self.assertEqual(get_cache_backend(), "sqlite")
+        self.assertEqual(get_cache_sqlite_path(), "/data/cache.db")
+
+    @patch.dict(os.environ, {"CACHE_BACKEND": "memcached"})
+    def test_unknown_backend(self):
+        """Test: Un backend desconocido usa memory"""
+        self.assertEqual(get_cache_backend(), "memory")
+
+
+class TestGetEngineSettings(unittest.TestCase):
+    """Tests para get_engine_workers y get_engine_queue_size."""
+
+    @patch.dict(os.environ, {"ENGINE_WORKERS": "3", "ENGINE_QUEUE_SIZE": "8"})
+    def test_custom_values(self):
+        """Test: Las variables de entorno fijan procesos y cola"""
+        self.assertEqual(get_engine_workers(), 3)
+        self.assertEqual(get_engine_queue_size(), 8)
+
+    @patch.dict(os.environ, {"ENGINE_WORKERS": "abc"})
+    def test_default_workers(self):
+        """Test: Por defecto un proceso por núcleo, o hilos con un solo núcleo"""
+        cores = len(os.sched_getaffinity(0))
+        self.assertEqual(get_engine_workers(), cores if cores > 1 else 0)
+
+    @patch.dict(os.environ, {"ENGINE_WORKERS": "-2", "ENGINE_QUEUE_SIZE": "-1"})
+    def test_negative_clamped_to_zero(self):
+        """Test: Valores negativos se limitan a 0"""
+        self.assertEqual(get_engine_workers(), 0)
+        self.assertEqual(get_engine_queue_size(), 0)
+
+
+class TestGetAnalysisBatchMaxItems(unittest.TestCase):
+    """Tests para la función get_analysis_batch_max_items."""
+
+    @patch.dict(os.environ, {}, clear=True)
+    def test_default(self):
+        """Test: Por defecto 1000 programas"""
+        self.assertEqual(get_analysis_batch_max_items(), 1000)
+
+    @patch.dict(os.environ, {"ANALYSIS_BATCH_MAX_ITEMS": "0"})
+    def test_minimum_one(self):
+        """Test: El mínimo es 1"""
+        self.assertEqual(get_analysis_batch_max_items(), 1)
+
+
+class TestGetAnalysisDeadline(unittest.TestCase):
+    """Tests para la función get_analysis_deadline."""
+
+    @patch.dict(os.environ, {}, clear=True)
+    def test_default(self):
+        """Test: Por defecto 30 segundos"""
+        self.assertEqual(get_analysis_deadline(), 30)
+
+    @patch.dict(os.environ, {"ANALYSIS_DEADLINE_SECONDS": "0"})
+    def test_zero_disables(self):
+        """Test: 0 desactiva el plazo"""
+        self.assertEqual(get_analysis_deadline(), 0)
+
+    @patch.dict(os.environ, {"ANALYSIS_DEADLINE_SECONDS": "-5"})
+    def test_negative_clamped_to_zero(self):
+        """Test: Valores negativos se limitan a 0"""
+        self.assertEqual(get_analysis_deadline(), 0)
+
+
+class TestGetWarmupEnabled(unittest.TestCase):
+    """Tests para la función get_warmup_enabled."""
+
+    @patch.dict(os.environ, {}, clear=True)
+    def test_default_enabled(self):
+        """Test: El calentamiento está activado por defecto"""
+        self.assertTrue(get_warmup_enabled())
+
+    @patch.dict(os.environ, {"WARMUP_ENABLED": "0"})
+    def test_disabled(self):
+        """Test: WARMUP_ENABLED=0 lo desactiva"""
+        self.assertFalse(get_warmup_enabled())
+
+
+class TestGetWarmupCorpusDir(unittest.TestCase):
+    """Tests para la función get_warmup_corpus_dir."""
+
+    @patch.dict(os.environ, {}, clear=True)
+    def test_default_is_grammar_fixtures(self):
+        """Test: Por defecto se usan los fixtures de la gramática"""
+        path = get_warmup_corpus_dir()
+        self.assertTrue(path.endswith(os.path.join("packages", "grammar", "fixtures")))
+        self.assertTrue(os.path.isdir(path))
+
+    @patch.dict(os.environ, {"WARMUP_CORPUS_DIR": "/tmp/corpus"})
+    def test_custom_dir(self):
+        """Test: Directorio personalizado"""
+        self.assertEqual(get_warmup_corpus_dir(), "/tmp/corpus")
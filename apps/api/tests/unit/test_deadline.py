@@ -0,0 +1,221 @@
+"""
+Tests unitarios para el plazo de análisis (app.modules.shared.deadline) y los
+resultados degradados de los analizadores y del servicio.
+
+Author: Juan Camilo Cruz Parra (@Cruz1122)
+"""
+import os
+import signal
+import threading
+import time
+import unittest
+from unittest.mock import patch
+from app.modules.analysis.analyzers.iterative import IterativeAnalyzer
+from app.modules.analysis.analyzers.recursive import RecursiveAnalyzer
+from app.modules.analysis.cache import get_analysis_cache
+from app.modules.analysis.programs import get_program_store
+from app.modules.analysis.service import analyze_algorithm
+from app.modules.parsing.service import parse_source
+from app.modules.shared.deadline import (
+    DeadlineExceeded,
+    check_deadline,
+    current_deadline,
+    deadline_after,
+    deadline_scope,
+    interruptible,
+    killable,
+)
+
+BURBUJA = """burbuja(A[n], n) BEGIN
+  FOR i <- 1 TO n - 1 DO BEGIN
+    FOR j <- 1 TO n - i DO BEGIN
+      IF (A[j] > A[j + 1]) THEN BEGIN
+        temp <- A[j];
+      END
+    END
+  END
+END"""
+
+FACTORIAL = """factorial(n) BEGIN
+  IF (n <= 1) THEN BEGIN
+    RETURN 1;
+  END
+  ELSE BEGIN
+    RETURN n * factorial(n - 1);
+  END
+END"""
+
+
+def _in_thread(fn):
+    """Ejecuta fn en otro hilo y devuelve (resultado, excepción)."""
+    outcome = {}
+
+    def target():
+        try:
+            outcome["result"] = fn()
+        except BaseException as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=target)
+    thread.start()
+    thread.join()
+    return outcome.get("result"), outcome.get("error")
+
+
+class TestDeadlineScope(unittest.TestCase):
+    """Tests para deadline_scope y check_deadline."""
+
+    def test_no_deadline(self):
+        """Test: Sin plazo check_deadline no hace nada"""
+        self.assertIsNone(deadline_after(0))
+        with deadline_scope(None):
+            self.assertIsNone(check_deadline())
+
+    def test_expired_deadline_raises(self):
+        """Test: Con el plazo agotado check_deadline lanza DeadlineExceeded"""
+        with deadline_scope(time.time() - 1):
+            with self.assertRaises(DeadlineExceeded):
+                check_deadline()
+        self.assertIsNone(current_deadline())
+
+    def test_nested_scope_keeps_shorter(self):
+        """Test: Un plazo anidado no extiende el plazo exterior"""
+        with deadline_scope(deadline_after(1)) as outer:
+            with deadline_scope(deadline_after(60)) as inner:
+                self.assertIs(inner, outer)
+            with deadline_scope(deadline_after(0.5)) as inner:
+                self.assertLess(inner.expires_at, outer.expires_at)
+            self.assertIs(current_deadline(), outer)
+
+    def test_not_caught_by_except_exception(self):
+        """Test: Los `except Exception` del pipeline no ocultan el plazo agotado"""
+        self.assertFalse(issubclass(DeadlineExceeded, Exception))
+
+
+class TestInterruption(unittest.TestCase):
+    """Tests para interruptible y killable."""
+
+    def test_alarm_interrupts_main_thread(self):
+        """Test: En el hilo principal la operación se corta en el plazo"""
+        start = time.time()
+        with deadline_scope(deadline_after(0.2)):
+            with self.assertRaises(DeadlineExceeded):
+                interruptible(time.sleep, 5)
+        self.assertLess(time.time() - start, 2)
+        self.assertEqual(signal.getitimer(signal.ITIMER_REAL)[0], 0)
+        self.assertIs(signal.getsignal(signal.SIGALRM), signal.SIG_DFL)
+
+    def test_swallowed_alarm_raises_again(self):
+        """Test: Si fn traga la alarma con un except desnudo, interruptible vuelve a lanzarla"""
+        def swallow():
+            try:
+                time.sleep(5)
+            except:  # noqa: E722 - simula los except desnudos de los analizadores
+                pass
+            return "a medias"
+
+        start = time.time()
+        with deadline_scope(deadline_after(0.2)):
+            with self.assertRaises(DeadlineExceeded):
+                interruptible(swallow)
+        self.assertLess(time.time() - start, 2)
+
+    def test_returns_result_within_deadline(self):
+        """Test: Dentro del plazo se devuelve el resultado"""
+        with deadline_scope(deadline_after(5)):
+            self.assertEqual(interruptible(sum, [1, 2, 3]), 6)
+            self.assertEqual(killable(max, 1, 4), 4)
+
+    def test_killable_in_thread_uses_child_process(self):
+        """Test: Fuera del hilo principal killable mata la operación al agotarse el plazo"""
+        def slow():
+            with deadline_scope(deadline_after(0.3)):
+                return killable(time.sleep, 5)
+
+        start = time.time()
+        _, error = _in_thread(slow)
+        self.assertIsInstance(error, DeadlineExceeded)
+        self.assertLess(time.time() - start, 2)
+
+    def test_killable_in_thread_result_and_errors(self):
+        """Test: killable en un hilo devuelve el resultado del hijo y convierte sus errores"""
+        def run(fn, *args):
+            with deadline_scope(deadline_after(10)):
+                return killable(fn, *args)
+
+        result, error = _in_thread(lambda: run(os.getpid))
+        self.assertIsNone(error)
+        self.assertNotEqual(result, os.getpid())
+        _, error = _in_thread(lambda: run(int, "x"))
+        self.assertIsInstance(error, RuntimeError)
+
+
+class TestDegradedAnalysis(unittest.TestCase):
+    """Tests de los resultados parciales de los analizadores."""
+
+    def test_iterative_keeps_sums_open(self):
+        """Test: Si el plazo se agota al cerrar sumatorias, T_open las deja abiertas"""
+        ast = parse_source(BURBUJA)["ast"]
+        with deadline_scope(time.time() - 1):
+            result = IterativeAnalyzer().analyze(ast, "worst")
+        self.assertTrue(result["ok"])
+        self.assertTrue(result["degraded"])
+        self.assertEqual(result["degradedStage"], "summations")
+        self.assertIn("\\sum", result["totals"]["T_open"])
+        self.assertNotIn("big_o", result["totals"])
+
+    def test_iterative_asymptotics_timeout(self):
+        """Test: Si el plazo se agota en las cotas asintóticas se conserva T_open cerrado"""
+        ast = parse_source(BURBUJA)["ast"]
+        with patch.object(IterativeAnalyzer, "_calculate_asymptotics", side_effect=DeadlineExceeded):
+            result = IterativeAnalyzer().analyze(ast, "worst")
+        self.assertEqual(result["degradedStage"], "asymptotics")
+        self.assertNotIn("\\sum", result["totals"]["T_open"])
+        self.assertNotIn("big_o", result["totals"])
+
+    def test_recursive_keeps_recurrence(self):
+        """Test: Si el plazo se agota al resolver, se devuelve la recurrencia sin solución"""
+        ast = parse_source(FACTORIAL)["ast"]
+        with patch.object(RecursiveAnalyzer, "_apply_method", side_effect=DeadlineExceeded):
+            result = RecursiveAnalyzer().analyze(ast, "worst")
+        self.assertTrue(result["degraded"])
+        self.assertEqual(result["degradedStage"], "method")
+        self.assertIn("recurrence", result["totals"])
+        self.assertEqual(result["totals"]["T_open"], "N/A")
+
+    def test_complete_analysis_not_degraded(self):
+        """Test: Dentro del plazo el resultado no se marca como degradado"""
+        ast = parse_source(BURBUJA)["ast"]
+        with deadline_scope(deadline_after(60)):
+            result = IterativeAnalyzer().analyze(ast, "worst")
+        self.assertNotIn("degraded", result)
+        self.assertIn("big_o", result["totals"])
+
+
+class TestServiceDeadline(unittest.TestCase):
+    """Tests del plazo en analyze_algorithm."""
+
+    def setUp(self):
+        get_analysis_cache().clear()
+        get_program_store().clear()
+
+    def test_degraded_result_not_cached(self):
+        """Test: Un resultado degradado no se guarda en la caché"""
+        with patch("app.modules.analysis.service.get_analysis_deadline", return_value=1e-9):
+            degraded = analyze_algorithm(BURBUJA, mode="all")
+        self.assertTrue(degraded["degraded"])
+        self.assertEqual(degraded["worst"]["degradedStage"], "summations")
+        complete = analyze_algorithm(BURBUJA, mode="all")
+        self.assertNotIn("degraded", complete)
+        self.assertIn("big_o", complete["worst"]["totals"])
+
+    def test_deadline_outside_analyzers(self):
+        """Test: Si el plazo se agota fuera de los analizadores se devuelve un error degradado"""
+        with patch("app.modules.analysis.service._analyze_algorithm", side_effect=DeadlineExceeded):
+            result = analyze_algorithm(FACTORIAL, mode="worst")
+        self.assertFalse(result["ok"])
+        self.assertTrue(result["degraded"])
+
+
+if __name__ == '__main__':
+    unittest.main()
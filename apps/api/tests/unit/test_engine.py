@@ -0,0 +1,166 @@
+"""
+Tests unitarios para el motor de ejecución (app.core.engine).
+
+Author: Juan Felipe Henao (@Pipe-1z)
+"""
+import asyncio
+import os
+import threading
+import unittest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from app.core.engine import EngineBusy, EngineUnavailable, ExecutionEngine
+from app.main import app
+
+
+def _worker_pid():
+    return os.getpid()
+
+
+def _crash():
+    os._exit(1)
+
+
+def _fail():
+    raise ValueError("fallo en el worker")
+
+
+class TestThreadMode(unittest.TestCase):
+    """Tests del motor sin pool de procesos (ENGINE_WORKERS=0)."""
+
+    def test_runs_in_thread(self):
+        """Test: El trabajo corre fuera del hilo del event loop"""
+        engine = ExecutionEngine(workers=0, queue_size=1)
+
+        async def main():
+            return await engine.run(threading.get_ident), threading.get_ident()
+
+        worker_thread, loop_thread = asyncio.run(main())
+        self.assertNotEqual(worker_thread, loop_thread)
+        self.assertEqual(engine.stats()["mode"], "thread")
+
+    def test_full_queue_rejected(self):
+        """Test: Con la cola llena se rechaza de inmediato con EngineBusy"""
+        engine = ExecutionEngine(workers=0, queue_size=0)
+        release = threading.Event()
+
+        async def main():
+            busy = asyncio.ensure_future(engine.run(release.wait, 5))
+            await asyncio.sleep(0.05)
+            try:
+                with self.assertRaises(EngineBusy) as ctx:
+                    await engine.run(int)
+            finally:
+                release.set()
+            await busy
+            return ctx.exception
+
+        error = asyncio.run(main())
+        self.assertEqual(error.status_code, 429)
+        stats = engine.stats()
+        self.assertEqual((stats["rejected"], stats["completed"], stats["in_flight"]), (1, 1, 0))
+
+    def test_ready_without_pool(self):
+        """Test: Sin pool de procesos el motor está listo desde el inicio"""
+        engine = ExecutionEngine(workers=0)
+        self.assertIsNone(engine.start())
+        self.assertTrue(engine.stats()["ready"])
+
+    def test_closed_engine(self):
+        """Test: Un motor cerrado responde EngineUnavailable"""
+        engine = ExecutionEngine(workers=0)
+        engine.shutdown()
+        with self.assertRaises(EngineUnavailable):
+            asyncio.run(engine.run(int))
+
+
+class TestProcessMode(unittest.TestCase):
+    """Tests del motor con pool de procesos."""
+
+    def setUp(self):
+        self.engine = ExecutionEngine(workers=1, queue_size=2)
+
+    def tearDown(self):
+        self.engine.shutdown()
+
+    def test_runs_in_worker_process(self):
+        """Test: El trabajo corre en otro proceso"""
+        pid = asyncio.run(self.engine.run(_worker_pid))
+        self.assertNotEqual(pid, os.getpid())
+
+    def test_exceptions_propagate(self):
+        """Test: Las excepciones del trabajo llegan al llamador"""
+        with self.assertRaises(ValueError):
+            asyncio.run(self.engine.run(_fail))
+
+    def test_ready_after_workers_start(self):
+        """Test: start() arranca los workers y el motor queda listo cuando responden"""
+        engine = ExecutionEngine(workers=2)
+        try:
+            self.assertFalse(engine.ready)
+            engine.start().join(timeout=30)
+            self.assertTrue(engine.stats()["ready"])
+        finally:
+            engine.shutdown()
+
+    def test_same_key_runs_in_same_worker(self):
+        """Test: run_on envía siempre la misma clave al mismo worker"""
+        engine = ExecutionEngine(workers=3)
+        try:
+            for key in ("programa-a", "programa-b", "programa-c"):
+                pids = {asyncio.run(engine.run_on(key, _worker_pid)) for _ in range(4)}
+                self.assertEqual(len(pids), 1, key)
+        finally:
+            engine.shutdown()
+
+    def test_crashed_worker_is_replaced(self):
+        """Test: Si un worker muere se responde 503 y ese worker se vuelve a crear"""
+        with self.assertRaises(EngineUnavailable):
+            asyncio.run(self.engine.run(_crash))
+        pid = asyncio.run(self.engine.run(_worker_pid))
+        self.assertNotEqual(pid, os.getpid())
+        self.assertEqual(self.engine.stats()["crashes"], 1)
+
+
+class TestEngineLifespan(unittest.TestCase):
+    """Tests del arranque y cierre del motor con la aplicación."""
+
+    def test_lifespan_starts_and_shuts_down_engine(self):
+        """Test: La aplicación arranca los workers del motor y los cierra al apagar"""
+        with patch("app.main.start_warmup"), \
+                patch("app.main.get_engine") as get_engine, \
+                patch("app.main.shutdown_engine") as shutdown_engine:
+            with TestClient(app):
+                get_engine.return_value.start.assert_called_once_with()
+                shutdown_engine.assert_not_called()
+            shutdown_engine.assert_called_once_with()
+
+
+class TestEngineErrorResponses(unittest.TestCase):
+    """Tests de las respuestas 429/503 de las rutas de análisis."""
+
+    def setUp(self):
+        self.client = TestClient(app)
+
+    def test_busy_returns_429(self):
+        """Test: Con el motor lleno /analyze/open responde 429 con Retry-After"""
+        engine = ExecutionEngine(workers=0, queue_size=0)
+        engine.in_flight = 1
+        with patch("app.modules.analysis.service.get_engine", return_value=engine):
+            response = self.client.post("/analyze/open", json={"source": "ocupado(n) BEGIN\n    x <- n;\nEND"})
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.headers["Retry-After"], "1")
+        self.assertFalse(response.json()["ok"])
+
+    def test_unavailable_returns_503(self):
+        """Test: Con el motor cerrado /analyze/trace responde 503"""
+        engine = ExecutionEngine(workers=0)
+        engine.shutdown()
+        with patch("app.modules.analysis.service.get_engine", return_value=engine):
+            response = self.client.post("/analyze/trace", json={"source": "cerrado(n) BEGIN\n    x <- n;\nEND"})
+        self.assertEqual(response.status_code, 503)
+        self.assertIn("errors", response.json())
+
+
+if __name__ == '__main__':
+    unittest.main()
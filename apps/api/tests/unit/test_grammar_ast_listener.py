@@ -0,0 +1,100 @@
+"""
+Tests unitarios para la construcción del AST en una pasada (aa_grammar.ast_listener).
+
+Author: Juan Camilo Cruz Parra (@Cruz1122)
+"""
+import ast as py_ast
+import glob
+import os
+import unittest
+from unittest.mock import patch
+from aa_grammar.api import (
+    AST_BUILD_LISTENER,
+    AST_BUILD_TREE,
+    ENGINE_ANTLR,
+    PREDICTION_MODES,
+    get_ast_build_mode,
+    parse_to_ast,
+)
+
+TESTS_DIR = os.path.join(os.path.dirname(__file__), "..")
+FIXTURES_DIR = os.path.join(TESTS_DIR, "..", "..", "..", "packages", "grammar", "fixtures")
+
+EDGE_CASES = [
+    "a.b.c <- 1;",
+    "a.b[i] <- x.y;",
+    "{ s <- \"hola\"; x <- -y; z <- not (a and b or c); print(length(A), g(1, 2)); }",
+    "IF (a) THEN { x <- 1; } ELSE IF (b) THEN { y <- 2; }",
+    "CALL foo(1); ; x[1..n] <- 2; A[3][4];",
+    "CLASS Foo { a b } x <- NULL;",
+    "p(Foo obj, A[n][m], k) BEGIN repeat k <- k div 2 mod 3; until (k = 0) RETURN k; END",
+    "buscar(A[1]..[n], x) BEGIN RETURN 1; END",
+    "{ a <- 1 $ b <- 2 }",
+    "test(n) BEGIN\n  x <- ;\nEND",
+]
+
+
+def load_corpus():
+    """Fixtures de la gramática y programas embebidos en los tests de la API."""
+    programs = []
+    for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, "*.pseudo"))):
+        with open(path, encoding="utf-8") as fh:
+            programs.append(fh.read())
+    for path in sorted(glob.glob(os.path.join(TESTS_DIR, "**", "*.py"), recursive=True)):
+        with open(path, encoding="utf-8") as fh:
+            tree = py_ast.parse(fh.read())
+        for node in py_ast.walk(tree):
+            if isinstance(node, py_ast.Constant) and isinstance(node.value, str):
+                if "BEGIN" in node.value or ("{" in node.value and "<-" in node.value):
+                    programs.append(node.value)
+    return programs + EDGE_CASES
+
+
+class TestAstBuildMode(unittest.TestCase):
+    """Tests para la selección del modo de construcción por variable de entorno."""
+
+    @patch.dict(os.environ, {}, clear=True)
+    def test_default_is_listener(self):
+        """Test: Por defecto el AST se construye en una pasada"""
+        self.assertEqual(get_ast_build_mode(), AST_BUILD_LISTENER)
+
+    @patch.dict(os.environ, {"AA_GRAMMAR_AST_BUILD": "Tree"})
+    def test_tree_switch(self):
+        """Test: AA_GRAMMAR_AST_BUILD=tree usa el árbol de ANTLR y ASTBuilder"""
+        self.assertEqual(get_ast_build_mode(), AST_BUILD_TREE)
+
+    @patch.dict(os.environ, {"AA_GRAMMAR_AST_BUILD": "otro"})
+    def test_unknown_value_uses_default(self):
+        """Test: Valores desconocidos usan el defecto"""
+        self.assertEqual(get_ast_build_mode(), AST_BUILD_LISTENER)
+
+
+class TestListenerEquivalence(unittest.TestCase):
+    """Tests diferenciales: el listener debe producir lo mismo que ASTBuilder."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.corpus = load_corpus()
+        # Los mensajes de recuperación de ANTLR dependen del DFA compartido:
+        # calentarlo antes de comparar
+        for prediction in PREDICTION_MODES:
+            for source in cls.corpus:
+                parse_to_ast(source, prediction, AST_BUILD_TREE, ENGINE_ANTLR)
+
+    def test_corpus_loaded(self):
+        """Test: El corpus incluye programas válidos e inválidos"""
+        results = [parse_to_ast(source)[1] for source in self.corpus]
+        self.assertGreater(sum(1 for errors in results if not errors), 40)
+        self.assertGreater(sum(1 for errors in results if errors), 0)
+
+    def test_same_result_as_ast_builder(self):
+        """Test: Mismo AST y errores que el camino con árbol, en ambas predicciones"""
+        for prediction in PREDICTION_MODES:
+            for source in self.corpus:
+                expected = parse_to_ast(source, prediction, AST_BUILD_TREE, ENGINE_ANTLR)
+                actual = parse_to_ast(source, prediction, AST_BUILD_LISTENER, ENGINE_ANTLR)
+                self.assertEqual(actual, expected, f"{prediction}: {source}")
+
+
+if __name__ == '__main__':
+    unittest.main()
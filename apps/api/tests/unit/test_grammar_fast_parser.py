@@ -0,0 +1,137 @@
+"""
+Tests unitarios para el parser descendente recursivo (aa_grammar.fast_parser).
+
+Author: Juan Camilo Cruz Parra (@Cruz1122)
+"""
+import os
+import random
+import unittest
+from unittest.mock import patch
+from aa_grammar.api import (
+    AST_BUILD_TREE,
+    ENGINE_ANTLR,
+    ENGINE_FAST,
+    PREDICTION_LL,
+    get_engine,
+    parse_to_ast,
+)
+from aa_grammar.fast_parser import FastParseError, parse_fast, tokenize
+from tests.unit.test_grammar_ast_listener import load_corpus
+
+# Fragmentos que se insertan al mutar programas del corpus
+SNIPPETS = [
+    "a.b.c", "x[1..n]", "-y", "not a", "\"s\"", "length(A)", "g(1, 2)", ";",
+    "(a + b) * c", "T", "F", "NULL", "A[i][j]", "p.q[r]", "<>", ":=", "..",
+    "CALL g()", "print(x)", "BEGIN END", "{ }", "RETURN 1;", "ELSE", "$",
+    "\"sin cerrar", "// comentario\n", "►", "≤", "DIV", "mod",
+]
+
+
+def antlr(source):
+    """Resultado de referencia: ANTLR con LL completo y ASTBuilder."""
+    return parse_to_ast(source, PREDICTION_LL, AST_BUILD_TREE, ENGINE_ANTLR)
+
+
+class TestEngineMode(unittest.TestCase):
+    """Tests para la selección del motor por variable de entorno."""
+
+    @patch.dict(os.environ, {}, clear=True)
+    def test_default_is_fast(self):
+        """Test: Por defecto se usa el parser propio"""
+        self.assertEqual(get_engine(), ENGINE_FAST)
+
+    @patch.dict(os.environ, {"AA_GRAMMAR_ENGINE": "ANTLR"})
+    def test_antlr_switch(self):
+        """Test: AA_GRAMMAR_ENGINE=antlr usa siempre ANTLR"""
+        self.assertEqual(get_engine(), ENGINE_ANTLR)
+
+
+class TestTokenize(unittest.TestCase):
+    """Tests del tokenizador."""
+
+    def test_positions_match_antlr_convention(self):
+        """Test: Línea base 1 y columna base 0"""
+        tokens = tokenize("x <- 1\n  // nota\n  FOR")
+        self.assertEqual(tokens[0], ("ID", "x", 1, 0))
+        self.assertEqual(tokens[1], ("<-", "<-", 1, 2))
+        self.assertEqual(tokens[3], ("FOR", "FOR", 3, 2))
+        self.assertEqual(tokens[4][0], "EOF")
+
+    def test_keywords_are_case_insensitive(self):
+        """Test: Palabras clave sin distinguir mayúsculas; t y f son booleanos"""
+        kinds = [tok[0] for tok in tokenize("While t f forx")[:4]]
+        self.assertEqual(kinds, ["WHILE", "TRUE", "FALSE", "ID"])
+
+    def test_operator_variants(self):
+        """Test: Variantes ASCII de asignación y distinto"""
+        kinds = [tok[0] for tok in tokenize(":= <> .. .")[:4]]
+        self.assertEqual(kinds, ["<-", "!=", "..", "."])
+
+    def test_unrecognized_character(self):
+        """Test: Caracteres que el lexer de ANTLR no reconoce se rechazan"""
+        for source in ["x <- 1 $", "x ← 1", "x <- \"abc"]:
+            with self.assertRaises(FastParseError):
+                tokenize(source)
+
+
+class TestFastParser(unittest.TestCase):
+    """Tests diferenciales contra ANTLR."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.corpus = load_corpus()
+
+    def test_corpus_same_ast(self):
+        """Test: Los programas válidos del corpus dan el mismo AST que ANTLR"""
+        accepted = 0
+        for source in self.corpus:
+            ast, errors = antlr(source)
+            fast = parse_fast(source)
+            if errors:
+                self.assertIsNone(fast, source)
+            elif fast is not None:
+                accepted += 1
+                self.assertEqual(fast, ast, source)
+        self.assertGreater(accepted, 40)
+
+    def test_fuzz_against_antlr(self):
+        """Test: Programas mutados: o mismo AST que ANTLR, o delegación en ANTLR"""
+        rng = random.Random(1122)
+        for _ in range(800):
+            source = rng.choice(self.corpus)
+            if source:
+                i = rng.randrange(len(source) + 1)
+                j = min(len(source), i + rng.randrange(0, 6))
+                choice = rng.random()
+                if choice < 0.5:
+                    source = source[:i] + rng.choice(SNIPPETS) + source[j:]
+                elif choice < 0.8:
+                    source = source[:i] + source[j:]
+            ast, errors = antlr(source)
+            fast = parse_fast(source)
+            if fast is not None:
+                self.assertEqual(errors, [], source)
+                self.assertEqual(fast, ast, source)
+
+    def test_errors_fall_back_to_antlr(self):
+        """Test: Con errores parse_to_ast devuelve los mensajes de ANTLR"""
+        source = "test(n) BEGIN\n  x <- ;\nEND"
+        self.assertIsNone(parse_fast(source))
+        # Mismo estado del DFA para ambos llamados
+        antlr(source)
+        self.assertEqual(
+            parse_to_ast(source, PREDICTION_LL, AST_BUILD_TREE, ENGINE_FAST),
+            antlr(source),
+        )
+
+    def test_range_params_fall_back(self):
+        """Test: Parámetros con rango se delegan en ANTLR"""
+        self.assertIsNone(parse_fast("buscar(A[1]..[n], x) BEGIN RETURN 1; END"))
+
+    def test_deep_nesting_falls_back(self):
+        """Test: Un anidamiento que agota la recursión no rompe el parseo"""
+        self.assertIsNone(parse_fast("x <- " + "(" * 5000 + "1" + ")" * 5000))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+"""
+Tests unitarios para los presupuestos de parseo (aa_grammar.budget).
+
+Author: Juan Camilo Cruz Parra (@Cruz1122)
+"""
+import os
+import unittest
+from unittest.mock import patch
+from aa_grammar.api import ENGINE_ANTLR, ENGINE_FAST, ENGINE_MODES, parse_to_ast
+from aa_grammar.budget import (
+    DEFAULT_MAX_DEPTH,
+    DEFAULT_MAX_TOKENS,
+    ParseBudget,
+    get_parse_budget,
+)
+from aa_grammar.incremental import parse_document, reparse_document
+from app.modules.parsing.adapter import parse_to_ast_adapter
+from app.modules.parsing.cache import get_parse_cache
+
+
+def nested(depth):
+    """Asignación con depth paréntesis anidados."""
+    return "x <- " + "(" * depth + "1" + ")" * depth + ";"
+
+
+class TestParseBudgetEnv(unittest.TestCase):
+    """Tests para la lectura de presupuestos desde el entorno."""
+
+    @patch.dict(os.environ, {}, clear=True)
+    def test_defaults(self):
+        """Test: Sin variables de entorno se usan los valores por defecto"""
+        budget = get_parse_budget()
+        self.assertEqual(budget.max_tokens, DEFAULT_MAX_TOKENS)
+        self.assertEqual(budget.max_depth, DEFAULT_MAX_DEPTH)
+
+    @patch.dict(os.environ, {"AA_GRAMMAR_MAX_DEPTH": "0", "AA_GRAMMAR_MAX_ERRORS": "x"})
+    def test_zero_disables_and_invalid_uses_default(self):
+        """Test: 0 desactiva el límite y un valor inválido usa el defecto"""
+        budget = get_parse_budget()
+        self.assertEqual(budget.max_depth, 0)
+        self.assertEqual(budget.max_errors, 100)
+
+
+class TestParseBudgets(unittest.TestCase):
+    """Tests de cada presupuesto en ambos motores."""
+
+    def assertBudget(self, result, kind):
+        ast, errors = result
+        self.assertIsNone(ast)
+        self.assertEqual(errors[-1]["budget"], kind)
+
+    def test_source_size(self):
+        """Test: Código más grande que el máximo se rechaza sin parsear"""
+        budget = ParseBudget(max_source_chars=10)
+        for engine in ENGINE_MODES:
+            self.assertBudget(parse_to_ast("x <- 12345678;", engine=engine, budget=budget), "source")
+
+    def test_token_count(self):
+        """Test: Se detiene al superar el máximo de tokens, en el token que lo supera"""
+        budget = ParseBudget(max_tokens=8)
+        for engine in ENGINE_MODES:
+            ast, errors = parse_to_ast("x <- 1;\ny <- 2;\nz <- 3;", engine=engine, budget=budget)
+            self.assertIsNone(ast)
+            self.assertEqual(errors, [{
+                "line": 3, "column": 1, "budget": "tokens",
+                "message": "El código supera el máximo de 8 tokens; parseo detenido",
+            }])
+
+    def test_nesting_depth(self):
+        """Test: Anidamiento más profundo que el máximo se detiene con un error claro"""
+        for engine in ENGINE_MODES:
+            self.assertIsNotNone(parse_to_ast(nested(DEFAULT_MAX_DEPTH), engine=engine)[0])
+            ast, errors = parse_to_ast(nested(5000), engine=engine)
+            self.assertIsNone(ast)
+            self.assertEqual(errors[-1]["budget"], "depth")
+            self.assertEqual(errors[-1]["column"], 6 + DEFAULT_MAX_DEPTH)
+
+    def test_recursion_without_delimiters(self):
+        """Test: Agotar la pila sin delimitadores también devuelve un error y no lanza"""
+        self.assertBudget(parse_to_ast("x <- " + "not " * 3000 + "a;"), "depth")
+
+    def test_error_count(self):
+        """Test: Se dejan de recoger errores al alcanzar el máximo"""
+        ast, errors = parse_to_ast("x <- ;\n" * 50, budget=ParseBudget(max_errors=5))
+        self.assertIsNone(ast)
+        self.assertEqual(len(errors), 6)
+        self.assertEqual(errors[-1]["budget"], "errors")
+
+    def test_deadline(self):
+        """Test: El tiempo máximo se comprueba desde el flujo de tokens"""
+        source = "x <- 1;\n" * 2000
+        budget = ParseBudget(deadline_ms=1)
+        self.assertBudget(parse_to_ast(source, engine=ENGINE_ANTLR, budget=budget), "deadline")
+
+    def test_within_budget_unchanged(self):
+        """Test: Sin superar los límites el resultado es el de siempre"""
+        source = "suma(n) BEGIN\n  s <- 0;\n  RETURN s;\nEND"
+        unlimited = ParseBudget(0, 0, 0, 0, 0)
+        for engine in (ENGINE_FAST, ENGINE_ANTLR):
+            self.assertEqual(
+                parse_to_ast(source, engine=engine),
+                parse_to_ast(source, engine=engine, budget=unlimited),
+            )
+
+
+class TestIncrementalBudgets(unittest.TestCase):
+    """Tests de presupuestos en el parseo incremental."""
+
+    def test_parse_document(self):
+        """Test: parse_document devuelve el error de presupuesto sin unidades"""
+        doc = parse_document(nested(200))
+        self.assertIsNone(doc.ast)
+        self.assertIsNone(doc.units)
+        self.assertEqual(doc.errors[-1]["budget"], "depth")
+
+    def test_reparse_over_budget_falls_back_to_full(self):
+        """Test: Una edición que supera el presupuesto reporta el error del documento"""
+        doc = parse_document("x <- 1;\ny <- 2;\nz <- 3;")
+        edit = {
+            "range": {"startLineNumber": 2, "startColumn": 6, "endLineNumber": 2, "endColumn": 7},
+            "text": nested(200)[5:-1],
+        }
+        new_doc, stats = reparse_document(doc, [edit])
+        self.assertFalse(stats["incremental"])
+        self.assertEqual(new_doc.errors[-1]["budget"], "depth")
+
+
+class TestBudgetCaching(unittest.TestCase):
+    """Tests de la caché de parsing con presupuestos."""
+
+    def setUp(self):
+        get_parse_cache().clear()
+
+    def tearDown(self):
+        get_parse_cache().clear()
+
+    @patch.dict(os.environ, {"AA_GRAMMAR_ENGINE": "antlr", "AA_GRAMMAR_DEADLINE_MS": "1"})
+    def test_deadline_results_not_cached(self):
+        """Test: Un parseo detenido por tiempo no se guarda en la caché"""
+        source = "x <- 1;\n" * 2000
+        ast, errors = parse_to_ast_adapter(source)
+        self.assertEqual(errors[-1]["budget"], "deadline")
+        self.assertEqual(get_parse_cache().stats()["size"], 0)
+
+    def test_depth_results_cached(self):
+        """Test: Los demás presupuestos dependen solo del código y sí se cachean"""
+        parse_to_ast_adapter(nested(200))
+        self.assertEqual(get_parse_cache().stats()["size"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+"""
+Tests unitarios para el parseo por lotes (aa_grammar.api.parse_many).
+
+Author: Juan Camilo Cruz Parra (@Cruz1122)
+"""
+import os
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+from aa_grammar import api as grammar_api
+from aa_grammar.api import get_parse_workers, parse_many, parse_to_ast, shutdown_pool
+from app.modules.parsing.adapter import parse_many_adapter
+from app.modules.parsing.cache import get_parse_cache
+
+SOURCES = [
+    "x <- 1;",
+    "test(n) BEGIN\n  x <- ;\nEND",
+    "suma(n) BEGIN\n  s <- 0;\n  FOR i <- 1 TO n DO BEGIN\n    s <- s + i;\n  END\n  RETURN s;\nEND",
+    "{ a <- 1 $ b <- 2 }",
+    "y <- length(A);",
+]
+
+
+class TestParseWorkers(unittest.TestCase):
+    """Tests para get_parse_workers."""
+
+    @patch.dict(os.environ, {"AA_GRAMMAR_WORKERS": "3"})
+    def test_custom_workers(self):
+        """Test: AA_GRAMMAR_WORKERS fija el número de procesos"""
+        self.assertEqual(get_parse_workers(), 3)
+
+    @patch.dict(os.environ, {"AA_GRAMMAR_WORKERS": "x"})
+    def test_invalid_uses_available_cores(self):
+        """Test: Valores inválidos usan los núcleos disponibles"""
+        self.assertGreaterEqual(get_parse_workers(), 1)
+
+
+class TestParseMany(unittest.TestCase):
+    """Tests para parse_many."""
+
+    @classmethod
+    def setUpClass(cls):
+        # Mensajes de error de ANTLR estables: DFA caliente antes de comparar
+        for source in SOURCES:
+            parse_to_ast(source)
+        cls.expected = [parse_to_ast(source) for source in SOURCES]
+
+    @classmethod
+    def tearDownClass(cls):
+        shutdown_pool()
+
+    def check(self, results):
+        self.assertEqual(len(results), len(SOURCES))
+        for result, (ast, errors) in zip(results, self.expected):
+            self.assertEqual(result["ast"], ast)
+            self.assertEqual(result["errors"], errors)
+            self.assertGreaterEqual(result["durationMs"], 0)
+
+    def test_in_process(self):
+        """Test: Con un worker se parsea en el proceso y se conserva el orden"""
+        self.check(parse_many(SOURCES, workers=1))
+
+    def test_process_pool(self):
+        """Test: Con varios workers el pool devuelve lo mismo, en orden de entrada"""
+        self.check(parse_many(SOURCES, workers=2))
+        # El pool se reutiliza entre lotes
+        self.check(parse_many(SOURCES, workers=2))
+
+    def test_pool_shared_across_sizes(self):
+        """Test: Lotes concurrentes de distinto tamaño comparten el pool sin cancelarse"""
+        parse_many(SOURCES, workers=2)
+        pool = grammar_api._pool
+        with ThreadPoolExecutor(max_workers=3) as threads:
+            batches = list(threads.map(lambda n: parse_many(SOURCES * n, workers=n + 1), (1, 2, 3)))
+        for n, results in zip((1, 2, 3), batches):
+            self.assertEqual(len(results), len(SOURCES) * n)
+            self.check(results[:len(SOURCES)])
+        self.assertIs(grammar_api._pool, pool)
+
+    def test_closed_pool_falls_back(self):
+        """Test: Si el pool ya está cerrado el lote se parsea en el proceso"""
+        with patch.object(grammar_api, "_get_pool") as get_pool:
+            get_pool.return_value.map.side_effect = RuntimeError("cannot schedule new futures after shutdown")
+            self.check(parse_many(SOURCES, workers=2))
+
+    def test_empty_batch(self):
+        """Test: Un lote vacío devuelve una lista vacía"""
+        self.assertEqual(parse_many([]), [])
+
+
+class TestParseManyAdapter(unittest.TestCase):
+    """Tests para parse_many_adapter (caché de parsing + duplicados)."""
+
+    def setUp(self):
+        get_parse_cache().clear()
+
+    def tearDown(self):
+        get_parse_cache().clear()
+
+    def test_cache_hits_and_duplicates(self):
+        """Test: Programas en caché y duplicados no se re-parsean"""
+        cached = "x <- 1;"
+        get_parse_cache().put(cached, parse_to_ast(cached))
+        sources = [cached, "y <- 2;", "y <- 2;"]
+        with patch("app.modules.parsing.adapter.parse_many", wraps=parse_many) as spy:
+            results = parse_many_adapter(sources)
+        spy.assert_called_once_with(["y <- 2;"])
+        self.assertEqual(results[0][2], 0.0)
+        self.assertEqual(results[1][0], results[2][0])
+        self.assertIsNot(results[1][0], results[2][0])
+        self.assertIsNotNone(get_parse_cache().get("y <- 2;"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+"""
+Tests unitarios para la estrategia de predicción de aa_grammar.api.parse_to_ast.
+
+Author: Juan Camilo Cruz Parra (@Cruz1122)
+"""
+import glob
+import os
+import unittest
+from unittest.mock import patch
+from aa_grammar.api import (
+    ENGINE_ANTLR,
+    PREDICTION_LL,
+    PREDICTION_TWO_STAGE,
+    get_prediction_mode,
+    parse_to_ast,
+)
+
+FIXTURES_DIR = os.path.join(
+    os.path.dirname(__file__), "..", "..", "..", "..", "packages", "grammar", "fixtures"
+)
+
+PROGRAMS = [
+    "factorial(n) BEGIN\n  IF (n <= 1) THEN BEGIN\n    RETURN 1;\n  END\n  ELSE BEGIN\n    RETURN n * factorial(n - 1);\n  END\nEND",
+    "burbuja(A[n], n) BEGIN\n  FOR i <- 1 TO n - 1 DO BEGIN\n    FOR j <- 1 TO n - i DO BEGIN\n      IF (A[j] > A[j + 1]) THEN BEGIN\n        temp <- A[j];\n        A[j] <- A[j + 1];\n        A[j + 1] <- temp;\n      END\n    END\n  END\nEND",
+    "{ i <- 1; repeat i <- i * 2; until (i >= n) }",
+]
+
+INVALID_PROGRAMS = [
+    "{ a <- 1 ",
+    "test(n) BEGIN\n  x <- ;\nEND",
+    "FOR i <- 1 TO DO BEGIN END",
+    "{ a <- 1 $ b <- 2 }",
+]
+
+
+class TestPredictionMode(unittest.TestCase):
+    """Tests para la selección de estrategia por variable de entorno."""
+
+    @patch.dict(os.environ, {}, clear=True)
+    def test_default_is_two_stage(self):
+        """Test: Por defecto se usa la estrategia en dos etapas"""
+        self.assertEqual(get_prediction_mode(), PREDICTION_TWO_STAGE)
+
+    @patch.dict(os.environ, {"AA_GRAMMAR_PREDICTION": "LL"})
+    def test_ll_switch(self):
+        """Test: AA_GRAMMAR_PREDICTION=ll fuerza LL completo"""
+        self.assertEqual(get_prediction_mode(), PREDICTION_LL)
+
+    @patch.dict(os.environ, {"AA_GRAMMAR_PREDICTION": "turbo"})
+    def test_unknown_value_uses_default(self):
+        """Test: Valores desconocidos usan el defecto"""
+        self.assertEqual(get_prediction_mode(), PREDICTION_TWO_STAGE)
+
+
+class TestTwoStageEquivalence(unittest.TestCase):
+    """Tests diferenciales: SLL->LL debe producir el mismo resultado que LL (motor ANTLR)."""
+
+    @classmethod
+    def setUpClass(cls):
+        fixtures = []
+        for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, "*.pseudo"))):
+            with open(path, encoding="utf-8") as fh:
+                fixtures.append(fh.read())
+        cls.corpus = fixtures + PROGRAMS + INVALID_PROGRAMS
+        # Los mensajes de recuperación de ANTLR dependen del DFA compartido:
+        # calentarlo con LL para comparar ambas estrategias en el mismo estado
+        for source in cls.corpus:
+            parse_to_ast(source, PREDICTION_LL, engine=ENGINE_ANTLR)
+
+    def test_fixtures_loaded(self):
+        """Test: El corpus incluye los fixtures de la gramática"""
+        self.assertGreater(len(self.corpus), len(PROGRAMS) + len(INVALID_PROGRAMS))
+
+    def test_valid_programs_same_ast(self):
+        """Test: Programas válidos producen el mismo AST en ambas estrategias"""
+        for source in self.corpus:
+            ll_ast, ll_errors = parse_to_ast(source, PREDICTION_LL, engine=ENGINE_ANTLR)
+            if ll_errors:
+                continue
+            fast_ast, fast_errors = parse_to_ast(source, PREDICTION_TWO_STAGE, engine=ENGINE_ANTLR)
+            self.assertEqual(fast_errors, [], source)
+            self.assertEqual(fast_ast, ll_ast, source)
+
+    def test_invalid_programs_same_errors(self):
+        """Test: Programas inválidos producen exactamente los mismos errores"""
+        for source in INVALID_PROGRAMS:
+            ll_result = parse_to_ast(source, PREDICTION_LL, engine=ENGINE_ANTLR)
+            fast_result = parse_to_ast(source, PREDICTION_TWO_STAGE, engine=ENGINE_ANTLR)
+            self.assertTrue(ll_result[1], source)
+            self.assertEqual(fast_result, ll_result, source)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+"""
+Tests unitarios para la validación ligera (aa_grammar.validation).
+
+Author: Juan Camilo Cruz Parra (@Cruz1122)
+"""
+import unittest
+from unittest.mock import patch
+from aa_grammar.api import parse_to_ast
+from aa_grammar.validation import _antlr_tokens, check_balance, validate_source
+from tests.unit.test_grammar_ast_listener import load_corpus
+
+
+class TestValidateSource(unittest.TestCase):
+    """Tests para validate_source."""
+
+    def test_valid_program(self):
+        """Test: Un programa balanceado no tiene errores"""
+        source = "f(A[n], n) BEGIN\n  IF (A[1] > 0) THEN { x <- (1 + 2); }\n  RETURN x;\nEND"
+        self.assertEqual(validate_source(source), [])
+
+    def test_lexer_errors_match_antlr(self):
+        """Test: Los errores léxicos son los mismos mensajes que en el parseo completo"""
+        source = "x <- 1 $"
+        self.assertEqual(validate_source(source), parse_to_ast(source)[1])
+
+    def test_unclosed_block(self):
+        """Test: BEGIN sin END se reporta en la posición de la apertura (base 1)"""
+        errors = validate_source("f(n) BEGIN\n  IF (a) THEN BEGIN x <- 1;\nEND")
+        self.assertEqual(errors, [{"line": 1, "column": 6, "message": "'BEGIN' sin cerrar (falta END)"}])
+
+    def test_closer_without_opener(self):
+        """Test: Un cierre sin apertura se reporta y se ignora"""
+        errors = validate_source("x <- 1;\nEND")
+        self.assertEqual(errors, [{"line": 2, "column": 1, "message": "'END' sin apertura correspondiente"}])
+
+    def test_interleaved_delimiters(self):
+        """Test: Un cierre externo cierra su apertura y reporta las intermedias"""
+        errors = validate_source("BEGIN ( END )")
+        self.assertEqual([e["column"] for e in errors], [7, 13])
+        self.assertIn("sin cerrar", errors[0]["message"])
+        self.assertIn("sin apertura", errors[1]["message"])
+
+    def test_keywords_are_case_insensitive(self):
+        """Test: begin/end en minúsculas también cuentan como bloque"""
+        self.assertEqual(validate_source("f(n) begin x <- 1; end"), [])
+
+    def test_unicode_fallback_reports_all_errors(self):
+        """Test: Con caracteres no reconocidos se usa LanguageLexer y se sigue validando"""
+        errors = validate_source("x ← (1")
+        self.assertEqual(errors[0]["message"], "token recognition error at: '←'")
+        self.assertIn("'(' sin cerrar", errors[1]["message"])
+
+    def test_fast_tokenizer_skips_antlr_lexer(self):
+        """Test: Sin errores léxicos no se ejecuta LanguageLexer"""
+        with patch("aa_grammar.validation._antlr_tokens") as antlr:
+            validate_source("x <- (1);")
+        antlr.assert_not_called()
+
+    def test_corpus_consistency(self):
+        """Test: Mismo resultado que con LanguageLexer y sin falsos positivos"""
+        for source in load_corpus():
+            delimiters, lex_errors = _antlr_tokens(source)
+            expected = sorted(lex_errors + check_balance(delimiters), key=lambda e: (e["line"], e["column"]))
+            errors = validate_source(source)
+            self.assertEqual(errors, expected, source)
+            if errors:
+                self.assertTrue(parse_to_ast(source)[1], source)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,220 @@
+"""
+Tests unitarios para aa_grammar.incremental y parse_incremental.
+
+Author: Juan Camilo Cruz Parra (@Cruz1122)
+"""
+import unittest
+from aa_grammar.api import parse_to_ast
+from aa_grammar.incremental import apply_edits, parse_document, reparse_document
+from app.modules.parsing.documents import DocumentStore, get_document_store
+from app.modules.parsing.service import parse_incremental
+
+SOURCE = """sumar(A[n], n) BEGIN
+  s <- 0;
+  FOR i <- 1 TO n DO BEGIN
+    s <- s + A[i];
+  END
+  RETURN s;
+END
+
+maximo(A[n], n) BEGIN
+  m <- A[1];
+  FOR i <- 2 TO n DO BEGIN
+    IF (A[i] > m) THEN BEGIN
+      m <- A[i];
+    END
+  END
+  RETURN m;
+END
+
+contar(n) BEGIN
+  c <- 0;
+  RETURN c;
+END
+x <- 1;
+"""
+
+
+def edit(start_line, start_col, end_line, end_col, text):
+    return {
+        "range": {
+            "startLineNumber": start_line,
+            "startColumn": start_col,
+            "endLineNumber": end_line,
+            "endColumn": end_col,
+        },
+        "text": text,
+    }
+
+
+class TestApplyEdits(unittest.TestCase):
+    """Tests para la aplicación de ediciones estilo Monaco."""
+
+    def test_insert(self):
+        """Test: Inserción en una posición"""
+        new_source, start, end = apply_edits("ab\ncd", [edit(2, 2, 2, 2, "X")])
+        self.assertEqual(new_source, "ab\ncXd")
+        self.assertEqual((start, end), (4, 4))
+
+    def test_replace_across_lines(self):
+        """Test: Reemplazo que abarca varias líneas"""
+        new_source, _, _ = apply_edits("ab\ncd\nef", [edit(1, 2, 3, 1, "-")])
+        self.assertEqual(new_source, "a-ef")
+
+    def test_multiple_edits_refer_to_original(self):
+        """Test: Varias ediciones se refieren al documento original"""
+        new_source, start, end = apply_edits("abc\ndef", [edit(1, 1, 1, 2, "X"), edit(2, 3, 2, 4, "Y")])
+        self.assertEqual(new_source, "Xbc\ndeY")
+        self.assertEqual((start, end), (0, 7))
+
+
+class TestReparseDocument(unittest.TestCase):
+    """Tests diferenciales: el AST incremental debe coincidir con un parseo completo."""
+
+    def assert_matches_full_parse(self, document):
+        ast, errors = parse_to_ast(document.source)
+        self.assertEqual(document.errors, errors)
+        self.assertEqual(document.ast, ast)
+
+    def test_parse_document_matches_parse_to_ast(self):
+        """Test: parse_document produce el mismo AST que parse_to_ast"""
+        document = parse_document(SOURCE)
+        self.assert_matches_full_parse(document)
+        self.assertEqual(len(document.units), 4)
+
+    def test_edit_inside_procedure_reparses_neighbourhood_only(self):
+        """Test: Editar un procedimiento solo re-parsea esa unidad y sus vecinas"""
+        document = parse_document(SOURCE)
+        new_document, stats = reparse_document(document, [edit(10, 3, 10, 3, "k <- 2;\n  ")])
+        self.assertTrue(stats["incremental"])
+        self.assertEqual(stats["reparsedUnits"], 3)
+        self.assertEqual(stats["totalUnits"], 4)
+        self.assert_matches_full_parse(new_document)
+
+    def test_positions_after_edit_are_shifted(self):
+        """Test: Las líneas de las unidades posteriores se desplazan"""
+        document = parse_document(SOURCE)
+        new_document, stats = reparse_document(document, [edit(2, 1, 2, 1, "\n\n\n")])
+        self.assertTrue(stats["incremental"])
+        self.assert_matches_full_parse(new_document)
+        contar = [n for n in new_document.ast["body"] if n and n.get("name") == "contar"][0]
+        self.assertEqual(contar["pos"]["line"], 22)
+
+    def test_same_line_column_shift(self):
+        """Test: Unidades en la misma línea que el fin de la edición desplazan su columna"""
+        source = "a <- 1; b <- 2; c <- 3; d <- 4;"
+        document = parse_document(source)
+        new_document, stats = reparse_document(document, [edit(1, 1, 1, 1, "zz <- 0; ")])
+        self.assertTrue(stats["incremental"])
+        self.assert_matches_full_parse(new_document)
+
+    def test_new_procedure_in_gap(self):
+        """Test: Insertar un procedimiento entre dos existentes"""
+        document = parse_document(SOURCE)
+        new_document, stats = reparse_document(document, [edit(8, 1, 8, 1, "otro(n) BEGIN\n  RETURN n;\nEND\n")])
+        self.assertTrue(stats["incremental"])
+        self.assertEqual(stats["totalUnits"], 5)
+        self.assert_matches_full_parse(new_document)
+
+    def test_syntax_error_falls_back_to_full_parse(self):
+        """Test: Un error de sintaxis produce los mismos errores que un parseo completo"""
+        document = parse_document(SOURCE)
+        new_document, stats = reparse_document(document, [edit(10, 5, 10, 7, "")])
+        self.assertFalse(stats["incremental"])
+        self.assertTrue(new_document.errors)
+        self.assertIsNone(new_document.units)
+        self.assert_matches_full_parse(new_document)
+
+    def test_recovers_after_error(self):
+        """Test: Tras un documento con errores la siguiente edición vuelve a funcionar"""
+        document = parse_document(SOURCE)
+        broken, _ = reparse_document(document, [edit(10, 3, 10, 3, "<- ")])
+        fixed, _ = reparse_document(broken, [edit(10, 3, 10, 6, "")])
+        self.assertEqual(fixed.errors, [])
+        self.assert_matches_full_parse(fixed)
+
+    def test_sequence_of_edits(self):
+        """Test: Una secuencia de ediciones mantiene el AST equivalente"""
+        document = parse_document(SOURCE)
+        for change in [
+            edit(4, 5, 4, 5, "t <- s;\n    "),
+            edit(1, 1, 1, 1, "// cabecera\n"),
+            edit(20, 7, 20, 8, "10"),
+            edit(24, 1, 24, 1, "y <- x + 1;\n"),
+        ]:
+            document, _ = reparse_document(document, [change])
+            self.assert_matches_full_parse(document)
+
+
+class TestParseIncrementalService(unittest.TestCase):
+    """Tests para parse_incremental (servicio)."""
+
+    def setUp(self):
+        get_document_store().clear()
+
+    def test_full_then_incremental(self):
+        """Test: Primer parseo devuelve documentId y el segundo usa ediciones"""
+        first = parse_incremental(source=SOURCE)
+        self.assertTrue(first["ok"])
+        self.assertFalse(first["incremental"]["incremental"])
+
+        second = parse_incremental(document_id=first["documentId"], edits=[edit(2, 8, 2, 9, "1")])
+        self.assertTrue(second["ok"])
+        self.assertTrue(second["incremental"]["incremental"])
+        self.assertNotEqual(second["documentId"], first["documentId"])
+        self.assertEqual(second["ast"], parse_to_ast(SOURCE.replace("s <- 0", "s <- 1"))[0])
+
+    def test_unknown_document_requests_source(self):
+        """Test: Un documento desconocido pide reenviar el código"""
+        result = parse_incremental(document_id="no-existe", edits=[])
+        self.assertFalse(result["ok"])
+        self.assertTrue(result["documentExpired"])
+
+    def test_malformed_requests_return_error(self):
+        """Test: Ediciones o documentId mal formados devuelven el error estándar"""
+        first = parse_incremental(source=SOURCE)
+        doc_id = first["documentId"]
+        cases = [
+            {"document_id": ["no", "hashable"], "edits": []},
+            {"document_id": doc_id, "edits": ["no es un dict"]},
+            {"document_id": doc_id, "edits": {"range": {}}},
+            {"document_id": doc_id, "edits": [{"range": [1, 2]}]},
+            {"document_id": doc_id, "edits": [edit("x", 1, 2, 1, "a")]},
+            {"document_id": doc_id, "edits": [edit(2, 1.5, 2, 1, "a")]},
+            {"document_id": doc_id, "edits": [{"range": {"startLineNumber": 1}, "text": 5}]},
+        ]
+        for case in cases:
+            result = parse_incremental(**case)
+            self.assertFalse(result["ok"], case)
+            self.assertIsNone(result["documentId"])
+            self.assertEqual(len(result["errors"]), 1)
+            self.assertNotIn("documentExpired", result)
+
+    def test_ast_error_is_reported_not_raised(self):
+        """Test: Un fallo del ASTBuilder en código que parsea se reporta como 'AST error'"""
+        # El parser acepta el parámetro A[1]..[n] pero el ASTBuilder falla con él
+        broken = "buscar(A[1]..[n], x) BEGIN RETURN 1; END"
+        result = parse_incremental(source=broken)
+        self.assertFalse(result["ok"])
+        self.assertIsNone(result["ast"])
+        self.assertEqual(result["errors"], parse_to_ast(broken)[1])
+        self.assertTrue(result["errors"][0]["message"].startswith("AST error:"))
+
+        # En el camino incremental se vuelve al parseo completo con el mismo error
+        document = parse_document(SOURCE)
+        new_document, stats = reparse_document(document, [edit(24, 1, 24, 1, broken + "\n")])
+        self.assertFalse(stats["incremental"])
+        self.assertIsNone(new_document.ast)
+        self.assertEqual(new_document.errors, parse_to_ast(new_document.source)[1])
+
+    def test_store_eviction(self):
+        """Test: El almacén expulsa el documento menos usado"""
+        store = DocumentStore(max_entries=1)
+        store.put("a", object())
+        store.put("b", object())
+        self.assertIsNone(store.get("a"))
+        self.assertIsNotNone(store.get("b"))
+
+
+if __name__ == '__main__':
+    unittest.main()
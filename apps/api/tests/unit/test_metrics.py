@@ -0,0 +1,190 @@
+"""
+Tests unitarios para las métricas por etapa (app.modules.shared.metrics), la
+cabecera Server-Timing y GET /metrics.
+
+Author: Juan Camilo Cruz Parra (@Cruz1122)
+"""
+import time
+import unittest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.modules.analysis.analyzers.iterative import IterativeAnalyzer
+from app.modules.analysis.analyzers.recursive import RecursiveAnalyzer
+from app.modules.analysis.cache import get_analysis_cache
+from app.modules.analysis.programs import get_program_store
+from app.modules.parsing.service import parse_source
+from app.modules.shared.deadline import DeadlineExceeded
+from app.modules.shared.metrics import (
+    Histogram,
+    collect_phases,
+    get_phase_histogram,
+    label_phases,
+    merge_phases,
+    phase,
+    timed,
+)
+
+BURBUJA = """burbuja(A[n], n) BEGIN
+  FOR i <- 1 TO n - 1 DO BEGIN
+    FOR j <- 1 TO n - i DO BEGIN
+      IF (A[j] > A[j + 1]) THEN BEGIN
+        temp <- A[j];
+      END
+    END
+  END
+END"""
+
+FACTORIAL = """factorial(n) BEGIN
+  IF (n <= 1) THEN BEGIN
+    RETURN 1;
+  END
+  ELSE BEGIN
+    RETURN n * factorial(n - 1);
+  END
+END"""
+
+
+def _sleep_phase(name, seconds):
+    with phase(name):
+        time.sleep(seconds)
+    return name
+
+
+class TestPhases(unittest.TestCase):
+    """Tests para phase, collect_phases y timed."""
+
+    def test_phase_without_collector(self):
+        """Test: Fuera de collect_phases phase no mide nada"""
+        with phase("visit") as measured:
+            pass
+        self.assertIsNone(measured.timings)
+
+    def test_phases_accumulate(self):
+        """Test: Una etapa repetida suma sus duraciones"""
+        with collect_phases(endpoint="/x") as timings:
+            _sleep_phase("visit", 0.01)
+            _sleep_phase("visit", 0.01)
+            label_phases(mode="worst", kind=None)
+        self.assertGreaterEqual(timings.phases["visit"], 0.02)
+        self.assertEqual(timings.labels, {"endpoint": "/x", "mode": "worst"})
+
+    def test_client_labels_bounded(self):
+        """Test: Valores de mode y kind desconocidos se etiquetan como other"""
+        with collect_phases(endpoint="/x") as timings:
+            label_phases(mode="junk-1", kind="recursive")
+            label_phases(kind="zzz")
+        self.assertEqual(timings.labels, {"endpoint": "/x", "mode": "other", "kind": "other"})
+
+    def test_phase_recorded_on_exception(self):
+        """Test: La etapa se registra aunque el bloque lance DeadlineExceeded"""
+        with collect_phases() as timings:
+            with self.assertRaises(DeadlineExceeded):
+                with phase("solve"):
+                    raise DeadlineExceeded()
+        self.assertIn("solve", timings.phases)
+
+    def test_timed_returns_snapshot(self):
+        """Test: timed mide aparte y merge_phases suma el snapshot a la petición"""
+        with collect_phases() as timings:
+            result, snapshot = timed(_sleep_phase, "parse", 0.01)
+            self.assertEqual(timings.phases, {})
+            merge_phases(snapshot)
+        self.assertEqual(result, "parse")
+        self.assertEqual(timings.phases, snapshot["phases"])
+
+    def test_server_timing(self):
+        """Test: Server-Timing lista las etapas en milisegundos"""
+        with collect_phases() as timings:
+            timings.add("parse", 0.0012)
+            timings.add("visit", 0.5)
+        self.assertEqual(timings.server_timing(), "parse;dur=1.200, visit;dur=500.000")
+
+
+class TestHistogram(unittest.TestCase):
+    """Tests para Histogram."""
+
+    def test_render(self):
+        """Test: Buckets acumulados, _sum y _count en formato de Prometheus"""
+        histogram = Histogram("h_seconds", "Ayuda.", ("phase",), (0.1, 1.0))
+        histogram.observe(("parse",), 0.1)
+        histogram.observe(("parse",), 0.5)
+        histogram.observe(("parse",), 3.0)
+        self.assertEqual(histogram.render(), [
+            "# HELP h_seconds Ayuda.",
+            "# TYPE h_seconds histogram",
+            'h_seconds_bucket{phase="parse",le="0.1"} 1',
+            'h_seconds_bucket{phase="parse",le="1.0"} 2',
+            'h_seconds_bucket{phase="parse",le="+Inf"} 3',
+            'h_seconds_sum{phase="parse"} 3.6',
+            'h_seconds_count{phase="parse"} 3',
+        ])
+
+    def test_label_escaping(self):
+        """Test: Las comillas y barras de las etiquetas se escapan"""
+        histogram = Histogram("h", "Ayuda.", ("endpoint",), (1.0,))
+        histogram.observe(('/a"b\\',), 0.5)
+        self.assertIn('h_count{endpoint="/a\\"b\\\\"} 1', histogram.render())
+
+
+class TestAnalyzerPhases(unittest.TestCase):
+    """Tests de las etapas medidas por los analizadores."""
+
+    def test_iterative_phases(self):
+        """Test: El análisis iterativo mide visit, summations, t_open y big_o"""
+        ast = parse_source(BURBUJA)["ast"]
+        with collect_phases() as timings:
+            IterativeAnalyzer().analyze(ast, "worst")
+        self.assertEqual(list(timings.phases), ["visit", "summations", "t_open", "big_o"])
+
+    def test_recursive_phases(self):
+        """Test: El análisis recursivo mide la extracción y la resolución de la recurrencia"""
+        ast = parse_source(FACTORIAL)["ast"]
+        with collect_phases() as timings:
+            RecursiveAnalyzer().analyze(ast, "worst")
+        self.assertEqual(list(timings.phases), ["recurrence", "solve"])
+
+
+class TestMetricsEndpoint(unittest.TestCase):
+    """Tests de Server-Timing y GET /metrics."""
+
+    def setUp(self):
+        self.client = TestClient(app)
+        get_analysis_cache().clear()
+        get_program_store().clear()
+        get_phase_histogram().clear()
+
+    def test_server_timing_header(self):
+        """Test: /analyze/open devuelve sus etapas en Server-Timing"""
+        response = self.client.post("/analyze/open", json={"source": FACTORIAL, "mode": "worst"})
+        header = response.headers["server-timing"]
+        for name in ("parse", "classify", "recurrence", "solve"):
+            self.assertIn(f"{name};dur=", header)
+
+    def test_no_header_without_phases(self):
+        """Test: Las rutas sin etapas de análisis no llevan Server-Timing"""
+        response = self.client.get("/metrics")
+        self.assertNotIn("server-timing", response.headers)
+
+    def test_metrics_exposition(self):
+        """Test: /metrics expone el histograma etiquetado por endpoint, mode, kind y phase"""
+        self.client.post("/analyze/open", json={"source": BURBUJA, "mode": "best"})
+        response = self.client.get("/metrics")
+        self.assertTrue(response.headers["content-type"].startswith("text/plain; version=0.0.4"))
+        self.assertIn("# TYPE analysis_phase_duration_seconds histogram", response.text)
+        self.assertIn(
+            'analysis_phase_duration_seconds_count{endpoint="/analyze/open",mode="best",kind="iterative",phase="summations"} 1',
+            response.text,
+        )
+
+
+    def test_metrics_series_bounded(self):
+        """Test: Modos inventados por el cliente no crean series nuevas en /metrics"""
+        for i in range(3):
+            self.client.post("/analyze/open", json={"source": BURBUJA, "mode": f"junk-{i}", "algorithm_kind": f"k{i}"})
+        text = self.client.get("/metrics").text
+        self.assertNotIn("junk-", text)
+        self.assertIn('endpoint="/analyze/open",mode="other",kind="other"', text)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+"""
+Tests unitarios para app.modules.parsing.cache.
+
+Author: Juan Camilo Cruz Parra (@Cruz1122)
+"""
+import unittest
+from unittest.mock import patch
+from app.modules.parsing import adapter
+from app.modules.parsing.cache import ParseCache, get_parse_cache, source_key
+
+
+class TestParseCache(unittest.TestCase):
+    """Tests para la clase ParseCache."""
+
+    def test_miss_then_hit(self):
+        """Test: Primera lectura es miss, tras guardar es hit"""
+        cache = ParseCache(max_entries=4)
+        self.assertIsNone(cache.get("a <- 1"))
+        cache.put("a <- 1", ({"type": "Program", "body": []}, []))
+        ast, errors = cache.get("a <- 1")
+        self.assertEqual(ast, {"type": "Program", "body": []})
+        self.assertEqual(errors, [])
+        stats = cache.stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["size"], 1)
+
+    def test_copy_on_read(self):
+        """Test: Mutar el AST devuelto no corrompe la entrada cacheada"""
+        cache = ParseCache(max_entries=4)
+        cache.put("src", ({"type": "Program", "body": [{"type": "Assign"}]}, []))
+        ast, _ = cache.get("src")
+        ast["body"].append({"type": "Return"})
+        ast["type"] = "Mutated"
+        ast_again, _ = cache.get("src")
+        self.assertEqual(ast_again, {"type": "Program", "body": [{"type": "Assign"}]})
+
+    def test_copy_on_write(self):
+        """Test: Mutar el resultado original después de guardarlo no afecta la caché"""
+        cache = ParseCache(max_entries=4)
+        errors = [{"line": 1, "column": 1, "message": "x"}]
+        cache.put("src", (None, errors))
+        errors.append({"line": 2, "column": 1, "message": "y"})
+        _, cached_errors = cache.get("src")
+        self.assertEqual(len(cached_errors), 1)
+
+    def test_lru_eviction(self):
+        """Test: Se expulsa la entrada menos usada recientemente"""
+        cache = ParseCache(max_entries=2)
+        cache.put("a", (None, []))
+        cache.put("b", (None, []))
+        cache.get("a")  # "a" pasa a ser la más reciente
+        cache.put("c", (None, []))
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("c"))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_zero_size_disables_cache(self):
+        """Test: Tamaño 0 desactiva la caché"""
+        cache = ParseCache(max_entries=0)
+        cache.put("a", (None, []))
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.stats()["size"], 0)
+
+    def test_clear_resets_counters(self):
+        """Test: clear() vacía entradas y contadores"""
+        cache = ParseCache(max_entries=2)
+        cache.put("a", (None, []))
+        cache.get("a")
+        cache.clear()
+        stats = cache.stats()
+        self.assertEqual(stats["size"], 0)
+        self.assertEqual(stats["hits"], 0)
+        self.assertEqual(stats["hit_ratio"], 0.0)
+
+    def test_source_key_is_content_hash(self):
+        """Test: La clave depende solo del contenido"""
+        self.assertEqual(source_key("x <- 1"), source_key("x <- 1"))
+        self.assertNotEqual(source_key("x <- 1"), source_key("x <- 2"))
+
+
+class TestAdapterUsesCache(unittest.TestCase):
+    """Tests de integración entre parse_to_ast_adapter y la caché."""
+
+    def setUp(self):
+        get_parse_cache().clear()
+
+    def tearDown(self):
+        get_parse_cache().clear()
+
+    @patch('app.modules.parsing.adapter.GRAMMAR_AVAILABLE', True)
+    @patch('app.modules.parsing.adapter.parse_to_ast')
+    def test_second_parse_served_from_cache(self, mock_parse):
+        """Test: Un código repetido no vuelve a invocar al parser"""
+        mock_parse.return_value = ({"type": "Program", "body": []}, [])
+
+        first, _ = adapter.parse_to_ast_adapter("cached(n) BEGIN END")
+        second, _ = adapter.parse_to_ast_adapter("cached(n) BEGIN END")
+
+        self.assertEqual(mock_parse.call_count, 1)
+        self.assertEqual(first, second)
+        self.assertIsNot(first, second)
+
+    @patch('app.modules.parsing.adapter.GRAMMAR_AVAILABLE', True)
+    @patch('app.modules.parsing.adapter.parse_to_ast')
+    def test_errors_are_cached(self, mock_parse):
+        """Test: Los errores de parsing también se cachean"""
+        mock_parse.return_value = (None, [{"line": 1, "column": 1, "message": "bad"}])
+
+        adapter.parse_to_ast_adapter("bad code")
+        _, errors = adapter.parse_to_ast_adapter("bad code")
+
+        self.assertEqual(mock_parse.call_count, 1)
+        self.assertEqual(errors[0]["message"], "bad")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,6 +6,7 @@ Author: Juan Camilo Cruz Parra (@Cruz1122)
 import unittest
 from unittest.mock import patch, MagicMock
 from app.modules.parsing import adapter
+from app.modules.parsing.cache import get_parse_cache
 
 
 class TestIsGrammarAvailable(unittest.TestCase):
@@ -27,6 +28,13 @@ class TestIsGrammarAvailable(unittest.TestCase):
 class TestParseToAstAdapter(unittest.TestCase):
     """Tests para la función parse_to_ast_adapter."""
 
+    def setUp(self):
+        # Los parsers mockeados no deben servirse desde resultados cacheados
+        get_parse_cache().clear()
+
+    def tearDown(self):
+        get_parse_cache().clear()
+
     @patch('app.modules.parsing.adapter.GRAMMAR_AVAILABLE', False)
     @patch('app.modules.parsing.adapter.parse_to_ast', None)
     def test_returns_error_when_grammar_unavailable(self):
@@ -0,0 +1,164 @@
+"""
+Tests unitarios para app.modules.shared.program_index.
+
+Author: Juan Camilo Cruz Parra (@Cruz1122)
+"""
+import unittest
+from unittest.mock import patch
+from app.modules.analysis.analyzers.recursive import RecursiveAnalyzer
+from app.modules.classification.classifier import detect_algorithm_kind
+from app.modules.execution.executor import CodeExecutor
+from app.modules.parsing.service import parse_source
+from app.modules.shared import program_index
+from app.modules.shared.program_index import ProgramIndex, get_program_index
+from tests.unit.test_grammar_ast_listener import load_corpus
+
+SOURCE = """auxiliar(x) BEGIN
+  RETURN x;
+END
+fib(n) BEGIN
+  IF (n <= 1) THEN BEGIN
+    RETURN n;
+  END
+  FOR i <- 1 TO n DO BEGIN
+    y <- auxiliar(i);
+  END
+  RETURN fib(n - 1) + fib(n - 2);
+END"""
+
+
+def parse(source):
+    result = parse_source(source)
+    assert result["ok"], result
+    return result["ast"]
+
+
+class TestProgramIndex(unittest.TestCase):
+    """Tests del índice construido en una pasada."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.ast = parse(SOURCE)
+        cls.index = ProgramIndex(cls.ast)
+
+    def test_procedures(self):
+        """Test: Tabla de procedimientos por nombre y procedimiento principal"""
+        self.assertEqual(self.index.main_procedure["name"], "auxiliar")
+        self.assertEqual(self.index.find_procedure("fib")["name"], "fib")
+        self.assertIsNone(self.index.find_procedure("FIB"))
+        self.assertEqual(self.index.find_procedure("FIB", case_sensitive=False)["name"], "fib")
+        self.assertIsNone(self.index.find_procedure("otro"))
+
+    def test_call_graph(self):
+        """Test: Grafo de llamadas con llamadas en orden de aparición"""
+        self.assertEqual(self.index.call_graph["fib"], ["auxiliar", "fib"])
+        self.assertNotIn("auxiliar", self.index.call_graph)
+        fib = self.index.find_procedure("fib")
+        self.assertEqual(
+            [call.get("callee") for call in self.index.calls_in(fib)],
+            ["auxiliar", "fib", "fib"],
+        )
+        self.assertIsNone(self.index.calls_in({"type": "ProcDef", "name": "fib"}))
+
+    def test_type_counts(self):
+        """Test: Conteo de nodos por tipo"""
+        self.assertEqual(self.index.type_counts["ProcDef"], 2)
+        self.assertEqual(self.index.type_counts["For"], 1)
+        self.assertTrue(self.index.has_type("While", "For"))
+        self.assertFalse(self.index.has_type("While", "Repeat"))
+
+    def test_parent_links(self):
+        """Test: Enlaces al nodo padre"""
+        fib = self.index.find_procedure("fib")
+        self.assertIs(self.index.parent(fib), self.ast)
+        self.assertIsNone(self.index.parent(self.ast))
+        call = self.index.calls_in(fib)[0]
+        self.assertIsNotNone(self.index.parent(call))
+
+    def test_registry_shares_index(self):
+        """Test: get_program_index devuelve el mismo índice para el mismo AST"""
+        ast = parse(SOURCE)
+        self.assertIs(get_program_index(ast), get_program_index(ast))
+        self.assertIsNot(get_program_index(ast), get_program_index(parse(SOURCE)))
+
+    def test_registry_is_bounded(self):
+        """Test: El registro descarta los índices menos usados"""
+        registry = program_index._ProgramIndexRegistry(2)
+        asts = [{"type": "Program", "body": []} for _ in range(3)]
+        for ast in asts:
+            registry.get(ast)
+        self.assertEqual(len(registry._entries), 2)
+        self.assertNotIn(id(asts[0]), registry._entries)
+
+
+class TestConsumersUseIndex(unittest.TestCase):
+    """Tests de que clasificador, analizador y ejecutor comparten el índice."""
+
+    def test_single_walk_per_ast(self):
+        """Test: Clasificar, analizar y ejecutar recorren el AST una sola vez"""
+        ast = parse("""factorial(n) BEGIN
+  IF (n <= 1) THEN BEGIN
+    RETURN 1;
+  END
+  ELSE BEGIN
+    RETURN n * factorial(n - 1);
+  END
+END""")
+        with patch.object(ProgramIndex, "_walk", autospec=True, side_effect=ProgramIndex._walk) as walk:
+            self.assertEqual(detect_algorithm_kind(ast), "recursive")
+            analyzer = RecursiveAnalyzer()
+            self.assertTrue(analyzer.analyze(ast, "worst")["ok"])
+            CodeExecutor(ast, 3, "worst").execute()
+        self.assertEqual(walk.call_count, 1)
+
+    def test_executor_uses_index(self):
+        """Test: El ejecutor resuelve procedimientos y recursión con el índice"""
+        rec = {"type": "ProcDef", "name": "rec", "params": [], "body": {
+            "type": "Block", "body": [{"type": "call", "name": "rec", "args": []}]}}
+        aux = {"type": "ProcDef", "name": "aux", "params": [], "body": {
+            "type": "Block", "body": [{"type": "call", "name": "rec", "args": []}]}}
+        ast = {"type": "Program", "body": [rec, aux]}
+        executor = CodeExecutor(ast, 2, "worst")
+        self.assertIs(executor.index, get_program_index(ast))
+        for proc in (rec, aux):
+            self.assertEqual(
+                executor._is_recursive_procedure(proc),
+                executor._has_recursive_call(proc["body"], proc["name"]),
+            )
+        self.assertTrue(executor._is_recursive_procedure(rec))
+        self.assertFalse(executor._is_recursive_procedure(aux))
+        self.assertIs(executor.index.find_procedure("aux"), aux)
+
+    def test_same_results_as_scans(self):
+        """Test: En el corpus el índice coincide con los recorridos anteriores"""
+        from app.modules.classification import classifier
+
+        for source in load_corpus():
+            result = parse_source(source)
+            if not result.get("ok") or not result.get("ast"):
+                continue
+            ast = result["ast"]
+            index = ProgramIndex(ast)
+            self.assertEqual(
+                index.has_type("For", "While", "Repeat"),
+                classifier._has_iterative_constructs(ast),
+                source,
+            )
+            self.assertIs(index.main_procedure, classifier._find_procedure_definition(ast), source)
+
+            analyzer = RecursiveAnalyzer()
+            for proc in ast.get("body", []):
+                if not isinstance(proc, dict) or proc.get("type") != "ProcDef":
+                    continue
+                analyzer.index = None
+                scanned = analyzer._find_recursive_calls(proc)
+                analyzer.index = index
+                self.assertEqual(
+                    [id(c) for c in analyzer._find_recursive_calls(proc)],
+                    [id(c) for c in scanned],
+                    source,
+                )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,168 @@
+"""
+Tests unitarios para los handles de programa (app.modules.analysis.programs y
+load_program en app.modules.analysis.service).
+
+Author: Juan Camilo Cruz Parra (@Cruz1122)
+"""
+import copy
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from app.core.engine import ExecutionEngine
+from app.main import app
+from app.modules.analysis.analyzers.recursive import RecursiveAnalyzer
+from app.modules.analysis.cache import get_analysis_cache
+from app.modules.analysis.programs import ProgramHandle, ProgramStore, get_program_store
+from app.modules.analysis.service import analyze_algorithm, detect_methods, load_program, program_kind
+from app.modules.parsing.service import parse_source
+
+FACTORIAL = """factorial(n) BEGIN
+  IF (n <= 1) THEN BEGIN
+    RETURN 1;
+  END
+  ELSE BEGIN
+    RETURN n * factorial(n - 1);
+  END
+END"""
+
+
+class TestProgramStore(unittest.TestCase):
+    """Tests para la clase ProgramStore."""
+
+    def _program(self, program_id):
+        return ProgramHandle(program_id, "x", {"type": "Program", "body": []})
+
+    def test_lru_eviction(self):
+        """Test: Se expulsa el programa menos usado"""
+        store = ProgramStore(max_entries=2)
+        for program_id in ("a", "b"):
+            store.put(self._program(program_id))
+        store.get("a")
+        store.put(self._program("c"))
+        self.assertIsNone(store.get("b"))
+        self.assertIsNotNone(store.get("a"))
+        self.assertEqual(len(store), 2)
+
+    def test_zero_size_disables_store(self):
+        """Test: Tamaño 0 no guarda programas"""
+        store = ProgramStore(max_entries=0)
+        store.put(self._program("a"))
+        self.assertIsNone(store.get("a"))
+
+
+class TestLoadProgram(unittest.TestCase):
+    """Tests para load_program y el uso de program_id en el servicio."""
+
+    def setUp(self):
+        get_analysis_cache().clear()
+        get_program_store().clear()
+
+    def test_same_source_reuses_handle(self):
+        """Test: El mismo código devuelve el mismo handle sin volver a parsear"""
+        program, error = load_program(FACTORIAL)
+        self.assertIsNone(error)
+        with patch("app.modules.analysis.service.parse_source") as parse:
+            again, _ = load_program(FACTORIAL)
+            by_id, _ = load_program(program_id=program.id)
+        parse.assert_not_called()
+        self.assertIs(again, program)
+        self.assertIs(by_id, program)
+
+    def test_unknown_program_id(self):
+        """Test: Un programId desconocido sin código pide reenviarlo"""
+        program, error = load_program(program_id="desconocido")
+        self.assertIsNone(program)
+        self.assertTrue(error["programExpired"])
+        program, error = load_program(FACTORIAL, program_id="desconocido")
+        self.assertIsNone(error)
+        self.assertEqual(program.source, FACTORIAL)
+
+    def test_source_or_program_id_required(self):
+        """Test: Sin código ni programId se devuelve un error"""
+        program, error = load_program()
+        self.assertIsNone(program)
+        self.assertFalse(error["ok"])
+        self.assertNotIn("programExpired", error)
+
+    def test_kind_detected_once(self):
+        """Test: La clasificación se guarda en el handle"""
+        program, _ = load_program(FACTORIAL)
+        with patch("app.modules.analysis.service.detect_algorithm_kind", return_value="recursive") as detect:
+            self.assertEqual(program_kind(program), "recursive")
+            self.assertEqual(program_kind(program), "recursive")
+        detect.assert_called_once()
+
+    def test_detect_then_open_extracts_recurrence_once(self):
+        """Test: detect-methods y open sobre el mismo programa extraen la recurrencia una vez"""
+        with patch.object(RecursiveAnalyzer, "_extract_recurrence", autospec=True,
+                          side_effect=RecursiveAnalyzer._extract_recurrence) as extract:
+            methods = detect_methods(FACTORIAL)
+            result = analyze_algorithm(program_id=methods["programId"], mode="worst")
+        self.assertTrue(methods["ok"])
+        self.assertTrue(result["ok"])
+        self.assertEqual(result["programId"], methods["programId"])
+        self.assertEqual(extract.call_count, 1)
+
+    def test_memo_does_not_change_result(self):
+        """Test: El análisis con el memo coincide con el análisis sin handle"""
+        detect_methods(FACTORIAL)
+        with_memo = analyze_algorithm(FACTORIAL, mode="worst")
+        get_analysis_cache().clear()
+        get_program_store().clear()
+        # Copia: un AST nuevo tiene su propio índice, sin memo
+        ast = copy.deepcopy(parse_source(FACTORIAL)["ast"])
+        fresh = RecursiveAnalyzer().analyze(ast, "worst")
+        with_memo.pop("programId")
+        self.assertEqual(with_memo, fresh)
+
+
+class TestProgramRoutes(unittest.TestCase):
+    """Tests del programId a través de las rutas HTTP y el motor de ejecución."""
+
+    def setUp(self):
+        get_analysis_cache().clear()
+        get_program_store().clear()
+        self.client = TestClient(app)
+
+    def _detect_then_open(self, workers):
+        extract = RecursiveAnalyzer._extract_recurrence
+        with tempfile.TemporaryDirectory() as tmp:
+            calls = os.path.join(tmp, "calls")
+
+            # Cada extracción (en cualquier proceso) agrega una línea al archivo
+            def counting(analyzer, *args, **kwargs):
+                with open(calls, "a") as f:
+                    f.write(f"{os.getpid()}\n")
+                return extract(analyzer, *args, **kwargs)
+
+            # El parche se aplica antes de crear los workers, que lo heredan al hacer fork
+            with patch.object(RecursiveAnalyzer, "_extract_recurrence", counting):
+                engine = ExecutionEngine(workers=workers)
+                try:
+                    with patch("app.modules.analysis.service.get_engine", return_value=engine):
+                        methods = self.client.post("/analyze/detect-methods", json={"source": FACTORIAL}).json()
+                        result = self.client.post(
+                            "/analyze/open", json={"program_id": methods["programId"], "mode": "worst"}
+                        ).json()
+                finally:
+                    engine.shutdown()
+            with open(calls) as f:
+                extractions = f.read().splitlines()
+        self.assertTrue(methods["ok"])
+        self.assertTrue(result["ok"], result)
+        self.assertEqual(result["programId"], methods["programId"])
+        self.assertEqual(len(extractions), 1)
+
+    def test_detect_then_open_without_process_pool(self):
+        """Test: Con ENGINE_WORKERS=0 detect-methods y open con programId extraen la recurrencia una vez"""
+        self._detect_then_open(0)
+
+    def test_detect_then_open_with_process_pool(self):
+        """Test: Con workers, open con programId llega al worker que guardó el handle"""
+        self._detect_then_open(2)
+
+
+if __name__ == '__main__':
+    unittest.main()
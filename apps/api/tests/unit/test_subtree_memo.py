@@ -0,0 +1,176 @@
+"""
+Tests unitarios para la memoización por hash estructural de subárboles
+(app.modules.analysis.utils.subtree_memo y BaseAnalyzer.visit_memoized).
+
+Author: Juan Camilo Cruz Parra (@Cruz1122)
+"""
+import unittest
+from unittest.mock import patch
+from app.modules.analysis.analyzers.iterative import IterativeAnalyzer
+from app.modules.analysis.utils.subtree_memo import (
+    MemoEntry,
+    SubtreeMemo,
+    get_subtree_memo,
+    structural_hash,
+)
+from app.modules.parsing.service import parse_source
+
+# Dos bucles idénticos en distintas líneas
+DOBLE = """doble(A[n], n) BEGIN
+  FOR i <- 1 TO n DO BEGIN
+    A[i] <- A[i] + 1;
+  END
+  FOR i <- 1 TO n DO BEGIN
+    A[i] <- A[i] + 1;
+  END
+END"""
+
+# El mismo bucle en otro programa y desplazado
+DESPLAZADO = """desplazado(A[n], n) BEGIN
+  x <- 0;
+  y <- 0;
+  FOR i <- 1 TO n DO BEGIN
+    A[i] <- A[i] + 1;
+  END
+END"""
+
+MIENTRAS = """mientras(n) BEGIN
+  i <- 0;
+  WHILE (i < n) DO BEGIN
+    i <- i + 1;
+  END
+END"""
+
+
+def _block(line, name="x", body_offset=1):
+    return {
+        "type": "Block",
+        "pos": {"line": line, "column": 1},
+        "body": [{
+            "type": "Assign",
+            "pos": {"line": line + body_offset, "column": 3},
+            "target": {"type": "Identifier", "name": name, "pos": {"line": line + body_offset, "column": 3}},
+            "value": {"type": "Literal", "value": 1, "pos": {"line": 0, "column": 0}},
+        }],
+    }
+
+
+def _analyze(source, mode="worst", avg_model=None):
+    ast = parse_source(source)["ast"]
+    return IterativeAnalyzer().analyze(ast, mode, avg_model=avg_model)
+
+
+class TestStructuralHash(unittest.TestCase):
+    """Tests para structural_hash."""
+
+    def test_same_structure_other_position(self):
+        """Test: El mismo subárbol en otra línea tiene el mismo hash"""
+        first, moved = structural_hash(_block(3)), structural_hash(_block(20))
+        self.assertEqual(first.digest, moved.digest)
+        self.assertEqual((moved.first_line, moved.last_line), (20, 21))
+        self.assertTrue(moved.portable)
+
+    def test_identifiers_and_layout_count(self):
+        """Test: Cambiar un identificador o la disposición de líneas cambia el hash"""
+        base = structural_hash(_block(3)).digest
+        self.assertNotEqual(base, structural_hash(_block(3, name="y")).digest)
+        self.assertNotEqual(base, structural_hash(_block(3, body_offset=2)).digest)
+
+    def test_while_not_portable(self):
+        """Test: Un subárbol con WHILE no es portable y su hash depende de la línea"""
+        def loop(line):
+            return {"type": "Block", "pos": {"line": line, "column": 1},
+                    "body": [{"type": "While", "pos": {"line": line + 1, "column": 3}, "body": _block(line + 1)}]}
+
+        info = structural_hash(loop(3))
+        self.assertFalse(info.portable)
+        self.assertNotEqual(info.digest, structural_hash(loop(10)).digest)
+
+
+class TestMemoEntry(unittest.TestCase):
+    """Tests para MemoEntry."""
+
+    def test_replay_rebases_lines_and_constants(self):
+        """Test: Las filas se desplazan a la nueva línea y las constantes se renumeran"""
+        rows = [{"line": 4, "kind": "assign", "ck": "C_{3} + C_{4}", "count": "n"}]
+        entry = MemoEntry.capture(rows, structural_hash(_block(3)), counter_start=2, counter_end=4)
+        self.assertTrue(entry.relocatable)
+        self.assertEqual(entry.constants, 2)
+
+        replayed = entry.replay(structural_hash(_block(10)), counter=7)
+        self.assertEqual(replayed, [{"line": 11, "kind": "assign", "ck": "C_{8} + C_{9}", "count": "n"}])
+        self.assertEqual(rows[0]["line"], 4)
+
+    def test_rows_shared_immutably(self):
+        """Test: El tramo memorizado es de solo lectura y replay devuelve dicts nuevos"""
+        rows = [{"line": 4, "ck": "C_{1}"}]
+        entry = MemoEntry.capture(rows, structural_hash(_block(3)), counter_start=0, counter_end=1)
+        with self.assertRaises(TypeError):
+            entry.rows[0]["line"] = 9
+        replayed = entry.replay(structural_hash(_block(3)), counter=1)
+        replayed[0]["count"] = "n"
+        self.assertNotIn("count", entry.rows[0])
+
+    def test_foreign_rows_not_captured(self):
+        """Test: Filas con líneas o constantes ajenas al subárbol no se reubican"""
+        info = structural_hash(_block(3))
+        self.assertIsNone(MemoEntry.capture([{"line": 9, "ck": "C_{1}"}], info, 0, 1))
+        self.assertIsNone(MemoEntry.capture([{"line": 4, "ck": "C_{1}"}], info, 1, 2))
+
+
+class TestSubtreeMemo(unittest.TestCase):
+    """Tests para SubtreeMemo."""
+
+    def test_lru_eviction(self):
+        """Test: Al superar max_entries se expulsa la entrada menos usada"""
+        memo = SubtreeMemo(max_entries=2)
+        memo.put("a", MemoEntry([]))
+        memo.put("b", MemoEntry([]))
+        memo.get("a")
+        memo.put("c", MemoEntry([]))
+        self.assertIsNotNone(memo.get("a"))
+        self.assertIsNone(memo.get("b"))
+        self.assertEqual(len(memo), 2)
+
+    def test_disabled(self):
+        """Test: Con max_entries=0 no se guarda nada"""
+        memo = SubtreeMemo(max_entries=0)
+        memo.put("a", MemoEntry([]))
+        self.assertIsNone(memo.get("a"))
+        self.assertEqual(len(memo), 0)
+
+
+class TestAnalyzerSubtreeMemo(unittest.TestCase):
+    """Tests del memo compartido en el análisis iterativo."""
+
+    def setUp(self):
+        get_subtree_memo().clear()
+
+    def _without_memo(self, source, mode="worst", avg_model=None):
+        with patch("app.modules.analysis.analyzers.base.get_subtree_memo", return_value=SubtreeMemo(0)):
+            return _analyze(source, mode, avg_model)
+
+    def test_hit_across_requests(self):
+        """Test: Un bloque analizado en un programa se reutiliza en otro"""
+        _analyze(DOBLE)
+        hits = get_subtree_memo().hits
+        _analyze(DESPLAZADO)
+        self.assertGreater(get_subtree_memo().hits, hits)
+
+    def test_same_result_as_fresh_analysis(self):
+        """Test: Reutilizar subárboles da el mismo resultado que analizarlos de nuevo"""
+        for mode in ("worst", "best", "avg"):
+            _analyze(DOBLE, mode)
+            for source in (DOBLE, DESPLAZADO, MIENTRAS):
+                self.assertEqual(_analyze(source, mode), self._without_memo(source, mode), (mode, source))
+
+    def test_symbolic_avg_not_shared(self):
+        """Test: El caso promedio simbólico no usa el memo compartido"""
+        avg_model = {"mode": "symbolic", "predicates": {}}
+        _analyze(DOBLE, "avg", avg_model)
+        self.assertEqual(len(get_subtree_memo()), 0)
+        self.assertEqual(_analyze(DESPLAZADO, "avg", avg_model), self._without_memo(DESPLAZADO, "avg", avg_model))
+
+
+if __name__ == '__main__':
+    unittest.main()
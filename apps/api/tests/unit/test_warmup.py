@@ -0,0 +1,139 @@
+"""
+Tests unitarios para el calentamiento al arrancar (app.core.warmup).
+
+Author: Juan Felipe Henao (@Pipe-1z)
+"""
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from app.core.warmup import (
+    STATUS_DISABLED,
+    STATUS_DONE,
+    STATUS_FAILED,
+    STATUS_PENDING,
+    WARMUP_PROGRAMS,
+    WarmupState,
+    get_warmup_state,
+    load_warmup_corpus,
+    run_warmup,
+    start_warmup,
+)
+
+
+class TestWarmupState(unittest.TestCase):
+    """Tests para WarmupState."""
+
+    def test_initially_pending_and_not_ready(self):
+        """Test: El estado inicial es pendiente y no listo"""
+        state = WarmupState()
+        self.assertEqual(state.status, STATUS_PENDING)
+        self.assertFalse(state.ready)
+        self.assertIsNone(state.snapshot()["durationMs"])
+
+    def test_finish_records_metrics(self):
+        """Test: Al terminar queda listo con duración y conteos"""
+        state = WarmupState()
+        state.start()
+        self.assertFalse(state.ready)
+        state.finish(42.0, 5, 1)
+        self.assertTrue(state.ready)
+        self.assertEqual(state.snapshot(), {
+            "status": STATUS_DONE, "durationMs": 42.0, "programs": 5, "failures": 1, "skipped": 0, "error": None,
+        })
+
+    def test_disabled_is_ready(self):
+        """Test: Desactivado cuenta como listo"""
+        state = WarmupState()
+        state.disable()
+        self.assertTrue(state.ready)
+
+
+class TestLoadWarmupCorpus(unittest.TestCase):
+    """Tests para load_warmup_corpus."""
+
+    def test_reads_pseudo_files_and_builtins(self):
+        """Test: Incluye los .pseudo del directorio y los algoritmos incorporados"""
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, "a.pseudo"), "w", encoding="utf-8") as fh:
+                fh.write("x <- 1;")
+            with open(os.path.join(tmp, "nota.txt"), "w", encoding="utf-8") as fh:
+                fh.write("ignorado")
+            corpus = load_warmup_corpus(tmp)
+        self.assertEqual(corpus, ["x <- 1;"] + WARMUP_PROGRAMS)
+
+    def test_missing_dir_uses_builtins(self):
+        """Test: Un directorio inexistente deja solo los algoritmos incorporados"""
+        self.assertEqual(load_warmup_corpus("/no/existe"), WARMUP_PROGRAMS)
+
+
+class TestRunWarmup(unittest.TestCase):
+    """Tests para run_warmup."""
+
+    def test_runs_parse_analysis_and_executor(self):
+        """Test: Parsea, analiza en todos los modos y ejecuta los iterativos"""
+        state = WarmupState()
+        with patch("app.modules.analysis.service.analyze_algorithm") as analyze, \
+                patch("app.modules.execution.executor.CodeExecutor") as executor:
+            result = run_warmup([WARMUP_PROGRAMS[0], WARMUP_PROGRAMS[2]], state)
+        modes = [call.args[1] for call in analyze.call_args_list]
+        self.assertEqual(modes, ["worst", "best", "avg", "all"] * 2)
+        # Solo el algoritmo iterativo (burbuja) pasa por CodeExecutor
+        self.assertEqual(executor.call_count, 1)
+        self.assertEqual(result["status"], STATUS_DONE)
+        self.assertEqual(result["programs"], 2)
+        self.assertEqual(result["failures"], 0)
+        self.assertGreaterEqual(result["durationMs"], 0)
+
+    def test_failures_are_counted_not_raised(self):
+        """Test: Un error en un paso se cuenta y el calentamiento termina"""
+        state = WarmupState()
+        with patch("app.modules.analysis.service.analyze_algorithm", side_effect=RuntimeError), \
+                patch("app.modules.execution.executor.CodeExecutor"):
+            result = run_warmup([WARMUP_PROGRAMS[2], "x <- ;"], state)
+        self.assertTrue(state.ready)
+        self.assertEqual(result["failures"], 4)
+        # "x <- ;" no parsea: se reporta en skipped
+        self.assertEqual(result["skipped"], 1)
+
+    def test_import_error_marks_failed(self):
+        """Test: Si fallan las importaciones el estado queda en failed, no en running"""
+        state = WarmupState()
+        with patch.dict("sys.modules", {"app.modules.analysis.service": None}):
+            result = run_warmup(WARMUP_PROGRAMS, state)
+        self.assertEqual(result["status"], STATUS_FAILED)
+        self.assertIn("app.modules.analysis.service", result["error"])
+        self.assertFalse(state.ready)
+
+    def test_default_corpus_parses(self):
+        """Test: Todos los programas del corpus por defecto parsean"""
+        with patch("app.modules.analysis.service.analyze_algorithm"), \
+                patch("app.modules.execution.executor.CodeExecutor"):
+            result = run_warmup(load_warmup_corpus(), WarmupState())
+        self.assertEqual(result["skipped"], 0)
+
+
+class TestStartWarmup(unittest.TestCase):
+    """Tests para start_warmup."""
+
+    def tearDown(self):
+        get_warmup_state().reset()
+
+    @patch.dict(os.environ, {"WARMUP_ENABLED": "0"})
+    def test_disabled_marks_ready(self):
+        """Test: Con WARMUP_ENABLED=0 no se lanza el hilo y queda listo"""
+        self.assertIsNone(start_warmup())
+        self.assertEqual(get_warmup_state().status, STATUS_DISABLED)
+
+    @patch.dict(os.environ, {"WARMUP_ENABLED": "1"})
+    def test_runs_in_background_thread(self):
+        """Test: Se lanza en un hilo de fondo y al terminar queda listo"""
+        with patch("app.core.warmup.load_warmup_corpus", return_value=[]):
+            thread = start_warmup()
+        thread.join(timeout=10)
+        self.assertTrue(thread.daemon)
+        self.assertTrue(get_warmup_state().ready)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,24 +1,201 @@
-from typing import Any, Dict, List, Tuple
-from antlr4 import InputStream, CommonTokenStream  # type: ignore
+import os
+import threading
+import time
+from concurrent.futures import CancelledError, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from antlr4 import InputStream, CommonTokenStream, PredictionMode  # type: ignore
+from antlr4.error.ErrorStrategy import BailErrorStrategy, DefaultErrorStrategy  # type: ignore
+from antlr4.error.Errors import ParseCancellationException  # type: ignore
 from .generated.LanguageLexer import LanguageLexer  # type: ignore
 from .generated.LanguageParser import LanguageParser  # type: ignore
 from .error_listener import CollectingErrorListener
 from .ast_builder import ASTBuilder
+from .ast_listener import ASTListener
+from .fast_parser import parse_fast
+from .budget import BudgetMeter, BudgetTokenStream, ParseBudget, ParseBudgetExceeded, get_parse_budget
 
-def parse_to_ast(source: str) -> Tuple[Dict[str, Any] | None, List[Dict[str, Any]]]:
+# Estrategias de predicción soportadas por parse_to_ast
+PREDICTION_TWO_STAGE = "two-stage"  # SLL con bail-out y, si falla, LL completo
+PREDICTION_LL = "ll"                # LL completo directamente (comportamiento original)
+PREDICTION_MODES = (PREDICTION_TWO_STAGE, PREDICTION_LL)
+
+# Modos de construcción del AST
+AST_BUILD_LISTENER = "listener"  # una pasada: AST desde eventos del parser, sin árbol
+AST_BUILD_TREE = "tree"          # árbol de ANTLR + ASTBuilder (comportamiento original)
+AST_BUILD_MODES = (AST_BUILD_LISTENER, AST_BUILD_TREE)
+
+# Motores de parseo
+ENGINE_FAST = "fast"    # parser descendente recursivo propio; ANTLR solo si hay errores
+ENGINE_ANTLR = "antlr"  # siempre ANTLR
+ENGINE_MODES = (ENGINE_FAST, ENGINE_ANTLR)
+
+# Lotes con menos programas que este umbral se parsean en el proceso actual:
+# enviar cada programa a otro proceso cuesta más que parsearlo
+PARSE_MANY_MIN_POOL_ITEMS = 4
+
+
+def get_prediction_mode() -> str:
+    """
+    Lee la estrategia de predicción configurada en AA_GRAMMAR_PREDICTION.
+
+    Valores: "two-stage" (por defecto) o "ll". Cualquier otro valor usa el defecto.
+    """
+    value = os.getenv("AA_GRAMMAR_PREDICTION", PREDICTION_TWO_STAGE).strip().lower()
+    return value if value in PREDICTION_MODES else PREDICTION_TWO_STAGE
+
+
+def get_ast_build_mode() -> str:
+    """
+    Lee el modo de construcción del AST configurado en AA_GRAMMAR_AST_BUILD.
+
+    Valores: "listener" (por defecto) o "tree". Cualquier otro valor usa el defecto.
+    """
+    value = os.getenv("AA_GRAMMAR_AST_BUILD", AST_BUILD_LISTENER).strip().lower()
+    return value if value in AST_BUILD_MODES else AST_BUILD_LISTENER
+
+
+def get_engine() -> str:
+    """
+    Lee el motor de parseo configurado en AA_GRAMMAR_ENGINE.
+
+    Valores: "fast" (por defecto) o "antlr". Cualquier otro valor usa el defecto.
+    """
+    value = os.getenv("AA_GRAMMAR_ENGINE", ENGINE_FAST).strip().lower()
+    return value if value in ENGINE_MODES else ENGINE_FAST
+
+
+def _parse_tree(
+    source: str,
+    prediction: str,
+    listener: Optional[ASTListener] = None,
+    meter: Optional[BudgetMeter] = None,
+):
+    """
+    Ejecuta lexer + parser y devuelve (árbol, errores de lexer, errores de parser).
+
+    En modo "two-stage" se intenta primero SLL con BailErrorStrategy, que es la
+    predicción más barata del runtime de Python. Si esa pasada encuentra un error
+    se re-parsea el mismo flujo de tokens con LL completo y el CollectingErrorListener,
+    de modo que los mensajes de error son exactamente los de la estrategia LL.
+
+    Con un ASTListener el parser no construye el árbol (buildParseTrees=False) y
+    el AST queda en listener.ast; el árbol devuelto no tiene hijos de regla. Si
+    la pasada SLL falla, la pasada LL vuelve a construir el árbol
+    (listener.detached).
+
+    Con un BudgetMeter los presupuestos se aplican desde el flujo de tokens y los
+    errores recogidos; al superarse se lanza ParseBudgetExceeded con los errores
+    que se alcanzaron a recoger.
+    """
     chars = InputStream(source)
     lexer = LanguageLexer(chars)
-    lex_err = CollectingErrorListener()
+    lex_err = CollectingErrorListener(meter)
     lexer.removeErrorListeners()
     lexer.addErrorListener(lex_err)
 
-    tokens = CommonTokenStream(lexer)
+    tokens = CommonTokenStream(lexer) if meter is None else BudgetTokenStream(lexer, meter)
     parser = LanguageParser(tokens)
-    par_err = CollectingErrorListener()
+    par_err = CollectingErrorListener(meter)
+    try:
+        tree = _run_parser(parser, tokens, prediction, listener, par_err)
+    except ParseBudgetExceeded as exc:
+        exc.errors = lex_err.errors + par_err.errors
+        raise
+    return tree, lex_err, par_err
+
+
+def _run_parser(parser, tokens, prediction: str, listener: Optional[ASTListener], par_err):
+    """Ejecuta la regla program con la estrategia de predicción y devuelve el árbol."""
     parser.removeErrorListeners()
+    if listener is not None:
+        parser.buildParseTrees = False
+        parser.addParseListener(listener)
+
+    if prediction == PREDICTION_TWO_STAGE:
+        parser._interp.predictionMode = PredictionMode.SLL
+        parser._errHandler = BailErrorStrategy()
+        try:
+            return parser.program()
+        except ParseCancellationException:
+            # Segunda pasada: los tokens ya leídos se reutilizan (el lexer no
+            # vuelve a reportar errores sobre ellos)
+            tokens.seek(0)
+            # reset() falla con parse listeners registrados (quita el tracer con remove)
+            parser.removeParseListeners()
+            parser.reset()
+            if listener is not None:
+                # Hay errores: la pasada LL construye el árbol para ASTBuilder
+                listener.detach()
+                parser.buildParseTrees = True
+            parser._interp.predictionMode = PredictionMode.LL
+            parser._errHandler = DefaultErrorStrategy()
+
     parser.addErrorListener(par_err)
+    return parser.program()
+
+
+def parse_to_ast(
+    source: str,
+    prediction: Optional[str] = None,
+    build: Optional[str] = None,
+    engine: Optional[str] = None,
+    budget: Optional[ParseBudget] = None,
+) -> Tuple[Dict[str, Any] | None, List[Dict[str, Any]]]:
+    """
+    Parsea un programa y devuelve (ast, errores).
+
+    El parseo se hace dentro de un ParseBudget (por defecto get_parse_budget()):
+    si se supera un límite se devuelve ast=None con los errores recogidos hasta
+    ese momento y un último error que explica el límite superado.
+    """
+    if budget is None:
+        budget = get_parse_budget()
+    try:
+        return _parse_to_ast(source, prediction, build, engine, budget)
+    except ParseBudgetExceeded as exc:
+        return None, exc.errors + [exc.error]
+    except RecursionError:
+        # Anidamiento sin delimitadores (p. ej. "not not not ...") que agota la pila
+        exc = ParseBudgetExceeded("depth", "El anidamiento es demasiado profundo; parseo detenido")
+        return None, [exc.error]
 
-    tree = parser.program()
+
+def _parse_to_ast(
+    source: str,
+    prediction: Optional[str],
+    build: Optional[str],
+    engine: Optional[str],
+    budget: ParseBudget,
+) -> Tuple[Dict[str, Any] | None, List[Dict[str, Any]]]:
+    budget.check_source(source)
+    meter = BudgetMeter(budget)
+
+    if engine is None:
+        engine = get_engine()
+    if engine == ENGINE_FAST:
+        # Programas válidos: parser propio. Cualquier error se delega en ANTLR para
+        # que los mensajes sean exactamente los de siempre
+        ast = parse_fast(source, budget)
+        if ast is not None:
+            return ast, []
+
+    if prediction is None:
+        prediction = get_prediction_mode()
+    if build is None:
+        build = get_ast_build_mode()
+
+    if build == AST_BUILD_LISTENER:
+        listener = ASTListener()
+        tree, lex_err, par_err = _parse_tree(source, prediction, listener, meter)
+        if not par_err.errors and not listener.failed and listener.ast is not None:
+            return listener.ast, lex_err.errors + par_err.errors
+        # Con errores de sintaxis el AST se arma sobre el árbol recuperado por ANTLR,
+        # igual que en el camino original (en "two-stage" ese árbol ya existe)
+        if not listener.detached:
+            tree, lex_err, par_err = _parse_tree(source, prediction, None, BudgetMeter(budget, meter.started))
+    else:
+        tree, lex_err, par_err = _parse_tree(source, prediction, None, meter)
     errors = lex_err.errors + par_err.errors
 
     try:
@@ -29,3 +206,109 @@ def parse_to_ast(source: str) -> Tuple[Dict[str, Any] | None, List[Dict[str, Any
         ast = None
 
     return ast, errors
+
+
+# Pool de procesos compartido por parse_many (se crea al primer lote grande con
+# get_parse_workers() procesos y los workers se reutilizan entre llamadas, con el
+# DFA de ANTLR ya caliente). Nunca se recrea por llamada: lotes concurrentes lo comparten.
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def get_parse_workers() -> int:
+    """
+    Lee el número de procesos para parse_many en AA_GRAMMAR_WORKERS.
+
+    Por defecto se usan los núcleos disponibles para el proceso. Un valor
+    inválido o menor que 1 usa el defecto; con 1 no se crea pool.
+    """
+    try:
+        available = len(os.sched_getaffinity(0))
+    except AttributeError:  # plataformas sin sched_getaffinity
+        available = os.cpu_count() or 1
+    try:
+        value = int(os.getenv("AA_GRAMMAR_WORKERS", "").strip())
+    except ValueError:
+        return available
+    return value if value >= 1 else available
+
+
+def _parse_timed(source: str) -> Tuple[Dict[str, Any] | None, List[Dict[str, Any]], float]:
+    """Parsea un programa y devuelve (ast, errores, duración en ms). Corre en los workers."""
+    started = time.perf_counter()
+    ast, errors = parse_to_ast(source)
+    return ast, errors, (time.perf_counter() - started) * 1000
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=get_parse_workers())
+        return _pool
+
+
+def _discard_pool(pool: ProcessPoolExecutor) -> None:
+    """Descarta un pool roto; si otro lote ya lo reemplazó no se toca el nuevo."""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False)
+
+
+def shutdown_pool() -> None:
+    """Cierra el pool de procesos de parse_many (si existe)."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def parse_many(sources: Sequence[str], workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Parsea varios programas repartiéndolos en un pool de procesos.
+
+    El parseo es CPU y, en Python puro, está limitado por el GIL: con procesos se
+    usan todos los núcleos. Los resultados vuelven en el orden de entrada, cada uno
+    como {"ast", "errors", "durationMs"} (durationMs: tiempo de parseo de ese
+    programa en su worker). Lotes pequeños o workers=1 se parsean en el proceso
+    actual. Si el pool se rompe (p. ej. un worker muere) o ya está cerrado, el
+    lote se parsea aquí.
+
+    El pool tiene siempre get_parse_workers() procesos; workers solo limita cuántos
+    usa esta llamada, repartiendo el lote en como mucho workers trozos.
+
+    Args:
+        sources: Códigos fuente a parsear
+        workers: Número de procesos (por defecto get_parse_workers())
+    """
+    sources = list(sources)
+    if workers is None:
+        workers = get_parse_workers()
+    workers = max(1, min(workers, len(sources) or 1))
+
+    results = None
+    if workers > 1 and len(sources) >= PARSE_MANY_MIN_POOL_ITEMS:
+        if workers < get_parse_workers():
+            # Como mucho workers trozos: esta llamada no ocupa más procesos del pool
+            chunksize = -(-len(sources) // workers)
+        else:
+            # Trozos de varios programas por envío para amortizar el pickling
+            chunksize = max(1, len(sources) // (workers * 4))
+        pool = _get_pool()
+        try:
+            results = list(pool.map(_parse_timed, sources, chunksize=chunksize))
+        except BrokenProcessPool:
+            _discard_pool(pool)
+        except (RuntimeError, CancelledError):
+            # Pool cerrado (apagado) o trabajos cancelados: se parsea en el proceso
+            pass
+    if results is None:
+        results = [_parse_timed(source) for source in sources]
+
+    return [
+        {"ast": ast, "errors": errors, "durationMs": duration}
+        for ast, errors, duration in results
+    ]
@@ -0,0 +1,346 @@
+"""
+Construcción del AST en una sola pasada desde los eventos del parser.
+
+Con parser.buildParseTrees = False ANTLR no enlaza los contextos de regla en un
+árbol; ASTListener, registrado como parse listener, recibe cada token consumido
+y cada fin de regla, y construye el nodo AST de la regla en ese momento a partir
+de los resultados de sus hijos. Así no hace falta materializar el árbol completo
+ni recorrerlo después con ASTBuilder.
+
+El AST producido es idéntico al de ASTBuilder (incluidas sus particularidades:
+posición {0, 0} en literales, identificadores y operadores binarios; la rama
+"else if" que ASTBuilder no recoge; etc.). Si el parseo tiene errores o aparece
+una construcción que aquí no se modela (parámetros con rango A[1]..[n]), el
+listener se marca como fallido y api.parse_to_ast vuelve al camino con árbol.
+En modo "two-stage" los errores ya se detectan en la pasada SLL, así que la
+pasada LL se hace directamente con árbol y no se parsea dos veces.
+"""
+import ast as py_ast
+from typing import Any, Dict, List, Optional
+from antlr4.tree.Tree import ParseTreeListener  # type: ignore
+from .generated.LanguageParser import LanguageParser as P  # type: ignore
+from .ast_builder import get_pos, normalize_op
+
+
+class _Unsupported(Exception):
+    """Construcción que el listener no modela: se usa el camino con árbol."""
+
+
+def _zero() -> Dict[str, int]:
+    # ASTBuilder pasa nodos terminales a get_pos, que devuelve {0, 0}
+    return {"line": 0, "column": 0}
+
+
+def _lit(value: Any) -> Dict[str, Any]:
+    return {"type": "Literal", "value": value, "pos": _zero()}
+
+
+def _ident(name: str) -> Dict[str, Any]:
+    return {"type": "Identifier", "name": name, "pos": _zero()}
+
+
+def _is_rule(item: Any) -> bool:
+    # Los hijos de regla se guardan como tuplas (rule_index, valor, ctx); los tokens tal cual
+    return type(item) is tuple
+
+
+def _values(items: List[Any], rule: int) -> List[Any]:
+    return [item[1] for item in items if type(item) is tuple and item[0] == rule]
+
+
+def _value(items: List[Any], rule: int) -> Any:
+    for item in items:
+        if type(item) is tuple and item[0] == rule:
+            return item[1]
+    return None
+
+
+def _token(items: List[Any], token_type: int):
+    for item in items:
+        if type(item) is not tuple and item.type == token_type:
+            return item
+    return None
+
+
+def _last_value(items: List[Any]) -> Any:
+    # Equivalente a visitChildren por defecto: resultado del último hijo
+    if items and _is_rule(items[-1]):
+        return items[-1][1]
+    return None
+
+
+class ASTListener(ParseTreeListener):
+    """Parse listener que construye el AST de ASTBuilder a medida que terminan las reglas."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        """Descarta el estado de un parseo anterior (p. ej. tras el bail-out de SLL)."""
+        self._frames: List[List[Any]] = [[]]
+        self.ast: Optional[Dict[str, Any]] = None
+        self.failed = False
+        self.detached = False
+
+    def detach(self) -> None:
+        """Marca que el parser volvió a construir el árbol y ya no usa este listener."""
+        self.reset()
+        self.detached = True
+
+    # ---- eventos del parser ----
+    def enterEveryRule(self, ctx):
+        self._frames.append([])
+
+    def visitTerminal(self, node):
+        self._frames[-1].append(node.symbol)
+
+    def visitErrorNode(self, node):
+        self.failed = True
+        self._frames[-1].append(node.symbol)
+
+    def exitEveryRule(self, ctx):
+        items = self._frames.pop()
+        if self.failed:
+            return
+        rule = ctx.getRuleIndex()
+        try:
+            handler = _HANDLERS.get(rule)
+            value = handler(ctx, items) if handler else _last_value(items)
+        except Exception:
+            # Nunca propagar al parser: se reconstruye con el camino con árbol
+            self.failed = True
+            return
+        if rule == P.RULE_program:
+            self.ast = value
+        else:
+            self._frames[-1].append((rule, value, ctx))
+
+
+# ---- programa y sentencias ----
+def _program(ctx, items):
+    procs = _values(items, P.RULE_procDef)
+    stmts = _values(items, P.RULE_stmt)
+    return {"type": "Program", "body": procs + stmts, "pos": get_pos(ctx)}
+
+
+def _proc_def(ctx, items):
+    name = _token(items, P.ID).text
+    params = _value(items, P.RULE_paramList) or []
+    body = _value(items, P.RULE_block)
+    return {"type": "ProcDef", "name": name, "params": params, "body": body, "pos": get_pos(ctx)}
+
+
+def _param(ctx, items):
+    if items and _is_rule(items[0]):
+        return items[0][1]  # arrayParam u objectParam
+    return {"type": "Param", "name": _token(items, P.ID).text, "pos": get_pos(ctx)}
+
+
+def _array_param(ctx, items):
+    if _token(items, P.RANGE) is not None:
+        raise _Unsupported("arrayParam con rango")
+    name = _token(items, P.ID).text
+    dims = _values(items, P.RULE_arrayDim)
+    start = dims[0] if dims else None
+    return {"type": "ArrayParam", "name": name, "start": start, "end": None, "pos": get_pos(ctx)}
+
+
+def _array_dim(ctx, items):
+    tok = _token(items, P.ID)
+    if tok is not None:
+        return _ident(tok.text)
+    tok = _token(items, P.INT)
+    if tok is not None:
+        return _lit(int(tok.text))
+    return {"type": "Literal", "value": 0, "pos": get_pos(ctx)}
+
+
+def _object_param(ctx, items):
+    ids = [item.text for item in items if not _is_rule(item) and item.type == P.ID]
+    return {"type": "ObjectParam", "className": ids[0], "name": ids[1], "pos": get_pos(ctx)}
+
+
+def _block(ctx, items):
+    return {"type": "Block", "body": _values(items, P.RULE_stmt), "pos": get_pos(ctx)}
+
+
+def _assignment(ctx, items):
+    target = _value(items, P.RULE_lvalue)
+    value = _value(items, P.RULE_expr)
+    return {"type": "Assign", "target": target, "value": value, "pos": get_pos(ctx)}
+
+
+def _decl_vector(ctx, items):
+    name = _token(items, P.ID).text
+    dims = _values(items, P.RULE_indexSuffix)
+    return {"type": "DeclVector", "id": name, "dims": dims, "pos": get_pos(ctx)}
+
+
+def _call_stmt(ctx, items):
+    callee = _token(items, P.ID).text
+    args = _value(items, P.RULE_argList) or []
+    return {"type": "Call", "callee": callee, "args": args, "statement": True, "pos": get_pos(ctx)}
+
+
+def _print_stmt(ctx, items):
+    args = _value(items, P.RULE_argList) or []
+    return {"type": "Print", "args": args, "pos": get_pos(ctx)}
+
+
+def _if_stmt(ctx, items):
+    test = _value(items, P.RULE_expr)
+    blocks = _values(items, P.RULE_block)
+    cons = blocks[0] if blocks else None
+    # ASTBuilder usa ctx.block(1): un "ELSE IF" (ifStmt anidado) no se recoge
+    alt = blocks[1] if len(blocks) > 1 else None
+    return {"type": "If", "test": test, "consequent": cons, "alternate": alt, "pos": get_pos(ctx)}
+
+
+def _while_stmt(ctx, items):
+    test = _value(items, P.RULE_expr)
+    body = _value(items, P.RULE_block)
+    return {"type": "While", "test": test, "body": body, "pos": get_pos(ctx)}
+
+
+def _for_stmt(ctx, items):
+    var = _token(items, P.ID).text
+    start, end = _values(items, P.RULE_expr)
+    body = _value(items, P.RULE_block)
+    return {"type": "For", "var": var, "start": start, "end": end, "body": body, "pos": get_pos(ctx)}
+
+
+def _repeat_stmt(ctx, items):
+    body_block = {"type": "Block", "body": _values(items, P.RULE_stmt), "pos": get_pos(ctx)}
+    test = _value(items, P.RULE_expr)
+    return {"type": "Repeat", "body": body_block, "test": test, "pos": get_pos(ctx)}
+
+
+def _return_stmt(ctx, items):
+    return {"type": "Return", "value": _value(items, P.RULE_expr), "pos": get_pos(ctx)}
+
+
+# ---- lvalues ----
+def _child_text(item) -> str:
+    rule, value, ctx = item
+    if rule == P.RULE_fieldAccess:
+        return value
+    return ctx.parser.getTokenStream().getText(ctx.start, ctx.stop)
+
+
+def _lvalue(ctx, items):
+    node = _ident(items[0].text)
+    count = len(items)
+    for i in range(1, count):
+        rule, value, child = items[i]
+        if rule == P.RULE_indexSuffix:
+            node = {"type": "Index", "target": node, "pos": get_pos(child), **value}
+        elif value.startswith("."):
+            # Igual que ASTBuilder: toma el texto del hijo siguiente de lvalue si existe
+            name = _child_text(items[i + 1]) if (i + 1) < count else value[1:]
+            node = {"type": "Field", "target": node, "name": name, "pos": get_pos(child)}
+    return node
+
+
+def _field_access(ctx, items):
+    return "".join(item.text for item in items)
+
+
+def _index_suffix(ctx, items):
+    exprs = _values(items, P.RULE_expr)
+    if _token(items, P.RANGE) is not None:
+        return {"range": {"start": exprs[0], "end": exprs[1]}}
+    return {"index": exprs[0]}
+
+
+# ---- expresiones ----
+def _fold_binary(ctx, items):
+    node = items[0][1]
+    for i in range(1, len(items) - 1, 2):
+        op = normalize_op(items[i].text)
+        node = {"type": "Binary", "op": op, "left": node, "right": items[i + 1][1], "pos": _zero()}
+    return node
+
+
+def _unary_expr(ctx, items):
+    first = items[0]
+    if not _is_rule(first):
+        op = "not" if first.type == P.NOT_KW else "-"
+        return {"type": "Unary", "op": op, "arg": items[1][1], "pos": get_pos(ctx)}
+    return first[1]
+
+
+def _primary(ctx, items):
+    first = items[0]
+    if _is_rule(first):
+        return first[1]  # lengthCall, callExpr o lvalue
+    kind = first.type
+    if kind == P.INT:
+        return _lit(int(first.text))
+    if kind == P.TRUE_KW:
+        return _lit(True)
+    if kind == P.FALSE_KW:
+        return _lit(False)
+    if kind == P.NULL_KW:
+        return _lit(None)
+    if kind == P.STRING:
+        raw = first.text
+        try:
+            value: Any = py_ast.literal_eval(raw)
+        except Exception:
+            value = raw[1:-1]
+        return _lit(value)
+    # (expr)
+    return _value(items, P.RULE_expr)
+
+
+def _length_call(ctx, items):
+    args = [_value(items, P.RULE_expr)]
+    return {"type": "Call", "callee": "length", "args": args, "builtIn": True, "statement": False, "pos": get_pos(ctx)}
+
+
+def _call_expr(ctx, items):
+    callee = _token(items, P.ID).text
+    args = _value(items, P.RULE_argList) or []
+    return {"type": "Call", "callee": callee, "args": args, "statement": False, "pos": get_pos(ctx)}
+
+
+def _arg_list(ctx, items):
+    return _values(items, P.RULE_expr)
+
+
+def _param_list(ctx, items):
+    return _values(items, P.RULE_param)
+
+
+_HANDLERS = {
+    P.RULE_program: _program,
+    P.RULE_procDef: _proc_def,
+    P.RULE_paramList: _param_list,
+    P.RULE_param: _param,
+    P.RULE_arrayParam: _array_param,
+    P.RULE_arrayDim: _array_dim,
+    P.RULE_objectParam: _object_param,
+    P.RULE_block: _block,
+    P.RULE_assignmentStmt: _assignment,
+    P.RULE_declVectorStmt: _decl_vector,
+    P.RULE_callStmt: _call_stmt,
+    P.RULE_printStmt: _print_stmt,
+    P.RULE_argList: _arg_list,
+    P.RULE_repeatStmt: _repeat_stmt,
+    P.RULE_returnStmt: _return_stmt,
+    P.RULE_ifStmt: _if_stmt,
+    P.RULE_whileStmt: _while_stmt,
+    P.RULE_forStmt: _for_stmt,
+    P.RULE_lvalue: _lvalue,
+    P.RULE_fieldAccess: _field_access,
+    P.RULE_indexSuffix: _index_suffix,
+    P.RULE_orExpr: _fold_binary,
+    P.RULE_andExpr: _fold_binary,
+    P.RULE_relExpr: _fold_binary,
+    P.RULE_addExpr: _fold_binary,
+    P.RULE_mulExpr: _fold_binary,
+    P.RULE_unaryExpr: _unary_expr,
+    P.RULE_primary: _primary,
+    P.RULE_lengthCall: _length_call,
+    P.RULE_callExpr: _call_expr,
+}
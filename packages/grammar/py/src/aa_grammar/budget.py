@@ -0,0 +1,205 @@
+"""
+Presupuestos de parseo para acotar la latencia en el peor caso.
+
+Entradas patológicas (archivos enormes pegados en el editor, miles de paréntesis
+anidados, basura que produce miles de errores de sintaxis) pueden ocupar un
+worker durante segundos o agotar la pila de Python. ParseBudget fija límites de
+tamaño del código, número de tokens, profundidad de anidamiento, errores
+recogidos y tiempo de reloj; al superar cualquiera el parseo se detiene con
+ParseBudgetExceeded, que parse_to_ast convierte en un error más.
+
+Los límites de tokens, profundidad y tiempo se comprueban desde el flujo de
+tokens (BudgetTokenStream) a medida que el parser lo consume, así que el costo
+es proporcional a lo que realmente se llegó a leer. La profundidad es el
+anidamiento de paréntesis, corchetes, llaves y bloques BEGIN…END.
+
+Cada límite se configura por variable de entorno; 0 lo desactiva.
+"""
+import os
+import time
+from typing import Any, Dict, Iterable, List, Optional
+from antlr4 import CommonTokenStream, Token  # type: ignore
+from .generated.LanguageLexer import LanguageLexer  # type: ignore
+
+# Valores por defecto (0 desactiva el límite)
+DEFAULT_MAX_SOURCE_CHARS = 200_000
+DEFAULT_MAX_TOKENS = 50_000
+# Cada nivel de paréntesis son ~9 reglas de ANTLR anidadas: 64 niveles quedan
+# lejos del límite de recursión de Python
+DEFAULT_MAX_DEPTH = 64
+DEFAULT_MAX_ERRORS = 100
+DEFAULT_DEADLINE_MS = 2000
+
+# Cada cuántos consume() se mira el reloj (perf_counter por token es caro)
+_DEADLINE_CHECK_EVERY = 256
+
+# Delimitadores: +1 al abrir, -1 al cerrar (tipos de ANTLR y de fast_parser)
+_ANTLR_DEPTH = {
+    LanguageLexer.LPAREN: 1, LanguageLexer.LBRACK: 1, LanguageLexer.LBRACE: 1, LanguageLexer.BEGIN_KW: 1,
+    LanguageLexer.RPAREN: -1, LanguageLexer.RBRACK: -1, LanguageLexer.RBRACE: -1, LanguageLexer.END_KW: -1,
+}
+_FAST_DEPTH = {"(": 1, "[": 1, "{": 1, "BEGIN": 1, ")": -1, "]": -1, "}": -1, "END": -1}
+
+
+def _env_limit(name: str, default: int) -> int:
+    try:
+        return max(0, int(os.getenv(name, "").strip()))
+    except ValueError:
+        return default
+
+
+class ParseBudgetExceeded(Exception):
+    """
+    Se superó un presupuesto de parseo.
+
+    error tiene la forma {line, column, message} más "budget" con el límite
+    superado ("source", "tokens", "depth", "errors" o "deadline").
+    """
+
+    def __init__(self, budget: str, message: str, line: int = 1, column: int = 1):
+        super().__init__(message)
+        self.budget = budget
+        self.error: Dict[str, Any] = {"line": line, "column": column, "message": message, "budget": budget}
+        # Errores recogidos antes de detener el parseo (los completa _parse_tree)
+        self.errors: List[Dict[str, Any]] = []
+
+
+class ParseBudget:
+    """Límites de un parseo; 0 desactiva cada límite."""
+
+    def __init__(
+        self,
+        max_source_chars: int = DEFAULT_MAX_SOURCE_CHARS,
+        max_tokens: int = DEFAULT_MAX_TOKENS,
+        max_depth: int = DEFAULT_MAX_DEPTH,
+        max_errors: int = DEFAULT_MAX_ERRORS,
+        deadline_ms: int = DEFAULT_DEADLINE_MS,
+    ):
+        self.max_source_chars = max_source_chars
+        self.max_tokens = max_tokens
+        self.max_depth = max_depth
+        self.max_errors = max_errors
+        self.deadline_ms = deadline_ms
+
+    def check_source(self, source: str) -> None:
+        if self.max_source_chars and len(source) > self.max_source_chars:
+            raise ParseBudgetExceeded(
+                "source",
+                f"El código tiene {len(source)} caracteres; el máximo es {self.max_source_chars}",
+            )
+
+    def check_tokens(self, tokens: Iterable[Any]) -> None:
+        """Comprueba tokens y profundidad sobre tokens de fast_parser (kind, text, line, col)."""
+        meter = BudgetMeter(self)
+        for tok in tokens:
+            if tok[0] != "EOF":
+                meter.on_token(_FAST_DEPTH.get(tok[0], 0), tok[2], tok[3])
+
+    def tokens_error(self, line: int, column: int) -> ParseBudgetExceeded:
+        return ParseBudgetExceeded(
+            "tokens",
+            f"El código supera el máximo de {self.max_tokens} tokens; parseo detenido",
+            line,
+            column + 1,
+        )
+
+    def depth_error(self, line: int, column: int) -> ParseBudgetExceeded:
+        return ParseBudgetExceeded(
+            "depth",
+            f"El anidamiento supera la profundidad máxima de {self.max_depth}; parseo detenido",
+            line,
+            column + 1,
+        )
+
+
+def get_parse_budget() -> ParseBudget:
+    """
+    Lee los presupuestos de parseo de las variables de entorno:
+
+    - AA_GRAMMAR_MAX_SOURCE_CHARS (por defecto 200000)
+    - AA_GRAMMAR_MAX_TOKENS (por defecto 50000)
+    - AA_GRAMMAR_MAX_DEPTH (por defecto 64)
+    - AA_GRAMMAR_MAX_ERRORS (por defecto 100)
+    - AA_GRAMMAR_DEADLINE_MS (por defecto 2000)
+
+    Valores inválidos usan el defecto; 0 desactiva el límite.
+    """
+    return ParseBudget(
+        max_source_chars=_env_limit("AA_GRAMMAR_MAX_SOURCE_CHARS", DEFAULT_MAX_SOURCE_CHARS),
+        max_tokens=_env_limit("AA_GRAMMAR_MAX_TOKENS", DEFAULT_MAX_TOKENS),
+        max_depth=_env_limit("AA_GRAMMAR_MAX_DEPTH", DEFAULT_MAX_DEPTH),
+        max_errors=_env_limit("AA_GRAMMAR_MAX_ERRORS", DEFAULT_MAX_ERRORS),
+        deadline_ms=_env_limit("AA_GRAMMAR_DEADLINE_MS", DEFAULT_DEADLINE_MS),
+    )
+
+
+class BudgetMeter:
+    """Consumo de un parseo: tokens, profundidad, errores y tiempo desde started."""
+
+    def __init__(self, budget: ParseBudget, started: Optional[float] = None):
+        self.budget = budget
+        self.started = time.perf_counter() if started is None else started
+        self.tokens = 0
+        self.depth = 0
+        self.errors = 0
+
+    def on_token(self, delta: int, line: int, column: int) -> None:
+        budget = self.budget
+        self.tokens += 1
+        if budget.max_tokens and self.tokens > budget.max_tokens:
+            raise budget.tokens_error(line, column)
+        if delta:
+            # Un cierre de más no baja de 0: eso es un error de sintaxis, no de presupuesto
+            self.depth = max(0, self.depth + delta)
+            if budget.max_depth and self.depth > budget.max_depth:
+                raise budget.depth_error(line, column)
+
+    def on_error(self, line: int = 1, column: int = 1) -> None:
+        """Cuenta un error recogido (posición base 1)."""
+        self.errors += 1
+        if self.budget.max_errors and self.errors >= self.budget.max_errors:
+            raise ParseBudgetExceeded(
+                "errors",
+                f"Se alcanzó el máximo de {self.budget.max_errors} errores; parseo detenido",
+                line,
+                column,
+            )
+
+    def check_deadline(self, line: int = 1, column: int = 0) -> None:
+        deadline_ms = self.budget.deadline_ms
+        if deadline_ms:
+            elapsed_ms = (time.perf_counter() - self.started) * 1000
+            if elapsed_ms > deadline_ms:
+                raise ParseBudgetExceeded(
+                    "deadline",
+                    f"El parseo superó el tiempo máximo de {deadline_ms} ms; parseo detenido",
+                    line,
+                    column + 1,
+                )
+
+
+class BudgetTokenStream(CommonTokenStream):
+    """CommonTokenStream que aplica los presupuestos a medida que el parser lee tokens."""
+
+    def __init__(self, lexer, meter: BudgetMeter):
+        super().__init__(lexer)
+        self.meter = meter
+        self._consumed = 0
+
+    def fetch(self, n: int) -> int:
+        # Tokens nuevos (cada uno se cuenta una sola vez, aunque haya seek/reparseo)
+        before = len(self.tokens)
+        fetched = super().fetch(n)
+        meter = self.meter
+        for tok in self.tokens[before:]:
+            if tok.type != Token.EOF and tok.channel == Token.DEFAULT_CHANNEL:
+                meter.on_token(_ANTLR_DEPTH.get(tok.type, 0), tok.line, tok.column)
+        return fetched
+
+    def consume(self) -> None:
+        # consume() también lo usa la predicción al mirar hacia adelante
+        self._consumed += 1
+        if self._consumed % _DEADLINE_CHECK_EVERY == 0:
+            tok = self.LT(1)
+            self.meter.check_deadline(tok.line, tok.column)
+        super().consume()
@@ -0,0 +1,174 @@
+"""
+Representación compacta del AST.
+
+ASTBuilder produce cada nodo como un dict más un dict anidado "pos". Para guardar
+muchos AST (cachés, almacenes de documentos) eso es caro: cada nodo paga la tabla
+hash del dict y otra más para la posición.
+
+Aquí cada nodo es un CompactNode con __slots__ que guarda:
+- una "forma" compartida (las claves del nodo, internadas: todos los Binary con
+  posición comparten la misma) con su etiqueta entera de tipo;
+- una tupla con los valores en el orden de las claves.
+
+Las posiciones {"line", "column"} se empaquetan en un solo entero y las listas se
+guardan como tuplas. CompactNode implementa Mapping, así que se puede leer como el
+dict original (node["type"], node.get("body"), "pos" in node); to_dict() / materialize()
+reconstruyen exactamente el dict de ASTBuilder para el contrato JSON de la API.
+"""
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Tuple
+
+# Etiquetas enteras de los tipos que produce ASTBuilder (orden estable)
+NODE_TYPES: Tuple[str, ...] = (
+    "Program", "ProcDef", "Param", "ArrayParam", "ObjectParam", "Block",
+    "Assign", "DeclVector", "Call", "Print", "If", "While", "For", "Repeat",
+    "Return", "Index", "Field", "Literal", "Identifier", "Unary", "Binary",
+)
+TYPE_TAGS: Dict[str, int] = {name: i for i, name in enumerate(NODE_TYPES)}
+UNKNOWN_TAG = -1
+
+_POS_SHIFT = 32
+_POS_MASK = (1 << _POS_SHIFT) - 1
+
+
+def pack_pos(line: int, column: int) -> int:
+    """Empaqueta (line, column) en un entero."""
+    return (line << _POS_SHIFT) | column
+
+
+def unpack_pos(packed: int) -> Dict[str, int]:
+    """Desempaqueta un entero de pack_pos al dict {"line", "column"}."""
+    return {"line": packed >> _POS_SHIFT, "column": packed & _POS_MASK}
+
+
+class _Shape:
+    """Claves de un nodo, su índice y la etiqueta de tipo; se comparte entre nodos."""
+
+    __slots__ = ("keys", "index", "pos_slot")
+
+    def __init__(self, keys: Tuple[str, ...]):
+        self.keys = keys
+        self.index = {key: i for i, key in enumerate(keys)}
+        self.pos_slot = self.index.get("pos", -1)
+
+
+_SHAPES: Dict[Tuple[str, ...], _Shape] = {}
+
+
+def _shape_for(keys: Tuple[str, ...]) -> _Shape:
+    shape = _SHAPES.get(keys)
+    if shape is None:
+        shape = _SHAPES.setdefault(keys, _Shape(keys))
+    return shape
+
+
+class CompactNode(Mapping):
+    """Nodo AST inmutable con __slots__; se lee como el dict equivalente."""
+
+    __slots__ = ("_shape", "_values")
+
+    def __init__(self, shape: _Shape, values: Tuple[Any, ...]):
+        self._shape = shape
+        self._values = values
+
+    # ---- Mapping ----
+    def __getitem__(self, key: str) -> Any:
+        i = self._shape.index[key]
+        value = self._values[i]
+        if i == self._shape.pos_slot and isinstance(value, int):
+            return unpack_pos(value)
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._shape.keys)
+
+    def __len__(self) -> int:
+        return len(self._shape.keys)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._shape.index
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self._shape.index:
+            return self[key]
+        return default
+
+    # ---- accesos tipados ----
+    @property
+    def tag(self) -> int:
+        """Etiqueta entera del tipo (UNKNOWN_TAG si no es un tipo de ASTBuilder)."""
+        i = self._shape.index.get("type")
+        return TYPE_TAGS.get(self._values[i], UNKNOWN_TAG) if i is not None else UNKNOWN_TAG
+
+    @property
+    def line(self) -> int:
+        return self._packed_pos() >> _POS_SHIFT
+
+    @property
+    def column(self) -> int:
+        return self._packed_pos() & _POS_MASK
+
+    def _packed_pos(self) -> int:
+        slot = self._shape.pos_slot
+        value = self._values[slot] if slot >= 0 else None
+        if isinstance(value, int):
+            return value
+        if isinstance(value, Mapping):
+            return pack_pos(value.get("line", 0), value.get("column", 0))
+        return 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Reconstruye el dict de ASTBuilder (copia nueva e independiente)."""
+        return materialize(self)
+
+    def __repr__(self) -> str:
+        return f"CompactNode({self.to_dict()!r})"
+
+
+def _is_plain_pos(value: Any) -> bool:
+    return (
+        type(value) is dict
+        and len(value) == 2
+        and type(value.get("line")) is int
+        and type(value.get("column")) is int
+        and value["line"] >= 0
+        and 0 <= value["column"] <= _POS_MASK
+    )
+
+
+def compact_ast(obj: Any) -> Any:
+    """
+    Convierte un AST (o cualquier valor JSON: dicts, listas, escalares) a su forma compacta.
+
+    Los dicts pasan a CompactNode, las listas a tuplas y los "pos" a enteros.
+    """
+    if isinstance(obj, dict):
+        keys = tuple(obj)
+        values = []
+        for key, value in obj.items():
+            if key == "pos" and _is_plain_pos(value):
+                values.append(pack_pos(value["line"], value["column"]))
+            else:
+                values.append(compact_ast(value))
+        return CompactNode(_shape_for(keys), tuple(values))
+    if isinstance(obj, list):
+        return tuple(compact_ast(item) for item in obj)
+    return obj
+
+
+def materialize(obj: Any) -> Any:
+    """
+    Inversa de compact_ast: devuelve dicts y listas nuevos, idénticos al AST original.
+    """
+    if isinstance(obj, CompactNode):
+        shape = obj._shape
+        out = {}
+        for i, (key, value) in enumerate(zip(shape.keys, obj._values)):
+            if i == shape.pos_slot and isinstance(value, int):
+                out[key] = {"line": value >> _POS_SHIFT, "column": value & _POS_MASK}
+            else:
+                out[key] = materialize(value)
+        return out
+    if isinstance(obj, tuple):
+        return [materialize(item) for item in obj]
+    return obj
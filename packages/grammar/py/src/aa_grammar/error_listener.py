@@ -2,9 +2,11 @@ from antlr4.error.ErrorListener import ErrorListener  # type: ignore
 from typing import List, Dict, Any
 
 class CollectingErrorListener(ErrorListener):
-    def __init__(self) -> None:
+    def __init__(self, meter: Any = None) -> None:
         super().__init__()
         self.errors: List[Dict[str, Any]] = []
+        # BudgetMeter opcional: detiene el parseo al alcanzar el máximo de errores
+        self.meter = meter
 
     def syntaxError(self, recognizer, offendingSymbol, line, column, msg, e):
         # ANTLR: line base 1, column base 0 → normalizar a base 1
@@ -13,3 +15,5 @@ class CollectingErrorListener(ErrorListener):
             "column": int(column) + 1,
             "message": str(msg),
         })
+        if self.meter is not None:
+            self.meter.on_error(int(line), int(column) + 1)
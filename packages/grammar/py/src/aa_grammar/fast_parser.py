@@ -0,0 +1,465 @@
+"""
+Tokenizador y parser descendente recursivo escritos a mano para Language.g4.
+
+La gramática es pequeña y casi LL(1), así que un parser directo evita el costo del
+runtime genérico de ANTLR (simulación del ATN, contextos, listeners) en el caso
+común: programas válidos. parse_fast devuelve el mismo AST que ASTBuilder (con sus
+particularidades: posición {0, 0} en nodos que vienen de tokens, "ELSE IF" sin
+recoger, procedimientos antes que sentencias, etc.).
+
+Ante cualquier cosa que no reconozca (carácter inválido, error de sintaxis,
+parámetros con rango A[1]..[n] que ASTBuilder no soporta) devuelve None y
+api.parse_to_ast usa ANTLR, de modo que los mensajes de error son siempre los de
+ANTLR.
+"""
+import ast as py_ast
+import re
+from typing import Any, Dict, List, Optional, Tuple
+from .ast_builder import normalize_op
+
+# Token: (tipo, texto, línea base 1, columna base 0)
+Token = Tuple[str, str, int, int]
+
+
+class FastParseError(Exception):
+    """Entrada que el parser rápido no acepta: se delega en ANTLR."""
+
+
+_KEYWORDS = {
+    "for": "FOR", "while": "WHILE", "if": "IF", "then": "THEN", "else": "ELSE",
+    "begin": "BEGIN", "end": "END", "to": "TO", "do": "DO", "call": "CALL",
+    "and": "AND", "or": "OR", "not": "NOT", "t": "TRUE", "f": "FALSE",
+    "null": "NULL", "length": "LENGTH", "div": "DIV", "mod": "MOD",
+    "class": "CLASS", "return": "RETURN", "repeat": "REPEAT", "until": "UNTIL",
+    "print": "PRINT",
+}
+
+# Variantes de un mismo token del lexer de ANTLR. Las variantes Unicode de
+# Language.g4 (←, ≤, ≠, ►...) no las reconoce el lexer generado, que reporta
+# "token recognition error": aquí tampoco se aceptan para delegar en ANTLR
+_OPERATOR_KINDS = {":=": "<-", "<>": "!="}
+
+# Orden de las alternativas = longest match de ANTLR para este vocabulario
+_TOKEN_RE = re.compile(
+    r"(?P<ws>[ \t\r\n\f]+)"
+    r"|(?P<comment>//[^\r\n]*)"
+    r"|(?P<word>[A-Za-z_][A-Za-z_0-9]*)"
+    r"|(?P<int>[0-9]+)"
+    r'|(?P<string>"(?:\\.|[^"\\\r\n])*")'
+    r"|(?P<op><-|:=|!=|<>|<=|>=|\.\.|[(){}\[\];+\-*/=<>,.])",
+    re.DOTALL,
+)
+
+
+def tokenize(source: str) -> List[Token]:
+    """
+    Convierte el código en tokens con las mismas posiciones que el lexer de ANTLR.
+
+    Raises:
+        FastParseError: si hay un carácter que el lexer de ANTLR reportaría como error
+    """
+    tokens: List[Token] = []
+    pos = 0
+    line = 1
+    line_start = 0
+    end = len(source)
+    match = _TOKEN_RE.match
+    while pos < end:
+        m = match(source, pos)
+        if m is None:
+            raise FastParseError(f"carácter inesperado {source[pos]!r}")
+        kind = m.lastgroup
+        text = m.group()
+        if kind == "word":
+            tokens.append((_KEYWORDS.get(text.lower(), "ID"), text, line, pos - line_start))
+        elif kind == "int":
+            tokens.append(("INT", text, line, pos - line_start))
+        elif kind == "op":
+            tokens.append((_OPERATOR_KINDS.get(text, text), text, line, pos - line_start))
+        elif kind == "string":
+            tokens.append(("STRING", text, line, pos - line_start))
+        newlines = text.count("\n")
+        if newlines:
+            line += newlines
+            line_start = pos + text.rindex("\n") + 1
+        pos = m.end()
+    eof = ("EOF", "<EOF>", line, pos - line_start)
+    tokens.append(eof)
+    tokens.append(eof)  # lookahead de 2 sin comprobar límites
+    return tokens
+
+
+def _pos(tok: Token) -> Dict[str, int]:
+    return {"line": tok[2], "column": tok[3]}
+
+
+def _zero() -> Dict[str, int]:
+    # ASTBuilder pasa nodos terminales a get_pos, que devuelve {0, 0}
+    return {"line": 0, "column": 0}
+
+
+def _lit(value: Any) -> Dict[str, Any]:
+    return {"type": "Literal", "value": value, "pos": _zero()}
+
+
+def _ident(name: str) -> Dict[str, Any]:
+    return {"type": "Identifier", "name": name, "pos": _zero()}
+
+
+_REL_OPS = frozenset(("=", "!=", "<", "<=", ">", ">="))
+_ADD_OPS = frozenset(("+", "-"))
+_MUL_OPS = frozenset(("*", "/", "DIV", "MOD"))
+_PRIMARY_LITERALS = {"TRUE": True, "FALSE": False, "NULL": None}
+
+
+class _Parser:
+    """Una regla de la gramática por método; misma forma de AST que ASTBuilder."""
+
+    def __init__(self, tokens: List[Token]):
+        self.toks = tokens
+        self.i = 0
+
+    # ---- utilidades ----
+    def peek(self, k: int = 0) -> str:
+        return self.toks[self.i + k][0]
+
+    def next(self) -> Token:
+        tok = self.toks[self.i]
+        self.i += 1
+        return tok
+
+    def expect(self, kind: str) -> Token:
+        tok = self.toks[self.i]
+        if tok[0] != kind:
+            raise FastParseError(f"se esperaba {kind} en {tok[2]}:{tok[3]}")
+        self.i += 1
+        return tok
+
+    def accept(self, kind: str) -> bool:
+        if self.toks[self.i][0] == kind:
+            self.i += 1
+            return True
+        return False
+
+    # ---- programa ----
+    def program(self) -> Dict[str, Any]:
+        start = self.toks[0]
+        while self.peek() == "CLASS":
+            self.class_def()
+        procs: List[Any] = []
+        stmts: List[Any] = []
+        while self.peek() != "EOF":
+            if self.peek() == "ID" and self.peek(1) == "(":
+                procs.append(self.proc_def())
+            else:
+                stmts.append(self.stmt())
+        return {"type": "Program", "body": procs + stmts, "pos": _pos(start)}
+
+    def class_def(self) -> None:
+        # ASTBuilder no incluye las clases en el AST
+        self.expect("CLASS")
+        self.expect("ID")
+        self.expect("{")
+        while self.accept("ID"):
+            pass
+        self.expect("}")
+
+    def proc_def(self) -> Dict[str, Any]:
+        name_tok = self.expect("ID")
+        self.expect("(")
+        params = []
+        if self.peek() != ")":
+            params.append(self.param())
+            while self.accept(","):
+                params.append(self.param())
+        self.expect(")")
+        body = self.block()
+        return {"type": "ProcDef", "name": name_tok[1], "params": params, "body": body, "pos": _pos(name_tok)}
+
+    def param(self) -> Dict[str, Any]:
+        name_tok = self.expect("ID")
+        kind = self.peek()
+        if kind == "[":
+            dims = [self.array_dim()]
+            while self.peek() == "[":
+                dims.append(self.array_dim())
+            if self.peek() == "..":
+                raise FastParseError("arrayParam con rango")
+            return {"type": "ArrayParam", "name": name_tok[1], "start": dims[0], "end": None, "pos": _pos(name_tok)}
+        if kind == "ID":
+            obj_tok = self.next()
+            return {"type": "ObjectParam", "className": name_tok[1], "name": obj_tok[1], "pos": _pos(name_tok)}
+        return {"type": "Param", "name": name_tok[1], "pos": _pos(name_tok)}
+
+    def array_dim(self) -> Dict[str, Any]:
+        self.expect("[")
+        tok = self.next()
+        if tok[0] == "ID":
+            node = _ident(tok[1])
+        elif tok[0] == "INT":
+            node = _lit(int(tok[1]))
+        else:
+            raise FastParseError("dimensión inválida")
+        self.expect("]")
+        return node
+
+    # ---- sentencias ----
+    def stmt(self) -> Optional[Dict[str, Any]]:
+        kind = self.peek()
+        if kind == "ID":
+            return self.assignment_or_decl()
+        if kind == "{" or kind == "BEGIN":
+            return self.block()
+        if kind == "IF":
+            return self.if_stmt()
+        if kind == "FOR":
+            return self.for_stmt()
+        if kind == "WHILE":
+            return self.while_stmt()
+        if kind == "REPEAT":
+            return self.repeat_stmt()
+        if kind == "RETURN":
+            return self.return_stmt()
+        if kind == "CALL":
+            return self.call_stmt()
+        if kind == "PRINT":
+            return self.print_stmt()
+        if kind == ";":
+            self.next()
+            return None
+        raise FastParseError(f"sentencia inesperada {kind}")
+
+    def block(self) -> Dict[str, Any]:
+        open_tok = self.next()
+        if open_tok[0] == "{":
+            close = "}"
+        elif open_tok[0] == "BEGIN":
+            close = "END"
+        else:
+            raise FastParseError("se esperaba un bloque")
+        body = []
+        while self.peek() != close:
+            body.append(self.stmt())
+        self.next()
+        return {"type": "Block", "body": body, "pos": _pos(open_tok)}
+
+    def assignment_or_decl(self) -> Dict[str, Any]:
+        id_tok = self.next()
+        suffixes = self.suffixes()
+        if self.accept("<-"):
+            value = self.expr()
+            self.accept(";")
+            target = self.build_lvalue(id_tok, suffixes)
+            return {"type": "Assign", "target": target, "value": value, "pos": _pos(id_tok)}
+        # declVectorStmt : ID indexSuffix+ ';'?
+        if not suffixes or any(s[0] != "index" for s in suffixes):
+            raise FastParseError("se esperaba una asignación")
+        self.accept(";")
+        dims = [s[1] for s in suffixes]
+        return {"type": "DeclVector", "id": id_tok[1], "dims": dims, "pos": _pos(id_tok)}
+
+    def call_stmt(self) -> Dict[str, Any]:
+        call_tok = self.next()
+        callee = self.expect("ID")[1]
+        args = self.call_args()
+        self.accept(";")
+        return {"type": "Call", "callee": callee, "args": args, "statement": True, "pos": _pos(call_tok)}
+
+    def print_stmt(self) -> Dict[str, Any]:
+        print_tok = self.next()
+        args = self.call_args()
+        self.accept(";")
+        return {"type": "Print", "args": args, "pos": _pos(print_tok)}
+
+    def call_args(self) -> List[Any]:
+        self.expect("(")
+        args = []
+        if self.peek() != ")":
+            args.append(self.expr())
+            while self.accept(","):
+                args.append(self.expr())
+        self.expect(")")
+        return args
+
+    def if_stmt(self) -> Dict[str, Any]:
+        if_tok = self.next()
+        test = self.paren_expr()
+        self.expect("THEN")
+        cons = self.block()
+        alt = None
+        if self.accept("ELSE"):
+            if self.peek() == "IF":
+                self.if_stmt()  # ASTBuilder usa ctx.block(1): el "ELSE IF" no se recoge
+            else:
+                alt = self.block()
+        return {"type": "If", "test": test, "consequent": cons, "alternate": alt, "pos": _pos(if_tok)}
+
+    def while_stmt(self) -> Dict[str, Any]:
+        while_tok = self.next()
+        test = self.paren_expr()
+        self.expect("DO")
+        body = self.block()
+        return {"type": "While", "test": test, "body": body, "pos": _pos(while_tok)}
+
+    def for_stmt(self) -> Dict[str, Any]:
+        for_tok = self.next()
+        var = self.expect("ID")[1]
+        self.expect("<-")
+        start = self.expr()
+        self.expect("TO")
+        end = self.expr()
+        self.expect("DO")
+        body = self.block()
+        return {"type": "For", "var": var, "start": start, "end": end, "body": body, "pos": _pos(for_tok)}
+
+    def repeat_stmt(self) -> Dict[str, Any]:
+        repeat_tok = self.next()
+        body_stmts = [self.stmt()]
+        while self.peek() != "UNTIL":
+            body_stmts.append(self.stmt())
+        self.next()
+        test = self.paren_expr()
+        self.accept(";")
+        body_block = {"type": "Block", "body": body_stmts, "pos": _pos(repeat_tok)}
+        return {"type": "Repeat", "body": body_block, "test": test, "pos": _pos(repeat_tok)}
+
+    def return_stmt(self) -> Dict[str, Any]:
+        return_tok = self.next()
+        value = self.expr()
+        self.expect(";")
+        return {"type": "Return", "value": value, "pos": _pos(return_tok)}
+
+    # ---- lvalues ----
+    def suffixes(self) -> List[Tuple[str, Any, Token, str]]:
+        """( fieldAccess | indexSuffix )*: (tipo, contenido, token inicial, texto)."""
+        out = []
+        while True:
+            kind = self.peek()
+            if kind == ".":
+                dot_tok = self.next()
+                name_tok = self.expect("ID")
+                text = dot_tok[1] + name_tok[1]
+                out.append(("field", text, dot_tok, text))
+            elif kind == "[":
+                first = self.i
+                open_tok = self.next()
+                index = self.expr()
+                if self.accept(".."):
+                    payload = {"range": {"start": index, "end": self.expr()}}
+                else:
+                    payload = {"index": index}
+                self.expect("]")
+                text = "".join(tok[1] for tok in self.toks[first:self.i])
+                out.append(("index", payload, open_tok, text))
+            else:
+                return out
+
+    def build_lvalue(self, id_tok: Token, suffixes) -> Dict[str, Any]:
+        node = _ident(id_tok[1])
+        count = len(suffixes)
+        for i, (kind, payload, start_tok, text) in enumerate(suffixes):
+            if kind == "index":
+                node = {"type": "Index", "target": node, "pos": _pos(start_tok), **payload}
+            else:
+                # Igual que ASTBuilder: toma el texto del hijo siguiente de lvalue si existe
+                name = suffixes[i + 1][3] if (i + 1) < count else text[1:]
+                node = {"type": "Field", "target": node, "name": name, "pos": _pos(start_tok)}
+        return node
+
+    # ---- expresiones ----
+    def paren_expr(self) -> Dict[str, Any]:
+        self.expect("(")
+        value = self.expr()
+        self.expect(")")
+        return value
+
+    def expr(self) -> Dict[str, Any]:
+        node = self.and_expr()
+        while self.peek() == "OR":
+            op = normalize_op(self.next()[1])
+            node = {"type": "Binary", "op": op, "left": node, "right": self.and_expr(), "pos": _zero()}
+        return node
+
+    def and_expr(self) -> Dict[str, Any]:
+        node = self.rel_expr()
+        while self.peek() == "AND":
+            op = normalize_op(self.next()[1])
+            node = {"type": "Binary", "op": op, "left": node, "right": self.rel_expr(), "pos": _zero()}
+        return node
+
+    def rel_expr(self) -> Dict[str, Any]:
+        node = self.add_expr()
+        while self.peek() in _REL_OPS:
+            op = normalize_op(self.next()[1])
+            node = {"type": "Binary", "op": op, "left": node, "right": self.add_expr(), "pos": _zero()}
+        return node
+
+    def add_expr(self) -> Dict[str, Any]:
+        node = self.mul_expr()
+        while self.peek() in _ADD_OPS:
+            op = normalize_op(self.next()[1])
+            node = {"type": "Binary", "op": op, "left": node, "right": self.mul_expr(), "pos": _zero()}
+        return node
+
+    def mul_expr(self) -> Dict[str, Any]:
+        node = self.unary_expr()
+        while self.peek() in _MUL_OPS:
+            op = normalize_op(self.next()[1])
+            node = {"type": "Binary", "op": op, "left": node, "right": self.unary_expr(), "pos": _zero()}
+        return node
+
+    def unary_expr(self) -> Dict[str, Any]:
+        kind = self.peek()
+        if kind == "NOT" or kind == "-":
+            op_tok = self.next()
+            arg = self.unary_expr()
+            return {"type": "Unary", "op": "not" if kind == "NOT" else "-", "arg": arg, "pos": _pos(op_tok)}
+        return self.primary()
+
+    def primary(self) -> Dict[str, Any]:
+        tok = self.next()
+        kind = tok[0]
+        if kind == "ID":
+            if self.peek() == "(":
+                args = self.call_args()
+                return {"type": "Call", "callee": tok[1], "args": args, "statement": False, "pos": _pos(tok)}
+            return self.build_lvalue(tok, self.suffixes())
+        if kind == "INT":
+            return _lit(int(tok[1]))
+        if kind in _PRIMARY_LITERALS:
+            return _lit(_PRIMARY_LITERALS[kind])
+        if kind == "STRING":
+            raw = tok[1]
+            try:
+                value: Any = py_ast.literal_eval(raw)
+            except Exception:
+                value = raw[1:-1]
+            return _lit(value)
+        if kind == "LENGTH":
+            arg = self.paren_expr()
+            return {"type": "Call", "callee": "length", "args": [arg], "builtIn": True, "statement": False, "pos": _pos(tok)}
+        if kind == "(":
+            value = self.expr()
+            self.expect(")")
+            return value
+        raise FastParseError(f"expresión inesperada {kind}")
+
+
+def parse_fast(source: str, budget: Any = None) -> Optional[Dict[str, Any]]:
+    """
+    Parsea un programa válido sin ANTLR.
+
+    Con un ParseBudget, los límites de tokens y profundidad se comprueban sobre
+    los tokens antes de parsear (ParseBudgetExceeded se propaga al llamador).
+
+    Returns:
+        AST idéntico al de ASTBuilder, o None si el programa tiene errores o usa
+        algo que este parser no cubre (el llamador debe usar ANTLR)
+    """
+    try:
+        tokens = tokenize(source)
+        if budget is not None:
+            budget.check_tokens(tokens)
+        return _Parser(tokens).program()
+    except (FastParseError, RecursionError):
+        return None
@@ -0,0 +1,262 @@
+"""
+Re-parseo incremental dirigido por ediciones de texto del editor.
+
+Un documento parseado guarda, además del AST, los rangos de caracteres de cada
+unidad de primer nivel del programa (classDef, procDef o stmt). Ante una lista
+de ediciones solo se re-parsean las unidades que tocan la edición (más una
+unidad vecina a cada lado) y el resultado se empalma en el AST anterior,
+desplazando las posiciones de las unidades que quedan después de la edición.
+
+Si el re-parseo parcial produce errores se hace un parseo completo, de modo que
+los errores reportados son siempre los del documento entero. Los presupuestos de
+parseo (ver budget.py) se aplican igual que en parse_to_ast.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+from .generated.LanguageParser import LanguageParser  # type: ignore
+from .api import _parse_tree, get_prediction_mode
+from .budget import BudgetMeter, ParseBudget, ParseBudgetExceeded, get_parse_budget
+from .ast_builder import ASTBuilder, get_pos
+
+
+class Unit:
+    """Unidad de primer nivel: tipo, rango [start, stop) en el código y nodo AST."""
+
+    __slots__ = ("kind", "start", "stop", "node")
+
+    def __init__(self, kind: str, start: int, stop: int, node: Optional[Dict[str, Any]]):
+        self.kind = kind
+        self.start = start
+        self.stop = stop
+        self.node = node
+
+
+class ParsedDocument:
+    """Resultado de parsear un documento: código, AST, errores y unidades."""
+
+    def __init__(
+        self,
+        source: str,
+        ast: Optional[Dict[str, Any]],
+        errors: List[Dict[str, Any]],
+        units: Optional[List[Unit]],
+    ):
+        self.source = source
+        self.ast = ast
+        self.errors = errors
+        # None cuando el documento tiene errores: la siguiente edición re-parsea todo
+        self.units = units
+
+
+def _line_col(text: str, offset: int) -> Tuple[int, int]:
+    """Línea (base 1) y columna (base 0) de un offset, con la misma convención que ANTLR."""
+    line = text.count("\n", 0, offset) + 1
+    column = offset - (text.rfind("\n", 0, offset) + 1)
+    return line, column
+
+
+def _units_from_tree(tree, base_offset: int = 0) -> List[Unit]:
+    units: List[Unit] = []
+    builder = ASTBuilder()
+    for child in tree.children or []:
+        if isinstance(child, LanguageParser.ClassDefContext):
+            kind, node = "classDef", None
+        elif isinstance(child, LanguageParser.ProcDefContext):
+            kind, node = "procDef", builder.visit(child)
+        elif isinstance(child, LanguageParser.StmtContext):
+            kind, node = "stmt", builder.visit(child)
+        else:
+            continue  # EOF
+        units.append(Unit(kind, child.start.start + base_offset, child.stop.stop + 1 + base_offset, node))
+    return units
+
+
+def _program_from_units(units: List[Unit], pos: Dict[str, int]) -> Dict[str, Any]:
+    # Mismo orden que ASTBuilder.visitProgram: procedimientos primero, luego sentencias
+    procs = [u.node for u in units if u.kind == "procDef"]
+    stmts = [u.node for u in units if u.kind == "stmt"]
+    return {"type": "Program", "body": procs + stmts, "pos": pos}
+
+
+def parse_document(
+    source: str,
+    prediction: Optional[str] = None,
+    budget: Optional[ParseBudget] = None,
+) -> ParsedDocument:
+    """Parsea un documento completo conservando los rangos de sus unidades."""
+    if prediction is None:
+        prediction = get_prediction_mode()
+    if budget is None:
+        budget = get_parse_budget()
+
+    try:
+        budget.check_source(source)
+        tree, lex_err, par_err = _parse_tree(source, prediction, None, BudgetMeter(budget))
+    except ParseBudgetExceeded as exc:
+        return ParsedDocument(source, None, exc.errors + [exc.error], None)
+    errors = lex_err.errors + par_err.errors
+
+    if errors:
+        try:
+            ast = ASTBuilder().visit(tree)
+        except Exception as e:  # AST puede fallar si el árbol está incompleto
+            errors.append({"line": 1, "column": 1, "message": f"AST error: {e}"})
+            ast = None
+        return ParsedDocument(source, ast, errors, None)
+
+    try:
+        units = _units_from_tree(tree)
+    except Exception as e:  # mismo trato que parse_to_ast: error de AST, sin unidades
+        errors.append({"line": 1, "column": 1, "message": f"AST error: {e}"})
+        return ParsedDocument(source, None, errors, None)
+    return ParsedDocument(source, _program_from_units(units, get_pos(tree)), errors, units)
+
+
+def _edit_offsets(line_starts: List[int], source_len: int, edit: Dict[str, Any]) -> Tuple[int, int]:
+    """Convierte el rango de una edición (estilo Monaco, base 1) a offsets [start, end)."""
+    rng = edit.get("range") or {}
+
+    def to_offset(line: int, column: int) -> int:
+        line = min(max(int(line), 1), len(line_starts))
+        return min(line_starts[line - 1] + max(int(column), 1) - 1, source_len)
+
+    start = to_offset(rng.get("startLineNumber", 1), rng.get("startColumn", 1))
+    end = to_offset(rng.get("endLineNumber", 1), rng.get("endColumn", 1))
+    return (start, end) if start <= end else (end, start)
+
+
+def apply_edits(source: str, edits: List[Dict[str, Any]]) -> Tuple[str, int, int]:
+    """
+    Aplica ediciones estilo Monaco ({range, text}) referidas al documento original.
+
+    Returns:
+        (nuevo código, inicio mínimo editado, fin máximo editado) en offsets del original
+    """
+    line_starts = [0]
+    for i, ch in enumerate(source):
+        if ch == "\n":
+            line_starts.append(i + 1)
+
+    spans = []
+    for edit in edits:
+        start, end = _edit_offsets(line_starts, len(source), edit)
+        spans.append((start, end, str(edit.get("text") or "")))
+
+    # Aplicar de atrás hacia adelante para que los offsets sigan siendo válidos
+    new_source = source
+    for start, end, text in sorted(spans, key=lambda s: (s[0], s[1]), reverse=True):
+        new_source = new_source[:start] + text + new_source[end:]
+
+    min_start = min(s[0] for s in spans)
+    max_end = max(s[1] for s in spans)
+    return new_source, min_start, max_end
+
+
+def _shift_positions(node: Any, anchor_line: int, line_delta: int, column_delta: int) -> Any:
+    """Copia un subárbol desplazando sus posiciones (copy-on-write)."""
+    if isinstance(node, list):
+        return [_shift_positions(item, anchor_line, line_delta, column_delta) for item in node]
+    if not isinstance(node, dict):
+        return node
+    shifted = {}
+    for key, value in node.items():
+        if key == "pos" and isinstance(value, dict) and value.get("line", 0) > 0:
+            line = value["line"]
+            column = value.get("column", 0)
+            if line == anchor_line:
+                column += column_delta
+            shifted[key] = {"line": line + line_delta, "column": column}
+        else:
+            shifted[key] = _shift_positions(value, anchor_line, line_delta, column_delta)
+    return shifted
+
+
+def reparse_document(
+    doc: ParsedDocument,
+    edits: List[Dict[str, Any]],
+    prediction: Optional[str] = None,
+    budget: Optional[ParseBudget] = None,
+) -> Tuple[ParsedDocument, Dict[str, Any]]:
+    """
+    Aplica ediciones a un documento y re-parsea solo las unidades afectadas.
+
+    Args:
+        doc: Documento parseado previamente
+        edits: Lista de ediciones {range: {startLineNumber, startColumn, endLineNumber,
+               endColumn}, text} referidas a doc.source
+        prediction: Estrategia de predicción (ver api.parse_to_ast)
+        budget: Presupuestos de parseo (por defecto get_parse_budget())
+
+    Returns:
+        (documento nuevo, estadísticas {incremental, reparsedUnits, totalUnits})
+    """
+    if budget is None:
+        budget = get_parse_budget()
+    if not edits:
+        return doc, {"incremental": True, "reparsedUnits": 0, "totalUnits": len(doc.units or [])}
+
+    old = doc.source
+    new_source, edit_start, edit_end = apply_edits(old, edits)
+
+    def full() -> Tuple[ParsedDocument, Dict[str, Any]]:
+        new_doc = parse_document(new_source, prediction, budget)
+        total = len(new_doc.units or [])
+        return new_doc, {"incremental": False, "reparsedUnits": total, "totalUnits": total}
+
+    units = doc.units
+    if not units or (budget.max_source_chars and len(new_source) > budget.max_source_chars):
+        return full()
+
+    # Unidades que tocan la edición, ampliadas con una vecina a cada lado para que
+    # las decisiones del parser en los bordes (';' opcional, lookahead) no cambien
+    # (si la edición cae entre dos unidades, first_hit == last_hit + 1 y se toman ambas)
+    first_hit = next((i for i, u in enumerate(units) if u.stop >= edit_start), len(units))
+    last_hit = next((i for i in range(len(units) - 1, -1, -1) if units[i].start <= edit_end), -1)
+    first = max(first_hit - 1, 0)
+    last = min(last_hit + 1, len(units) - 1)
+
+    region_start = units[first].start if first > 0 else 0
+    region_end = units[last].stop if last < len(units) - 1 else len(old)
+    region_start = min(region_start, edit_start)
+    region_end = max(region_end, edit_end)
+    delta = len(new_source) - len(old)
+
+    # Rellenar con saltos de línea/espacios para que ANTLR produzca posiciones absolutas
+    line, column = _line_col(new_source, region_start)
+    padding = "\n" * (line - 1) + " " * column
+    region_text = new_source[region_start:region_end + delta]
+
+    if prediction is None:
+        prediction = get_prediction_mode()
+    try:
+        tree, lex_err, par_err = _parse_tree(padding + region_text, prediction, None, BudgetMeter(budget))
+    except ParseBudgetExceeded:
+        return full()
+    if lex_err.errors or par_err.errors:
+        return full()
+
+    try:
+        region_units = _units_from_tree(tree, base_offset=region_start - len(padding))
+    except Exception:
+        # El parseo completo reporta el error de AST del documento entero
+        return full()
+
+    old_end_line, old_end_col = _line_col(old, region_end)
+    new_end_line, new_end_col = _line_col(new_source, region_end + delta)
+    line_delta = new_end_line - old_end_line
+    column_delta = new_end_col - old_end_col
+
+    tail: List[Unit] = []
+    for u in units[last + 1:]:
+        node = u.node
+        if line_delta or column_delta:
+            node = _shift_positions(node, old_end_line, line_delta, column_delta)
+        tail.append(Unit(u.kind, u.start + delta, u.stop + delta, node))
+
+    new_units = units[:first] + region_units + tail
+    if not new_units:
+        return full()
+
+    first_line, first_col = _line_col(new_source, new_units[0].start)
+    ast = _program_from_units(new_units, {"line": first_line, "column": first_col})
+    stats = {"incremental": True, "reparsedUnits": len(region_units), "totalUnits": len(new_units)}
+    return ParsedDocument(new_source, ast, [], new_units), stats
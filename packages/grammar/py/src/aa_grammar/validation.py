@@ -0,0 +1,117 @@
+"""
+Validación ligera: solo tokens y balance de delimitadores.
+
+Pensada para chequeos en cada pulsación del editor: no hay parser ni AST. Se
+tokeniza el código una vez y se comprueba en una pasada que paréntesis,
+corchetes, llaves y bloques BEGIN…END estén balanceados. Los errores tienen la
+misma forma {line, column, message} que los de parse_to_ast (línea y columna
+base 1).
+
+Se tokeniza con el tokenizador de fast_parser, que acepta exactamente lo mismo
+que LanguageLexer y es bastante más rápido; si encuentra un carácter no
+reconocido se vuelve a tokenizar con LanguageLexer para que los errores léxicos
+sean exactamente los mensajes de ANTLR.
+
+Un programa sin errores aquí puede tener errores de sintaxis; el parseo completo
+sigue siendo necesario para obtenerlos.
+"""
+from typing import Any, Dict, List, Tuple
+from antlr4 import InputStream, Token  # type: ignore
+from .generated.LanguageLexer import LanguageLexer  # type: ignore
+from .error_listener import CollectingErrorListener
+from .fast_parser import FastParseError, tokenize
+
+# (tipo, texto, línea base 1, columna base 0), como los tokens de fast_parser
+Delimiter = Tuple[str, str, int, int]
+
+# Apertura -> cierre esperado
+_CLOSER_OF = {"(": ")", "[": "]", "{": "}", "BEGIN": "END"}
+_CLOSERS = set(_CLOSER_OF.values())
+
+# Tipos de ANTLR -> tipos de fast_parser (solo delimitadores)
+_ANTLR_KINDS = {
+    LanguageLexer.LPAREN: "(",
+    LanguageLexer.RPAREN: ")",
+    LanguageLexer.LBRACK: "[",
+    LanguageLexer.RBRACK: "]",
+    LanguageLexer.LBRACE: "{",
+    LanguageLexer.RBRACE: "}",
+    LanguageLexer.BEGIN_KW: "BEGIN",
+    LanguageLexer.END_KW: "END",
+}
+
+
+def _error(token: Delimiter, message: str) -> Dict[str, Any]:
+    return {"line": token[2], "column": token[3] + 1, "message": message}
+
+
+def _unclosed(token: Delimiter) -> Dict[str, Any]:
+    closer = _CLOSER_OF[token[0]]
+    expected = closer if closer == "END" else f"'{closer}'"
+    return _error(token, f"'{token[1]}' sin cerrar (falta {expected})")
+
+
+def check_balance(tokens: List[Delimiter]) -> List[Dict[str, Any]]:
+    """
+    Comprueba en una pasada que los delimitadores estén balanceados.
+
+    Un cierre que no corresponde a la apertura más reciente, pero sí a una más
+    externa, cierra esa apertura y reporta las intermedias como sin cerrar; un
+    cierre sin ninguna apertura compatible se reporta y se ignora.
+    """
+    errors: List[Dict[str, Any]] = []
+    stack: List[Delimiter] = []
+    for token in tokens:
+        kind = token[0]
+        if kind in _CLOSER_OF:
+            stack.append(token)
+        elif kind in _CLOSERS:
+            if stack and _CLOSER_OF[stack[-1][0]] == kind:
+                stack.pop()
+                continue
+            depth = next(
+                (i for i in range(len(stack) - 1, -1, -1) if _CLOSER_OF[stack[i][0]] == kind),
+                None,
+            )
+            if depth is None:
+                errors.append(_error(token, f"'{token[1]}' sin apertura correspondiente"))
+                continue
+            errors.extend(_unclosed(opener) for opener in stack[depth + 1:])
+            del stack[depth:]
+    errors.extend(_unclosed(opener) for opener in stack)
+    return errors
+
+
+def _antlr_tokens(source: str) -> Tuple[List[Delimiter], List[Dict[str, Any]]]:
+    """Tokeniza con LanguageLexer: (delimitadores, errores léxicos de ANTLR)."""
+    lexer = LanguageLexer(InputStream(source))
+    lex_err = CollectingErrorListener()
+    lexer.removeErrorListeners()
+    lexer.addErrorListener(lex_err)
+
+    delimiters: List[Delimiter] = []
+    token = lexer.nextToken()
+    while token.type != Token.EOF:
+        kind = _ANTLR_KINDS.get(token.type)
+        if kind is not None:
+            delimiters.append((kind, token.text, token.line, token.column))
+        token = lexer.nextToken()
+    return delimiters, lex_err.errors
+
+
+def validate_source(source: str) -> List[Dict[str, Any]]:
+    """
+    Valida un programa solo con el lexer y el balance de delimitadores.
+
+    Devuelve la lista de errores (vacía si el programa tokeniza y está
+    balanceado), ordenada por posición.
+    """
+    try:
+        tokens: List[Delimiter] = tokenize(source)
+        lex_errors: List[Dict[str, Any]] = []
+    except FastParseError:
+        tokens, lex_errors = _antlr_tokens(source)
+
+    errors = lex_errors + check_balance(tokens)
+    errors.sort(key=lambda e: (e["line"], e["column"]))
+    return errors
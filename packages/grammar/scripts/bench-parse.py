@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark de parse_to_ast por motor, estrategia de predicción y construcción del AST.
+
+Corpus: los programas de packages/grammar/fixtures más todos los programas en
+pseudocódigo embebidos como strings en apps/api/tests (los que contienen BEGIN
+o bloques con asignaciones). Incluye programas válidos e inválidos, así que mide
+tanto la ruta rápida (SLL) como la de re-parseo con LL.
+
+Uso (con aa_grammar instalado):
+    python packages/grammar/scripts/bench-parse.py [--repeat 20]
+"""
+import argparse
+import ast as py_ast
+import glob
+import os
+import statistics
+import time
+
+from aa_grammar.api import AST_BUILD_MODES, ENGINE_ANTLR, ENGINE_MODES, PREDICTION_MODES, parse_to_ast
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+
+
+def load_corpus():
+    programs = []
+    for path in sorted(glob.glob(os.path.join(ROOT, "packages/grammar/fixtures/*.pseudo"))):
+        with open(path, encoding="utf-8") as fh:
+            programs.append(fh.read())
+    for path in sorted(glob.glob(os.path.join(ROOT, "apps/api/tests/**/*.py"), recursive=True)):
+        with open(path, encoding="utf-8") as fh:
+            tree = py_ast.parse(fh.read())
+        for node in py_ast.walk(tree):
+            if isinstance(node, py_ast.Constant) and isinstance(node.value, str):
+                text = node.value
+                if "BEGIN" in text or ("{" in text and "<-" in text):
+                    programs.append(text)
+    return programs
+
+
+def bench(programs, prediction, repeat, build=None, engine=ENGINE_ANTLR):
+    # Calentar el DFA compartido para medir el estado estable
+    for src in programs:
+        parse_to_ast(src, prediction, build, engine)
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for src in programs:
+            parse_to_ast(src, prediction, build, engine)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=20, help="pasadas completas por estrategia")
+    args = parser.parse_args()
+
+    programs = load_corpus()
+    invalid = sum(1 for src in programs if parse_to_ast(src)[1])
+    print(f"corpus: {len(programs)} programas ({invalid} con errores), {args.repeat} pasadas")
+
+    results = {}
+    for prediction in PREDICTION_MODES:
+        samples = bench(programs, prediction, args.repeat)
+        results[prediction] = statistics.median(samples)
+        per_program_ms = results[prediction] / len(programs) * 1000
+        print(f"{prediction:>10}: mediana {results[prediction] * 1000:8.2f} ms/pasada "
+              f"({per_program_ms:.3f} ms/programa)")
+
+    baseline = results["ll"]
+    for prediction, value in results.items():
+        if prediction != "ll" and value:
+            print(f"speedup {prediction} vs ll: {baseline / value:.2f}x")
+
+    builds = {}
+    for build in AST_BUILD_MODES:
+        builds[build] = statistics.median(bench(programs, None, args.repeat, build))
+        print(f"{build:>10}: mediana {builds[build] * 1000:8.2f} ms/pasada")
+    if builds["listener"]:
+        print(f"speedup listener vs tree: {builds['tree'] / builds['listener']:.2f}x")
+
+    engines = {}
+    for engine in ENGINE_MODES:
+        engines[engine] = statistics.median(bench(programs, None, args.repeat, None, engine))
+        print(f"{engine:>10}: mediana {engines[engine] * 1000:8.2f} ms/pasada")
+    if engines["fast"]:
+        print(f"speedup fast vs antlr: {engines['antlr'] / engines['fast']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()